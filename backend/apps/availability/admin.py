@@ -1,6 +1,16 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.db.models import QuerySet
+from django.http import HttpRequest
 
-from .models import Booking
+from .models import (
+    Booking,
+    BookingStatus,
+    CalendarEvent,
+    CalendarSyncState,
+    CalendarWatchChannel,
+    SlotHold,
+)
+from .services import push_bookings_to_calendar, remove_bookings_from_calendar
 
 
 @admin.register(Booking)
@@ -9,11 +19,62 @@ class BookingAdmin(admin.ModelAdmin):
         "customer_name",
         "service",
         "start_datetime",
+        "calendar_id",
         "status",
         "customer_email",
         "created_at",
     )
-    list_filter = ("status", "service")
+    list_filter = ("status", "service", "calendar_id")
     search_fields = ("customer_name", "customer_email")
     date_hierarchy = "start_datetime"
     readonly_fields = ("stripe_checkout_session_id", "google_event_id", "created_at")
+    actions = ("push_to_calendar", "remove_from_calendar")
+
+    @admin.action(description="Add selected bookings to Google Calendar")
+    def push_to_calendar(self, request: HttpRequest, queryset: QuerySet[Booking]) -> None:
+        pending = queryset.filter(google_event_id="", status=BookingStatus.CONFIRMED).count()
+        pushed = push_bookings_to_calendar(queryset.select_related("service"))
+        level = messages.SUCCESS if pushed == pending else messages.WARNING
+        self.message_user(request, f"{pushed} of {pending} booking(s) added to the calendar.", level)
+
+    @admin.action(description="Remove selected bookings from Google Calendar")
+    def remove_from_calendar(self, request: HttpRequest, queryset: QuerySet[Booking]) -> None:
+        linked = queryset.exclude(google_event_id="").count()
+        removed = remove_bookings_from_calendar(queryset)
+        level = messages.SUCCESS if removed == linked else messages.WARNING
+        self.message_user(request, f"{removed} of {linked} booking(s) removed from the calendar.", level)
+
+
+@admin.register(CalendarEvent)
+class CalendarEventAdmin(admin.ModelAdmin):
+    list_display = ("summary", "start_datetime", "end_datetime", "calendar_id", "synced_at")
+    list_filter = ("calendar_id",)
+    search_fields = ("summary", "google_event_id")
+    date_hierarchy = "start_datetime"
+    readonly_fields = ("google_event_id", "google_updated", "synced_at")
+
+
+@admin.register(CalendarSyncState)
+class CalendarSyncStateAdmin(admin.ModelAdmin):
+    list_display = ("calendar_id", "synced_at", "full_synced_at", "last_attempt_at", "last_error")
+    readonly_fields = (
+        "sync_token",
+        "synced_at",
+        "full_synced_at",
+        "updated_watermark",
+        "last_attempt_at",
+        "last_error",
+    )
+
+
+@admin.register(CalendarWatchChannel)
+class CalendarWatchChannelAdmin(admin.ModelAdmin):
+    list_display = ("channel_id", "calendar_id", "expires_at", "created_at")
+    exclude = ("token",)
+    readonly_fields = ("calendar_id", "channel_id", "resource_id", "expires_at", "created_at")
+
+
+@admin.register(SlotHold)
+class SlotHoldAdmin(admin.ModelAdmin):
+    list_display = ("start_datetime", "end_datetime", "expires_at", "stripe_checkout_session_id")
+    readonly_fields = ("stripe_checkout_session_id", "created_at")
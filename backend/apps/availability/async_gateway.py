@@ -0,0 +1,211 @@
+"""Async Google Calendar reads for the ASGI availability views.
+
+The discovery client is built on httplib2 and blocks a thread for the
+whole upstream round trip. Under UvicornWorker that means a handful of
+slow Google calls can exhaust the worker's thread pool. Here freeBusy
+(and the events.list pass for all-day events) is called over a pooled
+httpx.AsyncClient instead, so one worker keeps many calls in flight on
+the event loop; a semaphore caps how many are outstanding at once.
+
+Credentials and token refresh are still owned by the sync
+CalendarClient — a refresh happens roughly hourly and runs off-loop.
+Calls share calendar_gateway's circuit breaker and are cut off after
+calendar_gateway.CALL_TIMEOUT, queueing for the semaphore included.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any
+from urllib.parse import quote
+
+import httpx
+from asgiref.sync import sync_to_async
+from decouple import config
+
+from . import calendar_gateway, slots
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from datetime import datetime
+
+    from .cache import BusyInterval
+
+logger = logging.getLogger(__name__)
+
+API_BASE = "https://www.googleapis.com/calendar/v3"
+MAX_CONCURRENCY = config("GOOGLE_CALENDAR_MAX_CONCURRENCY", cast=int, default=10)
+TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+
+
+class AsyncCalendarClient:
+    """Pooled async HTTP access to the Calendar REST API.
+
+    The httpx client and semaphore are bound to the event loop that
+    first uses them and rebuilt if a different loop shows up (tests
+    run one loop per test; production has one loop per worker).
+    """
+
+    def __init__(
+        self,
+        *,
+        token: Callable[[], Awaitable[str | None]] | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        max_concurrency: int = MAX_CONCURRENCY,
+        timeout: httpx.Timeout = TIMEOUT,
+        deadline: float | None = None,
+    ) -> None:
+        self._token = token or sync_to_async(
+            calendar_gateway._client.access_token, thread_sensitive=False
+        )
+        self._transport = transport
+        self._max_concurrency = max_concurrency
+        self._timeout = timeout
+        self._deadline = deadline
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._http: httpx.AsyncClient | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+
+    def _bind(self) -> tuple[httpx.AsyncClient, asyncio.Semaphore]:
+        loop = asyncio.get_running_loop()
+        if self._http is None or self._semaphore is None or self._loop is not loop:
+            self._loop = loop
+            self._http = httpx.AsyncClient(
+                base_url=API_BASE,
+                transport=self._transport,
+                timeout=self._timeout,
+                limits=httpx.Limits(
+                    max_connections=self._max_concurrency,
+                    max_keepalive_connections=self._max_concurrency,
+                ),
+            )
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        return self._http, self._semaphore
+
+    async def post(self, path: str, body: dict[str, Any]) -> dict[str, Any] | None:
+        """POST JSON and return the decoded response; None on any failure."""
+        return await self._call("POST", path, json=body)
+
+    async def get(self, path: str, params: dict[str, Any]) -> dict[str, Any] | None:
+        """GET with query parameters; None on any failure."""
+        return await self._call("GET", path, params=params)
+
+    async def _call(self, method: str, path: str, **kwargs: Any) -> dict[str, Any] | None:
+        breaker = calendar_gateway._breaker
+        if not breaker.allow():
+            logger.warning("Google Calendar circuit open — not calling %s", path)
+            return None
+
+        deadline = self._deadline or calendar_gateway.CALL_TIMEOUT
+        try:
+            async with asyncio.timeout(deadline):
+                response = await self._send(method, path, **kwargs)
+        except TimeoutError:
+            breaker.record_failure()
+            logger.error("Calendar API deadline of %ss exceeded (%s)", deadline, path)
+            return None
+        except httpx.HTTPStatusError as error:
+            status = error.response.status_code
+            if status >= 500 or status == 429:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            logger.error(
+                "Calendar API error (%s): %s %s",
+                path,
+                status,
+                error.response.text[:500],
+            )
+            return None
+        except httpx.HTTPError as error:
+            breaker.record_failure()
+            logger.error("Calendar API transport error (%s): %r", path, error)
+            return None
+
+        if response is None:
+            breaker.record_failure()
+            logger.error("No calendar credentials — cannot call %s", path)
+            return None
+        breaker.record_success()
+        result: dict[str, Any] = response.json()
+        return result
+
+    async def _send(self, method: str, path: str, **kwargs: Any) -> httpx.Response | None:
+        token = await self._token()
+        if not token:
+            return None
+        http, semaphore = self._bind()
+        async with semaphore:
+            response = await http.request(
+                method,
+                path,
+                headers={"Authorization": f"Bearer {token}"},
+                **kwargs,
+            )
+        response.raise_for_status()
+        return response
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+        self._http = None
+        self._semaphore = None
+        self._loop = None
+
+
+_client = AsyncCalendarClient()
+
+
+async def _all_day_busy(
+    time_min: datetime, time_max: datetime, calendar_id: str
+) -> list[BusyInterval] | None:
+    """Async twin of list_busy_intervals' events.list pass for all-day events."""
+    path = f"/calendars/{quote(calendar_id, safe='')}/events"
+    params = calendar_gateway._all_day_params(time_min, time_max)
+    intervals: list[BusyInterval] = []
+    while True:
+        page = await _client.get(path, params)
+        if page is None:
+            return None
+        intervals.extend(
+            calendar_gateway._all_day_intervals(page.get("items", []), time_min, time_max)
+        )
+        if not page.get("nextPageToken"):
+            return intervals
+        params = {**params, "pageToken": page["nextPageToken"]}
+
+
+async def list_busy_intervals(
+    time_min: datetime,
+    time_max: datetime,
+    calendar_id: str = calendar_gateway.CALENDAR_ID,
+) -> list[BusyInterval] | None:
+    """Async twin of calendar_gateway.list_busy_intervals.
+
+    Chunks of a long range and the all-day pass are queried concurrently.
+    """
+    all_day, *results = await asyncio.gather(
+        _all_day_busy(time_min, time_max, calendar_id),
+        *(
+            _client.post(
+                "/freeBusy",
+                calendar_gateway._freebusy_body(calendar_id, chunk_min, chunk_max),
+            )
+            for chunk_min, chunk_max in calendar_gateway._freebusy_chunks(
+                time_min, time_max
+            )
+        ),
+    )
+    if all_day is None:
+        return None
+
+    intervals: list[BusyInterval] = list(all_day)
+    for result in results:
+        if result is None:
+            return None
+        chunk = calendar_gateway._freebusy_intervals(result, calendar_id)
+        if chunk is None:
+            return None
+        intervals.extend(chunk)
+    return slots.merge_intervals(intervals)
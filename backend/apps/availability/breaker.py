@@ -0,0 +1,132 @@
+"""Circuit breaker for calls to Google Calendar.
+
+Closed: calls go through and outcomes are recorded over a sliding
+window. Once the window holds at least `min_calls` outcomes and the
+failure rate reaches `failure_rate`, the breaker opens: calls are
+refused without touching the network for `reset_timeout` seconds.
+Then it goes half-open and lets a single probe through — success
+closes it, failure opens it for another `reset_timeout`.
+
+State is per process, which is what we want: each worker protects its
+own threads and event loop.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        *,
+        failure_rate: float = 0.5,
+        min_calls: int = 5,
+        window: float = 60.0,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self._failure_rate = failure_rate
+        self._min_calls = min_calls
+        self._window = window
+        self._reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._probe_started = 0.0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go out now. Half-open admits one probe."""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == CLOSED:
+                return True
+            # A probe whose outcome never got recorded (caller crashed)
+            # must not wedge the breaker half-open forever.
+            if self._state == HALF_OPEN and (
+                not self._probe_in_flight
+                or self._clock() - self._probe_started >= self._reset_timeout
+            ):
+                self._probe_in_flight = True
+                self._probe_started = self._clock()
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state == HALF_OPEN:
+                logger.info("Circuit %s closed after successful probe", self.name)
+                self._state = CLOSED
+                self._outcomes.clear()
+                self._probe_in_flight = False
+                return
+            self._record(ok=True)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._trip("probe failed")
+                return
+            self._record(ok=False)
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            if (
+                self._state == CLOSED
+                and len(self._outcomes) >= self._min_calls
+                and failures / len(self._outcomes) >= self._failure_rate
+            ):
+                self._trip(f"{failures}/{len(self._outcomes)} calls failed")
+
+    def reset(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._outcomes.clear()
+            self._probe_in_flight = False
+
+    # Callers hold self._lock for everything below.
+
+    def _record(self, *, ok: bool) -> None:
+        now = self._clock()
+        self._outcomes.append((now, ok))
+        while self._outcomes and self._outcomes[0][0] < now - self._window:
+            self._outcomes.popleft()
+
+    def _trip(self, reason: str) -> None:
+        logger.warning(
+            "Circuit %s opened for %.0fs: %s", self.name, self._reset_timeout, reason
+        )
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._probe_in_flight = False
+        self._outcomes.clear()
+
+    def _maybe_half_open(self) -> None:
+        if (
+            self._state == OPEN
+            and self._clock() - self._opened_at >= self._reset_timeout
+        ):
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
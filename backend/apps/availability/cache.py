@@ -0,0 +1,314 @@
+"""Month-level cache of raw busy intervals for availability reads.
+
+One entry per (calendar, month) holds the busy intervals fetched from
+Google. Busy days and free slots are both derived from that entry, so
+a visitor clicking through a month view costs one upstream fetch.
+
+Entries are fresh for ``TTL`` seconds, then served stale for up to
+``STALE_TTL`` more while a single background refresh runs. Writes to
+the calendar invalidate the months they touch; a delete without dates
+bumps the calendar's generation, which orphans every month at once.
+
+Every store also writes a "last known good" copy outside the
+generation scheme, kept for ``LAST_GOOD_TTL``. Invalidation leaves it
+alone; it is only read when Google cannot be reached at all (see
+last_good_month_intervals).
+
+refresh_month lets apps.availability.prewarm fill months before any
+visitor asks for them.
+
+aget_month_intervals is the same policy for async callers: cache
+access goes through the backend's async API and the background
+refresh is an asyncio task instead of a thread.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Coroutine
+
+    from django.core.cache.backends.base import BaseCache
+
+logger = logging.getLogger(__name__)
+
+# [start, end) as epoch seconds — compact and cheap to pickle.
+BusyInterval = tuple[int, int]
+
+_DEFAULTS: dict[str, Any] = {
+    "ALIAS": "default",
+    "TTL": 300,
+    "STALE_TTL": 3600,
+    "REFRESH_LOCK_TTL": 30,
+    "LAST_GOOD_TTL": 86400,
+}
+
+
+def _conf() -> dict[str, Any]:
+    return {**_DEFAULTS, **getattr(settings, "AVAILABILITY_CACHE", {})}
+
+
+def _cache() -> BaseCache:
+    return caches[_conf()["ALIAS"]]
+
+
+def _generation_key(calendar_id: str) -> str:
+    return f"availability:gen:{calendar_id}"
+
+
+def month_key(calendar_id: str, year: int, month: int) -> str:
+    generation = _cache().get(_generation_key(calendar_id), 0)
+    return f"availability:busy:{calendar_id}:g{generation}:{year:04d}-{month:02d}"
+
+
+async def amonth_key(calendar_id: str, year: int, month: int) -> str:
+    generation = await _cache().aget(_generation_key(calendar_id), 0)
+    return f"availability:busy:{calendar_id}:g{generation}:{year:04d}-{month:02d}"
+
+
+def _entry(intervals: list[BusyInterval]) -> dict[str, Any]:
+    return {"intervals": intervals, "fetched_at": time.time()}
+
+
+def _timeout() -> int:
+    conf = _conf()
+    return int(conf["TTL"] + conf["STALE_TTL"])
+
+
+def _last_good_key(calendar_id: str, year: int, month: int) -> str:
+    return f"availability:last-good:{calendar_id}:{year:04d}-{month:02d}"
+
+
+def _last_good_key_for(key: str) -> str:
+    # A month_key minus its generation.
+    head, _generation, year_month = key.rsplit(":", 2)
+    year, month = year_month.split("-")
+    return _last_good_key(
+        head.removeprefix("availability:busy:"), int(year), int(month)
+    )
+
+
+def _store(key: str, intervals: list[BusyInterval]) -> None:
+    cache = _cache()
+    entry = _entry(intervals)
+    cache.set(key, entry, timeout=_timeout())
+    cache.set(_last_good_key_for(key), entry, timeout=_conf()["LAST_GOOD_TTL"])
+
+
+async def _astore(key: str, intervals: list[BusyInterval]) -> None:
+    cache = _cache()
+    entry = _entry(intervals)
+    await cache.aset(key, entry, timeout=_timeout())
+    await cache.aset(
+        _last_good_key_for(key), entry, timeout=_conf()["LAST_GOOD_TTL"]
+    )
+
+
+def _spawn(fn: Callable[[], None]) -> None:
+    threading.Thread(target=fn, daemon=True, name="availability-refresh").start()
+
+
+def _refresh(
+    key: str,
+    fetch: Callable[[], list[BusyInterval] | None],
+    seen_fetched_at: float,
+) -> None:
+    cache = _cache()
+    try:
+        intervals = fetch()
+        if intervals is None:
+            return
+        # An invalidation that landed while we were fetching wins —
+        # never overwrite it with data read before the write.
+        current = cache.get(key)
+        if current is None or current.get("fetched_at") != seen_fetched_at:
+            return
+        _store(key, intervals)
+    except Exception:
+        logger.exception("Background availability refresh failed: %s", key)
+    finally:
+        cache.delete(f"{key}:refreshing")
+
+
+def get_month_intervals(
+    *,
+    calendar_id: str,
+    year: int,
+    month: int,
+    fetch: Callable[[], list[BusyInterval] | None],
+) -> list[BusyInterval] | None:
+    """Return cached busy intervals for a month, fetching on a miss.
+
+    `fetch` returns None on upstream failure; that is passed through
+    uncached so callers can fail closed instead of showing a fully
+    free day.
+    """
+    conf = _conf()
+    key = month_key(calendar_id, year, month)
+    entry = _cache().get(key)
+
+    if entry is not None:
+        fetched_at = entry["fetched_at"]
+        if time.time() - fetched_at >= conf["TTL"] and _cache().add(
+            f"{key}:refreshing", 1, timeout=conf["REFRESH_LOCK_TTL"]
+        ):
+            _spawn(lambda: _refresh(key, fetch, fetched_at))
+        intervals: list[BusyInterval] = entry["intervals"]
+        return intervals
+
+    fresh = fetch()
+    if fresh is not None:
+        _store(key, fresh)
+    return fresh
+
+
+_tasks: set[asyncio.Task[None]] = set()
+
+
+def _spawn_async(coro: Coroutine[Any, Any, None]) -> None:
+    # Keep a reference until done — the loop only holds weak ones.
+    task = asyncio.ensure_future(coro)
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+async def _arefresh(
+    key: str,
+    fetch: Callable[[], Awaitable[list[BusyInterval] | None]],
+    seen_fetched_at: float,
+) -> None:
+    cache = _cache()
+    try:
+        intervals = await fetch()
+        if intervals is None:
+            return
+        current = await cache.aget(key)
+        if current is None or current.get("fetched_at") != seen_fetched_at:
+            return
+        await _astore(key, intervals)
+    except Exception:
+        logger.exception("Background availability refresh failed: %s", key)
+    finally:
+        await cache.adelete(f"{key}:refreshing")
+
+
+async def aget_month_intervals(
+    *,
+    calendar_id: str,
+    year: int,
+    month: int,
+    fetch: Callable[[], Awaitable[list[BusyInterval] | None]],
+) -> list[BusyInterval] | None:
+    """Async get_month_intervals: same TTL, stale window and lock."""
+    conf = _conf()
+    cache = _cache()
+    key = await amonth_key(calendar_id, year, month)
+    entry = await cache.aget(key)
+
+    if entry is not None:
+        fetched_at = entry["fetched_at"]
+        if time.time() - fetched_at >= conf["TTL"] and await cache.aadd(
+            f"{key}:refreshing", 1, timeout=conf["REFRESH_LOCK_TTL"]
+        ):
+            _spawn_async(_arefresh(key, fetch, fetched_at))
+        intervals: list[BusyInterval] = entry["intervals"]
+        return intervals
+
+    fresh = await fetch()
+    if fresh is not None:
+        await _astore(key, fresh)
+    return fresh
+
+
+def _fetched_at(entry: dict[str, Any] | None) -> float | None:
+    return None if entry is None else float(entry["fetched_at"])
+
+
+def month_age(calendar_id: str, year: int, month: int) -> float | None:
+    """Seconds since the cached month was fetched; None if not cached."""
+    fetched_at = _fetched_at(_cache().get(month_key(calendar_id, year, month)))
+    return None if fetched_at is None else time.time() - fetched_at
+
+
+def refresh_month(
+    *,
+    calendar_id: str,
+    year: int,
+    month: int,
+    fetch: Callable[[], list[BusyInterval] | None],
+) -> bool:
+    """Fetch a month ahead of readers and cache it; False if `fetch` failed.
+
+    Like the background refresh, a write that invalidates the month
+    while the fetch is in flight wins over the fetched data.
+    """
+    cache = _cache()
+    key = month_key(calendar_id, year, month)
+    seen = _fetched_at(cache.get(key))
+    intervals = fetch()
+    if intervals is None:
+        return False
+    if _fetched_at(cache.get(key)) == seen:
+        _store(key, intervals)
+    return True
+
+
+def last_good_month_intervals(
+    calendar_id: str, year: int, month: int
+) -> list[BusyInterval] | None:
+    """The last intervals fetched for a month, however old; None if never.
+
+    Survives invalidation on purpose: this is the fallback for when
+    Google is unreachable, and callers must lay their own writes on top.
+    """
+    entry = _cache().get(_last_good_key(calendar_id, year, month))
+    if entry is None:
+        return None
+    intervals: list[BusyInterval] = entry["intervals"]
+    return intervals
+
+
+async def alast_good_month_intervals(
+    calendar_id: str, year: int, month: int
+) -> list[BusyInterval] | None:
+    entry = await _cache().aget(_last_good_key(calendar_id, year, month))
+    if entry is None:
+        return None
+    intervals: list[BusyInterval] = entry["intervals"]
+    return intervals
+
+
+def invalidate_month(calendar_id: str, year: int, month: int) -> None:
+    _cache().delete(month_key(calendar_id, year, month))
+
+
+def invalidate_range(calendar_id: str, start: datetime, end: datetime) -> None:
+    """Invalidate every month touched by [start, end)."""
+    start = timezone.localtime(start)
+    last = timezone.localtime(max(end - timedelta(microseconds=1), start))
+    year, month = start.year, start.month
+    while (year, month) <= (last.year, last.month):
+        invalidate_month(calendar_id, year, month)
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    logger.debug("Availability cache invalidated: %s %s..%s", calendar_id, start, end)
+
+
+def invalidate_calendar(calendar_id: str) -> None:
+    """Orphan every cached month for a calendar."""
+    cache = _cache()
+    key = _generation_key(calendar_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+    logger.debug("Availability cache generation bumped: %s", calendar_id)
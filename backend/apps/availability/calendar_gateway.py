@@ -1,34 +1,82 @@
 """Google Calendar API integration for managing booking events."""
 import base64
+import hashlib
 import json
 import logging
-from datetime import datetime, timedelta
-from typing import Any
+import os
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import UTC, date, datetime, timedelta
+from typing import Any, TypeVar
 from zoneinfo import ZoneInfo
 
+import google_auth_httplib2
+import httplib2
 from decouple import config
-from google.auth.exceptions import RefreshError
+from google.auth.exceptions import RefreshError, TransportError
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+from . import cache as availability_cache
+from . import slots
+from .breaker import OPEN, CircuitBreaker
+from .cache import BusyInterval
+
 logger = logging.getLogger(__name__)
 
 SCOPES = ["https://www.googleapis.com/auth/calendar"]
 CALENDAR_ID = config("GOOGLE_CALENDAR_ID", default="primary")
 TZ = ZoneInfo("Europe/Paris")
 
+# Refresh the access token this long before Google says it expires,
+# so a request never goes out with a token that dies mid-flight.
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
 
-def _get_credentials() -> Credentials | None:
-    """Load service-account credentials from environment."""
-    sa_b64 = config("GOOGLE_SERVICE_ACCOUNT_BASE64", default=None)
-    if not sa_b64:
-        logger.error(
-            "GOOGLE_SERVICE_ACCOUNT_BASE64 not set — "
-            "cannot authenticate with Google Calendar"
-        )
-        return None
+# Google rejects freeBusy queries over long ranges; longer windows are
+# split into consecutive queries of at most this length.
+FREEBUSY_MAX_WINDOW = timedelta(days=60)
+
+# Socket timeout for every Google call, token refreshes included.
+# Must stay well below the worker timeout: a hung upstream should cost
+# a visitor a few seconds, not the request.
+CALL_TIMEOUT = config("GOOGLE_CALENDAR_TIMEOUT", cast=float, default=5.0)
+
+# Threads fetching several calendars at once (see CalendarClient.map).
+FETCH_WORKERS = 4
+
+# Transport-level failures raised instead of an HttpError: httplib2's,
+# and google-auth's when a token refresh cannot reach the token endpoint.
+TRANSPORT_ERRORS = (OSError, httplib2.HttpLib2Error, TransportError)
+
+# Shared by every gateway call (and async_gateway). While open, calls
+# fail fast without touching the network and availability readers
+# fall back to the last intervals that were fetched successfully.
+_breaker = CircuitBreaker(
+    "google-calendar",
+    failure_rate=config("GOOGLE_CALENDAR_BREAKER_FAILURE_RATE", cast=float, default=0.5),
+    min_calls=config("GOOGLE_CALENDAR_BREAKER_MIN_CALLS", cast=int, default=5),
+    reset_timeout=config("GOOGLE_CALENDAR_BREAKER_RESET_SECONDS", cast=float, default=30.0),
+)
+
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+class SyncTokenExpiredError(Exception):
+    """Google answered 410 Gone: the sync token is no longer valid.
 
+    The only recovery is a full sync without a token.
+    """
+
+
+def _credentials_from_b64(sa_b64: str) -> Credentials | None:
+    """Decode a base64 service-account JSON into credentials."""
     try:
         sa_json = base64.b64decode(sa_b64).decode("utf-8")
         info = json.loads(sa_json)
@@ -41,180 +89,500 @@ def _get_credentials() -> Credentials | None:
         return None
 
 
+def _build_service(creds: Any) -> Any:
+    return build(
+        "calendar",
+        "v3",
+        http=google_auth_httplib2.AuthorizedHttp(
+            creds, http=httplib2.Http(timeout=CALL_TIMEOUT)
+        ),
+        cache_discovery=False,
+    )
+
+
+def _token_request() -> Any:
+    return google_auth_httplib2.Request(httplib2.Http(timeout=CALL_TIMEOUT))
+
+
+class CalendarClient:
+    """Process-wide holder for the authenticated Calendar API service.
+
+    Credentials are decoded once and reused until the service-account
+    secret changes (rotation). The access token is refreshed under a
+    lock shortly before it expires, so concurrent requests never race
+    each other to the token endpoint. The discovery-built service is
+    kept per thread: its httplib2 transport is not thread-safe.
+
+    The client also owns the small pool that fetches several calendars
+    at once, where each worker thread builds its service once. The pool
+    starts on first use, never at import, so management commands and
+    forked workers do not inherit its threads; close() stops it.
+    """
+
+    def __init__(
+        self,
+        *,
+        build_service: Callable[[Any], Any] = _build_service,
+        token_request: Callable[[], Any] = _token_request,
+        refresh_margin: timedelta = TOKEN_REFRESH_MARGIN,
+    ) -> None:
+        self._build_service = build_service
+        self._token_request = token_request
+        self._refresh_margin = refresh_margin
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._fingerprint: str | None = None
+        self._credentials: Any | None = None
+        self._generation = 0
+        self._pool_lock = threading.Lock()
+        self._pool: ThreadPoolExecutor | None = None
+        self._pool_pid: int | None = None
+
+    def reset(self) -> None:
+        """Drop cached credentials and services (tests, forced rotation)."""
+        with self._lock:
+            self._fingerprint = None
+            self._credentials = None
+            self._generation += 1
+
+    def map(self, fn: Callable[[_T], _R], items: Iterable[_T]) -> list[_R]:
+        """`fn` over `items` on the fetch pool, results in order."""
+        with self._pool_lock:
+            if self._pool is None or self._pool_pid != os.getpid():
+                self._pool = ThreadPoolExecutor(
+                    max_workers=FETCH_WORKERS, thread_name_prefix="calendar-fetch"
+                )
+                self._pool_pid = os.getpid()
+            pool = self._pool
+        return list(pool.map(fn, items))
+
+    def close(self) -> None:
+        """Stop the fetch pool; the next map() starts a new one."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _needs_refresh(self, creds: Any) -> bool:
+        if not getattr(creds, "token", None):
+            return True
+        expiry = getattr(creds, "expiry", None)
+        if expiry is None:
+            return False
+        # google-auth stores expiry as a naive UTC datetime.
+        now = datetime.now(UTC).replace(tzinfo=None)
+        return bool(expiry - self._refresh_margin <= now)
+
+    def _current_credentials(self) -> tuple[Any, int] | None:
+        sa_b64 = config("GOOGLE_SERVICE_ACCOUNT_BASE64", default=None)
+        if not sa_b64:
+            logger.error(
+                "GOOGLE_SERVICE_ACCOUNT_BASE64 not set — "
+                "cannot authenticate with Google Calendar"
+            )
+            return None
+        fingerprint = hashlib.sha256(sa_b64.encode("utf-8")).hexdigest()
+
+        with self._lock:
+            if fingerprint != self._fingerprint or self._credentials is None:
+                creds = _credentials_from_b64(sa_b64)
+                if creds is None:
+                    return None
+                if self._fingerprint is not None:
+                    logger.info("Service-account credentials rotated")
+                self._credentials = creds
+                self._fingerprint = fingerprint
+                self._generation += 1
+
+            creds = self._credentials
+            if self._needs_refresh(creds):
+                try:
+                    creds.refresh(self._token_request())
+                except (RefreshError, TransportError) as e:
+                    logger.error(
+                        "Failed to refresh service-account token: %s", e
+                    )
+                    return None
+            return creds, self._generation
+
+    def get_service(self) -> Any | None:
+        current = self._current_credentials()
+        if current is None:
+            return None
+        creds, generation = current
+
+        local = self._local
+        if getattr(local, "generation", None) != generation:
+            local.service = self._build_service(creds)
+            local.generation = generation
+        return local.service
+
+    def access_token(self) -> str | None:
+        """Bearer token for callers that skip the discovery client.
+
+        Valid for at least the refresh margin.
+        """
+        current = self._current_credentials()
+        if current is None:
+            return None
+        token: str | None = current[0].token
+        return token
+
+
+_client = CalendarClient()
+
+
 def _get_service() -> Any | None:
     """Get authenticated Calendar API service."""
-    creds = _get_credentials()
-    if not creds:
-        return None
-    try:
-        return build(
-            "calendar",
-            "v3",
-            credentials=creds,
-            cache_discovery=False,
-        )
-    except RefreshError as e:
-        logger.error(
-            "Failed to refresh service-account token: %s", e
-        )
-        return None
+    return _client.get_service()
 
 
-def list_busy_days(year: int, month: int) -> list[str]:
-    """Get dates (YYYY-MM-DD) that should be visually disabled in the calendar."""
+def _is_outage(error: BaseException) -> bool:
+    """Whether an error means Google is unhealthy, not that we asked wrong.
+
+    5xx, 429, token refresh failures and transport errors count
+    against the breaker; other 4xx prove Google is answering.
+    """
+    if isinstance(error, HttpError):
+        return error.resp.status >= 500 or error.resp.status == 429
+    return isinstance(error, (RefreshError, *TRANSPORT_ERRORS))
+
+
+def _open_service(action: str) -> Any | None:
+    """The service if the breaker lets a call through, else None."""
+    if not _breaker.allow():
+        logger.warning("Google Calendar circuit open — not trying to %s", action)
+        return None
     service = _get_service()
     if not service:
-        logger.error(
-            "No calendar credentials — cannot fetch busy days"
-        )
-        return []
+        # Missing or unrefreshable credentials fail every call alike.
+        _breaker.record_failure()
+        logger.error("No calendar credentials — cannot %s", action)
+    return service
 
-    start = datetime(year, month, 1, tzinfo=TZ)
-    if month == 12:
-        end = datetime(year + 1, 1, 1, tzinfo=TZ)
+
+def _record(error: BaseException | None) -> None:
+    """Report one Google call's outcome to the breaker."""
+    if error is not None and _is_outage(error):
+        _breaker.record_failure()
     else:
-        end = datetime(year, month + 1, 1, tzinfo=TZ)
+        _breaker.record_success()
 
-    try:
-        events_result = (
-            service.events()
-            .list(
-                calendarId=CALENDAR_ID,
-                timeMin=start.isoformat(),
-                timeMax=end.isoformat(),
-                singleEvents=True,
-                orderBy="startTime",
-            )
-            .execute()
-        )
 
-        events = events_result.get("items", [])
-        busy_dates: set[str] = set()
+@contextmanager
+def _recorded() -> Iterator[None]:
+    """Report the outcome of the enclosed Google call to the breaker."""
+    try:
+        yield
+    except BaseException as error:
+        _record(error)
+        raise
+    _record(None)
+
+
+def _freebusy_chunks(
+    time_min: datetime, time_max: datetime
+) -> list[tuple[datetime, datetime]]:
+    chunks: list[tuple[datetime, datetime]] = []
+    cursor = time_min
+    while cursor < time_max:
+        chunk_end = min(cursor + FREEBUSY_MAX_WINDOW, time_max)
+        chunks.append((cursor, chunk_end))
+        cursor = chunk_end
+    return chunks
+
+
+def _freebusy_body(
+    calendar_id: str, time_min: datetime, time_max: datetime
+) -> dict[str, Any]:
+    return {
+        "timeMin": time_min.isoformat(),
+        "timeMax": time_max.isoformat(),
+        "timeZone": str(TZ),
+        "items": [{"id": calendar_id}],
+    }
 
-        for event in events:
-            start_date = event["start"].get("date")
-            start_datetime = event["start"].get("dateTime")
 
-            if start_date:
-                busy_dates.add(start_date)
-                continue
+def _freebusy_intervals(
+    result: dict[str, Any], calendar_id: str
+) -> list[BusyInterval] | None:
+    """Busy blocks of one freeBusy response; None if Google reported an error."""
+    calendar = result.get("calendars", {}).get(calendar_id, {})
+    if calendar.get("errors"):
+        logger.error(
+            "freeBusy error for %s: %s",
+            calendar_id,
+            calendar["errors"],
+        )
+        return None
+    return [
+        (
+            int(datetime.fromisoformat(block["start"]).timestamp()),
+            int(datetime.fromisoformat(block["end"]).timestamp()),
+        )
+        for block in calendar.get("busy", [])
+    ]
+
+
+def _all_day_params(time_min: datetime, time_max: datetime) -> dict[str, Any]:
+    """events.list query for the events overlapping a range, bodies trimmed."""
+    return {
+        "timeMin": time_min.isoformat(),
+        "timeMax": time_max.isoformat(),
+        "singleEvents": True,
+        "maxResults": 2500,
+        "fields": "items(start,end,status),nextPageToken",
+    }
 
-            if start_datetime:
-                busy_dates.add(
-                    datetime.fromisoformat(start_datetime).date().isoformat()
-                )
 
-        return sorted(busy_dates)
+def _midnight(day_iso: str) -> int:
+    day = date.fromisoformat(day_iso)
+    return int(datetime(day.year, day.month, day.day, tzinfo=TZ).timestamp())
+
+
+def _all_day_intervals(
+    events: list[dict[str, Any]], time_min: datetime, time_max: datetime
+) -> list[BusyInterval]:
+    """The days blocked by the all-day events in an events.list page.
+
+    Google creates all-day events as "show as free", so freeBusy leaves
+    them out; a day off must block its day whatever its transparency.
+    """
+    lo, hi = int(time_min.timestamp()), int(time_max.timestamp())
+    intervals: list[BusyInterval] = []
+    for event in events:
+        start = event.get("start", {}).get("date")
+        end = event.get("end", {}).get("date")
+        if not start or not end or event.get("status") == "cancelled":
+            continue
+        interval = (max(lo, _midnight(start)), min(hi, _midnight(end)))
+        if interval[0] < interval[1]:
+            intervals.append(interval)
+    return intervals
+
+
+def list_busy_intervals(
+    time_min: datetime, time_max: datetime, calendar_id: str = CALENDAR_ID
+) -> list[BusyInterval] | None:
+    """Busy [start, end) intervals between two instants, merged and sorted.
+
+    One freeBusy query per FREEBUSY_MAX_WINDOW of range — Google only
+    returns the busy blocks, not event bodies — plus one trimmed
+    events.list pass for all-day events, which block their days even
+    when marked free (see _all_day_intervals). Returns None on failure
+    so callers can tell "free" apart from "could not ask Google".
+    """
+    service = _open_service("fetch busy intervals")
+    if not service:
+        return None
 
+    intervals: list[BusyInterval] = []
+    try:
+        for chunk_min, chunk_max in _freebusy_chunks(time_min, time_max):
+            with _recorded():
+                result = (
+                    service.freebusy()
+                    .query(body=_freebusy_body(calendar_id, chunk_min, chunk_max))
+                    .execute()
+                )
+            chunk = _freebusy_intervals(result, calendar_id)
+            if chunk is None:
+                return None
+            intervals.extend(chunk)
+
+        params = _all_day_params(time_min, time_max)
+        while True:
+            with _recorded():
+                page = service.events().list(calendarId=calendar_id, **params).execute()
+            intervals.extend(
+                _all_day_intervals(page.get("items", []), time_min, time_max)
+            )
+            if not page.get("nextPageToken"):
+                break
+            params["pageToken"] = page["nextPageToken"]
     except HttpError as error:
-        logger.error("Calendar API error (busy days): %s", error)
-        return []
+        logger.error("Calendar API error (busy intervals): %s", error)
+        return None
     except RefreshError as error:
         logger.error(
-            "Token refresh failed (busy days): %s", error
+            "Token refresh failed (busy intervals): %s", error
         )
+        return None
+    except TRANSPORT_ERRORS as error:
+        logger.error("Calendar API unreachable (busy intervals): %r", error)
+        return None
+
+    return slots.merge_intervals(intervals)
+
+
+def list_busy_days(year: int, month: int) -> list[str]:
+    """Get dates (YYYY-MM-DD) that should be visually disabled in the calendar."""
+    start = datetime(year, month, 1, tzinfo=TZ)
+    if month == 12:
+        end = datetime(year + 1, 1, 1, tzinfo=TZ)
+    else:
+        end = datetime(year, month + 1, 1, tzinfo=TZ)
+
+    intervals = list_busy_intervals(start, end)
+    if intervals is None:
         return []
+    return slots.busy_days(intervals, year, month)
 
 
 def list_free_slots(
     date_iso: str,
-    slot_minutes: int = 30,
-    work_hours: tuple[int, int] = (9, 19),
+    slot_minutes: int = slots.SLOT_MINUTES,
+    work_hours: tuple[int, int] = slots.WORK_HOURS,
 ) -> list[str]:
     """Get available time slots (HH:MM) for a specific date."""
-    service = _get_service()
-    if not service:
-        logger.error(
-            "No calendar credentials — cannot fetch slots for %s",
-            date_iso,
-        )
+    day = date.fromisoformat(date_iso)
+    start = datetime(day.year, day.month, day.day, work_hours[0], tzinfo=TZ)
+    end = datetime(day.year, day.month, day.day, work_hours[1], tzinfo=TZ)
+
+    intervals = list_busy_intervals(start, end)
+    if intervals is None:
         return []
+    return slots.free_slots(intervals, day, slot_minutes, work_hours)
+
+
+def list_event_changes(
+    *,
+    calendar_id: str = CALENDAR_ID,
+    sync_token: str = "",
+    time_min: datetime | None = None,
+) -> tuple[list[dict[str, Any]], str] | None:
+    """Page through events.list and return (events, next_sync_token).
+
+    With `sync_token`, only events changed since that token are
+    returned — deletions included, as status "cancelled". Without one
+    this is a full listing from `time_min`. Returns None on failure;
+    raises SyncTokenExpiredError when Google invalidated the token.
+    """
+    service = _open_service("list event changes")
+    if not service:
+        return None
 
-    day = datetime.fromisoformat(date_iso).replace(tzinfo=TZ)
-    start = day.replace(
-        hour=work_hours[0], minute=0, second=0, microsecond=0
-    )
-    end = day.replace(
-        hour=work_hours[1], minute=0, second=0, microsecond=0
-    )
+    params: dict[str, Any] = {
+        "calendarId": calendar_id,
+        "singleEvents": True,
+        "showDeleted": True,
+        "maxResults": 2500,
+    }
+    if sync_token:
+        params["syncToken"] = sync_token
+    elif time_min is not None:
+        params["timeMin"] = time_min.isoformat()
 
+    events: list[dict[str, Any]] = []
     try:
-        events_result = (
-            service.events()
-            .list(
-                calendarId=CALENDAR_ID,
-                timeMin=start.isoformat(),
-                timeMax=end.isoformat(),
-                singleEvents=True,
-                orderBy="startTime",
-            )
-            .execute()
-        )
+        while True:
+            with _recorded():
+                page = service.events().list(**params).execute()
+            events.extend(page.get("items", []))
+            if page.get("nextPageToken"):
+                params["pageToken"] = page["nextPageToken"]
+                continue
+            return events, str(page.get("nextSyncToken") or "")
+    except HttpError as error:
+        if sync_token and error.resp.status == 410:
+            raise SyncTokenExpiredError(calendar_id) from error
+        logger.error("Calendar API error (event changes): %s", error)
+        return None
+    except RefreshError as error:
+        logger.error("Token refresh failed (event changes): %s", error)
+        return None
+    except TRANSPORT_ERRORS as error:
+        logger.error("Calendar API unreachable (event changes): %r", error)
+        return None
 
-        events = events_result.get("items", [])
 
-        for event in events:
-            if event["start"].get("date"):
-                logger.info(
-                    "All-day event found on %s — no slots available",
-                    date_iso,
-                )
-                return []
-
-        occupied: list[tuple[datetime, datetime]] = []
-        for event in events:
-            event_start = event["start"].get("dateTime")
-            event_end = event["end"].get("dateTime")
-            if event_start and event_end:
-                occupied.append(
-                    (
-                        datetime.fromisoformat(event_start),
-                        datetime.fromisoformat(event_end),
-                    )
-                )
+def watch_events(
+    *,
+    channel_id: str,
+    address: str,
+    token: str,
+    ttl: timedelta,
+    calendar_id: str = CALENDAR_ID,
+) -> dict[str, Any] | None:
+    """Open a push-notification channel on a calendar's events.
 
-        slots: list[str] = []
-        current_time = start
-        slot_delta = timedelta(minutes=slot_minutes)
+    Returns {"resource_id", "expires_at"} or None on failure.
+    """
+    service = _open_service("open watch channel")
+    if not service:
+        return None
 
-        while current_time + slot_delta <= end:
-            slot_end = current_time + slot_delta
-            is_free = all(
-                slot_end <= occ_start or current_time >= occ_end
-                for occ_start, occ_end in occupied
+    try:
+        with _recorded():
+            channel = (
+                service.events()
+                .watch(
+                    calendarId=calendar_id,
+                    body={
+                        "id": channel_id,
+                        "type": "web_hook",
+                        "address": address,
+                        "token": token,
+                        "params": {"ttl": str(int(ttl.total_seconds()))},
+                    },
+                )
+                .execute()
             )
+    except HttpError as error:
+        logger.error("Calendar API error (watch): %s", error)
+        return None
+    except RefreshError as error:
+        logger.error("Token refresh failed (watch): %s", error)
+        return None
+    except TRANSPORT_ERRORS as error:
+        logger.error("Calendar API unreachable (watch): %r", error)
+        return None
 
-            if is_free:
-                slots.append(current_time.strftime("%H:%M"))
+    return {
+        "resource_id": channel.get("resourceId", ""),
+        "expires_at": datetime.fromtimestamp(
+            int(channel["expiration"]) / 1000, tz=UTC
+        ),
+    }
 
-            current_time += slot_delta
 
-        return slots
+def stop_channel(*, channel_id: str, resource_id: str) -> bool:
+    """Stop a push-notification channel.
 
+    A channel Google no longer knows about counts as stopped.
+    """
+    service = _open_service("stop watch channel")
+    if not service:
+        return False
+
+    try:
+        with _recorded():
+            service.channels().stop(
+                body={"id": channel_id, "resourceId": resource_id}
+            ).execute()
+        return True
     except HttpError as error:
-        logger.error("Calendar API error (free slots): %s", error)
-        return []
+        if error.resp.status == 404:
+            return True
+        logger.error("Calendar API error (stop channel): %s", error)
+        return False
     except RefreshError as error:
-        logger.error(
-            "Token refresh failed (free slots): %s", error
-        )
-        return []
+        logger.error("Token refresh failed (stop channel): %s", error)
+        return False
+    except TRANSPORT_ERRORS as error:
+        logger.error("Calendar API unreachable (stop channel): %r", error)
+        return False
 
 
-def create_booking_event(
+def booking_event_body(
     title: str,
     start_datetime: datetime,
     end_datetime: datetime,
     client_email: str,
     client_name: str,
     description: str = "",
-) -> dict | None:
-    """Create a calendar event for a booking."""
-    service = _get_service()
-    if not service:
-        logger.error("No calendar credentials — cannot create event")
-        return None
-
+) -> dict[str, Any]:
+    """The events.insert body for a booking."""
     full_description = (
         f"CLIENT NAME: {client_name}\n"
         f"CLIENT EMAIL: {client_email}\n"
@@ -222,7 +590,7 @@ def create_booking_event(
         f"{description}"
     )
 
-    event = {
+    return {
         "summary": title,
         "description": full_description,
         "start": {
@@ -242,21 +610,48 @@ def create_booking_event(
         },
     }
 
+
+def _created(event: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "id": event["id"],
+        "link": event.get("htmlLink"),
+        "status": event.get("status"),
+    }
+
+
+def create_booking_event(
+    title: str,
+    start_datetime: datetime,
+    end_datetime: datetime,
+    client_email: str,
+    client_name: str,
+    description: str = "",
+    calendar_id: str = CALENDAR_ID,
+) -> dict | None:
+    """Create a calendar event for a booking on `calendar_id`."""
+    service = _open_service("create event")
+    if not service:
+        return None
+
+    event = booking_event_body(
+        title, start_datetime, end_datetime, client_email, client_name, description
+    )
+
     try:
-        created_event = (
-            service.events()
-            .insert(
-                calendarId=CALENDAR_ID,
-                body=event,
+        with _recorded():
+            created_event = (
+                service.events()
+                .insert(
+                    calendarId=calendar_id,
+                    body=event,
+                )
+                .execute()
             )
-            .execute()
+        availability_cache.invalidate_range(
+            calendar_id, start_datetime, end_datetime
         )
 
-        return {
-            "id": created_event["id"],
-            "link": created_event.get("htmlLink"),
-            "status": created_event.get("status"),
-        }
+        return _created(created_event)
 
     except HttpError as error:
         content = error.content.decode("utf-8") if error.content else ""
@@ -265,19 +660,39 @@ def create_booking_event(
     except RefreshError as error:
         logger.error("Token refresh failed (create event): %s", error)
         return None
+    except TRANSPORT_ERRORS as error:
+        logger.error("Calendar API unreachable (create event): %r", error)
+        return None
 
 
-def delete_booking_event(event_id: str) -> bool:
-    """Delete a calendar event."""
-    service = _get_service()
+def delete_booking_event(
+    event_id: str,
+    *,
+    start_datetime: datetime | None = None,
+    end_datetime: datetime | None = None,
+    calendar_id: str = CALENDAR_ID,
+) -> bool:
+    """Delete a calendar event from `calendar_id`.
+
+    Pass the event's times when known so only its months are
+    invalidated; otherwise every cached month for the calendar is.
+    """
+    service = _open_service("delete event")
     if not service:
         return False
 
     try:
-        service.events().delete(
-            calendarId=CALENDAR_ID,
-            eventId=event_id,
-        ).execute()
+        with _recorded():
+            service.events().delete(
+                calendarId=calendar_id,
+                eventId=event_id,
+            ).execute()
+        if start_datetime and end_datetime:
+            availability_cache.invalidate_range(
+                calendar_id, start_datetime, end_datetime
+            )
+        else:
+            availability_cache.invalidate_calendar(calendar_id)
         return True
 
     except HttpError as error:
@@ -290,3 +705,171 @@ def delete_booking_event(event_id: str) -> bool:
             "Token refresh failed (delete event): %s", error
         )
         return False
+    except TRANSPORT_ERRORS as error:
+        logger.error("Calendar API unreachable (delete event): %r", error)
+        return False
+
+
+# ── Batch writes ─────────────────────────────────────
+# Bulk pushes (admin actions, reconciliation after an outage) group
+# their inserts and deletes into Google batch requests. Google allows
+# up to 1000 calls per batch but recommends 50; each item still counts
+# against quota — the saving is round trips, not requests.
+
+BATCH_SIZE = 50
+BATCH_RETRIES = 2
+BATCH_BACKOFF = 1.0
+
+# (response, error) for one item of a batch.
+Outcome = tuple[Any, BaseException | None]
+
+
+def _execute_batch(
+    service: Any, calls: dict[str, Callable[[], Any]]
+) -> dict[str, Outcome]:
+    """One batch round trip. Keys travel as positions, not Content-IDs."""
+    keys = list(calls)
+    outcomes: dict[str, Outcome] = {}
+
+    def collect(request_id: str, response: Any, error: BaseException | None) -> None:
+        outcomes[keys[int(request_id)]] = (response, error)
+
+    batch = service.new_batch_http_request(callback=collect)
+    for position, key in enumerate(keys):
+        batch.add(calls[key](), request_id=str(position))
+    try:
+        with _recorded():
+            batch.execute()
+    except (HttpError, RefreshError, *TRANSPORT_ERRORS) as error:
+        logger.error("Calendar batch request failed: %r", error)
+        return dict.fromkeys(keys, (None, error))
+    # A 200 envelope only proves the batch endpoint answered; each call
+    # inside it is a call to Google and counts against the breaker too.
+    for _, error in outcomes.values():
+        _record(error)
+    return outcomes
+
+
+def _execute_batches(
+    service: Any, calls: dict[str, Callable[[], Any]]
+) -> dict[str, Outcome]:
+    """Run `calls` BATCH_SIZE at a time and return each key's final outcome.
+
+    Items that failed on Google's side (see _is_outage) are collected
+    and re-sent together, in fresh batches, up to BATCH_RETRIES times
+    with exponential backoff; items Google rejected outright are not.
+    Retries stop early once the breaker opens.
+    """
+    outcomes: dict[str, Outcome] = {}
+    pending = list(calls)
+    for attempt in range(BATCH_RETRIES + 1):
+        if attempt:
+            logger.warning(
+                "Retrying %d failed calendar batch item(s), attempt %d",
+                len(pending),
+                attempt,
+            )
+            time.sleep(BATCH_BACKOFF * 2 ** (attempt - 1))
+        retry: list[str] = []
+        for offset in range(0, len(pending), BATCH_SIZE):
+            chunk = pending[offset : offset + BATCH_SIZE]
+            for key, outcome in _execute_batch(
+                service, {key: calls[key] for key in chunk}
+            ).items():
+                outcomes[key] = outcome
+                if outcome[1] is not None and _is_outage(outcome[1]):
+                    retry.append(key)
+        pending = retry
+        if not pending or _breaker.state == OPEN:
+            break
+    return outcomes
+
+
+def _status(error: BaseException | None) -> int | None:
+    return error.resp.status if isinstance(error, HttpError) else None
+
+
+def batch_create_events(
+    events: dict[str, dict[str, Any]],
+    calendar_id: str = CALENDAR_ID,
+) -> dict[str, dict[str, Any] | None]:
+    """Insert many events into `calendar_id` in batched round trips.
+
+    `events` maps a caller's key (a booking or voucher pk) to an
+    events.insert body, see booking_event_body. Returns each key's
+    {"id", "link", "status"}, or None if that insert failed.
+
+    Every event is given its id up front, so an insert retried after
+    an ambiguous failure that Google had in fact applied answers 409
+    and is reported as created instead of being duplicated.
+    """
+    results: dict[str, dict[str, Any] | None] = dict.fromkeys(events)
+    if not events:
+        return results
+    service = _open_service("create events")
+    if not service:
+        return results
+
+    bodies = {
+        key: {**body, "id": body.get("id") or uuid.uuid4().hex}
+        for key, body in events.items()
+    }
+    outcomes = _execute_batches(
+        service,
+        {
+            key: lambda body=body: service.events().insert(
+                calendarId=calendar_id, body=body
+            )
+            for key, body in bodies.items()
+        },
+    )
+
+    for key, (created_event, error) in outcomes.items():
+        body = bodies[key]
+        if _status(error) == 409:
+            created_event = {"id": body["id"], "status": "confirmed"}
+        elif error is not None:
+            logger.error("Failed to create calendar event %s: %s", key, error)
+            continue
+        results[key] = _created(created_event)
+        availability_cache.invalidate_range(
+            calendar_id,
+            datetime.fromisoformat(body["start"]["dateTime"]),
+            datetime.fromisoformat(body["end"]["dateTime"]),
+        )
+    return results
+
+
+def batch_delete_events(
+    event_ids: list[str], calendar_id: str = CALENDAR_ID
+) -> dict[str, bool]:
+    """Delete many events from `calendar_id` in batched round trips.
+
+    Returns whether each event is gone; one Google no longer has
+    (404/410) counts as deleted.
+    """
+    results = dict.fromkeys(event_ids, False)
+    if not event_ids:
+        return results
+    service = _open_service("delete events")
+    if not service:
+        return results
+
+    outcomes = _execute_batches(
+        service,
+        {
+            event_id: lambda event_id=event_id: service.events().delete(
+                calendarId=calendar_id, eventId=event_id
+            )
+            for event_id in event_ids
+        },
+    )
+
+    for event_id, (_response, error) in outcomes.items():
+        if error is None or _status(error) in (404, 410):
+            results[event_id] = True
+        else:
+            logger.error("Failed to delete calendar event %s: %s", event_id, error)
+    if any(results.values()):
+        availability_cache.invalidate_calendar(calendar_id)
+    return results
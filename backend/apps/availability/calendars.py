@@ -0,0 +1,60 @@
+"""Which Google calendars block which services.
+
+The studio's own calendar (GOOGLE_CALENDAR_ID) applies to every
+service. Further calendars — a second therapist, a treatment room — are
+listed in AVAILABILITY_CALENDARS with the services they apply to:
+
+    {"room@group.calendar.google.com": [3, 4], "holidays@...": null}
+
+null means every service. A calendar is a practitioner's unless it is
+named in AVAILABILITY_SHARED_CALENDARS (rooms, studio closures);
+GOOGLE_CALENDAR_ID is always a practitioner's.
+
+A slot is free for a service when at least one of its practitioners is
+free then, counting that practitioner's own calendar, every shared
+calendar of the service, and the bookings and holds that practitioner
+took. Each booking records the practitioner calendar it claimed, so
+two practitioners can take two bookings at the same time.
+"""
+
+from __future__ import annotations
+
+from django.conf import settings
+
+from . import calendar_gateway
+
+
+def calendar_services() -> dict[str, list[int] | None]:
+    """Configured calendar ids mapped to their service ids (None: all)."""
+    configured = getattr(settings, "AVAILABILITY_CALENDARS", None) or {}
+    return {calendar_gateway.CALENDAR_ID: None, **configured}
+
+
+def shared_calendars() -> set[str]:
+    """Calendars that block every practitioner at once."""
+    shared = set(getattr(settings, "AVAILABILITY_SHARED_CALENDARS", None) or ())
+    shared.discard(calendar_gateway.CALENDAR_ID)
+    return shared
+
+
+def calendars_for(service_id: int | None = None) -> list[str]:
+    """Calendars whose busy time bears on `service_id`.
+
+    With None (no service chosen) that is every practitioner, but only
+    the shared calendars that apply to every service: a room one
+    service needs does not make a day busy for the others.
+    """
+    shared = shared_calendars()
+    return [
+        calendar_id
+        for calendar_id, services in calendar_services().items()
+        if services is None
+        or (service_id is None and calendar_id not in shared)
+        or (service_id is not None and service_id in services)
+    ]
+
+
+def practitioners(calendar_ids: list[str]) -> list[str]:
+    """The practitioner calendars among `calendar_ids`, in order."""
+    shared = shared_calendars()
+    return [calendar_id for calendar_id in calendar_ids if calendar_id not in shared]
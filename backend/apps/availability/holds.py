@@ -0,0 +1,131 @@
+"""Slot holds: reserve a slot for the length of a Stripe checkout.
+
+A hold is placed when a booking checkout session is created and shows
+as busy in availability until it expires or the webhook turns it into
+a Booking (see services.create_booking_from_payload). A hold claims one
+practitioner calendar: the first of the service's practitioners that
+everything the slot listing reads (selectors.free_calendars: Google
+busy time, mirrored or cached, and local commitments) shows free.
+
+Finding the free practitioners may ask Google, so callers that hold a
+transaction open resolve them first and pass them to claim_hold. The
+claim itself only touches the database, so concurrent checkouts for
+the same practitioner are settled locally: the first gets the hold,
+the next gets another free practitioner or SlotUnavailableError.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from . import selectors
+from .models import Booking, SlotHold
+from .services import SlotUnavailableError
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Holds outlive their checkout session by this much, so a payment made
+# in the session's last minute is still covered when the webhook lands.
+HOLD_GRACE = timedelta(minutes=5)
+
+# Stripe refuses a checkout session that expires sooner than 30 minutes
+# after it is created; the extra minute covers the time until the call.
+CHECKOUT_MIN_LIFETIME = timedelta(minutes=31)
+
+
+def hold_ttl() -> timedelta:
+    """SLOT_HOLD_MINUTES, raised to what a Stripe session needs."""
+    configured = timedelta(minutes=getattr(settings, "SLOT_HOLD_MINUTES", 40))
+    return max(configured, CHECKOUT_MIN_LIFETIME + HOLD_GRACE)
+
+
+def place_hold(
+    start: datetime, end: datetime, calendar_ids: list[str] | None = None
+) -> SlotHold:
+    """Reserve [start, end) on a free practitioner's calendar.
+
+    `calendar_ids` are the calendars the booked service is checked
+    against (default: calendars_for()), as for its slot listing.
+    Raises SlotUnavailableError when no practitioner is free.
+    """
+    return claim_hold(start, end, selectors.free_calendars(start, end, calendar_ids))
+
+
+def claim_hold(start: datetime, end: datetime, free_calendar_ids: list[str]) -> SlotHold:
+    """Hold [start, end) on the first of `free_calendar_ids` still free locally.
+
+    `free_calendar_ids` come from selectors.free_calendars. Only the
+    database is read, so this is safe inside a transaction. Raises
+    SlotUnavailableError when every one of them was just taken.
+    """
+    for calendar_id in free_calendar_ids:
+        hold = _claim(calendar_id, start, end)
+        if hold is not None:
+            return hold
+    raise SlotUnavailableError(f"{start.isoformat()}/{end.isoformat()}")
+
+
+def _claim(calendar_id: str, start: datetime, end: datetime) -> SlotHold | None:
+    """Hold [start, end) on `calendar_id`; None if it was just taken."""
+    now = timezone.now()
+    try:
+        with transaction.atomic():
+            # Expired holds must not trip the exclusion constraint.
+            SlotHold.objects.filter(
+                calendar_id=calendar_id, expires_at__lte=now
+            ).overlapping(start, end).delete()
+            if (
+                Booking.objects.confirmed_overlapping(start, end)
+                .blocking(calendar_id)
+                .exists()
+                or SlotHold.objects.live(now)
+                .overlapping(start, end)
+                .blocking(calendar_id)
+                .exists()
+            ):
+                return None
+            return SlotHold.objects.create(
+                start_datetime=start,
+                end_datetime=end,
+                calendar_id=calendar_id,
+                expires_at=now + hold_ttl(),
+            )
+    except IntegrityError:
+        # A concurrent checkout's hold won the race (Postgres).
+        return None
+
+
+def attach_session(hold: SlotHold, session_id: str) -> None:
+    hold.stripe_checkout_session_id = session_id
+    hold.save(update_fields=["stripe_checkout_session_id"])
+
+
+def release_hold(hold: SlotHold) -> None:
+    hold.delete()
+
+
+def release_session_holds(session_id: str) -> int:
+    """Free the slot of a checkout session that expired unpaid."""
+    deleted, _ = SlotHold.objects.filter(stripe_checkout_session_id=session_id).delete()
+    return deleted
+
+
+def sweep_expired_holds() -> int:
+    """Delete expired holds. One indexed DELETE; returns rows removed.
+
+    Availability already ignores expired holds, so this only keeps
+    the table small.
+    """
+    deleted, _ = SlotHold.objects.filter(expires_at__lte=timezone.now()).delete()
+    if deleted:
+        logger.info("Swept %d expired slot hold(s)", deleted)
+    return deleted
@@ -0,0 +1,65 @@
+"""Fetch the coming weeks of availability into the month cache."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.availability import prewarm
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the availability cache for the next --weeks so visitors never "
+        "wait on Google. Only useful with a shared cache, which "
+        "`manage.py run_worker` already keeps warm; a per-process cache is "
+        "warmed by each web worker itself (AVAILABILITY_PREWARM)."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--weeks",
+            type=int,
+            default=prewarm.WEEKS,
+            help=f"How far ahead to warm (default: {prewarm.WEEKS}).",
+        )
+        parser.add_argument(
+            "--min-interval",
+            type=float,
+            default=prewarm.MIN_INTERVAL,
+            help="Minimum seconds between Google calls "
+            f"(default: {prewarm.MIN_INTERVAL}).",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running, prewarming every --interval seconds.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=prewarm.LOOP_INTERVAL,
+            help=f"Seconds between rounds with --loop (default: {prewarm.LOOP_INTERVAL}).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        while True:
+            counts = prewarm.prewarm(
+                weeks=options["weeks"], min_interval=options["min_interval"]
+            )
+            self.stdout.write(
+                f"{counts['fetched']} fetched, {counts['fresh']} fresh, "
+                f"{counts['mirrored']} mirrored, {counts['failed']} failed"
+            )
+            for (calendar_id, year, month), age in prewarm.freshness(
+                options["weeks"]
+            ).items():
+                state = "missing" if age is None else f"{int(age)}s old"
+                self.stdout.write(f"  {calendar_id} {year:04d}-{month:02d}: {state}")
+            if not options["loop"]:
+                if counts["failed"]:
+                    raise CommandError("Google could not be reached; run again later")
+                return
+            time.sleep(options["interval"])
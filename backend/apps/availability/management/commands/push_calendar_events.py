@@ -0,0 +1,39 @@
+"""Put upcoming bookings and vouchers that never reached Google on the calendar."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.availability.models import Booking, BookingStatus
+from apps.availability.services import push_bookings_to_calendar
+from apps.vouchers.models import GiftVoucher
+from apps.vouchers.services import push_vouchers_to_calendar
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the missing Google Calendar events for upcoming confirmed "
+        "bookings and vouchers, in batched requests. Run after a Google "
+        "outage to reconcile writes that failed."
+    )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        now = timezone.now()
+        bookings = Booking.objects.filter(
+            status=BookingStatus.CONFIRMED, google_event_id="", end_datetime__gt=now
+        ).select_related("service")
+        vouchers = GiftVoucher.objects.filter(
+            calendar_event_id="", service__isnull=False, end_datetime__gt=now
+        ).select_related("service")
+
+        pending = (len(bookings), len(vouchers))
+        pushed = (push_bookings_to_calendar(bookings), push_vouchers_to_calendar(vouchers))
+        self.stdout.write(
+            f"{pushed[0]}/{pending[0]} booking(s), "
+            f"{pushed[1]}/{pending[1]} voucher(s) added to the calendar"
+        )
+        if pushed != pending:
+            raise CommandError("Some events could not be created; run again later")
@@ -0,0 +1,37 @@
+"""Delete slot holds whose checkout window has passed."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from apps.availability.holds import sweep_expired_holds
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired checkout slot holds. Availability already ignores "
+        "them; this keeps the table small. Run from cron or with --loop."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running, sweeping every --interval seconds.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=300,
+            help="Seconds between sweeps with --loop (default: 300).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        while True:
+            self.stdout.write(f"{sweep_expired_holds()} expired hold(s) deleted")
+            if not options["loop"]:
+                return
+            time.sleep(options["interval"])
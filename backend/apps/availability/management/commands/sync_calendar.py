@@ -0,0 +1,58 @@
+"""Keep the local mirror of the Google calendars current."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.availability.calendars import calendar_services
+from apps.availability.sync import sync_calendar
+
+
+class Command(BaseCommand):
+    help = (
+        "Sync external Google Calendar events into the local availability "
+        "mirror using sync tokens, for every configured calendar. Run once "
+        "(cron) or with --loop as a worker."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--calendar",
+            action="append",
+            help="Calendar id to mirror; repeatable (default: GOOGLE_CALENDAR_ID "
+            "and every calendar in AVAILABILITY_CALENDARS).",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running, syncing every --interval seconds.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=300,
+            help="Seconds between syncs with --loop (default: 300).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        calendar_ids = options["calendar"] or list(calendar_services())
+        while True:
+            failed = []
+            for calendar_id in calendar_ids:
+                result = sync_calendar(calendar_id)
+                if result is None:
+                    failed.append(calendar_id)
+                    self.stderr.write(f"Sync failed for {calendar_id}")
+                    continue
+                self.stdout.write(
+                    f"{calendar_id}: {'full' if result['full'] else 'incremental'} "
+                    f"sync, {result['upserted']} upserted, {result['removed']} removed"
+                )
+            if not options["loop"]:
+                if failed:
+                    raise CommandError(f"Sync failed for {', '.join(failed)}")
+                return
+            time.sleep(options["interval"])
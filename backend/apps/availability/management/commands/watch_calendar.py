@@ -0,0 +1,81 @@
+"""Open or renew the Google push-notification channel of each calendar."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.availability import watch
+from apps.availability.calendars import calendar_services
+
+
+class Command(BaseCommand):
+    help = (
+        "Ensure each configured calendar has a Google Calendar watch channel "
+        "open and not about to expire, replacing it if needed. Run daily "
+        "from cron."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--calendar",
+            action="append",
+            help="Calendar id to watch; repeatable (default: GOOGLE_CALENDAR_ID "
+            "and every calendar in AVAILABILITY_CALENDARS).",
+        )
+        parser.add_argument(
+            "--address",
+            default=watch.WEBHOOK_URL,
+            help="Public HTTPS URL of the notifications endpoint "
+            "(default: GOOGLE_CALENDAR_WEBHOOK_URL).",
+        )
+        parser.add_argument(
+            "--ttl-hours",
+            type=int,
+            default=int(watch.CHANNEL_TTL.total_seconds() // 3600),
+            help="Requested channel lifetime in hours.",
+        )
+        parser.add_argument(
+            "--renew-before-hours",
+            type=int,
+            default=int(watch.RENEW_BEFORE.total_seconds() // 3600),
+            help="Replace the channel when it expires within this many hours.",
+        )
+        parser.add_argument(
+            "--stop",
+            action="store_true",
+            help="Stop every channel on the calendars instead.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        calendar_ids = options["calendar"] or list(calendar_services())
+        if options["stop"]:
+            for calendar_id in calendar_ids:
+                stopped = watch.stop_channels(calendar_id=calendar_id)
+                self.stdout.write(f"{calendar_id}: stopped {stopped} channel(s)")
+            return
+
+        if not options["address"]:
+            raise CommandError(
+                "No webhook address: set GOOGLE_CALENDAR_WEBHOOK_URL or pass --address"
+            )
+        failed = []
+        for calendar_id in calendar_ids:
+            channel = watch.ensure_channel(
+                address=options["address"],
+                calendar_id=calendar_id,
+                ttl=timedelta(hours=options["ttl_hours"]),
+                renew_before=timedelta(hours=options["renew_before_hours"]),
+            )
+            if channel is None:
+                failed.append(calendar_id)
+                self.stderr.write(f"Could not open a watch channel for {calendar_id}")
+                continue
+            self.stdout.write(
+                f"{calendar_id}: channel {channel.channel_id} valid until "
+                f"{channel.expires_at:%Y-%m-%d %H:%M %Z}"
+            )
+        if failed:
+            raise CommandError(f"Could not open a watch channel for {', '.join(failed)}")
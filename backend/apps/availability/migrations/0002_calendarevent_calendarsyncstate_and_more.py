@@ -0,0 +1,51 @@
+# Generated by Django 5.2.15 on 2026-10-18 05:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('availability', '0001_initial'),
+        ('services', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CalendarEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('calendar_id', models.CharField(max_length=255)),
+                ('google_event_id', models.CharField(max_length=1024)),
+                ('start_datetime', models.DateTimeField()),
+                ('end_datetime', models.DateTimeField()),
+                ('summary', models.CharField(blank=True, default='', max_length=500)),
+                ('google_updated', models.DateTimeField(blank=True, null=True)),
+                ('synced_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ('start_datetime',),
+            },
+        ),
+        migrations.CreateModel(
+            name='CalendarSyncState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('calendar_id', models.CharField(max_length=255, unique=True)),
+                ('sync_token', models.CharField(blank=True, default='', max_length=1024)),
+                ('synced_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['start_datetime', 'end_datetime'], name='booking_interval_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='calendarevent',
+            index=models.Index(fields=['calendar_id', 'start_datetime', 'end_datetime'], name='calendar_event_interval_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='calendarevent',
+            constraint=models.UniqueConstraint(fields=('calendar_id', 'google_event_id'), name='calendar_event_unique_per_calendar'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.15 on 2026-10-18 05:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('availability', '0002_calendarevent_calendarsyncstate_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='calendarsyncstate',
+            name='full_synced_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='calendarsyncstate',
+            name='last_attempt_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='calendarsyncstate',
+            name='last_error',
+            field=models.CharField(blank=True, default='', max_length=500),
+        ),
+        migrations.AddField(
+            model_name='calendarsyncstate',
+            name='updated_watermark',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
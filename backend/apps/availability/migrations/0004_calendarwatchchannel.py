@@ -0,0 +1,28 @@
+# Generated by Django 5.2.15 on 2026-10-18 05:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('availability', '0003_calendarsyncstate_full_synced_at_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CalendarWatchChannel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('calendar_id', models.CharField(max_length=255)),
+                ('channel_id', models.CharField(max_length=64, unique=True)),
+                ('resource_id', models.CharField(blank=True, default='', max_length=255)),
+                ('token', models.CharField(max_length=255)),
+                ('expires_at', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ('-expires_at',),
+            },
+        ),
+    ]
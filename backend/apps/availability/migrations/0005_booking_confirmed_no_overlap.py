@@ -0,0 +1,37 @@
+# Postgres-only: SQLite has no range types or exclusion constraints, so
+# the constraint is added by hand and kept out of the model state.
+# Deploying fails if confirmed bookings already overlap — cancel the
+# duplicates first.
+
+from django.db import migrations
+
+CONSTRAINT = "booking_confirmed_no_overlap"
+
+
+def add_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f"ALTER TABLE availability_booking ADD CONSTRAINT {CONSTRAINT} "
+        "EXCLUDE USING gist (tstzrange(start_datetime, end_datetime, '[)') WITH &&) "
+        "WHERE (status = 'confirmed')"
+    )
+
+
+def drop_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f"ALTER TABLE availability_booking DROP CONSTRAINT IF EXISTS {CONSTRAINT}"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('availability', '0004_calendarwatchchannel'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_constraint, drop_constraint),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.15 on 2026-10-18 05:35
+
+from django.db import migrations, models
+
+# Postgres-only, as in 0005: live holds cannot overlap. Expired rows are
+# deleted by place_hold before it inserts, so they never block.
+CONSTRAINT = "slothold_no_overlap"
+
+
+def add_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f"ALTER TABLE availability_slothold ADD CONSTRAINT {CONSTRAINT} "
+        "EXCLUDE USING gist (tstzrange(start_datetime, end_datetime, '[)') WITH &&)"
+    )
+
+
+def drop_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f"ALTER TABLE availability_slothold DROP CONSTRAINT IF EXISTS {CONSTRAINT}"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('availability', '0005_booking_confirmed_no_overlap'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlotHold',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start_datetime', models.DateTimeField()),
+                ('end_datetime', models.DateTimeField()),
+                ('expires_at', models.DateTimeField(db_index=True)),
+                ('stripe_checkout_session_id', models.CharField(blank=True, db_index=True, default='', max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ('start_datetime',),
+                'indexes': [models.Index(fields=['start_datetime', 'end_datetime'], name='slothold_interval_idx')],
+            },
+        ),
+        migrations.RunPython(add_constraint, drop_constraint),
+    ]
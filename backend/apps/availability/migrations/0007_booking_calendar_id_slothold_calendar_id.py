@@ -0,0 +1,68 @@
+# Generated by Django 5.2.15 on 2026-10-18 12:10
+
+from django.db import migrations, models
+
+# Postgres-only, as in 0005 and 0006: the exclusion constraints now only
+# keep rows on the same practitioner calendar apart. Rows with an empty
+# calendar_id (bookings from before this migration) stay exclusive among
+# themselves; place_hold and create_booking_from_payload check them
+# against every calendar. Comparing text with = under GiST needs the
+# btree_gist extension.
+CONSTRAINTS = (
+    (
+        "availability_booking",
+        "booking_confirmed_no_overlap",
+        "WHERE (status = 'confirmed')",
+    ),
+    ("availability_slothold", "slothold_no_overlap", ""),
+)
+
+
+def _exclude(calendar_scoped):
+    columns = "calendar_id WITH =, " if calendar_scoped else ""
+    return (
+        f"EXCLUDE USING gist ({columns}"
+        "tstzrange(start_datetime, end_datetime, '[)') WITH &&)"
+    )
+
+
+def _replace(schema_editor, *, calendar_scoped):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    if calendar_scoped:
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    for table, name, where in CONSTRAINTS:
+        schema_editor.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}")
+        schema_editor.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {name} "
+            f"{_exclude(calendar_scoped)} {where}"
+        )
+
+
+def scope_constraints(apps, schema_editor):
+    _replace(schema_editor, calendar_scoped=True)
+
+
+def unscope_constraints(apps, schema_editor):
+    _replace(schema_editor, calendar_scoped=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('availability', '0006_slothold'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='calendar_id',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='slothold',
+            name='calendar_id',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.RunPython(scope_constraints, unscope_constraints),
+    ]
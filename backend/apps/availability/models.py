@@ -1,6 +1,11 @@
 from __future__ import annotations
 
-from django.db import models
+from typing import TYPE_CHECKING, Self
+
+from django.db import connections, models
+
+if TYPE_CHECKING:
+    from datetime import datetime
 
 
 class BookingStatus(models.TextChoices):
@@ -8,12 +13,61 @@ class BookingStatus(models.TextChoices):
     CANCELED = "canceled", "Canceled"
 
 
+class IntervalQuerySet(models.QuerySet):
+    """Rows with a [start_datetime, end_datetime) interval."""
+
+    def overlapping(self, start: datetime, end: datetime) -> Self:
+        """Rows sharing any instant with [start, end).
+
+        On Postgres this is a tstzrange overlap, answered by the GiST
+        index behind the model's exclusion constraint; elsewhere a plain
+        comparison on the (start, end) index.
+        """
+        if connections[self.db].vendor != "postgresql":
+            return self.filter(start_datetime__lt=end, end_datetime__gt=start)
+
+        from django.contrib.postgres.fields import DateTimeRangeField
+
+        span = models.Func(
+            "start_datetime",
+            "end_datetime",
+            models.Value("[)"),
+            function="TSTZRANGE",
+            output_field=DateTimeRangeField(),
+        )
+        return self.alias(span=span).filter(span__overlap=(start, end))
+
+
+class ClaimQuerySet(IntervalQuerySet):
+    """Intervals that claim a practitioner calendar (see calendars)."""
+
+    def blocking(self, calendar_id: str) -> Self:
+        """Rows that keep `calendar_id` busy: its own claims and those
+        tied to no calendar, which block every practitioner. For an
+        empty `calendar_id`, every row."""
+        if not calendar_id:
+            return self
+        return self.filter(calendar_id__in=(calendar_id, ""))
+
+
+class BookingQuerySet(ClaimQuerySet):
+    def confirmed_overlapping(self, start: datetime, end: datetime) -> Self:
+        return self.filter(status=BookingStatus.CONFIRMED).overlapping(start, end)
+
+
 class Booking(models.Model):
     """A paid massage booking (kind="booking" checkout flow).
 
     Created by the Stripe webhook after payment confirmation — never
     directly by the API. `stripe_checkout_session_id` is unique so
     fulfillment is idempotent even under duplicate webhook delivery.
+
+    `calendar_id` is the practitioner calendar the booking took; empty
+    for bookings made before practitioners were told apart, which
+    block every calendar. On Postgres, confirmed bookings on the same
+    calendar cannot overlap: migrations 0005 and 0007 add an exclusion
+    constraint over (calendar_id, tstzrange(start, end)) that the model
+    does not declare, so SQLite (tests, local dev) is left without it.
     """
 
     status = models.CharField(
@@ -36,17 +90,150 @@ class Booking(models.Model):
 
     start_datetime = models.DateTimeField()
     end_datetime = models.DateTimeField()
+    calendar_id = models.CharField(max_length=255, blank=True, default="")
 
     stripe_checkout_session_id = models.CharField(max_length=255, unique=True)
     google_event_id = models.CharField(max_length=255, blank=True, default="")
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = BookingQuerySet.as_manager()
+
     class Meta:
         ordering = ("-start_datetime",)
+        indexes = (
+            models.Index(
+                fields=("start_datetime", "end_datetime"),
+                name="booking_interval_idx",
+            ),
+        )
 
     def __str__(self) -> str:
         return (
             f"Booking({self.status}) {self.customer_name} "
             f"{self.start_datetime:%Y-%m-%d %H:%M}"
         )
+
+
+class CalendarEvent(models.Model):
+    """Local mirror of an event on an external Google calendar.
+
+    Kept current by `manage.py sync_calendar`, so availability is an
+    indexed interval query instead of a round trip to Google. Only
+    events that block time are stored; cancelled events and timed
+    "show as free" ones are removed from the mirror.
+    """
+
+    calendar_id = models.CharField(max_length=255)
+    google_event_id = models.CharField(max_length=1024)
+
+    start_datetime = models.DateTimeField()
+    end_datetime = models.DateTimeField()
+    summary = models.CharField(max_length=500, blank=True, default="")
+
+    google_updated = models.DateTimeField(null=True, blank=True)
+    synced_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ("start_datetime",)
+        constraints = (
+            models.UniqueConstraint(
+                fields=("calendar_id", "google_event_id"),
+                name="calendar_event_unique_per_calendar",
+            ),
+        )
+        indexes = (
+            models.Index(
+                fields=("calendar_id", "start_datetime", "end_datetime"),
+                name="calendar_event_interval_idx",
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f"CalendarEvent {self.summary or self.google_event_id} {self.start_datetime:%Y-%m-%d %H:%M}"
+
+
+class CalendarSyncState(models.Model):
+    """Google sync token and watermarks for one mirrored calendar.
+
+    An empty token means the next sync is a full one. `synced_at` is
+    the last successful sync of either kind and decides whether the
+    mirror is fresh enough to answer availability on its own;
+    `updated_watermark` is the newest Google `updated` stamp applied.
+    """
+
+    calendar_id = models.CharField(max_length=255, unique=True)
+    sync_token = models.CharField(max_length=1024, blank=True, default="")
+
+    synced_at = models.DateTimeField(null=True, blank=True)
+    full_synced_at = models.DateTimeField(null=True, blank=True)
+    updated_watermark = models.DateTimeField(null=True, blank=True)
+
+    last_attempt_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.CharField(max_length=500, blank=True, default="")
+
+    def __str__(self) -> str:
+        return f"CalendarSyncState {self.calendar_id} @ {self.synced_at}"
+
+
+class CalendarWatchChannel(models.Model):
+    """A Google push-notification channel watching one calendar's events.
+
+    Google calls the webhook with `channel_id` and `token` in headers;
+    both must match a row that has not expired. Channels are created
+    and renewed by `manage.py watch_calendar`.
+    """
+
+    calendar_id = models.CharField(max_length=255)
+    channel_id = models.CharField(max_length=64, unique=True)
+    resource_id = models.CharField(max_length=255, blank=True, default="")
+    token = models.CharField(max_length=255)
+    expires_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ("-expires_at",)
+
+    def __str__(self) -> str:
+        return f"CalendarWatchChannel {self.channel_id} until {self.expires_at}"
+
+
+class SlotHoldQuerySet(ClaimQuerySet):
+    def live(self, now: datetime) -> Self:
+        return self.filter(expires_at__gt=now)
+
+
+class SlotHold(models.Model):
+    """A slot reserved while its customer is on the Stripe checkout page.
+
+    Placed with the checkout session, turned into a Booking by the
+    webhook, and ignored once `expires_at` passes (expired rows are
+    swept by the sweep_slot_holds command). Like a booking, a hold
+    claims one practitioner calendar. On Postgres, holds on the same
+    calendar cannot overlap: migrations 0006 and 0007 add an exclusion
+    constraint like Booking's, and place_hold clears expired
+    overlapping rows first.
+    """
+
+    start_datetime = models.DateTimeField()
+    end_datetime = models.DateTimeField()
+    calendar_id = models.CharField(max_length=255, blank=True, default="")
+    expires_at = models.DateTimeField(db_index=True)
+    stripe_checkout_session_id = models.CharField(
+        max_length=255, blank=True, default="", db_index=True
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = SlotHoldQuerySet.as_manager()
+
+    class Meta:
+        ordering = ("start_datetime",)
+        indexes = (
+            models.Index(
+                fields=("start_datetime", "end_datetime"),
+                name="slothold_interval_idx",
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f"SlotHold {self.start_datetime:%Y-%m-%d %H:%M} until {self.expires_at:%H:%M}"
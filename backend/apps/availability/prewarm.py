@@ -0,0 +1,154 @@
+"""Fill the availability month cache before visitors ask for it.
+
+Busy days and free slots are both derived from the cached month of
+busy intervals in microseconds; the only slow part of a cold request
+is the Google fetch behind it. Prewarming fetches the months of the
+next few weeks for every calendar that is not served by a fresh
+mirror, so the booking widget reads a warm cache even right after a
+deploy or a worker recycle.
+
+Months are refetched once their entry is older than half the cache
+TTL, so a steady loop keeps them fresh and the request path never
+falls through to Google. Calls are spaced at least `min_interval`
+apart, and a round stops at the first failure — a 429 or an outage
+is left to the circuit breaker and the next round.
+
+The production availability cache is shared, so one loop is enough:
+the worker process runs it (`manage.py run_worker`). With a
+per-process cache, each web worker runs its own instead
+(AVAILABILITY_PREWARM, start_in_background from config.asgi);
+`manage.py prewarm_availability --loop` does the same from cron or a
+shell.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from . import cache as availability_cache
+from . import calendar_gateway, calendars, selectors, sync
+
+if TYPE_CHECKING:
+    from datetime import date
+
+logger = logging.getLogger(__name__)
+
+WEEKS = 6
+MIN_INTERVAL = 0.5
+LOOP_INTERVAL = 60
+
+
+def months_ahead(weeks: int, today: date | None = None) -> list[tuple[int, int]]:
+    """The (year, month) pairs covering today through `weeks` ahead."""
+    today = today or timezone.localdate()
+    return selectors.months_between(today, today + timedelta(weeks=weeks))
+
+
+def _refresh_after() -> float:
+    return float(availability_cache._conf()["TTL"]) / 2
+
+
+def freshness(weeks: int = WEEKS) -> dict[tuple[str, int, int], float | None]:
+    """Age in seconds of each prewarmed month's entry; None if missing."""
+    return {
+        (calendar_id, year, month): availability_cache.month_age(calendar_id, year, month)
+        for calendar_id in calendars.calendar_services()
+        for year, month in months_ahead(weeks)
+    }
+
+
+def prewarm(
+    *,
+    weeks: int = WEEKS,
+    min_interval: float = MIN_INTERVAL,
+    refresh_after: float | None = None,
+) -> dict[str, int]:
+    """
+    Fetch every month in the next `weeks` that is missing or aging.
+
+    Returns counts of months fetched, already fresh, served by the
+    mirror, and failed (the round stops at the first failure).
+    """
+    if refresh_after is None:
+        refresh_after = _refresh_after()
+    calendar_ids = list(calendars.calendar_services())
+    mirrored = sync.mirrored_calendars(calendar_ids)
+    months = months_ahead(weeks)
+    counts = {
+        "fetched": 0,
+        "fresh": 0,
+        "mirrored": len(mirrored) * len(months),
+        "failed": 0,
+    }
+    last_call: float | None = None
+
+    for calendar_id in (c for c in calendar_ids if c not in mirrored):
+        for year, month in months:
+            age = availability_cache.month_age(calendar_id, year, month)
+            if age is not None and age < refresh_after:
+                counts["fresh"] += 1
+                continue
+            if last_call is not None:
+                time.sleep(max(0.0, last_call + min_interval - time.monotonic()))
+            last_call = time.monotonic()
+            start, end = selectors._month_bounds(year, month)
+            if not availability_cache.refresh_month(
+                calendar_id=calendar_id,
+                year=year,
+                month=month,
+                fetch=lambda s=start, e=end, c=calendar_id: (
+                    calendar_gateway.list_busy_intervals(s, e, c)
+                ),
+            ):
+                counts["failed"] += 1
+                logger.warning(
+                    "Prewarm stopped at %s %04d-%02d", calendar_id, year, month
+                )
+                return counts
+            counts["fetched"] += 1
+    return counts
+
+
+def run_forever(
+    *,
+    weeks: int = WEEKS,
+    min_interval: float = MIN_INTERVAL,
+    interval: float = LOOP_INTERVAL,
+) -> None:
+    """Prewarm every `interval` seconds until the process exits."""
+    while True:
+        close_old_connections()
+        try:
+            counts = prewarm(weeks=weeks, min_interval=min_interval)
+            if counts["fetched"] or counts["failed"]:
+                logger.info("Availability prewarm: %s", counts)
+        except Exception:
+            logger.exception("Availability prewarm failed")
+        time.sleep(interval)
+
+
+def start_thread() -> threading.Thread:
+    """Run the prewarm loop on a daemon thread."""
+    thread = threading.Thread(
+        target=run_forever,
+        kwargs={"weeks": getattr(settings, "AVAILABILITY_PREWARM_WEEKS", WEEKS)},
+        daemon=True,
+        name="availability-prewarm",
+    )
+    thread.start()
+    return thread
+
+
+def start_in_background() -> threading.Thread | None:
+    """Run the prewarm loop on a daemon thread if AVAILABILITY_PREWARM is on."""
+    if not getattr(settings, "AVAILABILITY_PREWARM", False):
+        return None
+    return start_thread()
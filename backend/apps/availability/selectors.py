@@ -1,23 +1,384 @@
+import asyncio
+import hashlib
 import logging
+from datetime import date, datetime, timedelta
+from typing import cast
 
-from .calendar_gateway import list_busy_days, list_free_slots
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils import timezone
+
+from apps.vouchers.models import GiftVoucher
+
+from . import async_gateway, calendar_gateway, calendars, slots, sync
+from .cache import (
+    BusyInterval,
+    aget_month_intervals,
+    alast_good_month_intervals,
+    get_month_intervals,
+    last_good_month_intervals,
+)
+from .models import Booking, BookingStatus, CalendarEvent, SlotHold
 
 logger = logging.getLogger(__name__)
 
+# Each practitioner calendar's busy time, with everything that blocks
+# every practitioner merged in (see calendars). A slot is free when it
+# is free on any one of them.
+Availability = dict[str, list[BusyInterval]]
+
+
+def _month_bounds(year: int, month: int) -> tuple[datetime, datetime]:
+    start = datetime(year, month, 1, tzinfo=calendar_gateway.TZ)
+    if month == 12:
+        end = datetime(year + 1, 1, 1, tzinfo=calendar_gateway.TZ)
+    else:
+        end = datetime(year, month + 1, 1, tzinfo=calendar_gateway.TZ)
+    return start, end
+
+
+def _commitment_rows(
+    start: datetime, end: datetime
+) -> list[tuple[str, datetime, datetime]]:
+    # Confirmed bookings, vouchers booked at purchase time and live
+    # checkout holds: busy whatever Google says. Bookings and holds
+    # carry the calendar they claimed; "" blocks every practitioner.
+    overlapping = {"start_datetime__lt": end, "end_datetime__gt": start}
+    spans = ("calendar_id", "start_datetime", "end_datetime")
+    return [
+        *Booking.objects.filter(
+            status=BookingStatus.CONFIRMED, **overlapping
+        ).values_list(*spans),
+        *(
+            ("", s, e)
+            for s, e in GiftVoucher.objects.filter(**overlapping).values_list(
+                "start_datetime", "end_datetime"
+            )
+        ),
+        *SlotHold.objects.live(timezone.now())
+        .filter(**overlapping)
+        .values_list(*spans),
+    ]
+
+
+def _to_intervals(rows: list[tuple[datetime, datetime]]) -> list[BusyInterval]:
+    return slots.merge_intervals(
+        [(int(s.timestamp()), int(e.timestamp())) for s, e in rows]
+    )
+
+
+def get_local_busy_intervals(
+    start: datetime, end: datetime, calendar_ids: list[str] | None = None
+) -> dict[str, list[BusyInterval]]:
+    """
+    Busy intervals in [start, end) from the database alone, by calendar.
+
+    Confirmed bookings and live slot holds under the calendar they
+    claimed, vouchers booked at purchase time under "" (they block
+    every practitioner), and the mirrored events of `calendar_ids`
+    (default: every configured calendar) under theirs — four indexed
+    range queries, merged per calendar.
+    """
+    if calendar_ids is None:
+        calendar_ids = list(calendars.calendar_services())
+    rows = [
+        *_commitment_rows(start, end),
+        *CalendarEvent.objects.filter(
+            calendar_id__in=calendar_ids,
+            start_datetime__lt=end,
+            end_datetime__gt=start,
+        ).values_list("calendar_id", "start_datetime", "end_datetime"),
+    ]
+    by_calendar: dict[str, list[tuple[datetime, datetime]]] = {}
+    for calendar_id, s, e in rows:
+        by_calendar.setdefault(calendar_id, []).append((s, e))
+    return {calendar_id: _to_intervals(spans) for calendar_id, spans in by_calendar.items()}
+
+
+def _calendar_busy(
+    calendar_id: str, year: int, month: int
+) -> list[BusyInterval] | None:
+    """One calendar's cached freeBusy month, or the last good copy."""
+    start, end = _month_bounds(year, month)
+    intervals = get_month_intervals(
+        calendar_id=calendar_id,
+        year=year,
+        month=month,
+        fetch=lambda: calendar_gateway.list_busy_intervals(start, end, calendar_id),
+    )
+    if intervals is None:
+        intervals = last_good_month_intervals(calendar_id, year, month)
+        _warn_stale(calendar_id, intervals)
+    return intervals
+
+
+def _warn_stale(calendar_id: str, intervals: list[BusyInterval] | None) -> None:
+    if intervals is not None:
+        logger.warning(
+            "Google unavailable; serving last known availability for %s",
+            calendar_id,
+        )
+
+
+def _availability(
+    calendar_ids: list[str],
+    local: dict[str, list[BusyInterval]],
+    fetched: dict[str, list[BusyInterval] | None],
+) -> Availability | None:
+    # `local` carries the commitments Google may not know about yet
+    # (holds never reach it, bookings only after their webhook). One
+    # unknown calendar makes availability unknown: fail closed.
+    if any(intervals is None for intervals in fetched.values()):
+        return None
+
+    def busy(calendar_id: str) -> list[BusyInterval]:
+        return slots.merge_sorted(
+            local.get(calendar_id, []), fetched.get(calendar_id) or []
+        )
+
+    practitioners = calendars.practitioners(calendar_ids)
+    common = slots.merge_sorted(
+        local.get("", []),
+        *(busy(c) for c in calendar_ids if c not in practitioners),
+    )
+    return {c: slots.merge_sorted(common, busy(c)) for c in practitioners}
+
+
+def get_month_busy_intervals(
+    *, year: int, month: int, calendar_ids: list[str] | None = None
+) -> Availability | None:
+    """
+    Each practitioner's busy intervals for a month; None if unknown.
+
+    Covers `calendar_ids` (default: calendars_for(), i.e. no service
+    chosen). A practitioner's intervals are its own calendar and
+    claims, unioned with the shared calendars and the commitments tied
+    to no calendar. A calendar is read from the database once its
+    Google mirror has synced; until then (or without a sync worker)
+    from the cached freeBusy fetch — calendars concurrently, on the
+    calendar client's fetch pool — falling back to the last fetch that
+    succeeded while Google cannot be reached.
+    """
+    if calendar_ids is None:
+        calendar_ids = calendars.calendars_for()
+    start, end = _month_bounds(year, month)
+    mirrored = sync.mirrored_calendars(calendar_ids)
+    remote = [c for c in calendar_ids if c not in mirrored]
+    if len(remote) > 1:
+        fetched = calendar_gateway._client.map(
+            lambda c: _calendar_busy(c, year, month), remote
+        )
+    else:
+        fetched = [_calendar_busy(c, year, month) for c in remote]
+    local = get_local_busy_intervals(start, end, list(mirrored))
+    return _availability(calendar_ids, local, dict(zip(remote, fetched, strict=True)))
+
+
+def month_busy_days(
+    availability: Availability | None, year: int, month: int
+) -> list[str]:
+    """Days on which no practitioner is clear of busy time."""
+    if not availability:
+        return []
+    days = [set(slots.busy_days(intervals, year, month)) for intervals in availability.values()]
+    return sorted(set.intersection(*days))
+
 
 def get_busy_days(*, year: int, month: int) -> list[str]:
     """
-    Return busy dates for a month.
+    Return busy dates for a month, no service chosen.
 
-    No caching in this pass.
+    Derived from the cached month of busy intervals: a day is busy
+    when every practitioner has something on it.
     """
-    return list_busy_days(year, month)
+    availability = get_month_busy_intervals(year=year, month=month)
+    return month_busy_days(availability, year, month)
+
+
+def _buffer_minutes() -> int:
+    return getattr(settings, "AVAILABILITY_BUFFER_MINUTES", slots.BUFFER_MINUTES)
+
 
+def day_slots(
+    availability: Availability | None,
+    day: date,
+    duration_minutes: int | None,
+) -> list[str]:
+    """Start times on `day` at which some practitioner is free."""
+    if availability is None:
+        return []
+    offsets: set[int] = set()
+    for intervals in availability.values():
+        offsets.update(
+            slots.free_slot_offsets(
+                intervals,
+                day,
+                duration_minutes=duration_minutes or slots.SLOT_MINUTES,
+                buffer_minutes=_buffer_minutes(),
+            )
+        )
+    return [slots.format_offset(offset) for offset in sorted(offsets)]
 
-def get_free_slots(*, date_iso: str) -> list[str]:
+
+def get_free_slots(
+    *, date_iso: str, duration_minutes: int | None = None
+) -> list[str]:
+    """
+    Return available start times for a date.
+
+    Derived from the cached month of busy intervals — every day in a
+    month shares one upstream fetch. `duration_minutes` is the length
+    of the service being booked (defaults to one slot).
+    """
+    day = date.fromisoformat(date_iso)
+    availability = get_month_busy_intervals(year=day.year, month=day.month)
+    return day_slots(availability, day, duration_minutes)
+
+
+def get_free_slots_range(
+    *, start: date, end: date, duration_minutes: int | None = None
+) -> dict[str, list[str]]:
+    """
+    Return available start times for every date in [start, end].
+
+    One cached interval array per month touched, so a week or a month
+    of slots costs at most two upstream fetches on a cold cache.
     """
-    Return available time slots for a date.
+    by_month: dict[tuple[int, int], Availability | None] = {}
+    for year, month in months_between(start, end):
+        by_month[(year, month)] = get_month_busy_intervals(year=year, month=month)
+    return range_slots(start, end, by_month, duration_minutes)
 
-    No caching in this pass.
+
+def free_calendars(
+    start: datetime, end: datetime, calendar_ids: list[str] | None = None
+) -> list[str]:
+    """
+    The practitioner calendars among `calendar_ids` free for [start, end).
+
+    Reads the same month availability as the slot listing — mirrored
+    or cached Google busy time plus local commitments — and applies the
+    same buffer, so a slot that was offered can be held. While
+    availability is unknown, no calendar is free.
     """
-    return list_free_slots(date_iso)
+    first = start.astimezone(calendar_gateway.TZ).date()
+    last = (end - timedelta(microseconds=1)).astimezone(calendar_gateway.TZ).date()
+    span = (int(start.timestamp()), int(end.timestamp()))
+    free: list[str] | None = None
+    for year, month in months_between(first, last):
+        availability = get_month_busy_intervals(
+            year=year, month=month, calendar_ids=calendar_ids
+        )
+        if availability is None:
+            return []
+        free = [
+            calendar_id
+            for calendar_id, intervals in availability.items()
+            if (free is None or calendar_id in free)
+            and not slots.overlaps(intervals, *span, buffer_seconds=_buffer_minutes() * 60)
+        ]
+    return free or []
+
+
+def months_between(start: date, end: date) -> list[tuple[int, int]]:
+    months: list[tuple[int, int]] = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def range_slots(
+    start: date,
+    end: date,
+    by_month: dict[tuple[int, int], Availability | None],
+    duration_minutes: int | None,
+) -> dict[str, list[str]]:
+    days: dict[str, list[str]] = {}
+    day = start
+    while day <= end:
+        days[day.isoformat()] = day_slots(
+            by_month[(day.year, day.month)], day, duration_minutes
+        )
+        day += timedelta(days=1)
+    return days
+
+
+# ── Async variants (ASGI views) ─────────────────────
+# Same results as the functions above; the database hop runs in the
+# sync thread and Google is called through async_gateway, so a slow
+# upstream never pins a worker thread.
+
+
+async def _acalendar_busy(
+    calendar_id: str, year: int, month: int
+) -> list[BusyInterval] | None:
+    start, end = _month_bounds(year, month)
+    intervals = await aget_month_intervals(
+        calendar_id=calendar_id,
+        year=year,
+        month=month,
+        fetch=lambda: async_gateway.list_busy_intervals(start, end, calendar_id),
+    )
+    if intervals is None:
+        intervals = await alast_good_month_intervals(calendar_id, year, month)
+        _warn_stale(calendar_id, intervals)
+    return intervals
+
+
+async def aget_month_busy_intervals(
+    *, year: int, month: int, calendar_ids: list[str] | None = None
+) -> Availability | None:
+    """Calendars are fetched concurrently, alongside the database read."""
+    if calendar_ids is None:
+        calendar_ids = calendars.calendars_for()
+    start, end = _month_bounds(year, month)
+    mirrored = await sync_to_async(sync.mirrored_calendars)(calendar_ids)
+    remote = [c for c in calendar_ids if c not in mirrored]
+    local, *fetched = await asyncio.gather(
+        sync_to_async(get_local_busy_intervals)(start, end, list(mirrored)),
+        *(_acalendar_busy(c, year, month) for c in remote),
+    )
+    return _availability(calendar_ids, local, dict(zip(remote, fetched, strict=True)))
+
+
+async def aget_busy_intervals_by_month(
+    months: list[tuple[int, int]], calendar_ids: list[str] | None = None
+) -> dict[tuple[int, int], Availability | None]:
+    """Busy intervals for each month, fetched concurrently."""
+    fetched = await asyncio.gather(
+        *(
+            aget_month_busy_intervals(year=y, month=m, calendar_ids=calendar_ids)
+            for y, m in months
+        )
+    )
+    return dict(zip(months, fetched, strict=True))
+
+
+# ── Derived payloads and their version ─────────────
+# The availability views fetch the month intervals once, compare their
+# version with the client's ETag, and only derive (and encode) the
+# payload when it changed.
+
+
+def intervals_version(
+    by_month: dict[tuple[int, int], Availability | None],
+    duration_minutes: int | None = None,
+) -> str | None:
+    """
+    Digest of everything a payload is derived from; None if unknown.
+
+    Hashes the per-practitioner intervals themselves rather than
+    tracking writes: a hold that expires changes availability without
+    touching a row. The slot length and buffer are included since they
+    reshape slots.
+    """
+    if any(availability is None for availability in by_month.values()):
+        return None
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((duration_minutes, _buffer_minutes())).encode())
+    for key, availability in sorted(by_month.items()):
+        digest.update(repr((key, sorted(cast("Availability", availability).items()))).encode())
+    return digest.hexdigest()
+
@@ -1,14 +1,45 @@
 from __future__ import annotations
 
+from typing import Any
+
 from rest_framework import serializers
 
+from apps.services.models import Service
+
+from .calendars import calendars_for
+
+MAX_RANGE_DAYS = 42
+
 
 class BusyDaysQuerySerializer(serializers.Serializer):
     year = serializers.IntegerField(min_value=1970, max_value=2100)
     month = serializers.IntegerField(min_value=1, max_value=12)
 
 
-class FreeSlotsQuerySerializer(serializers.Serializer):
+class BusyDaysResponseSerializer(serializers.Serializer):
+    busy = serializers.ListField(child=serializers.DateField())
+
+
+class ServiceDurationMixin(serializers.Serializer):
+    """Optional `service` id whose duration and calendars shape the slots."""
+
+    service = serializers.PrimaryKeyRelatedField(
+        queryset=Service.objects.filter(is_available=True),
+        required=False,
+    )
+
+    @property
+    def duration_minutes(self) -> int | None:
+        service = self.validated_data.get('service')
+        return service.duration_minutes if service else None
+
+    @property
+    def calendar_ids(self) -> list[str]:
+        service = self.validated_data.get('service')
+        return calendars_for(service.pk if service else None)
+
+
+class FreeSlotsQuerySerializer(ServiceDurationMixin):
     # Accepts "YYYY-MM-DD" and validates properly.
     date = serializers.DateField()
 
@@ -16,3 +47,36 @@ class FreeSlotsQuerySerializer(serializers.Serializer):
     def date_iso(self) -> str:
         # Fixed: Explicit cast to str to satisfy Mypy
         return str(self.validated_data['date'].isoformat())
+
+
+class SlotsRangeQuerySerializer(ServiceDurationMixin):
+    start = serializers.DateField()
+    end = serializers.DateField()
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        span = (attrs["end"] - attrs["start"]).days
+        if span < 0:
+            raise serializers.ValidationError(
+                {"end": "End must not be before start."}
+            )
+        if span >= MAX_RANGE_DAYS:
+            raise serializers.ValidationError(
+                {"end": f"Range is limited to {MAX_RANGE_DAYS} days."}
+            )
+        return attrs
+
+
+# ── Response shapes (OpenAPI only; the async views build plain dicts) ──
+
+
+class FreeSlotsResponseSerializer(serializers.Serializer):
+    times = serializers.ListField(
+        child=serializers.CharField(), help_text='Start times, "HH:MM".'
+    )
+
+
+class SlotsRangeResponseSerializer(serializers.Serializer):
+    days = serializers.DictField(
+        child=serializers.ListField(child=serializers.CharField()),
+        help_text='Start times ("HH:MM") keyed by date ("YYYY-MM-DD").',
+    )
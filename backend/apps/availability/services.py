@@ -4,19 +4,29 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from django.conf import settings
-from django.core.mail import EmailMessage
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 
+from apps.emails.outbox import queue_email
+from apps.emails.rendering import render_email
+
 from . import calendar_gateway
-from .models import Booking
+from .models import Booking, BookingStatus, SlotHold
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
 
 logger = logging.getLogger(__name__)
 
 
+class SlotUnavailableError(Exception):
+    """The paid-for slot overlaps a confirmed booking."""
+
+
 def _as_datetime(value: Any) -> datetime:
     """Metadata round-trips through JSON — datetimes arrive as strings."""
     if isinstance(value, datetime):
@@ -37,34 +47,76 @@ def create_booking_from_payload(
     """Idempotently create the Booking for a paid checkout session.
 
     `stripe_checkout_session_id` is unique — duplicate webhook delivery
-    finds the existing row instead of double-booking.
+    finds the existing row instead of double-booking. The booking takes
+    the practitioner calendar its session's slot hold claimed, and the
+    hold is consumed in the same transaction. Without a hold (it was
+    swept, or the checkout predates holds) the booking is tied to no
+    calendar and blocks them all. Raises SlotUnavailableError if the
+    slot overlaps a confirmed booking on that calendar: the overlap
+    query runs in the same transaction as the insert, and on Postgres
+    the exclusion constraint settles concurrent checkouts.
     """
-    defaults: dict[str, Any] = {
-            "service_id": payload["service_id"],
-            "customer_name": payload.get("sender_name", ""),
-            "customer_email": payload.get("sender_email", ""),
-            "preferred_language": payload.get("preferred_language", "fr"),
-            "message": payload.get("message", "") or "",
-            "start_datetime": _as_datetime(payload["start_datetime"]),
-            "end_datetime": _as_datetime(payload["end_datetime"]),
+    existing = Booking.objects.filter(stripe_checkout_session_id=session_id).first()
+    if existing:
+        return existing, False
+
+    start = _as_datetime(payload["start_datetime"])
+    end = _as_datetime(payload["end_datetime"])
+    try:
+        with transaction.atomic():
+            session_holds = SlotHold.objects.filter(stripe_checkout_session_id=session_id)
+            calendar_id = (
+                session_holds.values_list("calendar_id", flat=True).first() or ""
+            )
+            session_holds.delete()
+            if (
+                Booking.objects.confirmed_overlapping(start, end)
+                .blocking(calendar_id)
+                .exists()
+            ):
+                raise SlotUnavailableError(session_id)
+            booking = Booking.objects.create(
+                stripe_checkout_session_id=session_id,
+                service_id=payload["service_id"],
+                customer_name=payload.get("sender_name", ""),
+                customer_email=payload.get("sender_email", ""),
+                preferred_language=payload.get("preferred_language", "fr"),
+                message=payload.get("message", "") or "",
+                start_datetime=start,
+                end_datetime=end,
+                calendar_id=calendar_id,
+            )
+    except IntegrityError as error:
+        # Either a concurrent delivery of this same session won the
+        # unique key, or another checkout won the slot.
+        existing = Booking.objects.filter(stripe_checkout_session_id=session_id).first()
+        if existing:
+            return existing, False
+        raise SlotUnavailableError(session_id) from error
+    return booking, True
+
+
+def _calendar_of(booking: Booking) -> str:
+    """Where the booking's event lives: its practitioner's calendar."""
+    return booking.calendar_id or calendar_gateway.CALENDAR_ID
+
+
+def _event_args(booking: Booking) -> dict[str, Any]:
+    return {
+        "title": f"Booking — {booking.service}",
+        "start_datetime": booking.start_datetime,
+        "end_datetime": booking.end_datetime,
+        "client_email": booking.customer_email,
+        "client_name": booking.customer_name,
+        "description": booking.message or "",
     }
-    booking, created = Booking.objects.get_or_create(
-        stripe_checkout_session_id=session_id,
-        defaults=defaults,
-    )
-    return booking, created
 
 
 def sync_booking_to_calendar(booking: Booking) -> None:
     if booking.google_event_id:
         return
     event = calendar_gateway.create_booking_event(
-        title=f"Booking — {booking.service}",
-        start_datetime=booking.start_datetime,
-        end_datetime=booking.end_datetime,
-        client_email=booking.customer_email,
-        client_name=booking.customer_name,
-        description=booking.message or "",
+        **_event_args(booking), calendar_id=_calendar_of(booking)
     )
     event_id = str(event.get("id") or "") if event else ""
     if event_id:
@@ -72,33 +124,96 @@ def sync_booking_to_calendar(booking: Booking) -> None:
         booking.save(update_fields=["google_event_id"])
 
 
-def send_booking_emails(booking: Booking) -> None:
-    """Confirmation to the customer + notification to the studio."""
-    when = booking.start_datetime.strftime("%Y-%m-%d %H:%M")
-    if booking.preferred_language == "fr":
-        subject = "Votre réservation — La Serenity"
-        body = (
-            f"Bonjour {booking.customer_name},\n\n"
-            f"Votre réservation est confirmée :\n"
-            f"Soin : {booking.service}\n"
-            f"Date : {when}\n\n"
-            f"À très bientôt,\nLa Serenity"
+def _by_calendar(bookings: dict[str, Booking]) -> dict[str, list[str]]:
+    """Keys of `bookings` grouped by the calendar their events live on."""
+    grouped: dict[str, list[str]] = {}
+    for key, booking in bookings.items():
+        grouped.setdefault(_calendar_of(booking), []).append(key)
+    return grouped
+
+
+def push_bookings_to_calendar(bookings: Iterable[Booking]) -> int:
+    """Create the missing calendar events for many bookings at once.
+
+    Only confirmed bookings without a google_event_id are pushed, in
+    Google batch requests; failed items are retried on their own and a
+    booking whose insert still fails keeps an empty google_event_id for
+    the next push. Returns how many bookings were put on the calendar.
+    """
+    pending = {
+        str(b.pk): b
+        for b in bookings
+        if b.status == BookingStatus.CONFIRMED and not b.google_event_id
+    }
+    created: dict[str, dict[str, Any] | None] = {}
+    for calendar_id, keys in _by_calendar(pending).items():
+        created |= calendar_gateway.batch_create_events(
+            {
+                key: calendar_gateway.booking_event_body(**_event_args(pending[key]))
+                for key in keys
+            },
+            calendar_id,
         )
-    else:
-        subject = "Your booking — La Serenity"
-        body = (
-            f"Hello {booking.customer_name},\n\n"
-            f"Your booking is confirmed:\n"
-            f"Treatment: {booking.service}\n"
-            f"Date: {when}\n\n"
-            f"See you soon,\nLa Serenity"
+    updated = []
+    for key, event in created.items():
+        if event:
+            pending[key].google_event_id = str(event["id"])
+            updated.append(pending[key])
+    Booking.objects.bulk_update(updated, ["google_event_id"])
+    if len(updated) < len(pending):
+        logger.warning(
+            "%d booking(s) could not be put on the calendar",
+            len(pending) - len(updated),
         )
+    return len(updated)
+
+
+def remove_bookings_from_calendar(bookings: Iterable[Booking]) -> int:
+    """Delete the calendar events of many bookings in batched requests.
+
+    Clears google_event_id on each booking whose event is gone.
+    Returns how many were removed.
+    """
+    by_event = {b.google_event_id: b for b in bookings if b.google_event_id}
+    deleted: dict[str, bool] = {}
+    for calendar_id, event_ids in _by_calendar(by_event).items():
+        deleted |= calendar_gateway.batch_delete_events(event_ids, calendar_id)
+    updated = []
+    for event_id, gone in deleted.items():
+        if gone:
+            by_event[event_id].google_event_id = ""
+            updated.append(by_event[event_id])
+    Booking.objects.bulk_update(updated, ["google_event_id"])
+    return len(updated)
+
+
+def send_booking_conflict_email(payload: dict[str, Any], *, session_id: str) -> None:
+    """Tell the studio a paid checkout lost its slot and needs a refund."""
+    admin_to = getattr(settings, "BOOKING_ADMIN_EMAIL", "") or getattr(
+        settings, "DEFAULT_FROM_EMAIL", ""
+    )
+    if not admin_to:
+        return
     try:
-        EmailMessage(
-            subject=subject,
-            body=body,
-            to=[booking.customer_email],
-        ).send()
+        email = render_email(
+            "booking_conflict", {"payload": payload, "session_id": session_id}
+        )
+        queue_email(email.message(to=[admin_to]))
+    except Exception:
+        logger.exception("Booking conflict email failed: %s", session_id)
+
+
+def send_booking_emails(booking: Booking) -> None:
+    """Confirmation to the customer + notification to the studio."""
+    context = {
+        "booking": booking,
+        "when": booking.start_datetime.strftime("%Y-%m-%d %H:%M"),
+    }
+    try:
+        email = render_email(
+            "booking_confirmation", context, lang=booking.preferred_language
+        )
+        queue_email(email.message(to=[booking.customer_email]))
     except Exception:
         logger.exception("Booking confirmation email failed: %s", booking.pk)
 
@@ -108,17 +223,7 @@ def send_booking_emails(booking: Booking) -> None:
     if not admin_to:
         return
     try:
-        EmailMessage(
-            subject=f"New booking: {booking.customer_name} — {when}",
-            body=(
-                f"Service: {booking.service}\n"
-                f"Customer: {booking.customer_name} <{booking.customer_email}>\n"
-                f"Start: {booking.start_datetime.isoformat()}\n"
-                f"End: {booking.end_datetime.isoformat()}\n"
-                f"Message: {booking.message or '-'}\n"
-                f"Session: {booking.stripe_checkout_session_id}"
-            ),
-            to=[admin_to],
-        ).send()
+        email = render_email("booking_admin", context)
+        queue_email(email.message(to=[admin_to]))
     except Exception:
         logger.exception("Booking admin email failed: %s", booking.pk)
@@ -0,0 +1,154 @@
+"""Pure availability computations over busy intervals.
+
+Intervals are [start, end) epoch seconds, as returned by
+calendar_gateway.list_busy_intervals and stored in the month cache.
+Nothing here talks to Google or the database.
+
+Free slots come from a single sweep: intervals are merged once, then
+walked in step with the slot grid, so a day costs O(log n + slots)
+instead of O(slots * n). Slots are returned as minutes since local
+midnight; format_offset turns one into "HH:MM" for the API.
+"""
+
+from __future__ import annotations
+
+import heapq
+from bisect import bisect_right
+from calendar import monthrange
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING
+from zoneinfo import ZoneInfo
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .cache import BusyInterval
+
+TZ = ZoneInfo("Europe/Paris")
+
+SLOT_MINUTES = 30
+WORK_HOURS = (9, 19)
+BUFFER_MINUTES = 0
+
+
+def busy_days(intervals: list[BusyInterval], year: int, month: int) -> list[str]:
+    """Dates (YYYY-MM-DD) in the month that any interval overlaps."""
+    first = date(year, month, 1)
+    last = date(year, month, monthrange(year, month)[1])
+    busy: set[str] = set()
+    for start, end in intervals:
+        day = max(datetime.fromtimestamp(start, TZ).date(), first)
+        end_day = min(
+            datetime.fromtimestamp(max(end - 1, start), TZ).date(), last
+        )
+        while day <= end_day:
+            busy.add(day.isoformat())
+            day += timedelta(days=1)
+    return sorted(busy)
+
+
+def _coalesce(ordered: Iterable[BusyInterval]) -> list[BusyInterval]:
+    merged: list[BusyInterval] = []
+    for start, end in ordered:
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def merge_intervals(intervals: list[BusyInterval]) -> list[BusyInterval]:
+    """Sort and coalesce overlapping or touching intervals."""
+    return _coalesce(sorted(intervals))
+
+
+def merge_sorted(*lists: list[BusyInterval]) -> list[BusyInterval]:
+    """Union of already sorted interval lists, coalesced.
+
+    A k-way heap merge — O(n log k) for k calendars instead of
+    re-sorting the concatenation.
+    """
+    return _coalesce(heapq.merge(*lists))
+
+
+def overlaps(
+    merged: list[BusyInterval], start: int, end: int, *, buffer_seconds: int = 0
+) -> bool:
+    """Whether [start, end), widened by `buffer_seconds` either side,
+    touches any interval of `merged` (sorted and disjoint)."""
+    i = bisect_right(merged, start - buffer_seconds, key=lambda iv: iv[1])
+    return i < len(merged) and merged[i][0] < end + buffer_seconds
+
+
+def free_slot_offsets(
+    merged: list[BusyInterval],
+    day: date,
+    *,
+    duration_minutes: int = SLOT_MINUTES,
+    step_minutes: int = SLOT_MINUTES,
+    buffer_minutes: int = BUFFER_MINUTES,
+    work_hours: tuple[int, int] = WORK_HOURS,
+) -> list[int]:
+    """Start offsets (minutes since local midnight) of free slots on `day`.
+
+    `merged` must be sorted and disjoint (see merge_intervals). A slot
+    of `duration_minutes` starting on the `step_minutes` grid is free
+    when it plus `buffer_minutes` either side overlaps no interval and
+    ends within work hours.
+    """
+    window_start = int(
+        datetime(day.year, day.month, day.day, work_hours[0], tzinfo=TZ).timestamp()
+    )
+    window_end = int(
+        datetime(day.year, day.month, day.day, work_hours[1], tzinfo=TZ).timestamp()
+    )
+    duration, step, buffer = duration_minutes * 60, step_minutes * 60, buffer_minutes * 60
+    base_offset = work_hours[0] * 60
+
+    # Merged intervals have increasing ends: skip straight to the first
+    # one that can still touch the day.
+    i = bisect_right(merged, window_start - buffer, key=lambda iv: iv[1])
+    count = len(merged)
+    offsets: list[int] = []
+    t = window_start
+    while t + duration <= window_end:
+        while i < count and merged[i][1] <= t - buffer:
+            i += 1
+        if i < count and merged[i][0] < t + duration + buffer:
+            # Jump to the first grid point clear of this interval.
+            clear = merged[i][1] + buffer
+            t = window_start + -(-(clear - window_start) // step) * step
+            continue
+        offsets.append(base_offset + (t - window_start) // 60)
+        t += step
+    return offsets
+
+
+def format_offset(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def free_slots(
+    intervals: list[BusyInterval],
+    day: date,
+    slot_minutes: int = SLOT_MINUTES,
+    work_hours: tuple[int, int] = WORK_HOURS,
+    *,
+    duration_minutes: int | None = None,
+    buffer_minutes: int = BUFFER_MINUTES,
+) -> list[str]:
+    """Start times (HH:MM) of free slots on `day`.
+
+    Slots start every `slot_minutes` and last `duration_minutes`
+    (defaults to one grid step).
+    """
+    offsets = free_slot_offsets(
+        merge_intervals(intervals),
+        day,
+        duration_minutes=duration_minutes or slot_minutes,
+        step_minutes=slot_minutes,
+        buffer_minutes=buffer_minutes,
+        work_hours=work_hours,
+    )
+    return [format_offset(offset) for offset in offsets]
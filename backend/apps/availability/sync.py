@@ -0,0 +1,245 @@
+"""Mirror external Google Calendar events into the local database.
+
+Confirmed bookings already live in Postgres; the only thing Google
+knows that we don't is what the studio puts on the calendar by hand
+(days off, appointments taken by phone). This module copies those
+events into CalendarEvent using Google sync tokens, so each run only
+transfers what changed since the last one. When Google expires a
+token (410 Gone) the next run falls back to a full resync.
+
+CalendarSyncState records watermarks for every run; the mirror only
+answers availability while its last successful sync is recent enough
+(AVAILABILITY_MIRROR_MAX_AGE), so a stalled worker degrades to live
+Google reads instead of serving stale data.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.jobs.queue import enqueue
+
+from . import cache as availability_cache
+from . import calendar_gateway
+from .models import CalendarEvent, CalendarSyncState
+
+if TYPE_CHECKING:
+    from apps.jobs.models import Job
+
+logger = logging.getLogger(__name__)
+
+# A full sync only needs events that can still block a future slot.
+FULL_SYNC_LOOKBACK = timedelta(days=1)
+
+MIRROR_MAX_AGE = 900
+
+# Job (apps.jobs) that syncs one calendar; see tasks.py. Past a few
+# retries the periodic sync (apps.availability.upkeep) catches up anyway.
+SYNC_CALENDAR = "availability.sync_calendar"
+SYNC_ATTEMPTS = 3
+
+
+def _parse_when(when: dict[str, Any]) -> datetime | None:
+    if when.get("dateTime"):
+        return datetime.fromisoformat(when["dateTime"])
+    if when.get("date"):
+        day = date.fromisoformat(when["date"])
+        return datetime(day.year, day.month, day.day, tzinfo=calendar_gateway.TZ)
+    return None
+
+
+def event_interval(event: dict[str, Any]) -> tuple[datetime, datetime] | None:
+    """The [start, end) an event blocks, or None if it blocks nothing.
+
+    A timed "show as free" event blocks nothing. An all-day event blocks
+    its days whatever its transparency: Google creates them as free by
+    default, and that is how the studio marks its days off.
+    """
+    if event.get("status") == "cancelled":
+        return None
+    all_day = bool(event.get("start", {}).get("date"))
+    if event.get("transparency") == "transparent" and not all_day:
+        return None
+    start = _parse_when(event.get("start", {}))
+    end = _parse_when(event.get("end", {}))
+    if start is None or end is None or end <= start:
+        return None
+    return start, end
+
+
+def _updated(event: dict[str, Any]) -> datetime | None:
+    updated = event.get("updated")
+    return datetime.fromisoformat(updated) if updated else None
+
+
+def _apply(
+    calendar_id: str, events: list[dict[str, Any]]
+) -> tuple[int, int, list[tuple[datetime, datetime]]]:
+    """Upsert blocking events, drop the rest.
+
+    One read of the rows being replaced, one bulk upsert and one delete,
+    however many events changed. Returns (upserted, removed, touched)
+    where `touched` holds the old and new interval of every event that
+    changed, so callers can invalidate just the months involved.
+    """
+    # Later entries are Google's last word on an event.
+    latest = {event["id"]: event for event in events if event.get("id")}
+    previous = {
+        event_id: (start, end)
+        for event_id, start, end in CalendarEvent.objects.filter(
+            calendar_id=calendar_id, google_event_id__in=list(latest)
+        ).values_list("google_event_id", "start_datetime", "end_datetime")
+    }
+    touched = list(previous.values())
+    rows: list[CalendarEvent] = []
+    gone: list[str] = []
+    for event_id, event in latest.items():
+        interval = event_interval(event)
+        if interval is None:
+            gone.append(event_id)
+            continue
+        rows.append(
+            CalendarEvent(
+                calendar_id=calendar_id,
+                google_event_id=event_id,
+                start_datetime=interval[0],
+                end_datetime=interval[1],
+                summary=(event.get("summary") or "")[:500],
+                google_updated=_updated(event),
+            )
+        )
+        touched.append(interval)
+
+    removed = 0
+    if gone:
+        removed = CalendarEvent.objects.filter(
+            calendar_id=calendar_id, google_event_id__in=gone
+        ).delete()[0]
+    if rows:
+        CalendarEvent.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=("calendar_id", "google_event_id"),
+            update_fields=(
+                "start_datetime",
+                "end_datetime",
+                "summary",
+                "google_updated",
+                "synced_at",
+            ),
+        )
+    return len(rows), removed, touched
+
+
+def _list_changes(
+    calendar_id: str, sync_token: str
+) -> tuple[list[dict[str, Any]], str] | None:
+    return calendar_gateway.list_event_changes(
+        calendar_id=calendar_id,
+        sync_token=sync_token,
+        time_min=None if sync_token else timezone.now() - FULL_SYNC_LOOKBACK,
+    )
+
+
+def sync_calendar(calendar_id: str = calendar_gateway.CALENDAR_ID) -> dict[str, Any] | None:
+    """Bring the mirror for one calendar up to date.
+
+    Incremental when a sync token is stored, full otherwise or when
+    Google expired the token (the full sync replaces the mirror
+    wholesale). Returns counts, or None if Google could not be
+    reached — the mirror is left untouched and the error recorded.
+
+    Runs with the calendar's CalendarSyncState row locked, so syncs of
+    one calendar (the periodic worker, a burst of push notifications)
+    take turns: each starts from the token the previous one stored.
+    """
+    CalendarSyncState.objects.get_or_create(calendar_id=calendar_id)
+    with transaction.atomic():
+        state = CalendarSyncState.objects.select_for_update().get(calendar_id=calendar_id)
+        state.last_attempt_at = timezone.now()
+        full = not state.sync_token
+
+        try:
+            result = _list_changes(calendar_id, state.sync_token)
+        except calendar_gateway.SyncTokenExpiredError:
+            logger.warning("Sync token expired for %s — running a full sync", calendar_id)
+            full = True
+            result = _list_changes(calendar_id, "")
+
+        if result is None:
+            state.last_error = "Google Calendar unavailable"
+            state.save(update_fields=["last_attempt_at", "last_error"])
+            return None
+        events, next_token = result
+
+        if full:
+            CalendarEvent.objects.filter(calendar_id=calendar_id).delete()
+        upserted, removed, touched = _apply(calendar_id, events)
+
+        stamps = [u for u in map(_updated, events) if u is not None]
+        if stamps and (
+            full
+            or state.updated_watermark is None
+            or max(stamps) > state.updated_watermark
+        ):
+            state.updated_watermark = max(stamps)
+        state.sync_token = next_token
+        state.synced_at = timezone.now()
+        if full:
+            state.full_synced_at = state.synced_at
+        state.last_error = ""
+        state.save()
+
+    # Readers on the Google fallback path must not keep serving months
+    # cached before these changes; an incremental sync knows exactly
+    # which months moved.
+    if full:
+        availability_cache.invalidate_calendar(calendar_id)
+    else:
+        for start, end in touched:
+            availability_cache.invalidate_range(calendar_id, start, end)
+
+    logger.info(
+        "Calendar %s synced (%s): %d upserted, %d removed",
+        calendar_id,
+        "full" if full else "incremental",
+        upserted,
+        removed,
+    )
+    return {"full": full, "upserted": upserted, "removed": removed}
+
+
+def queue_sync(calendar_id: str) -> Job:
+    """Queue a sync of `calendar_id`, or return the one already waiting.
+
+    A burst of notifications and the periodic sync fold into the job
+    still waiting, so a calendar is not synced twice in a row.
+    """
+    return enqueue(
+        SYNC_CALENDAR,
+        {"calendar_id": calendar_id},
+        unique=True,
+        max_attempts=SYNC_ATTEMPTS,
+    )
+
+
+def mirrored_calendars(calendar_ids: list[str]) -> set[str]:
+    """The calendars whose mirror synced recently enough to trust."""
+    max_age = getattr(settings, "AVAILABILITY_MIRROR_MAX_AGE", MIRROR_MAX_AGE)
+    return set(
+        CalendarSyncState.objects.filter(
+            calendar_id__in=calendar_ids,
+            synced_at__gte=timezone.now() - timedelta(seconds=max_age),
+        ).values_list("calendar_id", flat=True)
+    )
+
+
+def mirror_ready(calendar_id: str = calendar_gateway.CALENDAR_ID) -> bool:
+    """True while the mirror's last successful sync is recent enough to trust."""
+    return bool(mirrored_calendars([calendar_id]))
@@ -0,0 +1,14 @@
+"""Calendar mirror syncs, run by the job queue (apps.jobs)."""
+
+from __future__ import annotations
+
+from apps.jobs.queue import task
+
+from . import sync
+
+
+@task(sync.SYNC_CALENDAR)
+def sync_calendar(calendar_id: str) -> None:
+    if sync.sync_calendar(calendar_id) is None:
+        # Retried with backoff; the next notification may beat it.
+        raise RuntimeError(f"Google Calendar unavailable while syncing {calendar_id}")
@@ -0,0 +1,13 @@
+import pytest
+
+from apps.availability import calendar_gateway
+
+from .fake_google import FakeGoogleCalendar
+
+
+@pytest.fixture()
+def fake_google(monkeypatch):
+    """Route every gateway call to an in-memory Google Calendar."""
+    calendar = FakeGoogleCalendar()
+    monkeypatch.setattr(calendar_gateway, "_get_service", lambda: calendar)
+    return calendar
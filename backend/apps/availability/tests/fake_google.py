@@ -0,0 +1,254 @@
+"""In-memory stand-in for the Google Calendar v3 service.
+
+Implements the slice of the discovery client the gateway uses —
+events().list/insert/delete/watch, channels().stop, freebusy().query,
+new_batch_http_request() — with Google's sync semantics: incremental listings by syncToken
+including cancelled events, nextPageToken paging, and 410 Gone once
+tokens are expired.
+"""
+
+from __future__ import annotations
+
+import itertools
+from datetime import UTC, date, datetime, timedelta
+from typing import Any
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from apps.availability.calendar_gateway import TZ
+
+_EPOCH = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+def _http_error(status: int, message: str) -> HttpError:
+    return HttpError(resp=httplib2.Response({"status": status}), content=message.encode())
+
+
+class _Request:
+    def __init__(self, fn: Any) -> None:
+        self._fn = fn
+
+    def execute(self) -> Any:
+        return self._fn()
+
+
+def _bound(when: dict[str, Any]) -> datetime:
+    if "dateTime" in when:
+        return datetime.fromisoformat(when["dateTime"])
+    day = date.fromisoformat(when["date"])
+    return datetime(day.year, day.month, day.day, tzinfo=TZ)
+
+
+class _Events:
+    def __init__(self, calendar: FakeGoogleCalendar) -> None:
+        self._calendar = calendar
+
+    def list(self, **params: Any) -> _Request:
+        return _Request(lambda: self._calendar._list(params))
+
+    def insert(self, *, calendarId: str, body: dict[str, Any]) -> _Request:
+        return _Request(lambda: self._calendar._write(lambda: self._calendar._insert(body)))
+
+    def delete(self, *, calendarId: str, eventId: str) -> _Request:
+        return _Request(lambda: self._calendar._write(lambda: self._calendar.cancel(eventId)))
+
+    def watch(self, *, calendarId: str, body: dict[str, Any]) -> _Request:
+        return _Request(lambda: self._calendar._watch(body))
+
+
+class _Channels:
+    def __init__(self, calendar: FakeGoogleCalendar) -> None:
+        self._calendar = calendar
+
+    def stop(self, *, body: dict[str, Any]) -> _Request:
+        return _Request(lambda: self._calendar._stop(body))
+
+
+class _FreeBusy:
+    def __init__(self, calendar: FakeGoogleCalendar) -> None:
+        self._calendar = calendar
+
+    def query(self, *, body: dict[str, Any]) -> _Request:
+        return _Request(lambda: self._calendar._freebusy(body))
+
+
+class _Batch:
+    def __init__(self, calendar: FakeGoogleCalendar, callback: Any) -> None:
+        self._calendar = calendar
+        self._callback = callback
+        self._requests: list[tuple[str, _Request]] = []
+
+    def add(self, request: _Request, request_id: str) -> None:
+        self._requests.append((request_id, request))
+
+    def execute(self) -> None:
+        self._calendar.requests.append(("batch", {"size": len(self._requests)}))
+        for request_id, request in self._requests:
+            try:
+                response, error = request.execute(), None
+            except HttpError as exc:
+                response, error = None, exc
+            self._callback(request_id, response, error)
+
+
+class FakeGoogleCalendar:
+    """One calendar's worth of events plus a change log for sync tokens."""
+
+    def __init__(self, *, page_size: int = 2) -> None:
+        self.page_size = page_size
+        self.requests: list[tuple[str, dict[str, Any]]] = []
+        self._events: dict[str, dict[str, Any]] = {}
+        self._changed_at: dict[str, int] = {}
+        self._seq = 0
+        self._expired_before = 0
+        self._ids = itertools.count(1)
+        self.open_channels: dict[str, dict[str, Any]] = {}
+        self._failing_writes: list[tuple[int, bool]] = []
+
+    # -- discovery-client surface -------------------------------------
+
+    def events(self) -> _Events:
+        return _Events(self)
+
+    def freebusy(self) -> _FreeBusy:
+        return _FreeBusy(self)
+
+    def channels(self) -> _Channels:
+        return _Channels(self)
+
+    def new_batch_http_request(self, *, callback: Any) -> _Batch:
+        return _Batch(self, callback)
+
+    # -- test helpers ---------------------------------------------------
+
+    def put_event(
+        self,
+        event_id: str | None,
+        start: str | None = None,
+        end: str | None = None,
+        *,
+        body: dict[str, Any] | None = None,
+        **extra: Any,
+    ) -> dict[str, Any]:
+        """Create or replace an event. `start`/`end` are ISO datetimes or dates."""
+        if body is None:
+            key = "date" if len(start or "") == 10 else "dateTime"
+            body = {"start": {key: start}, "end": {key: end}, **extra}
+        event_id = event_id or f"evt_{next(self._ids)}"
+        event = {**body, "id": event_id, "status": body.get("status", "confirmed")}
+        return self._record(event)
+
+    def cancel(self, event_id: str) -> None:
+        if event_id not in self._events:
+            raise _http_error(404, "Not Found")
+        self._record({**self._events[event_id], "status": "cancelled"})
+
+    def fail_writes(self, count: int, *, status: int = 503, applied: bool = False) -> None:
+        """Fail the next `count` inserts/deletes with `status`.
+
+        With `applied`, the write still takes effect — the ambiguous
+        failure a client can only resolve by retrying.
+        """
+        self._failing_writes.extend([(status, applied)] * count)
+
+    def expire_sync_tokens(self) -> None:
+        """Invalidate every token issued so far, as Google does periodically."""
+        self._expired_before = self._seq + 1
+
+    # -- internals --------------------------------------------------------
+
+    def _write(self, apply: Any) -> Any:
+        if not self._failing_writes:
+            return apply()
+        status, applied = self._failing_writes.pop(0)
+        if applied:
+            apply()
+        raise _http_error(status, "Backend Error")
+
+    def _insert(self, body: dict[str, Any]) -> dict[str, Any]:
+        if body.get("id") in self._events:
+            raise _http_error(409, "The requested identifier already exists.")
+        return self.put_event(body.get("id"), body=body)
+
+    def _record(self, event: dict[str, Any]) -> dict[str, Any]:
+        self._seq += 1
+        event["updated"] = (_EPOCH + timedelta(seconds=self._seq)).isoformat()
+        event.setdefault("htmlLink", f"https://calendar.example/{event['id']}")
+        self._events[event["id"]] = event
+        self._changed_at[event["id"]] = self._seq
+        return event
+
+    def _list(self, params: dict[str, Any]) -> dict[str, Any]:
+        self.requests.append(("events.list", params))
+        token = params.get("syncToken")
+        if token:
+            since = int(token.removeprefix("sync-"))
+            if since < self._expired_before:
+                raise _http_error(410, "Sync token is no longer valid")
+            ids = [i for i, seq in self._changed_at.items() if seq > since]
+        else:
+            time_min, time_max = params.get("timeMin"), params.get("timeMax")
+            ids = [
+                i
+                for i, e in self._events.items()
+                if e["status"] != "cancelled"
+                and (time_min is None or _bound(e["end"]) > datetime.fromisoformat(time_min))
+                and (time_max is None or _bound(e["start"]) < datetime.fromisoformat(time_max))
+            ]
+        ids.sort(key=self._changed_at.__getitem__)
+
+        offset = int(params.get("pageToken") or 0)
+        page_size = min(self.page_size, params.get("maxResults", self.page_size))
+        page: dict[str, Any] = {
+            "items": [dict(self._events[i]) for i in ids[offset : offset + page_size]]
+        }
+        if offset + page_size < len(ids):
+            page["nextPageToken"] = str(offset + page_size)
+        else:
+            page["nextSyncToken"] = f"sync-{self._seq}"
+        return page
+
+    def _watch(self, body: dict[str, Any]) -> dict[str, Any]:
+        self.requests.append(("events.watch", body))
+        ttl = int(body.get("params", {}).get("ttl", 604800))
+        expiration = datetime.now(UTC) + timedelta(seconds=ttl)
+        channel = {
+            "kind": "api#channel",
+            "id": body["id"],
+            "resourceId": f"res-{body['id']}",
+            "token": body.get("token", ""),
+            "address": body["address"],
+            "expiration": str(int(expiration.timestamp() * 1000)),
+        }
+        self.open_channels[body["id"]] = channel
+        return channel
+
+    def _stop(self, body: dict[str, Any]) -> None:
+        self.requests.append(("channels.stop", body))
+        if self.open_channels.pop(body["id"], None) is None:
+            raise _http_error(404, "Channel not found")
+
+    def _freebusy(self, body: dict[str, Any]) -> dict[str, Any]:
+        self.requests.append(("freebusy.query", body))
+        lo = datetime.fromisoformat(body["timeMin"])
+        hi = datetime.fromisoformat(body["timeMax"])
+        busy = sorted(
+            (max(_bound(e["start"]), lo), min(_bound(e["end"]), hi))
+            for e in self._events.values()
+            if e["status"] != "cancelled"
+            and e.get("transparency") != "transparent"
+            and _bound(e["start"]) < hi
+            and _bound(e["end"]) > lo
+        )
+        return {
+            "calendars": {
+                item["id"]: {
+                    "busy": [
+                        {"start": s.astimezone(UTC).isoformat(), "end": e.astimezone(UTC).isoformat()}
+                        for s, e in busy
+                    ]
+                }
+                for item in body["items"]
+            }
+        }
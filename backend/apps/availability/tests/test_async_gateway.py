@@ -0,0 +1,245 @@
+import asyncio
+import json
+from datetime import datetime
+
+import httpx
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.availability import async_gateway, calendar_gateway
+from apps.availability.calendar_gateway import CALENDAR_ID, TZ
+from apps.availability.models import CalendarEvent, CalendarSyncState
+
+
+def _ts(*args):
+    return int(datetime(*args, tzinfo=TZ).timestamp())
+
+
+async def _token():
+    return "tok"
+
+
+def _freebusy_response(request, busy, all_day=()):
+    """freeBusy answers with `busy`; the all-day events.list pass with `all_day`."""
+    if request.method == "GET":
+        return httpx.Response(200, json={"items": list(all_day)})
+    body = json.loads(request.content)
+    return httpx.Response(
+        200, json={"calendars": {body["items"][0]["id"]: {"busy": busy}}}
+    )
+
+
+@pytest.fixture()
+def use_client(monkeypatch):
+    """Install an AsyncCalendarClient backed by a mock transport."""
+
+    def _install(handler, **kwargs):
+        client = async_gateway.AsyncCalendarClient(
+            token=kwargs.pop("token", _token),
+            transport=httpx.MockTransport(handler),
+            **kwargs,
+        )
+        monkeypatch.setattr(async_gateway, "_client", client)
+        return client
+
+    return _install
+
+
+@pytest.mark.asyncio
+async def test_list_busy_intervals_posts_freebusy(use_client):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return _freebusy_response(
+            request,
+            [
+                {"start": "2026-02-12T13:00:00Z", "end": "2026-02-12T14:00:00Z"},
+                {"start": "2026-02-12T09:00:00Z", "end": "2026-02-12T10:00:00Z"},
+                {"start": "2026-02-12T09:30:00Z", "end": "2026-02-12T10:30:00Z"},
+            ],
+        )
+
+    use_client(handler)
+
+    intervals = await async_gateway.list_busy_intervals(
+        datetime(2026, 2, 1, tzinfo=TZ), datetime(2026, 3, 1, tzinfo=TZ)
+    )
+
+    assert intervals == [
+        (_ts(2026, 2, 12, 10), _ts(2026, 2, 12, 11, 30)),
+        (_ts(2026, 2, 12, 14), _ts(2026, 2, 12, 15)),
+    ]
+    (request,) = [r for r in requests if r.method == "POST"]
+    assert request.url == "https://www.googleapis.com/calendar/v3/freeBusy"
+    assert request.headers["Authorization"] == "Bearer tok"
+    assert json.loads(request.content)["items"] == [{"id": CALENDAR_ID}]
+
+
+@pytest.mark.asyncio
+async def test_all_day_events_block_their_days_even_when_marked_free(use_client):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return _freebusy_response(
+            request,
+            [],
+            all_day=[
+                {
+                    "start": {"date": "2026-02-16"},
+                    "end": {"date": "2026-02-17"},
+                    "transparency": "transparent",
+                },
+            ],
+        )
+
+    use_client(handler)
+
+    intervals = await async_gateway.list_busy_intervals(
+        datetime(2026, 2, 1, tzinfo=TZ), datetime(2026, 3, 1, tzinfo=TZ)
+    )
+
+    assert intervals == [(_ts(2026, 2, 16), _ts(2026, 2, 17))]
+    (listing,) = [r for r in requests if r.method == "GET"]
+    assert listing.url.path == "/calendar/v3/calendars/primary/events"
+    assert listing.url.params["singleEvents"] == "true"
+    assert listing.url.params["timeMin"] == "2026-02-01T00:00:00+01:00"
+
+
+@pytest.mark.asyncio
+async def test_long_ranges_are_split_and_fetched_concurrently(use_client):
+    bodies = []
+
+    def handler(request):
+        if request.method == "POST":
+            bodies.append(json.loads(request.content))
+        return _freebusy_response(request, [])
+
+    use_client(handler)
+
+    await async_gateway.list_busy_intervals(
+        datetime(2026, 1, 1, tzinfo=TZ), datetime(2026, 5, 1, tzinfo=TZ)
+    )
+
+    assert len(bodies) == 2
+    assert {b["timeMin"] for b in bodies} == {
+        "2026-01-01T00:00:00+01:00",
+        "2026-03-02T00:00:00+01:00",
+    }
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_capped(use_client):
+    in_flight = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return _freebusy_response(request, [])
+
+    use_client(handler, max_concurrency=3)
+    window = (datetime(2026, 2, 1, tzinfo=TZ), datetime(2026, 3, 1, tzinfo=TZ))
+
+    results = await asyncio.gather(
+        *(async_gateway.list_busy_intervals(*window) for _ in range(12))
+    )
+
+    assert results == [[]] * 12
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_failures_return_none(use_client):
+    window = (datetime(2026, 2, 1, tzinfo=TZ), datetime(2026, 3, 1, tzinfo=TZ))
+
+    use_client(lambda request: httpx.Response(500, text="backend error"))
+    assert await async_gateway.list_busy_intervals(*window) is None
+
+    def timeout(request):
+        raise httpx.ConnectTimeout("slow", request=request)
+
+    use_client(timeout)
+    assert await async_gateway.list_busy_intervals(*window) is None
+
+    use_client(
+        lambda request: httpx.Response(
+            200, json={"calendars": {CALENDAR_ID: {"errors": [{"reason": "notFound"}]}}}
+        )
+    )
+    assert await async_gateway.list_busy_intervals(*window) is None
+
+    async def no_token():
+        return None
+
+    use_client(lambda request: pytest.fail("must not call Google"), token=no_token)
+    assert await async_gateway.list_busy_intervals(*window) is None
+
+
+@pytest.mark.asyncio
+async def test_slow_upstream_is_cut_off_at_the_deadline(use_client):
+    async def handler(request):
+        await asyncio.sleep(5)
+        return _freebusy_response(request, [])
+
+    use_client(handler, deadline=0.05)
+    window = (datetime(2026, 2, 1, tzinfo=TZ), datetime(2026, 3, 1, tzinfo=TZ))
+
+    async with asyncio.timeout(1):
+        assert await async_gateway.list_busy_intervals(*window) is None
+
+
+@pytest.mark.asyncio
+async def test_shares_the_gateway_circuit_breaker(use_client):
+    calls = 0
+
+    def handler(request):
+        nonlocal calls
+        calls += 1
+        return httpx.Response(503, text="unavailable")
+
+    use_client(handler)
+    window = (datetime(2026, 2, 1, tzinfo=TZ), datetime(2026, 3, 1, tzinfo=TZ))
+
+    for _ in range(3):
+        assert await async_gateway.list_busy_intervals(*window) is None
+    assert calendar_gateway._breaker.state == "open"
+    calls_while_closed = calls
+
+    assert await async_gateway.list_busy_intervals(*window) is None
+    assert calls == calls_while_closed
+
+
+@pytest.mark.django_db
+def test_slots_view_uses_async_gateway(client, use_client):
+    use_client(
+        lambda request: _freebusy_response(
+            request, [{"start": "2031-02-12T08:00:00Z", "end": "2031-02-12T17:00:00Z"}]
+        )
+    )
+
+    res = client.get(reverse("availability_slots"), {"date": "2031-02-12"})
+
+    assert res.status_code == 200
+    assert res.json() == {"times": ["18:00", "18:30"]}
+
+
+@pytest.mark.django_db
+def test_slots_view_reads_fresh_mirror_without_google(client, use_client):
+    use_client(lambda request: pytest.fail("must not call Google"))
+    CalendarSyncState.objects.create(calendar_id=CALENDAR_ID, synced_at=timezone.now())
+    CalendarEvent.objects.create(
+        calendar_id=CALENDAR_ID,
+        google_event_id="evt",
+        start_datetime=datetime(2031, 2, 13, 9, tzinfo=TZ),
+        end_datetime=datetime(2031, 2, 13, 18, tzinfo=TZ),
+    )
+
+    res = client.get(reverse("availability_slots"), {"date": "2031-02-13"})
+
+    assert res.json() == {"times": ["18:00", "18:30"]}
@@ -0,0 +1,203 @@
+from datetime import datetime
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from apps.availability import calendar_gateway as gateway
+from apps.availability.calendar_gateway import TZ
+from apps.availability.models import Booking, BookingStatus
+from apps.availability.services import (
+    push_bookings_to_calendar,
+    remove_bookings_from_calendar,
+)
+from apps.services.models import Service
+from apps.vouchers.models import GiftVoucher
+from apps.vouchers.services import push_vouchers_to_calendar
+
+
+@pytest.fixture(autouse=True)
+def _no_backoff(monkeypatch):
+    monkeypatch.setattr(gateway, "BATCH_BACKOFF", 0)
+
+
+def _body(day, hour=10):
+    return gateway.booking_event_body(
+        "Massage",
+        datetime(2030, 3, day, hour, tzinfo=TZ),
+        datetime(2030, 3, day, hour + 1, tzinfo=TZ),
+        "a@example.com",
+        "A",
+    )
+
+
+def _batches(calendar):
+    return [params["size"] for kind, params in calendar.requests if kind == "batch"]
+
+
+def test_inserts_are_grouped_into_batches(fake_google, monkeypatch):
+    monkeypatch.setattr(gateway, "BATCH_SIZE", 3)
+
+    created = gateway.batch_create_events({str(i): _body(i + 1) for i in range(7)})
+
+    assert _batches(fake_google) == [3, 3, 1]
+    assert all(created[str(i)]["id"] for i in range(7))
+    assert len({event["id"] for event in created.values()}) == 7
+
+
+def test_only_failed_items_are_retried(fake_google):
+    fake_google.fail_writes(2)
+
+    created = gateway.batch_create_events({str(i): _body(i + 1) for i in range(5)})
+
+    assert _batches(fake_google) == [5, 2]
+    assert all(created.values())
+
+
+def test_applied_but_failed_insert_is_not_duplicated(fake_google):
+    fake_google.fail_writes(1, applied=True)
+
+    created = gateway.batch_create_events({"a": _body(1)})
+
+    assert created["a"]["id"]
+    assert _batches(fake_google) == [1, 1]
+    assert [e for e in fake_google._events.values() if e["status"] == "confirmed"] == [
+        fake_google._events[created["a"]["id"]]
+    ]
+
+
+def test_rejected_items_are_not_retried(fake_google):
+    fake_google.fail_writes(1, status=400)
+
+    created = gateway.batch_create_events({"bad": _body(1), "good": _body(2)})
+
+    assert created["bad"] is None
+    assert created["good"] is not None
+    assert _batches(fake_google) == [2]
+
+
+def test_retries_give_up_after_the_limit(fake_google, monkeypatch):
+    monkeypatch.setattr(gateway, "BATCH_RETRIES", 2)
+    fake_google.fail_writes(10)
+
+    created = gateway.batch_create_events({"a": _body(1)})
+
+    assert created == {"a": None}
+    assert _batches(fake_google) == [1, 1, 1]
+
+
+def test_failed_items_inside_a_batch_open_the_breaker(fake_google):
+    fake_google.fail_writes(10)
+
+    created = gateway.batch_create_events({str(i): _body(i + 1) for i in range(5)})
+
+    assert all(value is None for value in created.values())
+    assert gateway._breaker.state == "open"
+    # The breaker opened on the first batch, so nothing was retried.
+    assert _batches(fake_google) == [5]
+
+
+def test_batch_delete_treats_missing_events_as_deleted(fake_google):
+    kept = fake_google.put_event("kept", "2030-03-01T10:00:00+01:00", "2030-03-01T11:00:00+01:00")
+    fake_google.fail_writes(1)
+
+    deleted = gateway.batch_delete_events([kept["id"], "never-existed"])
+
+    assert deleted == {"kept": True, "never-existed": True}
+    assert fake_google._events["kept"]["status"] == "cancelled"
+    assert _batches(fake_google) == [2, 1]
+
+
+def test_open_breaker_skips_the_batch(fake_google, monkeypatch):
+    monkeypatch.setattr(gateway._breaker, "allow", lambda: False)
+
+    assert gateway.batch_create_events({"a": _body(1)}) == {"a": None}
+    assert gateway.batch_delete_events(["x"]) == {"x": False}
+    assert fake_google.requests == []
+
+
+@pytest.fixture()
+def service(db):
+    return Service.objects.create(title_en="Massage", title_fr="Massage")
+
+
+def _booking(service, day, **extra):
+    return Booking.objects.create(
+        service=service,
+        customer_name="A",
+        customer_email="a@example.com",
+        start_datetime=datetime(2030, 3, day, 10, tzinfo=TZ),
+        end_datetime=datetime(2030, 3, day, 11, tzinfo=TZ),
+        stripe_checkout_session_id=f"cs_{day}",
+        **extra,
+    )
+
+
+def test_push_bookings_maps_events_back(fake_google, service):
+    fake_google.fail_writes(1, status=400)
+    first = _booking(service, 1)
+    second = _booking(service, 2)
+    linked = _booking(service, 3, google_event_id="existing")
+    canceled = _booking(service, 4, status=BookingStatus.CANCELED)
+
+    pushed = push_bookings_to_calendar(Booking.objects.all())
+
+    assert pushed == 1
+    first.refresh_from_db()
+    second.refresh_from_db()
+    assert {first.google_event_id, second.google_event_id} - {""} == {
+        e["id"] for e in fake_google._events.values()
+    }
+    assert Booking.objects.get(pk=linked.pk).google_event_id == "existing"
+    assert Booking.objects.get(pk=canceled.pk).google_event_id == ""
+
+
+def test_remove_bookings_clears_event_ids(fake_google, service):
+    for day in (1, 2):
+        _booking(service, day)
+    push_bookings_to_calendar(Booking.objects.all())
+
+    removed = remove_bookings_from_calendar(Booking.objects.all())
+
+    assert removed == 2
+    assert set(Booking.objects.values_list("google_event_id", flat=True)) == {""}
+    assert {e["status"] for e in fake_google._events.values()} == {"cancelled"}
+
+
+def test_push_vouchers_maps_events_back(fake_google, service):
+    voucher = GiftVoucher.objects.create(
+        recipient_name="Alice",
+        recipient_email="alice@example.com",
+        sender_name="Bob",
+        sender_email="bob@example.com",
+        amount=100,
+        service=service,
+        start_datetime=datetime(2030, 3, 5, 10, tzinfo=TZ),
+        end_datetime=datetime(2030, 3, 5, 11, tzinfo=TZ),
+    )
+    GiftVoucher.objects.create(
+        recipient_name="Carol",
+        recipient_email="carol@example.com",
+        sender_name="Bob",
+        sender_email="bob@example.com",
+        amount=50,
+    )
+
+    assert push_vouchers_to_calendar(GiftVoucher.objects.all()) == 1
+
+    voucher.refresh_from_db()
+    event = fake_google._events[voucher.calendar_event_id]
+    assert event["summary"] == "[Voucher] Alice - Massage"
+    assert voucher.calendar_event_link == event["htmlLink"]
+    assert voucher.calendar_event_status == "confirmed"
+
+
+def test_push_command_reports_failures(fake_google, service):
+    _booking(service, 1)
+    fake_google.fail_writes(1, status=403)
+
+    with pytest.raises(CommandError):
+        call_command("push_calendar_events")
+
+    call_command("push_calendar_events")
+    assert Booking.objects.get().google_event_id
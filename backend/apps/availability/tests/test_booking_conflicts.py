@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta
+
+import pytest
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+
+from apps.availability.calendar_gateway import TZ
+from apps.availability.models import Booking, BookingStatus, SlotHold
+from apps.availability.services import SlotUnavailableError, create_booking_from_payload
+from apps.services.models import Service
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture()
+def service():
+    return Service.objects.create(title_en="Massage", title_fr="Massage")
+
+
+def _payload(service, start_hour, end_hour):
+    return {
+        "service_id": service.id,
+        "sender_name": "A",
+        "sender_email": "a@example.com",
+        "start_datetime": datetime(2030, 3, 1, start_hour, tzinfo=TZ).isoformat(),
+        "end_datetime": datetime(2030, 3, 1, end_hour, tzinfo=TZ).isoformat(),
+    }
+
+
+def test_overlapping_booking_is_refused(service):
+    create_booking_from_payload(_payload(service, 10, 11), session_id="cs_1")
+
+    with pytest.raises(SlotUnavailableError):
+        create_booking_from_payload(_payload(service, 10, 12), session_id="cs_2")
+
+    assert Booking.objects.count() == 1
+
+
+def test_holds_on_different_calendars_book_the_same_slot(service):
+    for session_id, calendar_id in (("cs_1", "a@example.com"), ("cs_2", "b@example.com")):
+        SlotHold.objects.create(
+            start_datetime=datetime(2030, 3, 1, 10, tzinfo=TZ),
+            end_datetime=datetime(2030, 3, 1, 11, tzinfo=TZ),
+            calendar_id=calendar_id,
+            expires_at=timezone.now() + timedelta(minutes=30),
+            stripe_checkout_session_id=session_id,
+        )
+
+    first, _ = create_booking_from_payload(_payload(service, 10, 11), session_id="cs_1")
+    second, _ = create_booking_from_payload(_payload(service, 10, 11), session_id="cs_2")
+
+    assert (first.calendar_id, second.calendar_id) == ("a@example.com", "b@example.com")
+    # Without a hold the booking claims no calendar, so it conflicts with both.
+    with pytest.raises(SlotUnavailableError):
+        create_booking_from_payload(_payload(service, 10, 11), session_id="cs_3")
+
+
+def test_adjacent_and_canceled_bookings_do_not_conflict(service):
+    first, _ = create_booking_from_payload(_payload(service, 10, 11), session_id="cs_1")
+    create_booking_from_payload(_payload(service, 11, 12), session_id="cs_2")
+    first.status = BookingStatus.CANCELED
+    first.save(update_fields=["status"])
+
+    _, created = create_booking_from_payload(_payload(service, 9, 11), session_id="cs_3")
+
+    assert created
+
+
+def test_redelivered_session_returns_its_booking(service):
+    booking, created = create_booking_from_payload(
+        _payload(service, 10, 11), session_id="cs_1"
+    )
+
+    again, created_again = create_booking_from_payload(
+        _payload(service, 10, 11), session_id="cs_1"
+    )
+
+    assert created
+    assert not created_again
+    assert again == booking
+
+
+def test_confirmed_overlapping_matches_half_open_intervals(service):
+    create_booking_from_payload(_payload(service, 10, 11), session_id="cs_1")
+
+    def overlapping(start_hour, end_hour):
+        return Booking.objects.confirmed_overlapping(
+            datetime(2030, 3, 1, start_hour, tzinfo=TZ),
+            datetime(2030, 3, 1, end_hour, tzinfo=TZ),
+        ).count()
+
+    assert overlapping(9, 10) == 0
+    assert overlapping(9, 11) == 1
+    assert overlapping(10, 11) == 1
+    assert overlapping(11, 12) == 0
+
+
+@pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="exclusion constraint is Postgres-only"
+)
+def test_database_refuses_overlapping_confirmed_bookings(service):
+    Booking.objects.create(
+        service=service,
+        start_datetime=datetime(2030, 3, 1, 10, tzinfo=TZ),
+        end_datetime=datetime(2030, 3, 1, 11, tzinfo=TZ),
+        stripe_checkout_session_id="cs_1",
+    )
+
+    with pytest.raises(IntegrityError), transaction.atomic():
+        Booking.objects.create(
+            service=service,
+            start_datetime=datetime(2030, 3, 1, 10, 30, tzinfo=TZ),
+            end_datetime=datetime(2030, 3, 1, 11, 30, tzinfo=TZ),
+            stripe_checkout_session_id="cs_2",
+        )
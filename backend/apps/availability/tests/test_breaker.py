@@ -0,0 +1,93 @@
+from apps.availability.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _breaker(clock, **kwargs):
+    kwargs = {"min_calls": 4, "failure_rate": 0.5, "window": 60, "reset_timeout": 30, **kwargs}
+    return CircuitBreaker("test", clock=clock, **kwargs)
+
+
+def test_stays_closed_below_min_calls():
+    breaker = _breaker(_Clock())
+
+    for _ in range(3):
+        breaker.record_failure()
+
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+
+def test_opens_once_failure_rate_reached():
+    breaker = _breaker(_Clock())
+
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+
+def test_old_outcomes_leave_the_window():
+    clock = _Clock()
+    breaker = _breaker(clock)
+    for _ in range(3):
+        breaker.record_failure()
+
+    clock.now = 61
+    breaker.record_failure()
+
+    assert breaker.state == CLOSED
+
+
+def test_half_open_admits_one_probe_and_success_closes():
+    clock = _Clock()
+    breaker = _breaker(clock, min_calls=1)
+    breaker.record_failure()
+
+    clock.now = 30
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+
+def test_failed_probe_reopens_for_another_timeout():
+    clock = _Clock()
+    breaker = _breaker(clock, min_calls=1)
+    breaker.record_failure()
+
+    clock.now = 30
+    assert breaker.allow()
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    clock.now = 59
+    assert not breaker.allow()
+    clock.now = 60
+    assert breaker.allow()
+
+
+def test_unreported_probe_does_not_wedge_half_open():
+    clock = _Clock()
+    breaker = _breaker(clock, min_calls=1)
+    breaker.record_failure()
+
+    clock.now = 30
+    assert breaker.allow()
+    clock.now = 45
+    assert not breaker.allow()
+    clock.now = 60
+    assert breaker.allow()
@@ -0,0 +1,188 @@
+from datetime import datetime
+
+import pytest
+
+from apps.availability import cache as availability_cache
+from apps.availability import calendar_gateway as gateway
+from apps.availability.calendar_gateway import TZ
+
+
+@pytest.fixture
+def inline_refresh(monkeypatch):
+    """Run stale-while-revalidate refreshes synchronously."""
+    monkeypatch.setattr(availability_cache, "_spawn", lambda fn: fn())
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = {"t": 1_000_000.0}
+    monkeypatch.setattr(availability_cache.time, "time", lambda: now["t"])
+    return now
+
+
+def _get(fetch, month=2):
+    return availability_cache.get_month_intervals(
+        calendar_id="cal", year=2026, month=month, fetch=fetch
+    )
+
+
+class _Fetch:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.results[min(self.calls, len(self.results)) - 1]
+
+
+def test_fresh_entry_is_served_without_fetch(clock, settings):
+    settings.AVAILABILITY_CACHE = {"TTL": 60, "STALE_TTL": 600}
+    fetch = _Fetch([(1, 2)])
+
+    assert _get(fetch) == [(1, 2)]
+    clock["t"] += 59
+    assert _get(fetch) == [(1, 2)]
+    assert fetch.calls == 1
+
+
+def test_stale_entry_is_served_then_refreshed(clock, settings, inline_refresh):
+    settings.AVAILABILITY_CACHE = {"TTL": 60, "STALE_TTL": 600}
+    fetch = _Fetch([(1, 2)], [(3, 4)])
+
+    _get(fetch)
+    clock["t"] += 61
+
+    # The stale value is returned immediately; the refresh replaces it.
+    assert _get(fetch) == [(1, 2)]
+    assert fetch.calls == 2
+    assert _get(fetch) == [(3, 4)]
+
+
+def test_only_one_refresh_runs_at_a_time(clock, settings, monkeypatch):
+    settings.AVAILABILITY_CACHE = {"TTL": 60, "STALE_TTL": 600}
+    spawned = []
+    monkeypatch.setattr(availability_cache, "_spawn", spawned.append)
+    fetch = _Fetch([(1, 2)])
+
+    _get(fetch)
+    clock["t"] += 61
+    _get(fetch)
+    _get(fetch)
+
+    assert len(spawned) == 1
+
+
+def test_refresh_does_not_resurrect_invalidated_month(clock, settings, monkeypatch):
+    settings.AVAILABILITY_CACHE = {"TTL": 60, "STALE_TTL": 600}
+    spawned = []
+    monkeypatch.setattr(availability_cache, "_spawn", spawned.append)
+    fetch = _Fetch([(1, 2)], [(9, 9)], [(5, 6)])
+
+    _get(fetch)
+    clock["t"] += 61
+    _get(fetch)
+    availability_cache.invalidate_month("cal", 2026, 2)
+    spawned[0]()  # refresh completes after the invalidation
+
+    assert _get(fetch) == [(5, 6)]
+
+
+def test_failed_fetch_is_not_cached():
+    fetch = _Fetch(None, [(1, 2)])
+
+    assert _get(fetch) is None
+    assert _get(fetch) == [(1, 2)]
+
+
+def test_last_good_survives_invalidation():
+    _get(_Fetch([(1, 2)]))
+    availability_cache.invalidate_calendar("cal")
+
+    assert _get(_Fetch(None)) is None
+    assert availability_cache.last_good_month_intervals("cal", 2026, 2) == [(1, 2)]
+    assert availability_cache.last_good_month_intervals("cal", 2026, 3) is None
+
+
+def test_invalidate_range_spans_months():
+    fetch = _Fetch([(1, 2)])
+    _get(fetch, month=1)
+    _get(fetch, month=2)
+    _get(fetch, month=3)
+
+    availability_cache.invalidate_range(
+        "cal",
+        datetime(2026, 1, 31, 23, tzinfo=TZ),
+        datetime(2026, 2, 1, 1, tzinfo=TZ),
+    )
+    _get(fetch, month=1)
+    _get(fetch, month=2)
+    _get(fetch, month=3)
+
+    assert fetch.calls == 5
+
+
+def test_invalidate_calendar_orphans_every_month():
+    fetch = _Fetch([(1, 2)])
+    _get(fetch, month=1)
+    _get(fetch, month=2)
+
+    availability_cache.invalidate_calendar("cal")
+    availability_cache.invalidate_calendar("cal")
+    _get(fetch, month=1)
+    _get(fetch, month=2)
+
+    assert fetch.calls == 4
+
+
+# ── Write-through invalidation from the gateway ────────────────────
+
+
+class _ServiceStub:
+    def events(self):
+        return self
+
+    def insert(self, **kwargs):
+        return self
+
+    def delete(self, **kwargs):
+        return self
+
+    def execute(self):
+        return {"id": "evt_1"}
+
+
+def test_create_booking_event_invalidates_its_month(monkeypatch):
+    monkeypatch.setattr(gateway, "_get_service", lambda: _ServiceStub())
+    fetch = _Fetch([])
+    availability_cache.get_month_intervals(
+        calendar_id=gateway.CALENDAR_ID, year=2026, month=2, fetch=fetch
+    )
+
+    gateway.create_booking_event(
+        title="Massage",
+        start_datetime=datetime(2026, 2, 12, 10, tzinfo=TZ),
+        end_datetime=datetime(2026, 2, 12, 11, tzinfo=TZ),
+        client_email="a@example.com",
+        client_name="Alice",
+    )
+    availability_cache.get_month_intervals(
+        calendar_id=gateway.CALENDAR_ID, year=2026, month=2, fetch=fetch
+    )
+
+    assert fetch.calls == 2
+
+
+def test_delete_booking_event_without_dates_invalidates_calendar(monkeypatch):
+    monkeypatch.setattr(gateway, "_get_service", lambda: _ServiceStub())
+    fetch = _Fetch([])
+    availability_cache.get_month_intervals(
+        calendar_id=gateway.CALENDAR_ID, year=2026, month=5, fetch=fetch
+    )
+
+    assert gateway.delete_booking_event("evt_1") is True
+    availability_cache.get_month_intervals(
+        calendar_id=gateway.CALENDAR_ID, year=2026, month=5, fetch=fetch
+    )
+
+    assert fetch.calls == 2
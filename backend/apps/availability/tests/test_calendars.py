@@ -0,0 +1,256 @@
+import asyncio
+import json
+import threading
+from datetime import datetime
+
+import httpx
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.availability import async_gateway, calendars, holds, selectors
+from apps.availability.calendar_gateway import CALENDAR_ID, TZ
+from apps.availability.models import Booking, CalendarEvent, CalendarSyncState
+from apps.availability.services import SlotUnavailableError
+from apps.services.models import Service
+
+pytestmark = pytest.mark.django_db
+
+ROOM = "room@group.calendar.google.com"
+THERAPIST = "therapist@group.calendar.google.com"
+
+
+def _ts(*args):
+    return int(datetime(*args, tzinfo=TZ).timestamp())
+
+
+@pytest.fixture()
+def services():
+    return [
+        Service.objects.create(title_en=name, title_fr=name) for name in ("Massage", "Facial")
+    ]
+
+
+@pytest.fixture()
+def studio(settings, services):
+    massage, _ = services
+    settings.AVAILABILITY_CALENDARS = {ROOM: [massage.pk], THERAPIST: None}
+    settings.AVAILABILITY_SHARED_CALENDARS = [ROOM]
+    return services
+
+
+def test_calendars_for_service(studio):
+    massage, facial = studio
+
+    assert calendars.calendars_for(massage.pk) == [CALENDAR_ID, ROOM, THERAPIST]
+    assert calendars.calendars_for(facial.pk) == [CALENDAR_ID, THERAPIST]
+    # No service chosen: a room only massages need blocks nothing.
+    assert calendars.calendars_for() == [CALENDAR_ID, THERAPIST]
+    assert calendars.practitioners(calendars.calendars_for(massage.pk)) == [
+        CALENDAR_ID,
+        THERAPIST,
+    ]
+
+
+def test_no_service_counts_every_practitioner(settings, services):
+    _, facial = services
+    settings.AVAILABILITY_CALENDARS = {THERAPIST: [facial.pk]}
+
+    assert calendars.calendars_for() == [CALENDAR_ID, THERAPIST]
+
+
+def test_default_is_the_studio_calendar(settings):
+    settings.AVAILABILITY_CALENDARS = {}
+
+    assert calendars.calendars_for(1) == [CALENDAR_ID]
+
+
+BUSY = {
+    CALENDAR_ID: [(_ts(2030, 3, 4, 9), _ts(2030, 3, 4, 10))],
+    ROOM: [(_ts(2030, 3, 4, 9, 30), _ts(2030, 3, 4, 12))],
+    THERAPIST: [(_ts(2030, 3, 4, 15), _ts(2030, 3, 4, 16))],
+}
+
+
+def test_calendars_are_fetched_in_parallel_and_merged(monkeypatch, studio):
+    # Each fetch waits for the other two: a sequential loop would time out.
+    barrier = threading.Barrier(3, timeout=5)
+
+    def _fetch(time_min, time_max, calendar_id=CALENDAR_ID):
+        barrier.wait()
+        return BUSY[calendar_id]
+
+    monkeypatch.setattr(selectors.calendar_gateway, "list_busy_intervals", _fetch)
+    massage, _ = studio
+
+    availability = selectors.get_month_busy_intervals(
+        year=2030, month=3, calendar_ids=calendars.calendars_for(massage.pk)
+    )
+
+    # The shared room is busy for both practitioners.
+    assert availability == {
+        CALENDAR_ID: [(_ts(2030, 3, 4, 9), _ts(2030, 3, 4, 12))],
+        THERAPIST: [
+            (_ts(2030, 3, 4, 9, 30), _ts(2030, 3, 4, 12)),
+            (_ts(2030, 3, 4, 15), _ts(2030, 3, 4, 16)),
+        ],
+    }
+
+
+def test_one_unknown_calendar_fails_closed(monkeypatch, studio):
+    def _fetch(time_min, time_max, calendar_id=CALENDAR_ID):
+        return None if calendar_id == ROOM else BUSY[calendar_id]
+
+    monkeypatch.setattr(selectors.calendar_gateway, "list_busy_intervals", _fetch)
+
+    assert (
+        selectors.get_month_busy_intervals(
+            year=2030, month=3, calendar_ids=[CALENDAR_ID, ROOM, THERAPIST]
+        )
+        is None
+    )
+    assert selectors.get_month_busy_intervals(
+        year=2030, month=3, calendar_ids=[CALENDAR_ID, THERAPIST]
+    ) == {CALENDAR_ID: BUSY[CALENDAR_ID], THERAPIST: BUSY[THERAPIST]}
+
+
+def test_a_second_practitioner_keeps_slots_open(monkeypatch, studio):
+    def _fetch(time_min, time_max, calendar_id=CALENDAR_ID):
+        return BUSY[calendar_id]
+
+    monkeypatch.setattr(selectors.calendar_gateway, "list_busy_intervals", _fetch)
+
+    times = selectors.get_free_slots(date_iso="2030-03-04")
+
+    # The studio calendar is busy 9-10 and the therapist 15-16: every
+    # hour has someone free. Without a service the room does not count.
+    assert times[0] == "09:00"
+    assert "15:00" in times
+
+
+def test_busy_days_without_a_service_skip_service_rooms(monkeypatch, studio):
+    room_day = [(_ts(2030, 3, 6), _ts(2030, 3, 7))]
+
+    def _fetch(time_min, time_max, calendar_id=CALENDAR_ID):
+        return room_day if calendar_id == ROOM else BUSY[calendar_id]
+
+    monkeypatch.setattr(selectors.calendar_gateway, "list_busy_intervals", _fetch)
+
+    # Both practitioners have time booked on the 4th; only the room,
+    # which massages alone need, is taken on the 6th.
+    assert selectors.get_busy_days(year=2030, month=3) == ["2030-03-04"]
+
+
+def test_bookings_and_holds_block_only_their_practitioner(monkeypatch, studio):
+    monkeypatch.setattr(selectors.calendar_gateway, "list_busy_intervals", lambda *a: [])
+    _, facial = studio
+    start, end = datetime(2030, 3, 4, 10, tzinfo=TZ), datetime(2030, 3, 4, 11, tzinfo=TZ)
+    Booking.objects.create(
+        service=facial,
+        customer_name="A",
+        customer_email="a@example.com",
+        start_datetime=start,
+        end_datetime=end,
+        calendar_id=CALENDAR_ID,
+        stripe_checkout_session_id="cs_1",
+    )
+
+    assert "10:00" in selectors.get_free_slots(date_iso="2030-03-04")
+    assert holds.place_hold(start, end).calendar_id == THERAPIST
+    assert "10:00" not in selectors.get_free_slots(date_iso="2030-03-04")
+    with pytest.raises(SlotUnavailableError):
+        holds.place_hold(start, end)
+
+
+def test_unassigned_booking_blocks_every_practitioner(monkeypatch, studio):
+    monkeypatch.setattr(selectors.calendar_gateway, "list_busy_intervals", lambda *a: [])
+    _, facial = studio
+    Booking.objects.create(
+        service=facial,
+        customer_name="A",
+        customer_email="a@example.com",
+        start_datetime=datetime(2030, 3, 4, 10, tzinfo=TZ),
+        end_datetime=datetime(2030, 3, 4, 11, tzinfo=TZ),
+        stripe_checkout_session_id="cs_1",
+    )
+
+    assert "10:00" not in selectors.get_free_slots(date_iso="2030-03-04")
+    assert selectors.get_busy_days(year=2030, month=3) == ["2030-03-04"]
+
+
+def test_mirrored_calendar_is_read_locally(monkeypatch, studio):
+    fetched = []
+
+    def _fetch(time_min, time_max, calendar_id=CALENDAR_ID):
+        fetched.append(calendar_id)
+        return []
+
+    monkeypatch.setattr(selectors.calendar_gateway, "list_busy_intervals", _fetch)
+    CalendarSyncState.objects.create(calendar_id=ROOM, synced_at=timezone.now())
+    CalendarEvent.objects.create(
+        calendar_id=ROOM,
+        google_event_id="evt",
+        start_datetime=datetime(2030, 3, 4, 9, tzinfo=TZ),
+        end_datetime=datetime(2030, 3, 4, 10, tzinfo=TZ),
+    )
+
+    massage, _ = studio
+
+    availability = selectors.get_month_busy_intervals(
+        year=2030, month=3, calendar_ids=calendars.calendars_for(massage.pk)
+    )
+
+    room_busy = [(_ts(2030, 3, 4, 9), _ts(2030, 3, 4, 10))]
+    assert availability == {CALENDAR_ID: room_busy, THERAPIST: room_busy}
+    assert sorted(fetched) == [CALENDAR_ID, THERAPIST]
+
+
+@pytest.fixture()
+def freebusy(monkeypatch):
+    """Async Google stub; each freeBusy waits until all three are in flight."""
+    fetched = []
+    barrier = asyncio.Barrier(3)
+
+    async def handler(request):
+        if request.method == "GET":  # the all-day events pass
+            return httpx.Response(200, json={"items": []})
+        calendar_id = json.loads(request.content)["items"][0]["id"]
+        fetched.append(calendar_id)
+        async with asyncio.timeout(5):
+            await barrier.wait()
+        busy = [
+            {
+                "start": datetime.fromtimestamp(s, TZ).isoformat(),
+                "end": datetime.fromtimestamp(e, TZ).isoformat(),
+            }
+            for s, e in BUSY[calendar_id]
+        ]
+        return httpx.Response(200, json={"calendars": {calendar_id: {"busy": busy}}})
+
+    async def _token():
+        return "tok"
+
+    client = async_gateway.AsyncCalendarClient(
+        token=_token, transport=httpx.MockTransport(handler)
+    )
+    monkeypatch.setattr(async_gateway, "_client", client)
+    return fetched
+
+
+def test_slots_view_checks_only_the_services_calendars(client, studio, freebusy):
+    massage, facial = studio
+    url = reverse("availability_slots")
+
+    massage_times = client.get(url, {"date": "2030-03-04", "service": massage.pk}).json()
+    # Served from the month cache the first request filled.
+    facial_times = client.get(url, {"date": "2030-03-04", "service": facial.pk}).json()
+
+    assert sorted(freebusy) == [CALENDAR_ID, ROOM, THERAPIST]
+    # The room is taken 9:30-12 whoever gives the massage.
+    assert "10:00" not in massage_times["times"]
+    assert "12:00" in massage_times["times"]
+    # A facial needs no room: the therapist is free at 9, the studio
+    # calendar at 10 and 15.
+    assert "09:00" in facial_times["times"]
+    assert "10:00" in facial_times["times"]
+    assert "15:00" in facial_times["times"]
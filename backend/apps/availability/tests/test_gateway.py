@@ -1,7 +1,10 @@
-from datetime import datetime
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
 from unittest.mock import MagicMock, patch
 from zoneinfo import ZoneInfo
 
+from google.auth.exceptions import RefreshError, TransportError
 from googleapiclient.errors import HttpError
 
 from apps.availability import calendar_gateway as gateway
@@ -9,14 +12,6 @@ from apps.availability import calendar_gateway as gateway
 TZ = ZoneInfo("Europe/Paris")
 
 
-class _EventsListStub:
-    def __init__(self, items):
-        self._items = items
-
-    def execute(self):
-        return {"items": self._items}
-
-
 class _EventsInsertStub:
     def __init__(self, created):
         self._created = created
@@ -30,12 +25,22 @@ class _EventsDeleteStub:
         return None
 
 
+class _EventsListStub:
+    def __init__(self, items):
+        self._items = items
+
+    def execute(self):
+        return {"items": self._items}
+
+
 class _EventsStub:
-    def __init__(self, items=None, created=None):
-        self._items = items or []
+    def __init__(self, created=None, items=None):
         self._created = created or {"id": "evt_123", "status": "confirmed", "htmlLink": "https://example.com"}
+        self._items = items or []
+        self.list_params = []
 
-    def list(self, **kwargs):
+    def list(self, **params):
+        self.list_params.append(params)
         return _EventsListStub(self._items)
 
     def insert(self, **kwargs):
@@ -45,13 +50,47 @@ class _EventsStub:
         return _EventsDeleteStub()
 
 
+class _FreeBusyQueryStub:
+    def __init__(self, busy, body):
+        self._busy = busy
+        self._body = body
+
+    def execute(self):
+        calendar_id = self._body["items"][0]["id"]
+        return {"calendars": {calendar_id: {"busy": self._busy}}}
+
+
+class _FreeBusyStub:
+    def __init__(self, busy):
+        self._busy = busy
+        self.bodies = []
+
+    def query(self, body):
+        self.bodies.append(body)
+        return _FreeBusyQueryStub(self._busy, body)
+
+
 class _ServiceStub:
-    def __init__(self, items=None, created=None):
-        self._events = _EventsStub(items=items, created=created)
+    def __init__(self, busy=None, created=None, items=None):
+        self._events = _EventsStub(created=created, items=items)
+        self._freebusy = _FreeBusyStub(busy or [])
 
     def events(self):
         return self._events
 
+    def freebusy(self):
+        return self._freebusy
+
+
+def _failing_freebusy_service():
+    freebusy_stub = MagicMock()
+    freebusy_stub.query.return_value.execute.side_effect = HttpError(
+        resp=MagicMock(status=500), content=b"server error"
+    )
+    service_stub = MagicMock()
+    service_stub.freebusy.return_value = freebusy_stub
+    return service_stub
+
 
 def test_list_busy_days_returns_empty_if_no_credentials(monkeypatch):
     monkeypatch.setattr(gateway, "_get_service", lambda: None)
@@ -59,22 +98,20 @@ def test_list_busy_days_returns_empty_if_no_credentials(monkeypatch):
 
 
 def test_list_busy_days_collects_all_day_and_timed_events(monkeypatch):
-    items = [
-        {"start": {"date": "2026-02-10"}, "end": {"date": "2026-02-11"}},
-        {"start": {"dateTime": "2026-02-12T10:00:00+01:00"}, "end": {"dateTime": "2026-02-12T11:00:00+01:00"}},
-        {"start": {"dateTime": "2026-02-12T15:00:00+01:00"}, "end": {"dateTime": "2026-02-12T16:00:00+01:00"}},
+    busy = [
+        {"start": "2026-02-09T23:00:00Z", "end": "2026-02-10T23:00:00Z"},  # all-day
+        {"start": "2026-02-12T09:00:00Z", "end": "2026-02-12T10:00:00Z"},
+        {"start": "2026-02-12T14:00:00Z", "end": "2026-02-12T15:00:00Z"},
     ]
-    monkeypatch.setattr(gateway, "_get_service", lambda: _ServiceStub(items=items))
+    monkeypatch.setattr(gateway, "_get_service", lambda: _ServiceStub(busy=busy))
 
     assert gateway.list_busy_days(2026, 2) == ["2026-02-10", "2026-02-12"]
 
 
 def test_list_free_slots_excludes_occupied_ranges(monkeypatch):
-    # One event from 10:00 to 11:00 blocks those slots.
-    items = [
-        {"start": {"dateTime": "2026-02-12T10:00:00+01:00"}, "end": {"dateTime": "2026-02-12T11:00:00+01:00"}},
-    ]
-    monkeypatch.setattr(gateway, "_get_service", lambda: _ServiceStub(items=items))
+    # One event from 10:00 to 11:00 (Paris) blocks those slots.
+    busy = [{"start": "2026-02-12T09:00:00Z", "end": "2026-02-12T10:00:00Z"}]
+    monkeypatch.setattr(gateway, "_get_service", lambda: _ServiceStub(busy=busy))
 
     slots = gateway.list_free_slots("2026-02-12", slot_minutes=30, work_hours=(9, 12))
 
@@ -124,26 +161,12 @@ def test_delete_booking_event_returns_true_on_success(monkeypatch):
 
 
 def test_list_busy_days_returns_empty_on_http_error(monkeypatch):
-    events_stub = MagicMock()
-    events_stub.list.return_value.execute.side_effect = HttpError(
-        resp=MagicMock(status=500), content=b"server error"
-    )
-    service_stub = MagicMock()
-    service_stub.events.return_value = events_stub
-
-    monkeypatch.setattr(gateway, "_get_service", lambda: service_stub)
+    monkeypatch.setattr(gateway, "_get_service", _failing_freebusy_service)
     assert gateway.list_busy_days(2026, 3) == []
 
 
 def test_list_free_slots_returns_empty_on_http_error(monkeypatch):
-    events_stub = MagicMock()
-    events_stub.list.return_value.execute.side_effect = HttpError(
-        resp=MagicMock(status=500), content=b"server error"
-    )
-    service_stub = MagicMock()
-    service_stub.events.return_value = events_stub
-
-    monkeypatch.setattr(gateway, "_get_service", lambda: service_stub)
+    monkeypatch.setattr(gateway, "_get_service", _failing_freebusy_service)
     assert gateway.list_free_slots("2026-03-01") == []
 
 
@@ -188,37 +211,25 @@ def test_delete_booking_event_returns_false_on_http_error(monkeypatch):
 
 
 def test_list_busy_days_december_boundary(monkeypatch):
+    service = _ServiceStub()
     monkeypatch.setattr(
-        gateway, "_get_service", lambda: _ServiceStub(items=[])
+        gateway, "_get_service", lambda: service
     )
     result = gateway.list_busy_days(2026, 12)
     assert result == []
+    assert service.freebusy().bodies[0]["timeMax"] == "2027-01-01T00:00:00+01:00"
 
 
-# ── _get_credentials branches ───────────────────────────────────────
-
-
-def test_get_credentials_returns_none_when_no_env(monkeypatch):
-    monkeypatch.setattr(
-        gateway, "config", lambda key, default=None: default
-    )
-    assert gateway._get_credentials() is None
+# ── _credentials_from_b64 branches ──────────────────────────────────
 
 
-def test_get_credentials_returns_none_on_bad_json(monkeypatch):
+def test_credentials_from_b64_returns_none_on_bad_json():
     import base64
     bad_b64 = base64.b64encode(b"not-valid-json").decode("utf-8")
-    monkeypatch.setattr(
-        gateway,
-        "config",
-        lambda key, default=None: bad_b64
-        if key == "GOOGLE_SERVICE_ACCOUNT_BASE64"
-        else default,
-    )
-    assert gateway._get_credentials() is None
+    assert gateway._credentials_from_b64(bad_b64) is None
 
 
-def test_get_credentials_returns_service_account_credentials(monkeypatch):
+def test_credentials_from_b64_returns_service_account_credentials():
     import base64
     import json
 
@@ -239,33 +250,352 @@ def test_get_credentials_returns_service_account_credentials(monkeypatch):
         json.dumps(service_account_info).encode("utf-8")
     ).decode("utf-8")
 
-    monkeypatch.setattr(
-        gateway,
-        "config",
-        lambda key, default=None: encoded
-        if key == "GOOGLE_SERVICE_ACCOUNT_BASE64"
-        else default,
-    )
-
     with patch(
         "apps.availability.calendar_gateway.Credentials.from_service_account_info"
     ) as mock_from_info:
         mock_creds = MagicMock()
         mock_from_info.return_value = mock_creds
 
-        creds = gateway._get_credentials()
+        creds = gateway._credentials_from_b64(encoded)
 
         mock_from_info.assert_called_once()
         assert creds is mock_creds
 
 
-def test_get_credentials_returns_none_on_invalid_service_account_base64(monkeypatch):
-    monkeypatch.setattr(
-        gateway,
-        "config",
-        lambda key, default=None: "%%%not-base64%%%"
-        if key == "GOOGLE_SERVICE_ACCOUNT_BASE64"
-        else default,
+def test_credentials_from_b64_returns_none_on_invalid_base64():
+    assert gateway._credentials_from_b64("%%%not-base64%%%") is None
+
+
+# ── CalendarClient (process-wide service holder) ───────────────────
+
+
+class _FakeCredentials:
+    """Stand-in for service-account credentials with a controllable expiry."""
+
+    def __init__(self, lifetime=timedelta(hours=1)):
+        self.token = None
+        self.expiry = None
+        self.lifetime = lifetime
+        self.refreshes = 0
+
+    def refresh(self, request):
+        self.refreshes += 1
+        self.token = f"token-{self.refreshes}"
+        self.expiry = datetime.now(UTC).replace(tzinfo=None) + self.lifetime
+
+
+def _client(monkeypatch, *, secret="c2VjcmV0", lifetime=timedelta(hours=1)):
+    built = []
+    creds_made = []
+
+    def fake_from_b64(sa_b64):
+        creds = _FakeCredentials(lifetime=lifetime)
+        creds_made.append((sa_b64, creds))
+        return creds
+
+    def fake_build(creds):
+        built.append(creds)
+        return _ServiceStub()
+
+    env = {"GOOGLE_SERVICE_ACCOUNT_BASE64": secret}
+    monkeypatch.setattr(gateway, "config", lambda key, default=None: env.get(key, default))
+    monkeypatch.setattr(gateway, "_credentials_from_b64", fake_from_b64)
+    client = gateway.CalendarClient(build_service=fake_build, token_request=lambda: "transport")
+    return client, env, built, creds_made
+
+
+def test_calendar_client_builds_once_and_reuses_token(monkeypatch):
+    client, _, built, creds_made = _client(monkeypatch)
+
+    first = client.get_service()
+    second = client.get_service()
+
+    assert first is second
+    assert len(built) == 1
+    assert len(creds_made) == 1
+    assert creds_made[0][1].refreshes == 1
+
+
+def test_calendar_client_refreshes_token_near_expiry(monkeypatch):
+    client, _, built, creds_made = _client(monkeypatch, lifetime=timedelta(minutes=2))
+
+    client.get_service()
+    client.get_service()
+
+    # Token lives less than the refresh margin, so every call refreshes —
+    # but the service itself is never rebuilt.
+    assert creds_made[0][1].refreshes == 2
+    assert len(built) == 1
+
+
+def test_calendar_client_rebuilds_when_credentials_rotate(monkeypatch):
+    client, env, built, creds_made = _client(monkeypatch)
+
+    first = client.get_service()
+    env["GOOGLE_SERVICE_ACCOUNT_BASE64"] = "cm90YXRlZA=="
+    second = client.get_service()
+
+    assert first is not second
+    assert [sa for sa, _ in creds_made] == ["c2VjcmV0", "cm90YXRlZA=="]
+    assert len(built) == 2
+
+
+def test_calendar_client_returns_none_on_refresh_error(monkeypatch):
+    client, _, built, _ = _client(monkeypatch)
+
+    def failing_refresh(self, request):
+        raise RefreshError("invalid_grant")
+
+    monkeypatch.setattr(_FakeCredentials, "refresh", failing_refresh)
+
+    assert client.get_service() is None
+    assert built == []
+
+
+def test_calendar_client_returns_none_without_secret(monkeypatch):
+    client, env, built, _ = _client(monkeypatch)
+    env.pop("GOOGLE_SERVICE_ACCOUNT_BASE64")
+
+    assert client.get_service() is None
+    assert built == []
+
+
+def test_calendar_client_refreshes_once_under_concurrency(monkeypatch):
+    client, _, built, creds_made = _client(monkeypatch)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        services = list(pool.map(lambda _: client.get_service(), range(32)))
+
+    assert all(s is not None for s in services)
+    assert len(creds_made) == 1
+    assert creds_made[0][1].refreshes == 1
+    # One service per worker thread, never more.
+    assert len(built) <= 8
+
+
+def test_calendar_client_starts_its_fetch_pool_on_first_use():
+    client = gateway.CalendarClient()
+    assert client._pool is None
+
+    assert client.map(lambda n: n * 2, [1, 2, 3]) == [2, 4, 6]
+    pool = client._pool
+    assert client.map(str, [1]) == ["1"]
+    assert client._pool is pool
+
+    client.close()
+    assert client._pool is None
+    assert client.map(str, [2]) == ["2"]
+    assert client._pool is not pool
+    client.close()
+
+
+# ── list_busy_intervals ─────────────────────────────────────────────
+
+
+def test_list_busy_intervals_returns_sorted_epoch_pairs(monkeypatch):
+    busy = [
+        {"start": "2026-02-12T09:00:00Z", "end": "2026-02-12T10:00:00Z"},
+        {"start": "2026-02-09T23:00:00Z", "end": "2026-02-10T23:00:00Z"},
+    ]
+    monkeypatch.setattr(gateway, "_get_service", lambda: _ServiceStub(busy=busy))
+
+    intervals = gateway.list_busy_intervals(
+        datetime(2026, 2, 1, tzinfo=TZ), datetime(2026, 3, 1, tzinfo=TZ)
+    )
+
+    assert intervals == [
+        (int(datetime(2026, 2, 10, tzinfo=TZ).timestamp()), int(datetime(2026, 2, 11, tzinfo=TZ).timestamp())),
+        (int(datetime(2026, 2, 12, 10, tzinfo=TZ).timestamp()), int(datetime(2026, 2, 12, 11, tzinfo=TZ).timestamp())),
+    ]
+
+
+def test_list_busy_intervals_queries_one_window(monkeypatch):
+    service = _ServiceStub()
+    monkeypatch.setattr(gateway, "_get_service", lambda: service)
+
+    gateway.list_busy_intervals(
+        datetime(2026, 2, 1, tzinfo=TZ), datetime(2026, 3, 15, tzinfo=TZ)
+    )
+
+    bodies = service.freebusy().bodies
+    assert len(bodies) == 1
+    assert bodies[0]["items"] == [{"id": gateway.CALENDAR_ID}]
+    assert bodies[0]["timeMin"] == "2026-02-01T00:00:00+01:00"
+    assert bodies[0]["timeMax"] == "2026-03-15T00:00:00+01:00"
+
+
+def test_list_busy_intervals_splits_long_ranges(monkeypatch):
+    service = _ServiceStub()
+    monkeypatch.setattr(gateway, "_get_service", lambda: service)
+
+    gateway.list_busy_intervals(
+        datetime(2026, 1, 1, tzinfo=TZ), datetime(2026, 7, 1, tzinfo=TZ)
+    )
+
+    bodies = service.freebusy().bodies
+    assert len(bodies) == 4
+    assert bodies[0]["timeMin"] == "2026-01-01T00:00:00+01:00"
+    assert bodies[-1]["timeMax"] == "2026-07-01T00:00:00+02:00"
+    assert all(a["timeMax"] == b["timeMin"] for a, b in itertools.pairwise(bodies))
+
+
+def test_all_day_events_block_their_days_even_when_marked_free(monkeypatch):
+    """Google makes all-day events "show as free"; freeBusy omits them."""
+    items = [
+        {"start": {"date": "2026-02-16"}, "end": {"date": "2026-02-18"}, "transparency": "transparent"},
+        {"start": {"date": "2026-01-31"}, "end": {"date": "2026-02-02"}},
+        {"start": {"dateTime": "2026-02-20T10:00:00+01:00"}, "end": {"dateTime": "2026-02-20T11:00:00+01:00"}},
+    ]
+    service = _ServiceStub(items=items)
+    monkeypatch.setattr(gateway, "_get_service", lambda: service)
+    window = (datetime(2026, 2, 1, tzinfo=TZ), datetime(2026, 3, 1, tzinfo=TZ))
+
+    intervals = gateway.list_busy_intervals(*window)
+
+    # Timed events come from freeBusy alone; the stub's is empty.
+    assert intervals == [
+        (int(window[0].timestamp()), int(datetime(2026, 2, 2, tzinfo=TZ).timestamp())),
+        (int(datetime(2026, 2, 16, tzinfo=TZ).timestamp()), int(datetime(2026, 2, 18, tzinfo=TZ).timestamp())),
+    ]
+    (params,) = service.events().list_params
+    assert params["timeMin"] == "2026-02-01T00:00:00+01:00"
+    assert params["timeMax"] == "2026-03-01T00:00:00+01:00"
+    assert params["singleEvents"] is True
+
+
+def test_list_busy_days_includes_free_all_day_events(fake_google):
+    fake_google.put_event("off", "2026-02-10", "2026-02-11", transparency="transparent")
+    fake_google.put_event(
+        "lunch", "2026-02-12T12:00:00+01:00", "2026-02-12T13:00:00+01:00", transparency="transparent"
     )
+    fake_google.put_event("client", "2026-02-13T10:00:00+01:00", "2026-02-13T11:00:00+01:00")
+
+    # A timed "show as free" event stays free, as it does in Google.
+    assert gateway.list_busy_days(2026, 2) == ["2026-02-10", "2026-02-13"]
+
+
+def test_list_busy_intervals_returns_none_on_failure(monkeypatch):
+    monkeypatch.setattr(gateway, "_get_service", _failing_freebusy_service)
+
+    window = (datetime(2026, 2, 1, tzinfo=TZ), datetime(2026, 3, 1, tzinfo=TZ))
+    assert gateway.list_busy_intervals(*window) is None
+
+    monkeypatch.setattr(gateway, "_get_service", lambda: None)
+    assert gateway.list_busy_intervals(*window) is None
+
+
+def test_list_busy_intervals_returns_none_on_calendar_error(monkeypatch):
+    service_stub = MagicMock()
+    service_stub.freebusy.return_value.query.return_value.execute.return_value = {
+        "calendars": {gateway.CALENDAR_ID: {"errors": [{"reason": "notFound"}]}}
+    }
+    monkeypatch.setattr(gateway, "_get_service", lambda: service_stub)
+
+    assert gateway.list_busy_intervals(
+        datetime(2026, 2, 1, tzinfo=TZ), datetime(2026, 3, 1, tzinfo=TZ)
+    ) is None
+
+
+def test_list_event_changes_pages_and_returns_sync_token(monkeypatch):
+    events_stub = MagicMock()
+    events_stub.list.return_value.execute.side_effect = [
+        {"items": [{"id": "a"}], "nextPageToken": "p2"},
+        {"items": [{"id": "b"}], "nextSyncToken": "tok-2"},
+    ]
+    service_stub = MagicMock()
+    service_stub.events.return_value = events_stub
+    monkeypatch.setattr(gateway, "_get_service", lambda: service_stub)
+
+    events, token = gateway.list_event_changes(sync_token="tok-1")
+
+    assert [e["id"] for e in events] == ["a", "b"]
+    assert token == "tok-2"
+    first, second = (c.kwargs for c in events_stub.list.call_args_list)
+    assert first["syncToken"] == "tok-1"
+    assert "timeMin" not in first
+    assert second["pageToken"] == "p2"
+
+
+def test_list_event_changes_returns_none_on_http_error(monkeypatch):
+    events_stub = MagicMock()
+    events_stub.list.return_value.execute.side_effect = HttpError(
+        resp=MagicMock(status=500), content=b"server error"
+    )
+    service_stub = MagicMock()
+    service_stub.events.return_value = events_stub
+    monkeypatch.setattr(gateway, "_get_service", lambda: service_stub)
+
+    assert gateway.list_event_changes(time_min=datetime(2026, 2, 1, tzinfo=TZ)) is None
+
+
+def test_open_breaker_short_circuits_every_call(monkeypatch):
+    service_stub = MagicMock()
+    monkeypatch.setattr(gateway, "_get_service", lambda: service_stub)
+    monkeypatch.setattr(gateway._breaker, "allow", lambda: False)
+    window = (datetime(2026, 2, 1, tzinfo=TZ), datetime(2026, 3, 1, tzinfo=TZ))
+
+    assert gateway.list_busy_intervals(*window) is None
+    assert gateway.list_event_changes(sync_token="tok") is None
+    assert gateway.create_booking_event("T", *window, "a@b.c", "A") is None
+    assert gateway.delete_booking_event("evt") is False
+    assert service_stub.mock_calls == []
+
+
+def test_transport_failures_trip_the_breaker(monkeypatch):
+    freebusy_stub = MagicMock()
+    freebusy_stub.query.return_value.execute.side_effect = TimeoutError("timed out")
+    service_stub = MagicMock()
+    service_stub.freebusy.return_value = freebusy_stub
+    monkeypatch.setattr(gateway, "_get_service", lambda: service_stub)
+    window = (datetime(2026, 2, 1, tzinfo=TZ), datetime(2026, 3, 1, tzinfo=TZ))
+
+    for _ in range(5):
+        assert gateway.list_busy_intervals(*window) is None
+
+    assert gateway._breaker.state == "open"
+    assert gateway.list_busy_intervals(*window) is None
+    assert freebusy_stub.query.return_value.execute.call_count == 5
+
+
+def test_auth_transport_failures_fail_closed_and_trip_the_breaker(monkeypatch):
+    """A token refresh that cannot reach Google mid-call is an outage."""
+    freebusy_stub = MagicMock()
+    freebusy_stub.query.return_value.execute.side_effect = TransportError(
+        "token endpoint unreachable"
+    )
+    service_stub = MagicMock()
+    service_stub.freebusy.return_value = freebusy_stub
+    service_stub.events.return_value.list.return_value.execute.side_effect = (
+        TransportError("token endpoint unreachable")
+    )
+    monkeypatch.setattr(gateway, "_get_service", lambda: service_stub)
+    window = (datetime(2026, 2, 1, tzinfo=TZ), datetime(2026, 3, 1, tzinfo=TZ))
+
+    for _ in range(3):
+        assert gateway.list_busy_intervals(*window) is None
+        assert gateway.list_event_changes(sync_token="tok") is None
+
+    assert gateway._breaker.state == "open"
+
+
+def test_client_errors_do_not_trip_the_breaker(monkeypatch):
+    events_stub = MagicMock()
+    events_stub.delete.return_value.execute.side_effect = HttpError(
+        resp=MagicMock(status=404), content=b"not found"
+    )
+    service_stub = MagicMock()
+    service_stub.events.return_value = events_stub
+    monkeypatch.setattr(gateway, "_get_service", lambda: service_stub)
+
+    for _ in range(10):
+        assert gateway.delete_booking_event("gone") is False
+
+    assert gateway._breaker.state == "closed"
+
+
+def test_calls_carry_the_configured_socket_timeout(monkeypatch):
+    monkeypatch.setattr(gateway, "CALL_TIMEOUT", 2.5)
 
-    assert gateway._get_credentials() is None
+    assert gateway._token_request().http.timeout == 2.5
+    service = gateway._build_service(MagicMock())
+    assert service._http.http.timeout == 2.5
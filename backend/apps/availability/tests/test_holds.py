@@ -0,0 +1,202 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.availability import holds, selectors
+from apps.availability.calendar_gateway import CALENDAR_ID, TZ
+from apps.availability.models import Booking, SlotHold
+from apps.availability.services import SlotUnavailableError
+from apps.payments.models import PaymentStatus, StripePayment
+from apps.payments.webhooks import _expire_checkout_session, _fulfill_from_checkout_session
+from apps.services.models import Service
+
+pytestmark = pytest.mark.django_db
+
+
+def _dt(hour, minute=0):
+    return datetime(2030, 3, 1, hour, minute, tzinfo=TZ)
+
+
+@pytest.fixture(autouse=True)
+def _google(fake_google):
+    return fake_google
+
+
+@pytest.fixture()
+def service():
+    return Service.objects.create(title_en="Massage", title_fr="Massage", price=60)
+
+
+def test_overlapping_hold_is_refused():
+    holds.place_hold(_dt(18), _dt(19))
+
+    with pytest.raises(SlotUnavailableError):
+        holds.place_hold(_dt(18, 30), _dt(19, 30))
+    holds.place_hold(_dt(19), _dt(20))
+
+    assert SlotHold.objects.count() == 2
+
+
+def test_expired_hold_frees_the_slot():
+    stale = holds.place_hold(_dt(18), _dt(19))
+    SlotHold.objects.filter(pk=stale.pk).update(expires_at=timezone.now())
+
+    fresh = holds.place_hold(_dt(18), _dt(19))
+
+    assert list(SlotHold.objects.all()) == [fresh]
+
+
+def test_confirmed_booking_blocks_holds(service):
+    Booking.objects.create(
+        service=service,
+        start_datetime=_dt(18),
+        end_datetime=_dt(19),
+        stripe_checkout_session_id="cs_paid",
+    )
+
+    with pytest.raises(SlotUnavailableError):
+        holds.place_hold(_dt(18), _dt(19))
+
+
+def test_google_busy_time_blocks_holds(fake_google):
+    fake_google.put_event("dentist", _dt(18).isoformat(), _dt(19).isoformat())
+
+    with pytest.raises(SlotUnavailableError):
+        holds.place_hold(_dt(18, 30), _dt(19, 30))
+    holds.place_hold(_dt(19), _dt(20))
+
+
+def test_unknown_availability_blocks_holds(monkeypatch):
+    monkeypatch.setattr(selectors.calendar_gateway, "list_busy_intervals", lambda *a: None)
+
+    with pytest.raises(SlotUnavailableError):
+        holds.place_hold(_dt(18), _dt(19))
+
+
+def test_hold_outlives_the_shortest_stripe_session(settings):
+    settings.SLOT_HOLD_MINUTES = 20
+
+    assert holds.hold_ttl() - holds.HOLD_GRACE >= timedelta(minutes=30)
+
+
+def test_sweeper_deletes_only_expired_holds():
+    live = holds.place_hold(_dt(10), _dt(11))
+    stale = holds.place_hold(_dt(12), _dt(13))
+    SlotHold.objects.filter(pk=stale.pk).update(expires_at=timezone.now() - timedelta(seconds=1))
+
+    call_command("sweep_slot_holds")
+
+    assert list(SlotHold.objects.all()) == [live]
+
+
+def test_live_holds_show_as_busy(monkeypatch):
+    monkeypatch.setattr(selectors.calendar_gateway, "list_busy_intervals", lambda *a: [])
+    stale = holds.place_hold(_dt(9), _dt(10))
+    SlotHold.objects.filter(pk=stale.pk).update(expires_at=timezone.now())
+    holds.place_hold(_dt(18), _dt(19))
+
+    slots = selectors.get_free_slots(date_iso="2030-03-01")
+
+    assert "09:00" in slots
+    assert "17:30" in slots
+    assert "18:00" not in slots
+    assert "18:30" not in slots
+
+
+def _checkout(client, service, start, end):
+    return client.post(
+        reverse("payments_checkout"),
+        data=json.dumps(
+            {
+                "kind": "booking",
+                "sender_name": "A",
+                "sender_email": "a@example.com",
+                "preferred_language": "fr",
+                "amount": "60.00",
+                "service_id": service.id,
+                "start_datetime": start.isoformat(),
+                "end_datetime": end.isoformat(),
+            }
+        ),
+        content_type="application/json",
+    )
+
+
+@pytest.fixture()
+def fake_stripe(monkeypatch):
+    sessions = []
+
+    def create(**kwargs):
+        session = {"id": f"cs_{len(sessions)}", "url": "https://checkout.example", **kwargs}
+        sessions.append(session)
+        return session
+
+    monkeypatch.setattr("apps.payments.services.stripe_gateway.create_checkout_session", create)
+    return sessions
+
+
+def test_checkout_holds_the_slot_until_the_session_expires(client, service, fake_stripe):
+    first = _checkout(client, service, _dt(18), _dt(19))
+    second = _checkout(client, service, _dt(18, 30), _dt(19, 30))
+
+    assert first.status_code == 201
+    assert second.status_code == 400
+    assert second.json()["errors"][0]["code"] == "slot_unavailable"
+    hold = SlotHold.objects.get()
+    assert hold.stripe_checkout_session_id == "cs_0"
+    assert fake_stripe[0]["expires_at"] == int((hold.expires_at - holds.HOLD_GRACE).timestamp())
+    assert len(fake_stripe) == 1
+
+
+def test_failed_stripe_call_releases_the_hold(client, service, monkeypatch):
+    def boom(**kwargs):
+        raise RuntimeError("stripe down")
+
+    monkeypatch.setattr("apps.payments.services.stripe_gateway.create_checkout_session", boom)
+
+    with pytest.raises(RuntimeError):
+        _checkout(client, service, _dt(18), _dt(19))
+
+    assert not SlotHold.objects.exists()
+
+
+def test_failed_draft_releases_the_hold(client, service, fake_stripe, monkeypatch):
+    def boom(payload):
+        raise RuntimeError("draft failed")
+
+    monkeypatch.setattr("apps.payments.services.CheckoutDraft.from_payload", boom)
+
+    with pytest.raises(RuntimeError):
+        _checkout(client, service, _dt(18), _dt(19))
+
+    assert not SlotHold.objects.exists()
+    assert fake_stripe == []
+
+
+def test_fulfilment_turns_the_hold_into_a_booking(client, service, fake_stripe, monkeypatch):
+    monkeypatch.setattr(
+        "apps.availability.services.calendar_gateway.create_booking_event", lambda **kw: None
+    )
+    _checkout(client, service, _dt(18), _dt(19))
+
+    _fulfill_from_checkout_session(
+        {"id": "cs_0", "metadata": fake_stripe[0]["metadata"], "payment_intent": "pi_1"}
+    )
+
+    assert not SlotHold.objects.exists()
+    booking = Booking.objects.get()
+    assert booking.stripe_checkout_session_id == "cs_0"
+    assert booking.calendar_id == CALENDAR_ID
+
+
+def test_expired_session_releases_the_hold(client, service, fake_stripe):
+    _checkout(client, service, _dt(18), _dt(19))
+
+    _expire_checkout_session({"id": "cs_0"})
+
+    assert not SlotHold.objects.exists()
+    assert StripePayment.objects.get().status == PaymentStatus.CANCELED
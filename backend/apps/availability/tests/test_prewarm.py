@@ -0,0 +1,122 @@
+from datetime import date
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.availability import async_gateway, prewarm
+from apps.availability import cache as availability_cache
+from apps.availability.calendar_gateway import CALENDAR_ID
+from apps.availability.models import CalendarSyncState
+
+pytestmark = pytest.mark.django_db
+
+ROOM = "room@group.calendar.google.com"
+
+
+@pytest.fixture()
+def fetches(monkeypatch):
+    """Record upstream fetches; `fail_on` makes one calendar/month fail."""
+    state = {"calls": [], "fail_on": None, "sleeps": []}
+
+    def _fetch(time_min, time_max, calendar_id=CALENDAR_ID):
+        key = (calendar_id, time_min.year, time_min.month)
+        state["calls"].append(key)
+        return None if key == state["fail_on"] else []
+
+    monkeypatch.setattr(prewarm.calendar_gateway, "list_busy_intervals", _fetch)
+    monkeypatch.setattr(prewarm.time, "sleep", state["sleeps"].append)
+    monkeypatch.setattr(prewarm.timezone, "localdate", lambda: date(2030, 3, 20))
+    return state
+
+
+def test_months_ahead_spans_the_window():
+    assert prewarm.months_ahead(6, today=date(2030, 12, 10)) == [(2030, 12), (2031, 1)]
+
+
+def test_prewarm_fetches_each_month_once(fetches):
+    assert prewarm.prewarm(weeks=4) == {"fetched": 2, "fresh": 0, "mirrored": 0, "failed": 0}
+    assert fetches["calls"] == [(CALENDAR_ID, 2030, 3), (CALENDAR_ID, 2030, 4)]
+
+    assert prewarm.prewarm(weeks=4)["fresh"] == 2
+    assert len(fetches["calls"]) == 2
+    assert all(age is not None for age in prewarm.freshness(4).values())
+
+
+def test_aging_months_are_refetched(fetches):
+    prewarm.prewarm(weeks=4)
+
+    prewarm.prewarm(weeks=4, refresh_after=0)
+
+    assert len(fetches["calls"]) == 4
+
+
+def test_calls_are_spaced_out(fetches):
+    prewarm.prewarm(weeks=4, min_interval=10)
+
+    assert len(fetches["sleeps"]) == 1
+    assert 9 < fetches["sleeps"][0] <= 10
+
+
+def test_round_stops_at_the_first_failure(fetches, settings):
+    settings.AVAILABILITY_CALENDARS = {ROOM: None}
+    fetches["fail_on"] = (CALENDAR_ID, 2030, 4)
+
+    counts = prewarm.prewarm(weeks=4)
+
+    assert counts == {"fetched": 1, "fresh": 0, "mirrored": 0, "failed": 1}
+    assert (ROOM, 2030, 3) not in fetches["calls"]
+
+
+def test_mirrored_calendars_are_skipped(fetches, settings):
+    settings.AVAILABILITY_CALENDARS = {ROOM: None}
+    CalendarSyncState.objects.create(calendar_id=CALENDAR_ID, synced_at=timezone.now())
+
+    counts = prewarm.prewarm(weeks=4)
+
+    assert counts["mirrored"] == 2
+    assert {calendar for calendar, _, _ in fetches["calls"]} == {ROOM}
+
+
+def test_warm_cache_serves_the_widget_without_google(client, fetches, monkeypatch):
+    async def _no_google(*args):
+        pytest.fail("must not call Google")
+
+    prewarm.prewarm(weeks=4)
+    monkeypatch.setattr(async_gateway, "list_busy_intervals", _no_google)
+
+    res = client.get(reverse("availability_slots"), {"date": "2030-04-02"})
+
+    assert res.json()["times"][0] == "09:00"
+
+
+def test_prewarm_does_not_overwrite_a_concurrent_invalidation(fetches, monkeypatch):
+    def _fetch_then_invalidate(time_min, time_max, calendar_id=CALENDAR_ID):
+        availability_cache.invalidate_month(calendar_id, time_min.year, time_min.month)
+        return [(1, 2)]
+
+    prewarm.prewarm(weeks=1)
+    monkeypatch.setattr(
+        prewarm.calendar_gateway, "list_busy_intervals", _fetch_then_invalidate
+    )
+
+    prewarm.prewarm(weeks=1, refresh_after=0)
+
+    assert availability_cache.month_age(CALENDAR_ID, 2030, 3) is None
+
+
+def test_command_reports_freshness(fetches, capsys):
+    call_command("prewarm_availability", "--weeks", "1")
+
+    out = capsys.readouterr().out
+    assert "1 fetched, 0 fresh, 0 mirrored, 0 failed" in out
+    assert f"{CALENDAR_ID} 2030-03: 0s old" in out
+
+
+def test_command_fails_when_google_is_down(fetches):
+    fetches["fail_on"] = (CALENDAR_ID, 2030, 3)
+
+    with pytest.raises(CommandError):
+        call_command("prewarm_availability", "--weeks", "1")
@@ -1,20 +1,213 @@
+from datetime import datetime
+
+import pytest
+from django.utils import timezone
+
+from apps.availability import cache as availability_cache
 from apps.availability import selectors
+from apps.availability.calendar_gateway import CALENDAR_ID, TZ
+from apps.availability.models import (
+    Booking,
+    BookingStatus,
+    CalendarEvent,
+    CalendarSyncState,
+)
+from apps.services.models import Service
+from apps.vouchers.models import GiftVoucher
+
+pytestmark = pytest.mark.django_db
+
+
+def _ts(*args):
+    return int(datetime(*args, tzinfo=TZ).timestamp())
+
+
+def _fake_fetch(monkeypatch, intervals):
+    calls = []
+
+    def _fake(time_min, time_max, calendar_id=CALENDAR_ID):
+        calls.append((time_min, time_max))
+        return intervals
+
+    monkeypatch.setattr(selectors.calendar_gateway, "list_busy_intervals", _fake)
+    return calls
+
+
+def test_get_busy_days_derives_from_intervals(monkeypatch):
+    calls = _fake_fetch(
+        monkeypatch,
+        [
+            (_ts(2026, 2, 10), _ts(2026, 2, 11)),  # all-day
+            (_ts(2026, 2, 12, 10), _ts(2026, 2, 12, 11)),
+            (_ts(2026, 2, 12, 15), _ts(2026, 2, 12, 16)),
+        ],
+    )
+
+    assert selectors.get_busy_days(year=2026, month=2) == ["2026-02-10", "2026-02-12"]
+    assert calls == [(datetime(2026, 2, 1, tzinfo=TZ), datetime(2026, 3, 1, tzinfo=TZ))]
+
+
+def test_get_busy_days_clips_multi_day_interval_to_month(monkeypatch):
+    _fake_fetch(monkeypatch, [(_ts(2026, 1, 30, 12), _ts(2026, 2, 2, 9))])
+
+    assert selectors.get_busy_days(year=2026, month=2) == ["2026-02-01", "2026-02-02"]
+
+
+def test_get_free_slots_excludes_occupied_ranges(monkeypatch):
+    _fake_fetch(monkeypatch, [(_ts(2026, 2, 12, 10), _ts(2026, 2, 12, 11))])
+
+    slots = selectors.get_free_slots(date_iso="2026-02-12")
+
+    assert "09:30" in slots
+    assert "10:00" not in slots
+    assert "10:30" not in slots
+    assert "11:00" in slots
+    assert slots[0] == "09:00"
+    assert slots[-1] == "18:30"
+
+
+def test_get_free_slots_all_day_event_blocks_day(monkeypatch):
+    _fake_fetch(monkeypatch, [(_ts(2026, 2, 12), _ts(2026, 2, 13))])
+
+    assert selectors.get_free_slots(date_iso="2026-02-12") == []
+
+
+def test_month_view_costs_one_upstream_fetch(monkeypatch):
+    calls = _fake_fetch(monkeypatch, [(_ts(2026, 2, 12, 10), _ts(2026, 2, 12, 11))])
+
+    selectors.get_busy_days(year=2026, month=2)
+    for day in range(1, 29):
+        selectors.get_free_slots(date_iso=f"2026-02-{day:02d}")
+
+    assert len(calls) == 1
+
+
+def test_upstream_failure_returns_empty_and_is_not_cached(monkeypatch):
+    calls = _fake_fetch(monkeypatch, None)
+
+    assert selectors.get_busy_days(year=2026, month=2) == []
+    assert selectors.get_free_slots(date_iso="2026-02-12") == []
+    assert len(calls) == 2
+
+
+def test_get_free_slots_range_fetches_once_per_month(monkeypatch):
+    calls = _fake_fetch(monkeypatch, [(_ts(2026, 2, 27), _ts(2026, 2, 28))])
+
+    days = selectors.get_free_slots_range(
+        start=datetime(2026, 2, 25).date(), end=datetime(2026, 3, 3).date()
+    )
+
+    assert list(days) == [
+        "2026-02-25", "2026-02-26", "2026-02-27", "2026-02-28",
+        "2026-03-01", "2026-03-02", "2026-03-03",
+    ]
+    assert days["2026-02-27"] == []
+    assert days["2026-02-26"][0] == "09:00"
+    assert len(calls) == 2
+
+
+@pytest.fixture()
+def synced_mirror():
+    return CalendarSyncState.objects.create(
+        calendar_id=CALENDAR_ID, sync_token="tok", synced_at=timezone.now()
+    )
+
+
+def _dt(*args):
+    return datetime(*args, tzinfo=TZ)
+
+
+def test_local_source_replaces_google_once_mirror_synced(monkeypatch, synced_mirror):
+    calls = _fake_fetch(monkeypatch, [])
+    service = Service.objects.create(title_en="Massage", title_fr="Massage")
+    Booking.objects.create(
+        service=service,
+        customer_name="A",
+        customer_email="a@example.com",
+        start_datetime=_dt(2026, 2, 12, 9),
+        end_datetime=_dt(2026, 2, 12, 10),
+        stripe_checkout_session_id="cs_1",
+    )
+    Booking.objects.create(
+        status=BookingStatus.CANCELED,
+        service=service,
+        customer_name="B",
+        customer_email="b@example.com",
+        start_datetime=_dt(2026, 2, 12, 10),
+        end_datetime=_dt(2026, 2, 12, 11),
+        stripe_checkout_session_id="cs_2",
+    )
+    GiftVoucher.objects.create(
+        recipient_name="R",
+        recipient_email="r@example.com",
+        sender_name="S",
+        sender_email="s@example.com",
+        amount=80,
+        start_datetime=_dt(2026, 2, 12, 11),
+        end_datetime=_dt(2026, 2, 12, 12),
+    )
+    CalendarEvent.objects.create(
+        calendar_id=CALENDAR_ID,
+        google_event_id="evt_1",
+        start_datetime=_dt(2026, 2, 12, 13),
+        end_datetime=_dt(2026, 2, 12, 19),
+    )
+
+    slots = selectors.get_free_slots(date_iso="2026-02-12")
+
+    assert slots == ["10:00", "10:30", "12:00", "12:30"]
+    assert calls == []
+
+
+def test_local_busy_intervals_are_grouped_by_calendar(synced_mirror):
+    CalendarEvent.objects.create(
+        calendar_id=CALENDAR_ID,
+        google_event_id="evt_1",
+        start_datetime=_dt(2026, 2, 12, 9),
+        end_datetime=_dt(2026, 2, 12, 11),
+    )
+    CalendarEvent.objects.create(
+        calendar_id="someone-else",
+        google_event_id="evt_2",
+        start_datetime=_dt(2026, 2, 13, 9),
+        end_datetime=_dt(2026, 2, 13, 11),
+    )
+    GiftVoucher.objects.create(
+        recipient_name="R",
+        recipient_email="r@example.com",
+        sender_name="S",
+        sender_email="s@example.com",
+        amount=80,
+        start_datetime=_dt(2026, 2, 12, 10),
+        end_datetime=_dt(2026, 2, 12, 12),
+    )
 
+    intervals = selectors.get_local_busy_intervals(_dt(2026, 2, 1), _dt(2026, 3, 1))
 
-def test_get_busy_days_delegates(monkeypatch):
-    def _fake(year, month):
-        assert year == 2026
-        assert month == 2
-        return ["2026-02-10"]
+    assert intervals == {
+        CALENDAR_ID: [(_ts(2026, 2, 12, 9), _ts(2026, 2, 12, 11))],
+        "": [(_ts(2026, 2, 12, 10), _ts(2026, 2, 12, 12))],
+    }
 
-    monkeypatch.setattr(selectors, "list_busy_days", _fake)
-    assert selectors.get_busy_days(year=2026, month=2) == ["2026-02-10"]
 
 
-def test_get_free_slots_delegates(monkeypatch):
-    def _fake(date_iso):
-        assert date_iso == "2026-02-12"
-        return ["09:00"]
+def test_outage_serves_last_good_plus_local_bookings(monkeypatch):
+    _fake_fetch(monkeypatch, [(_ts(2026, 2, 12, 9), _ts(2026, 2, 12, 12))])
+    selectors.get_free_slots(date_iso="2026-02-12")
+    service = Service.objects.create(title_en="Massage", title_fr="Massage")
+    Booking.objects.create(
+        service=service,
+        customer_name="A",
+        customer_email="a@example.com",
+        start_datetime=_dt(2026, 2, 12, 14),
+        end_datetime=_dt(2026, 2, 12, 19),
+        stripe_checkout_session_id="cs_1",
+    )
+    availability_cache.invalidate_calendar(CALENDAR_ID)
+    _fake_fetch(monkeypatch, None)
 
-    monkeypatch.setattr(selectors, "list_free_slots", _fake)
-    assert selectors.get_free_slots(date_iso="2026-02-12") == ["09:00"]
+    assert selectors.get_free_slots(date_iso="2026-02-12") == [
+        "12:00", "12:30", "13:00", "13:30",
+    ]
+    # Never fetched: nothing to fall back to, fail closed.
+    assert selectors.get_free_slots(date_iso="2026-03-12") == []
@@ -0,0 +1,153 @@
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from apps.availability import slots
+from apps.availability.slots import TZ
+
+
+def _ts(*args):
+    return int(datetime(*args, tzinfo=TZ).timestamp())
+
+
+def _legacy_free_slots(intervals, day, slot_minutes=30, work_hours=(9, 19)):
+    """The per-slot all() scan the sweep replaced — kept as the oracle."""
+    start = datetime(day.year, day.month, day.day, work_hours[0], tzinfo=TZ)
+    end = datetime(day.year, day.month, day.day, work_hours[1], tzinfo=TZ)
+    out = []
+    current = start
+    delta = timedelta(minutes=slot_minutes)
+    while current + delta <= end:
+        s0 = int(current.timestamp())
+        s1 = int((current + delta).timestamp())
+        if all(s1 <= s or s0 >= e for s, e in intervals):
+            out.append(current.strftime("%H:%M"))
+        current += delta
+    return out
+
+
+def _busy_month(events, seed=7):
+    """`events` random 15-120 min bookings spread over February 2026."""
+    rng = random.Random(seed)
+    month_start = _ts(2026, 2, 1, 8)
+    intervals = []
+    for _ in range(events):
+        start = month_start + rng.randrange(0, 27 * 86400, 900)
+        intervals.append((start, start + rng.choice((15, 30, 60, 90, 120)) * 60))
+    return intervals
+
+
+def test_merge_intervals_coalesces_overlapping_and_touching():
+    merged = slots.merge_intervals([(50, 60), (0, 10), (10, 20), (5, 8), (30, 40)])
+
+    assert merged == [(0, 20), (30, 40), (50, 60)]
+
+
+def test_merge_sorted_matches_merging_the_concatenation():
+    calendars = [slots.merge_intervals(_busy_month(seed=seed, events=200)) for seed in range(5)]
+
+    assert slots.merge_sorted(*calendars) == slots.merge_intervals(
+        [interval for calendar in calendars for interval in calendar]
+    )
+    assert slots.merge_sorted() == []
+
+
+def test_free_slots_matches_legacy_scan_on_busy_month():
+    intervals = _busy_month(400)
+
+    for day_number in range(1, 29):
+        day = date(2026, 2, day_number)
+        assert slots.free_slots(intervals, day) == _legacy_free_slots(intervals, day)
+
+
+def test_free_slot_offsets_are_minutes_since_midnight():
+    merged = [(_ts(2026, 2, 12, 10), _ts(2026, 2, 12, 11))]
+
+    offsets = slots.free_slot_offsets(merged, date(2026, 2, 12), work_hours=(9, 12))
+
+    assert offsets == [540, 570, 660, 690]
+    assert [slots.format_offset(o) for o in offsets] == ["09:00", "09:30", "11:00", "11:30"]
+
+
+def test_free_slot_offsets_fit_service_duration():
+    merged = [(_ts(2026, 2, 12, 11), _ts(2026, 2, 12, 12))]
+
+    offsets = slots.free_slot_offsets(
+        merged, date(2026, 2, 12), duration_minutes=90, work_hours=(9, 14)
+    )
+
+    # 90 min ending by 11:00 → 09:00, 09:30; then from 12:00 until 12:30.
+    assert [slots.format_offset(o) for o in offsets] == ["09:00", "09:30", "12:00", "12:30"]
+
+
+def test_free_slot_offsets_keep_buffer_around_bookings():
+    merged = [(_ts(2026, 2, 12, 10), _ts(2026, 2, 12, 11))]
+
+    offsets = slots.free_slot_offsets(
+        merged, date(2026, 2, 12), buffer_minutes=15, work_hours=(9, 12)
+    )
+
+    # 09:30-10:00 would end inside the buffer; 11:00 starts inside it.
+    assert [slots.format_offset(o) for o in offsets] == ["09:00", "11:30"]
+
+
+def test_free_slot_offsets_skip_intervals_before_the_day():
+    merged = [
+        (_ts(2026, 2, 1, 9), _ts(2026, 2, 1, 10)),
+        (_ts(2026, 2, 11, 18), _ts(2026, 2, 12, 9, 30)),
+    ]
+
+    offsets = slots.free_slot_offsets(merged, date(2026, 2, 12), work_hours=(9, 11))
+
+    assert offsets == [570, 600, 630]
+
+
+def test_free_slot_offsets_on_dst_change_day():
+    # Clocks go forward at 02:00 on 2026-03-29; work hours are local.
+    merged = [(_ts(2026, 3, 29, 10), _ts(2026, 3, 29, 11))]
+
+    offsets = slots.free_slot_offsets(merged, date(2026, 3, 29), work_hours=(9, 12))
+
+    assert [slots.format_offset(o) for o in offsets] == ["09:00", "09:30", "11:00", "11:30"]
+
+
+class _CountingIntervals(list):
+    """A list of intervals that counts how many times one is read."""
+
+    reads = 0
+
+    def __getitem__(self, index):
+        self.reads += 1
+        return super().__getitem__(index)
+
+    def __iter__(self):
+        for interval in super().__iter__():
+            self.reads += 1
+            yield interval
+
+
+@pytest.mark.performance
+def test_sweep_reads_far_fewer_intervals_than_legacy_scan():
+    """
+    One month of slots over a calendar with 600 events.
+
+    The legacy loop rescans every interval for every slot; the sweep
+    merges once and walks the grid. Counts interval reads rather than
+    wall-clock time, so the comparison is the same on any machine.
+    """
+    intervals = _busy_month(600)
+    days = [date(2026, 2, n) for n in range(1, 29)]
+
+    legacy = _CountingIntervals(intervals)
+    legacy_slots = [_legacy_free_slots(legacy, d) for d in days]
+
+    sweep = _CountingIntervals(slots.merge_intervals(intervals))
+    sweep_slots = [
+        [slots.format_offset(o) for o in slots.free_slot_offsets(sweep, d)] for d in days
+    ]
+
+    assert sweep_slots == legacy_slots
+    # The sweep reads each merged interval about once per day it
+    # touches; the scan reads all 600 for each of ~560 slots.
+    assert sweep.reads * 50 < legacy.reads
@@ -0,0 +1,194 @@
+from datetime import datetime, timedelta
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+
+from apps.availability import selectors, sync
+from apps.availability.calendar_gateway import CALENDAR_ID, TZ
+from apps.availability.models import CalendarEvent, CalendarSyncState
+
+pytestmark = pytest.mark.django_db
+
+
+def _mirrored():
+    return {
+        e.google_event_id: (e.start_datetime, e.end_datetime)
+        for e in CalendarEvent.objects.all()
+    }
+
+
+def _list_requests(fake_google):
+    return [params for name, params in fake_google.requests if name == "events.list"]
+
+
+def test_full_sync_mirrors_blocking_events(fake_google):
+    fake_google.put_event("timed", "2030-02-12T10:00:00+01:00", "2030-02-12T11:00:00+01:00")
+    fake_google.put_event("all-day", "2030-02-14", "2030-02-15")
+    fake_google.put_event(
+        "free", "2030-02-12T12:00:00+01:00", "2030-02-12T13:00:00+01:00",
+        transparency="transparent",
+    )
+    fake_google.put_event("past", "2026-01-02T10:00:00+01:00", "2026-01-02T11:00:00+01:00")
+
+    result = sync.sync_calendar()
+
+    assert result["full"] is True
+    assert _mirrored() == {
+        "timed": (datetime(2030, 2, 12, 10, tzinfo=TZ), datetime(2030, 2, 12, 11, tzinfo=TZ)),
+        "all-day": (datetime(2030, 2, 14, tzinfo=TZ), datetime(2030, 2, 15, tzinfo=TZ)),
+    }
+    # "past" ends before timeMin, so three events over two pages.
+    requests = _list_requests(fake_google)
+    assert "timeMin" in requests[0]
+    assert len(requests) == 2
+
+    state = CalendarSyncState.objects.get(calendar_id=CALENDAR_ID)
+    assert state.sync_token
+    assert state.full_synced_at == state.synced_at
+    assert state.updated_watermark is not None
+    assert state.last_error == ""
+    assert sync.mirror_ready()
+
+
+def test_incremental_sync_pulls_only_deltas(fake_google):
+    fake_google.put_event("moved", "2030-02-12T10:00:00+01:00", "2030-02-12T11:00:00+01:00")
+    fake_google.put_event("deleted", "2030-02-13T10:00:00+01:00", "2030-02-13T11:00:00+01:00")
+    fake_google.put_event("steady", "2030-02-14T10:00:00+01:00", "2030-02-14T11:00:00+01:00")
+    sync.sync_calendar()
+    first_watermark = CalendarSyncState.objects.get().updated_watermark
+    fake_google.requests.clear()
+
+    fake_google.put_event("moved", "2030-02-12T15:00:00+01:00", "2030-02-12T16:00:00+01:00")
+    fake_google.cancel("deleted")
+    result = sync.sync_calendar()
+
+    assert result == {"full": False, "upserted": 1, "removed": 1}
+    requests = _list_requests(fake_google)
+    assert len(requests) == 1
+    assert requests[0]["syncToken"]
+    assert set(_mirrored()) == {"moved", "steady"}
+    assert _mirrored()["moved"][0] == datetime(2030, 2, 12, 15, tzinfo=TZ)
+    state = CalendarSyncState.objects.get()
+    assert state.updated_watermark > first_watermark
+    assert state.full_synced_at < state.synced_at
+
+
+def test_all_day_events_block_even_when_marked_free(fake_google):
+    """Google creates all-day events as "show as free"; a day off still blocks."""
+    fake_google.put_event("day-off", "2030-02-14", "2030-02-15", transparency="transparent")
+    fake_google.put_event(
+        "free", "2030-02-12T12:00:00+01:00", "2030-02-12T13:00:00+01:00",
+        transparency="transparent",
+    )
+
+    sync.sync_calendar()
+
+    assert _mirrored() == {
+        "day-off": (datetime(2030, 2, 14, tzinfo=TZ), datetime(2030, 2, 15, tzinfo=TZ)),
+    }
+    assert selectors.get_free_slots(date_iso="2030-02-14") == []
+
+
+def test_sync_writes_in_a_constant_number_of_queries(fake_google, django_assert_max_num_queries):
+    fake_google.page_size = 500
+    for n in range(20):
+        day = f"2030-03-{n + 1:02d}"
+        fake_google.put_event(f"evt{n}", f"{day}T10:00:00+01:00", f"{day}T11:00:00+01:00")
+    sync.sync_calendar()
+    for n in range(0, 20, 2):
+        day = f"2030-03-{n + 1:02d}"
+        fake_google.put_event(f"evt{n}", f"{day}T14:00:00+01:00", f"{day}T15:00:00+01:00")
+    for n in range(1, 20, 2):
+        fake_google.cancel(f"evt{n}")
+
+    # State read, previous rows, one delete, one upsert, state save
+    # and the transaction around them — not one query per event.
+    with django_assert_max_num_queries(10):
+        result = sync.sync_calendar()
+
+    assert result == {"full": False, "upserted": 10, "removed": 10}
+    assert len(_mirrored()) == 10
+    assert _mirrored()["evt0"][0] == datetime(2030, 3, 1, 14, tzinfo=TZ)
+
+
+def test_expired_token_triggers_full_resync(fake_google):
+    fake_google.put_event("kept", "2030-02-12T10:00:00+01:00", "2030-02-12T11:00:00+01:00")
+    fake_google.put_event("dropped", "2030-02-13T10:00:00+01:00", "2030-02-13T11:00:00+01:00")
+    sync.sync_calendar()
+
+    # Google forgets the deletion along with the token: only a full
+    # resync can notice that "dropped" is gone.
+    fake_google.cancel("dropped")
+    fake_google.expire_sync_tokens()
+    fake_google.requests.clear()
+
+    result = sync.sync_calendar()
+
+    assert result["full"] is True
+    requests = _list_requests(fake_google)
+    assert requests[0].get("syncToken")
+    assert "syncToken" not in requests[1]
+    assert set(_mirrored()) == {"kept"}
+
+
+def test_failed_sync_leaves_mirror_untouched(fake_google, monkeypatch):
+    fake_google.put_event("kept", "2030-02-12T10:00:00+01:00", "2030-02-12T11:00:00+01:00")
+    sync.sync_calendar()
+    synced_at = CalendarSyncState.objects.get().synced_at
+
+    monkeypatch.setattr(sync.calendar_gateway, "_get_service", lambda: None)
+    assert sync.sync_calendar() is None
+
+    state = CalendarSyncState.objects.get()
+    assert set(_mirrored()) == {"kept"}
+    assert state.synced_at == synced_at
+    assert state.last_attempt_at > synced_at
+    assert state.last_error
+
+
+def test_stale_mirror_falls_back_to_google(fake_google):
+    fake_google.put_event("evt", "2030-02-12T09:00:00+01:00", "2030-02-12T19:00:00+01:00")
+    sync.sync_calendar()
+    assert selectors.get_free_slots(date_iso="2030-02-12") == []
+    assert not [r for r in fake_google.requests if r[0] == "freebusy.query"]
+
+    CalendarSyncState.objects.update(synced_at=timezone.now() - timedelta(hours=1))
+
+    assert not sync.mirror_ready()
+    assert selectors.get_free_slots(date_iso="2030-02-12") == []
+    assert [r for r in fake_google.requests if r[0] == "freebusy.query"]
+
+
+def test_sync_calendar_command(fake_google, monkeypatch, capsys):
+    call_command("sync_calendar")
+    assert "full sync, 0 upserted" in capsys.readouterr().out
+
+    monkeypatch.setattr(sync.calendar_gateway, "_get_service", lambda: None)
+    with pytest.raises(CommandError):
+        call_command("sync_calendar")
+
+
+def test_sync_calendar_command_mirrors_every_configured_calendar(fake_google, settings):
+    settings.AVAILABILITY_CALENDARS = {"room@example.com": [3]}
+
+    call_command("sync_calendar")
+
+    assert [params["calendarId"] for params in _list_requests(fake_google)] == [
+        CALENDAR_ID,
+        "room@example.com",
+    ]
+    assert set(CalendarSyncState.objects.values_list("calendar_id", flat=True)) == {
+        CALENDAR_ID,
+        "room@example.com",
+    }
+
+
+def test_sync_calendar_command_calendar_overrides(fake_google, settings):
+    settings.AVAILABILITY_CALENDARS = {"room@example.com": [3]}
+
+    call_command("sync_calendar", "--calendar", "room@example.com")
+
+    assert [params["calendarId"] for params in _list_requests(fake_google)] == [
+        "room@example.com"
+    ]
@@ -0,0 +1,79 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from apps.availability import upkeep, watch
+from apps.availability.calendar_gateway import CALENDAR_ID
+from apps.availability.models import CalendarWatchChannel, SlotHold
+from apps.availability.sync import SYNC_CALENDAR
+from apps.jobs.models import Job, JobStatus
+from apps.jobs.queue import run_pending
+
+pytestmark = pytest.mark.django_db
+
+ADDRESS = "https://serenity.example/api/calendar/notifications/"
+
+
+@pytest.fixture(autouse=True)
+def _calendars(settings):
+    settings.AVAILABILITY_CALENDARS = {"room@example.com": [3]}
+
+
+def _queued_syncs():
+    return sorted(
+        job.payload["calendar_id"] for job in Job.objects.filter(task=SYNC_CALENDAR)
+    )
+
+
+def test_queue_syncs_covers_every_calendar_once(fake_google):
+    assert upkeep.queue_syncs() == 2
+    assert upkeep.queue_syncs() == 2
+
+    assert _queued_syncs() == sorted([CALENDAR_ID, "room@example.com"])
+    run_pending(10)
+    assert Job.objects.filter(task=SYNC_CALENDAR, status=JobStatus.DONE).count() == 2
+
+
+def test_renew_channels_needs_a_webhook_address(fake_google, monkeypatch):
+    monkeypatch.setattr(watch, "WEBHOOK_URL", "")
+    assert upkeep.renew_channels() == 0
+    assert not CalendarWatchChannel.objects.exists()
+
+    monkeypatch.setattr(watch, "WEBHOOK_URL", ADDRESS)
+    assert upkeep.renew_channels() == 2
+    assert set(CalendarWatchChannel.objects.values_list("calendar_id", flat=True)) == {
+        CALENDAR_ID,
+        "room@example.com",
+    }
+
+
+def test_run_due_runs_each_chore_on_its_interval(fake_google, monkeypatch):
+    monkeypatch.setattr(watch, "WEBHOOK_URL", "")
+    now = timezone.now()
+    SlotHold.objects.create(
+        start_datetime=now, end_datetime=now + timedelta(hours=1), expires_at=now
+    )
+    due = {}
+
+    assert upkeep.run_due(due, 1000.0) == ["sync", "watch", "sweep"]
+    assert not SlotHold.objects.exists()
+    assert upkeep.run_due(due, 1000.0 + upkeep.SWEEP_INTERVAL) == ["sync", "sweep"]
+    assert upkeep.run_due(due, 1000.0 + upkeep.WATCH_INTERVAL) == [
+        "sync",
+        "watch",
+        "sweep",
+    ]
+
+
+def test_a_failing_chore_does_not_stop_the_others(monkeypatch):
+    def boom():
+        raise RuntimeError("down")
+
+    swept = []
+    monkeypatch.setattr(upkeep, "queue_syncs", boom)
+    monkeypatch.setattr(upkeep, "renew_channels", boom)
+    monkeypatch.setattr(upkeep, "sweep_expired_holds", lambda: swept.append(1) or 0)
+
+    assert upkeep.run_due({}, 0.0) == ["sync", "watch", "sweep"]
+    assert swept == [1]
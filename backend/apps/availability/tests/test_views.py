@@ -1,6 +1,30 @@
+from datetime import datetime
+
 import pytest
 from django.urls import reverse
 
+from apps.availability.calendar_gateway import CALENDAR_ID, TZ
+
+
+def _ts(day, hour, minute=0):
+    return int(datetime(2026, 2, day, hour, minute, tzinfo=TZ).timestamp())
+
+
+@pytest.fixture()
+def busy_intervals(monkeypatch):
+    """Serve `intervals` for every month the views ask for."""
+    from apps.availability import views
+
+    state = {"intervals": [], "months": []}
+
+    async def _fake(months, calendar_ids=None):
+        state["months"].append(months)
+        intervals = state["intervals"]
+        return dict.fromkeys(months, None if intervals is None else {CALENDAR_ID: intervals})
+
+    monkeypatch.setattr(views, "aget_busy_intervals_by_month", _fake)
+    return state
+
 
 @pytest.mark.django_db
 def test_busy_requires_valid_params(client, monkeypatch):
@@ -10,16 +34,20 @@ def test_busy_requires_valid_params(client, monkeypatch):
     res = client.get(url)
     assert res.status_code == 400
 
-    # Invalid month -> 400
+    # Invalid month -> 400, with the standard error contract
     res = client.get(url, {"year": 2026, "month": 13})
     assert res.status_code == 400
+    body = res.json()
+    assert "month" in body
+    assert body["errors"][0]["field"] == "month"
 
+    # Read-only endpoint
+    assert client.post(url, {"year": 2026, "month": 2}).status_code == 405
 
-@pytest.mark.django_db
-def test_busy_returns_payload(client, monkeypatch):
-    from apps.availability import views
 
-    monkeypatch.setattr(views, "get_busy_days", lambda year, month: ["2026-02-10"])
+@pytest.mark.django_db
+def test_busy_returns_payload(client, busy_intervals):
+    busy_intervals["intervals"] = [(_ts(10, 0), _ts(11, 0))]
 
     url = reverse("availability_busy")
     res = client.get(url, {"year": 2026, "month": 2})
@@ -40,13 +68,106 @@ def test_slots_requires_valid_date(client):
 
 
 @pytest.mark.django_db
-def test_slots_returns_payload(client, monkeypatch):
-    from apps.availability import views
-
-    monkeypatch.setattr(views, "get_free_slots", lambda date_iso: ["09:00", "09:30"])
+def test_slots_returns_payload(client, busy_intervals):
+    busy_intervals["intervals"] = [(_ts(12, 10), _ts(12, 19))]
 
     url = reverse("availability_slots")
     res = client.get(url, {"date": "2026-02-12"})
 
     assert res.status_code == 200
     assert res.json() == {"times": ["09:00", "09:30"]}
+
+
+@pytest.mark.django_db
+def test_slots_range_returns_days(client, busy_intervals):
+    busy_intervals["intervals"] = [(_ts(12, 9, 30), _ts(13, 19))]
+
+    url = reverse("availability_slots_range")
+    res = client.get(url, {"start": "2026-02-12", "end": "2026-02-13"})
+
+    assert res.status_code == 200
+    assert res.json() == {"days": {"2026-02-12": ["09:00"], "2026-02-13": []}}
+    assert busy_intervals["months"] == [[(2026, 2)]]
+
+
+@pytest.mark.django_db
+def test_slots_range_validates_bounds(client):
+    url = reverse("availability_slots_range")
+
+    assert client.get(url).status_code == 400
+    assert client.get(url, {"start": "2026-02-13", "end": "2026-02-12"}).status_code == 400
+    assert client.get(url, {"start": "2026-01-01", "end": "2026-03-01"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_slots_passes_service_duration(client, busy_intervals):
+    from apps.services.models import Service
+
+    service = Service.objects.create(
+        title_en="Long Massage", title_fr="Massage Long", duration_minutes=90
+    )
+    busy_intervals["intervals"] = [(_ts(12, 9), _ts(12, 17))]
+
+    url = reverse("availability_slots")
+    res = client.get(url, {"date": "2026-02-12", "service": service.pk})
+
+    assert res.status_code == 200
+    assert res.json() == {"times": ["17:00", "17:30"]}
+
+    res = client.get(url, {"date": "2026-02-12", "service": 999999})
+    assert res.status_code == 400
+
+
+@pytest.mark.django_db
+def test_repeat_poll_gets_304(client, busy_intervals):
+    url = reverse("availability_slots")
+
+    first = client.get(url, {"date": "2026-02-12"})
+    etag = first["ETag"]
+    again = client.get(url, {"date": "2026-02-12"}, HTTP_IF_NONE_MATCH=etag)
+
+    assert etag.startswith('"')
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again["ETag"] == etag
+    assert "s-maxage=15" in again["Cache-Control"]
+
+
+@pytest.mark.django_db
+def test_etag_changes_with_the_intervals(client, busy_intervals):
+    url = reverse("availability_busy")
+    params = {"year": 2026, "month": 2}
+    etag = client.get(url, params)["ETag"]
+
+    busy_intervals["intervals"] = [(_ts(10, 0), _ts(11, 0))]
+    res = client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+
+    assert res.status_code == 200
+    assert res.json() == {"busy": ["2026-02-10"]}
+    assert res["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_responses_are_cacheable_at_the_edge(client, busy_intervals, settings):
+    settings.AVAILABILITY_EDGE_MAX_AGE = 30
+
+    res = client.get(reverse("availability_busy"), {"year": 2026, "month": 2})
+
+    directives = {d.strip() for d in res["Cache-Control"].split(",")}
+    assert directives == {
+        "public",
+        "max-age=0",
+        "s-maxage=30",
+        "stale-while-revalidate=30",
+    }
+
+
+@pytest.mark.django_db
+def test_unknown_availability_is_not_cached(client, busy_intervals):
+    busy_intervals["intervals"] = None
+
+    res = client.get(reverse("availability_slots"), {"date": "2026-02-12"})
+
+    assert res.json() == {"times": []}
+    assert "ETag" not in res
+    assert "no-store" in res["Cache-Control"]
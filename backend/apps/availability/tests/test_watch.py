@@ -0,0 +1,163 @@
+from datetime import datetime, timedelta
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.availability import cache as availability_cache
+from apps.availability import sync, watch
+from apps.availability.calendar_gateway import CALENDAR_ID, TZ
+from apps.availability.models import CalendarEvent, CalendarWatchChannel
+from apps.jobs.models import Job, JobStatus
+from apps.jobs.queue import run_pending
+
+pytestmark = pytest.mark.django_db
+
+ADDRESS = "https://serenity.example/api/calendar/notifications/"
+
+
+def _notify(client, channel, *, token=None, state="exists"):
+    return client.post(
+        reverse("availability_notifications"),
+        HTTP_X_GOOG_CHANNEL_ID=channel.channel_id,
+        HTTP_X_GOOG_CHANNEL_TOKEN=channel.token if token is None else token,
+        HTTP_X_GOOG_RESOURCE_STATE=state,
+        HTTP_X_GOOG_RESOURCE_ID=channel.resource_id,
+    )
+
+
+def test_ensure_channel_opens_and_reuses(fake_google):
+    channel = watch.ensure_channel(address=ADDRESS)
+
+    assert channel.channel_id in fake_google.open_channels
+    assert fake_google.open_channels[channel.channel_id]["address"] == ADDRESS
+    assert channel.expires_at > timezone.now() + timedelta(days=6)
+    assert watch.ensure_channel(address=ADDRESS) == channel
+    assert len(fake_google.open_channels) == 1
+
+
+def test_ensure_channel_renews_before_expiry(fake_google):
+    old = watch.ensure_channel(address=ADDRESS)
+    CalendarWatchChannel.objects.filter(pk=old.pk).update(
+        expires_at=timezone.now() + timedelta(hours=2)
+    )
+
+    new = watch.ensure_channel(address=ADDRESS)
+
+    assert new.channel_id != old.channel_id
+    assert list(fake_google.open_channels) == [new.channel_id]
+    assert list(CalendarWatchChannel.objects.all()) == [new]
+
+
+def test_watch_calendar_command(fake_google, capsys):
+    call_command("watch_calendar", "--address", ADDRESS)
+    assert "valid until" in capsys.readouterr().out
+    assert CalendarWatchChannel.objects.count() == 1
+
+    call_command("watch_calendar", "--stop")
+    assert CalendarWatchChannel.objects.count() == 0
+    assert fake_google.open_channels == {}
+
+
+def test_watch_calendar_command_watches_every_configured_calendar(fake_google, settings):
+    settings.AVAILABILITY_CALENDARS = {"room@example.com": [3]}
+
+    call_command("watch_calendar", "--address", ADDRESS)
+    assert set(CalendarWatchChannel.objects.values_list("calendar_id", flat=True)) == {
+        CALENDAR_ID,
+        "room@example.com",
+    }
+
+    call_command("watch_calendar", "--stop", "--calendar", "room@example.com")
+    assert list(CalendarWatchChannel.objects.values_list("calendar_id", flat=True)) == [
+        CALENDAR_ID
+    ]
+
+
+def test_watch_calendar_command_requires_address(fake_google, monkeypatch):
+    monkeypatch.setattr(watch, "WEBHOOK_URL", "")
+    with pytest.raises(CommandError):
+        call_command("watch_calendar", "--address", "")
+
+
+def test_webhook_rejects_unknown_or_forged_channels(client, fake_google):
+    channel = watch.ensure_channel(address=ADDRESS)
+
+    assert _notify(client, channel, token="forged").status_code == 403
+
+    CalendarWatchChannel.objects.filter(pk=channel.pk).update(
+        expires_at=timezone.now() - timedelta(minutes=1)
+    )
+    assert _notify(client, channel).status_code == 403
+
+    assert client.post(reverse("availability_notifications")).status_code == 403
+    assert client.get(reverse("availability_notifications")).status_code == 405
+
+
+def test_webhook_sync_handshake_does_not_sync(client, fake_google):
+    channel = watch.ensure_channel(address=ADDRESS)
+    fake_google.requests.clear()
+
+    assert _notify(client, channel, state="sync").status_code == 200
+    assert fake_google.requests == []
+
+
+def test_webhook_syncs_and_invalidates_only_touched_month(client, fake_google):
+    fake_google.put_event("evt", "2030-02-12T10:00:00+01:00", "2030-02-12T11:00:00+01:00")
+    sync.sync_calendar()
+    channel = watch.ensure_channel(address=ADDRESS)
+
+    cached = {
+        month: availability_cache.get_month_intervals(
+            calendar_id=CALENDAR_ID, year=2030, month=month, fetch=lambda: []
+        )
+        for month in (2, 3, 4)
+    }
+    assert cached == {2: [], 3: [], 4: []}
+
+    # The studio moves the appointment into March by hand.
+    fake_google.put_event("evt", "2030-03-05T10:00:00+01:00", "2030-03-05T11:00:00+01:00")
+
+    assert _notify(client, channel).status_code == 200
+    assert run_pending() == {"done": 1, "failed": 0}
+
+    mirrored = CalendarEvent.objects.get(google_event_id="evt")
+    assert mirrored.start_datetime == datetime(2030, 3, 5, 10, tzinfo=TZ)
+
+    def _cached(month):
+        return availability_cache._cache().get(
+            availability_cache.month_key(CALENDAR_ID, 2030, month)
+        )
+
+    assert _cached(2) is None
+    assert _cached(3) is None
+    assert _cached(4) is not None
+
+
+def test_webhook_burst_queues_one_sync_without_calling_google(client, fake_google):
+    channel = watch.ensure_channel(address=ADDRESS)
+    fake_google.requests.clear()
+
+    for _ in range(5):
+        assert _notify(client, channel).status_code == 200
+
+    assert fake_google.requests == []
+    job = Job.objects.get(task=sync.SYNC_CALENDAR)
+    assert job.payload == {"calendar_id": CALENDAR_ID}
+
+    run_pending()
+    assert Job.objects.get().status == JobStatus.DONE
+    assert [name for name, _ in fake_google.requests] == ["events.list"]
+
+
+def test_failed_sync_job_is_retried(client, fake_google, monkeypatch):
+    channel = watch.ensure_channel(address=ADDRESS)
+    monkeypatch.setattr(sync.calendar_gateway, "_get_service", lambda: None)
+
+    _notify(client, channel)
+
+    assert run_pending() == {"done": 0, "failed": 1}
+    job = Job.objects.get()
+    assert job.status == JobStatus.QUEUED
+    assert "Google Calendar unavailable" in job.last_error
@@ -0,0 +1,103 @@
+"""Periodic upkeep of the calendar mirror, its watch channels and holds.
+
+Push notifications only say that a calendar changed. Without them (a
+channel lapsed, a notification lost) the mirror stops advancing and
+goes stale past AVAILABILITY_MIRROR_MAX_AGE, and every lookup falls
+back to Google. The worker process (`manage.py run_worker`) runs this
+loop, which:
+
+- queues a sync of every configured calendar each SYNC_INTERVAL,
+  folded into a sync a notification already queued;
+- renews watch channels about to expire each WATCH_INTERVAL, when
+  GOOGLE_CALENDAR_WEBHOOK_URL is set;
+- deletes expired slot holds each SWEEP_INTERVAL.
+
+`manage.py sync_calendar`, `watch_calendar` and `sweep_slot_holds` do
+the same one at a time, from cron.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from django.db import close_old_connections
+
+from . import watch
+from .calendars import calendar_services
+from .holds import sweep_expired_holds
+from .sync import queue_sync
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+SYNC_INTERVAL = 300
+WATCH_INTERVAL = 3600
+SWEEP_INTERVAL = 300
+# How often the loop wakes to check what is due.
+TICK = 30.0
+
+
+def queue_syncs() -> int:
+    """Queue a sync of every configured calendar; how many."""
+    calendar_ids = list(calendar_services())
+    for calendar_id in calendar_ids:
+        queue_sync(calendar_id)
+    return len(calendar_ids)
+
+
+def renew_channels() -> int:
+    """Keep a watch channel open on every configured calendar; how many are."""
+    if not watch.WEBHOOK_URL:
+        return 0
+    open_channels = 0
+    for calendar_id in calendar_services():
+        if watch.ensure_channel(address=watch.WEBHOOK_URL, calendar_id=calendar_id) is None:
+            logger.warning("Could not open a watch channel for %s", calendar_id)
+        else:
+            open_channels += 1
+    return open_channels
+
+
+def chores() -> tuple[tuple[str, float, Callable[[], int]], ...]:
+    """(name, interval in seconds, function) of each upkeep chore."""
+    return (
+        ("sync", SYNC_INTERVAL, queue_syncs),
+        ("watch", WATCH_INTERVAL, renew_channels),
+        ("sweep", SWEEP_INTERVAL, sweep_expired_holds),
+    )
+
+
+def run_due(due: dict[str, float], now: float) -> list[str]:
+    """Run the chores whose time has come, rescheduling them in `due`."""
+    ran = []
+    for name, interval, chore in chores():
+        if due.get(name, 0.0) > now:
+            continue
+        due[name] = now + interval
+        ran.append(name)
+        try:
+            chore()
+        except Exception:
+            logger.exception("Availability upkeep failed: %s", name)
+    return ran
+
+
+def run_forever(*, tick: float = TICK) -> None:
+    """Run each chore on its interval until the process exits."""
+    due: dict[str, float] = {}
+    while True:
+        close_old_connections()
+        run_due(due, time.monotonic())
+        time.sleep(tick)
+
+
+def start_thread() -> threading.Thread:
+    """Run the upkeep loop on a daemon thread."""
+    thread = threading.Thread(target=run_forever, daemon=True, name="availability-upkeep")
+    thread.start()
+    return thread
@@ -1,8 +1,15 @@
 from django.urls import path
 
 from . import views
+from .webhooks import google_calendar_webhook
 
 urlpatterns = [
     path("busy/", views.busy, name="availability_busy"),
     path("slots/", views.slots, name="availability_slots"),
+    path("slots/range/", views.slots_range, name="availability_slots_range"),
+    path(
+        "notifications/",
+        google_calendar_webhook,
+        name="availability_notifications",
+    ),
 ]
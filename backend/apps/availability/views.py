@@ -1,42 +1,172 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, cast
 
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny
-from rest_framework.response import Response
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse
+from django.utils.cache import (
+    add_never_cache_headers,
+    get_conditional_response,
+    patch_cache_control,
+    quote_etag,
+)
+from django.views.decorators.http import require_GET
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiResponse
+from rest_framework.exceptions import ValidationError
 
-from .selectors import get_busy_days, get_free_slots
-from .serializers import BusyDaysQuerySerializer, FreeSlotsQuerySerializer
+from apps.core.api_errors import api_exception_handler
+from apps.core.openapi import documented_view
+
+from .selectors import (
+    aget_busy_intervals_by_month,
+    day_slots,
+    intervals_version,
+    month_busy_days,
+    months_between,
+    range_slots,
+)
+from .serializers import (
+    BusyDaysQuerySerializer,
+    BusyDaysResponseSerializer,
+    FreeSlotsQuerySerializer,
+    FreeSlotsResponseSerializer,
+    SlotsRangeQuerySerializer,
+    SlotsRangeResponseSerializer,
+)
 
 if TYPE_CHECKING:
-    from rest_framework.request import Request
+    from collections.abc import Callable
+    from typing import Any
+
+    from django.http import HttpRequest, HttpResponse
+    from rest_framework.response import Response
+    from rest_framework.serializers import Serializer
+
+# Native async views: production serves config.asgi under UvicornWorker,
+# where a sync view holds a thread for the whole Google round trip.
+# DRF views cannot be async, so these validate with the same
+# serializers and answer with the same error contract by hand.
+# documented_view keeps them in the OpenAPI schema.
+
+_NOT_MODIFIED = OpenApiResponse(description="The client's ETag is current.")
+_INVALID = OpenApiResponse(
+    OpenApiTypes.OBJECT, description="Invalid query; see the API error contract."
+)
+
+
+async def _validate(ser: Serializer) -> JsonResponse | None:
+    """Run validation off-loop (it may query Service); 400 on failure."""
+    if await sync_to_async(ser.is_valid)():
+        return None
+    response = cast("Response", api_exception_handler(ValidationError(ser.errors), {}))
+    return JsonResponse(response.data, status=response.status_code)
 
 
-@api_view(['GET'])
-@permission_classes([AllowAny])
-def busy(request: Request) -> Response:
+def _conditional(
+    request: HttpRequest,
+    version: str | None,
+    render: Callable[[], dict[str, Any]],
+) -> HttpResponse:
+    """
+    Answer 304 when the client (or CDN) already holds this version.
+
+    The ETag is the digest of the month intervals the payload derives
+    from, so a repeat poll skips deriving and encoding it. Edges may
+    share a response for AVAILABILITY_EDGE_MAX_AGE seconds; browsers
+    revalidate every time. A fail-closed (empty) answer is not cached.
+    """
+    if version is None:
+        response = JsonResponse(render())
+        add_never_cache_headers(response)
+        return response
+
+    etag = quote_etag(version)
+    response = get_conditional_response(request, etag=etag) or JsonResponse(render())
+    response["ETag"] = etag
+    edge_max_age = getattr(settings, "AVAILABILITY_EDGE_MAX_AGE", 15)
+    patch_cache_control(
+        response,
+        public=True,
+        max_age=0,
+        s_maxage=edge_max_age,
+        stale_while_revalidate=edge_max_age,
+    )
+    return response
+
+
+@documented_view(
+    parameters=[BusyDaysQuerySerializer],
+    responses={200: BusyDaysResponseSerializer, 304: _NOT_MODIFIED, 400: _INVALID},
+)
+@require_GET
+async def busy(request: HttpRequest) -> HttpResponse:
     """
     Return busy dates for a given year and month.
     """
-    ser = BusyDaysQuerySerializer(data=request.query_params)
-    ser.is_valid(raise_exception=True)
+    ser = BusyDaysQuerySerializer(data=request.GET)
+    if invalid := await _validate(ser):
+        return invalid
 
-    data = get_busy_days(
-        year=ser.validated_data['year'],
-        month=ser.validated_data['month'],
+    year, month = ser.validated_data['year'], ser.validated_data['month']
+    by_month = await aget_busy_intervals_by_month([(year, month)])
+    return _conditional(
+        request,
+        intervals_version(by_month),
+        lambda: {'busy': month_busy_days(by_month[(year, month)], year, month)},
     )
-    return Response({'busy': data})
 
 
-@api_view(['GET'])
-@permission_classes([AllowAny])
-def slots(request: Request) -> Response:
+@documented_view(
+    parameters=[FreeSlotsQuerySerializer],
+    responses={200: FreeSlotsResponseSerializer, 304: _NOT_MODIFIED, 400: _INVALID},
+)
+@require_GET
+async def slots(request: HttpRequest) -> HttpResponse:
     """
     Return available time slots for a given date.
+
+    With `?service=<id>`, slots are sized to that service's duration
+    and checked against the calendars it is mapped to.
     """
-    ser = FreeSlotsQuerySerializer(data=request.query_params)
-    ser.is_valid(raise_exception=True)
+    ser = FreeSlotsQuerySerializer(data=request.GET)
+    if invalid := await _validate(ser):
+        return invalid
+
+    day, duration = ser.validated_data['date'], ser.duration_minutes
+    by_month = await aget_busy_intervals_by_month(
+        [(day.year, day.month)], ser.calendar_ids
+    )
+    return _conditional(
+        request,
+        intervals_version(by_month, duration),
+        lambda: {
+            'times': day_slots(by_month[(day.year, day.month)], day, duration)
+        },
+    )
+
 
-    times = get_free_slots(date_iso=ser.validated_data['date'].isoformat())
-    return Response({'times': times})
+@documented_view(
+    parameters=[SlotsRangeQuerySerializer],
+    responses={200: SlotsRangeResponseSerializer, 304: _NOT_MODIFIED, 400: _INVALID},
+)
+@require_GET
+async def slots_range(request: HttpRequest) -> HttpResponse:
+    """
+    Return available time slots for every date in [start, end].
+    """
+    ser = SlotsRangeQuerySerializer(data=request.GET)
+    if invalid := await _validate(ser):
+        return invalid
+
+    start, end = ser.validated_data['start'], ser.validated_data['end']
+    duration = ser.duration_minutes
+    by_month = await aget_busy_intervals_by_month(
+        months_between(start, end), ser.calendar_ids
+    )
+    return _conditional(
+        request,
+        intervals_version(by_month, duration),
+        lambda: {'days': range_slots(start, end, by_month, duration)},
+    )
@@ -0,0 +1,112 @@
+"""Google push-notification channels for the studio calendar.
+
+A channel makes Google POST to our webhook whenever the calendar's
+events change. The webhook queues an incremental sync, which updates
+the mirror and invalidates only the months the changed events touch
+— so cached availability can live much longer than the time it takes
+the studio to edit the calendar by hand.
+
+Channels expire (Google caps them at about a week); the worker's
+upkeep loop (apps.availability.upkeep) or `manage.py watch_calendar`
+opens a replacement before the current one lapses.
+"""
+
+from __future__ import annotations
+
+import logging
+import secrets
+import uuid
+from datetime import timedelta
+
+from decouple import config
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+
+from . import calendar_gateway
+from .models import CalendarWatchChannel
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_URL = config("GOOGLE_CALENDAR_WEBHOOK_URL", default="")
+CHANNEL_TTL = timedelta(days=7)
+RENEW_BEFORE = timedelta(days=1)
+
+
+def ensure_channel(
+    *,
+    address: str,
+    calendar_id: str = calendar_gateway.CALENDAR_ID,
+    ttl: timedelta = CHANNEL_TTL,
+    renew_before: timedelta = RENEW_BEFORE,
+) -> CalendarWatchChannel | None:
+    """Return a channel valid for at least `renew_before`, opening one if needed.
+
+    Older channels for the calendar are stopped once the new one is
+    live, so at most one channel delivers notifications. Returns None
+    if Google refused the new channel.
+    """
+    now = timezone.now()
+    current = CalendarWatchChannel.objects.filter(
+        calendar_id=calendar_id, expires_at__gt=now + renew_before
+    ).first()
+    if current is not None:
+        return current
+
+    channel_id = str(uuid.uuid4())
+    token = secrets.token_urlsafe(32)
+    opened = calendar_gateway.watch_events(
+        channel_id=channel_id,
+        address=address,
+        token=token,
+        ttl=ttl,
+        calendar_id=calendar_id,
+    )
+    if opened is None:
+        return None
+
+    channel = CalendarWatchChannel.objects.create(
+        calendar_id=calendar_id,
+        channel_id=channel_id,
+        resource_id=opened["resource_id"],
+        token=token,
+        expires_at=opened["expires_at"],
+    )
+    logger.info("Opened watch channel %s until %s", channel_id, channel.expires_at)
+
+    stop_channels(
+        calendar_id=calendar_id,
+        keep=channel.channel_id,
+    )
+    return channel
+
+
+def stop_channels(
+    *,
+    calendar_id: str = calendar_gateway.CALENDAR_ID,
+    keep: str = "",
+) -> int:
+    """Stop and forget every channel on the calendar except `keep`."""
+    stopped = 0
+    for old in CalendarWatchChannel.objects.filter(calendar_id=calendar_id).exclude(
+        channel_id=keep
+    ):
+        # Expired channels are already dead on Google's side.
+        if old.expires_at > timezone.now() and not calendar_gateway.stop_channel(
+            channel_id=old.channel_id, resource_id=old.resource_id
+        ):
+            continue
+        old.delete()
+        stopped += 1
+    return stopped
+
+
+def authenticate(channel_id: str, token: str) -> CalendarWatchChannel | None:
+    """The live channel a notification claims to come from, if its token matches."""
+    if not channel_id or not token:
+        return None
+    channel = CalendarWatchChannel.objects.filter(
+        channel_id=channel_id, expires_at__gt=timezone.now()
+    ).first()
+    if channel is None or not constant_time_compare(token, channel.token):
+        return None
+    return channel
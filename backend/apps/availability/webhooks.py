@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import logging
+
+from django.http import HttpRequest, HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+
+from .sync import queue_sync
+from .watch import authenticate
+
+logger = logging.getLogger(__name__)
+
+
+@csrf_exempt
+@require_POST
+def google_calendar_webhook(request: HttpRequest) -> HttpResponse:
+    """
+    Receive Google Calendar push notifications.
+
+    Notifications carry no event data — only "something changed" — so
+    an incremental sync finds the changed events and invalidates the
+    months they touch. The sync runs on the job queue, not in the
+    request: Google sends notifications in bursts, and a burst queues
+    one sync per calendar (a job still waiting absorbs the rest). The
+    answer is 200 once authenticated and queued; a failed sync is
+    retried by the queue, the next notification or the periodic sync.
+    """
+    channel = authenticate(
+        request.headers.get("X-Goog-Channel-ID", ""),
+        request.headers.get("X-Goog-Channel-Token", ""),
+    )
+    if channel is None:
+        return HttpResponse(status=403)
+
+    state = request.headers.get("X-Goog-Resource-State", "")
+    if state == "sync":
+        # Handshake sent once when the channel opens.
+        return HttpResponse(status=200)
+
+    job = queue_sync(channel.calendar_id)
+    logger.debug(
+        "Push notification queued sync %s: channel=%s state=%s",
+        job.pk,
+        channel.channel_id,
+        state,
+    )
+    return HttpResponse(status=200)
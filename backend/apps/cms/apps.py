@@ -11,9 +11,5 @@ class CmsConfig(AppConfig):
     label = "cms"
 
     def ready(self) -> None:
-        # Signal-based cache invalidation is prepared in signals.py
-        # but currently disabled.  Uncomment the import below to
-        # activate it:
-        #
-        #   import apps.cms.signals
-        pass
+        """Connect the hydrated homepage cache invalidation."""
+        import apps.cms.signals  # noqa: F401
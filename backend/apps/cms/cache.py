@@ -0,0 +1,86 @@
+"""Cache of the hydrated homepage payload, as the JSON bytes served.
+
+Building the payload resolves the site and homepage, serializes the
+page with its hero slides, the services and both settings objects, and
+computes every Cloudinary URL on the way. Its result is the same for
+every visitor of a site (both languages are in it), so one entry per
+site holds the response body, ready to send.
+
+Entries are keyed by the site's generation. signals.py bumps it once
+a change commits — a HomePage published or unpublished, a HeroSlide or
+Service saved or deleted, a site's GiftSettings or SerenitySettings
+saved — which orphans the site's entry. A request that read the old
+data before the commit can only store it under the old generation.
+TTL bounds anything the signals do not see (an image replaced in the
+Wagtail image library, say).
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+from django.core.cache import caches
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from django.core.cache.backends.base import BaseCache
+
+logger = logging.getLogger(__name__)
+
+_DEFAULTS: dict[str, Any] = {
+    "ALIAS": "default",
+    "TTL": 3600,
+}
+
+# Requests no Wagtail Site matches share this entry.
+NO_SITE = 0
+
+
+def _conf() -> dict[str, Any]:
+    return {**_DEFAULTS, **getattr(settings, "HOMEPAGE_CACHE", {})}
+
+
+def _cache() -> BaseCache:
+    return caches[_conf()["ALIAS"]]
+
+
+def _generation_key(site_id: int) -> str:
+    return f"cms:hydrated:gen:{site_id}"
+
+
+def payload_key(site_id: int) -> str:
+    generation = _cache().get(_generation_key(site_id), 0)
+    return f"cms:hydrated:{site_id}:g{generation}:all"
+
+
+def get_or_build(site_id: int, build: Callable[[], bytes]) -> bytes:
+    """The cached body for `site_id`, or `build()`'s, stored for next time."""
+    cache = _cache()
+    key = payload_key(site_id)
+    body = cache.get(key)
+    if body is None:
+        body = build()
+        cache.set(key, body, timeout=_conf()["TTL"])
+    return body
+
+
+def invalidate_sites(site_ids: Iterable[int]) -> None:
+    """Orphan the cached payload of each site."""
+    cache = _cache()
+    for site_id in site_ids:
+        key = _generation_key(site_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+    logger.debug("Homepage cache invalidated: sites %s", list(site_ids))
+
+
+def invalidate_all() -> None:
+    """Orphan the cached payload of every site."""
+    from wagtail.models import Site
+
+    invalidate_sites([NO_SITE, *Site.objects.values_list("id", flat=True)])
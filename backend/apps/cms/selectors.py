@@ -4,8 +4,11 @@ import logging
 from typing import TYPE_CHECKING, Any, TypedDict
 
 from django.db.models import Prefetch
+from rest_framework.renderers import JSONRenderer
 from wagtail.models import Site
 
+from . import cache
+
 if TYPE_CHECKING:
     from django.http import HttpRequest
 
@@ -99,7 +102,27 @@ def get_hydrated_homepage_payload(
     - No fallbacks: Fails fast if dependencies are missing.
     - Orchestrated: Composes smaller internal 'require' functions.
     """
+    return _build_hydrated_payload(request=request, site=_require_site(request))
+
+
+def get_hydrated_homepage_json(*, request: HttpRequest) -> bytes:
+    """
+    The hydrated payload rendered to JSON, cached per site (see cache.py).
+
+    Only a cache miss builds the payload; a hit costs the site lookup.
+    """
     site = _require_site(request)
+
+    def build() -> bytes:
+        payload = _build_hydrated_payload(request=request, site=site)
+        return JSONRenderer().render(payload)
+
+    return cache.get_or_build(site.pk if site else cache.NO_SITE, build)
+
+
+def _build_hydrated_payload(
+    *, request: HttpRequest, site: Site | None
+) -> HydratedHomepagePayload:
     page_obj = _require_homepage(site)
 
     payload: HydratedHomepagePayload = {
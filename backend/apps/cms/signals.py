@@ -1,67 +1,55 @@
-# signals.py
-# from django.core.cache import cache
-# from django.db.models.signals import post_delete, post_save
-# from django.dispatch import receiver
-# from wagtail.models import Site
+"""Invalidate the hydrated homepage cache (apps.cms.cache) on content changes.
 
-# from apps.cms.pages import HeroSlide, HomePage
-# from apps.cms.settings import GiftSettings, SerenitySettings
+Each receiver bumps the generation on commit, so a rolled-back edit
+invalidates nothing. Homepage content reaches visitors only once
+published, so HomePage drafts are ignored; HeroSlide rows are written
+by the publish itself.
+Services and homepages can surface on any site, settings on their own.
+"""
 
-# # Import Service model for cache invalidation
-# try:
-#     from apps.services.models import Service
-# except ImportError:
-#     Service = None
+from __future__ import annotations
 
+import logging
+from typing import Any
 
-# def _delete_hydrated_cache():
-#     """Clears the combined hydrated cache for all sites and languages."""
-#     site_ids = list(Site.objects.values_list("id", flat=True)) or [0]
-#     for site_id in site_ids:
-#         cache.delete(f"cms:hydrated:{site_id}:all")
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from wagtail.signals import page_published, page_unpublished
 
+from apps.services.models import Service
 
-# def _delete_homepage_cache_variants():
-#     """Clears specific homepage caches + the hydrated bundle."""
-#     site_ids = list(Site.objects.values_list("id", flat=True)) or [0]
-#     for lang in ("en", "fr"):
-#         for site_id in site_ids:
-#             cache.delete(f"cms:homepage:{site_id}:{lang}")
-#     _delete_hydrated_cache()
+from . import cache
+from .pages import HeroSlide, HomePage
+from .settings import GiftSettings, SerenitySettings
 
+logger = logging.getLogger(__name__)
 
-# def _delete_globals_cache():
-#     """Clears global settings cache."""
-#     site_ids = list(Site.objects.values_list("id", flat=True)) or [0]
-#     for site_id in site_ids:
-#         cache.delete(f"cms:globals:{site_id}")
 
+@receiver([page_published, page_unpublished], sender=HomePage)
+@receiver(post_delete, sender=HomePage)
+def on_homepage_change(sender: type[HomePage], **kwargs: Any) -> None:
+    """Invalidate every site when a HomePage goes live, offline or away."""
+    transaction.on_commit(cache.invalidate_all)
 
-# @receiver([post_save, post_delete], sender=HomePage)
-# def clear_homepage_cache_on_homepage(sender, **kwargs):
-#     _delete_homepage_cache_variants()
 
+@receiver([post_save, post_delete], sender=HeroSlide)
+def on_hero_slide_change(sender: type[HeroSlide], **kwargs: Any) -> None:
+    """Invalidate every site when a published hero slide changes."""
+    transaction.on_commit(cache.invalidate_all)
 
-# @receiver([post_save, post_delete], sender=HeroSlide)
-# def clear_homepage_cache_on_slide(sender, **kwargs):
-#     _delete_homepage_cache_variants()
 
+@receiver([post_save, post_delete], sender=Service)
+def on_service_change(sender: type[Service], **kwargs: Any) -> None:
+    """Invalidate every site when a Service is created, updated, or deleted."""
+    transaction.on_commit(cache.invalidate_all)
 
-# @receiver([post_save, post_delete], sender=GiftSettings)
-# def clear_globals_cache_on_gift_settings(sender, **kwargs):
-#     _delete_globals_cache()
-#     _delete_hydrated_cache()
 
-
-# @receiver([post_save, post_delete], sender=SerenitySettings)
-# def clear_globals_cache_on_serenity_settings(sender, **kwargs):
-#     _delete_globals_cache()
-#     _delete_hydrated_cache()
-
-
-# if Service is not None:
-
-#     @receiver([post_save, post_delete], sender=Service)
-#     def clear_services_cache(sender, **kwargs):
-#         cache.delete("cms:services")
-#         _delete_hydrated_cache()
+@receiver([post_save, post_delete], sender=GiftSettings)
+@receiver([post_save, post_delete], sender=SerenitySettings)
+def on_site_settings_change(
+    sender: type[GiftSettings | SerenitySettings], instance: Any, **kwargs: Any
+) -> None:
+    """Invalidate the settings' own site."""
+    site_id = instance.site_id
+    transaction.on_commit(lambda: cache.invalidate_sites([site_id]))
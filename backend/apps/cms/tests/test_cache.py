@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import json
+import time
+
+import pytest
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.cms import cache
+from apps.cms.selectors import (
+    get_hydrated_homepage_json,
+    get_hydrated_homepage_payload,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def request_for(rf):
+    def _request(site):
+        return rf.get("/", HTTP_HOST=site.hostname)
+
+    return _request
+
+
+def test_second_request_is_served_from_cache(
+    homepage_site, hero_slides, request_for
+):
+    request = request_for(homepage_site)
+
+    with CaptureQueriesContext(connection) as miss:
+        first = get_hydrated_homepage_json(request=request)
+    with CaptureQueriesContext(connection) as hit:
+        second = get_hydrated_homepage_json(request=request)
+
+    assert second == first
+    assert len(hit) < len(miss)
+    assert json.loads(first) == json.loads(
+        json.dumps(get_hydrated_homepage_payload(request=request))
+    )
+
+
+def test_entries_are_per_site(homepage_site, default_site, gift_settings, request_for):
+    default = json.loads(get_hydrated_homepage_json(request=request_for(default_site)))
+    home = json.loads(get_hydrated_homepage_json(request=request_for(homepage_site)))
+
+    assert default["globals"]["gift"] is not None
+    assert home["globals"]["gift"] is None
+
+
+def test_invalidate_sites_changes_only_their_key(homepage_site, default_site):
+    home_key = cache.payload_key(homepage_site.pk)
+    default_key = cache.payload_key(default_site.pk)
+
+    cache.invalidate_sites([homepage_site.pk])
+
+    assert cache.payload_key(homepage_site.pk) != home_key
+    assert cache.payload_key(default_site.pk) == default_key
+
+
+def test_ttl_comes_from_settings(settings, homepage_site, request_for, monkeypatch):
+    settings.HOMEPAGE_CACHE = {"TTL": 60}
+    timeouts = []
+    backend = cache._cache()
+    original = backend.set
+
+    def spy(key, value, timeout=None, **kwargs):
+        timeouts.append(timeout)
+        return original(key, value, timeout=timeout, **kwargs)
+
+    monkeypatch.setattr(backend, "set", spy)
+
+    get_hydrated_homepage_json(request=request_for(homepage_site))
+
+    assert timeouts == [60]
+
+
+def test_entries_go_to_the_configured_alias(settings, homepage_site, request_for):
+    settings.CACHES = {
+        **settings.CACHES,
+        "homepage": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "serenity-tests-homepage",
+        },
+    }
+    settings.HOMEPAGE_CACHE = {"ALIAS": "homepage"}
+
+    get_hydrated_homepage_json(request=request_for(homepage_site))
+
+    key = cache.payload_key(homepage_site.pk)
+    assert caches["homepage"].get(key) is not None
+    assert caches["default"].get(key) is None
+
+
+@pytest.mark.performance
+def test_cached_payload_benchmark(homepage_site, hero_slides, request_for):
+    """
+    Benchmark: hydrated homepage, cache miss vs. hit.
+
+    Timings are only reported when the assertion fails.
+    """
+    request = request_for(homepage_site)
+    runs = 50
+
+    began = time.perf_counter()
+    for _ in range(runs):
+        cache.invalidate_sites([homepage_site.pk])
+        get_hydrated_homepage_json(request=request)
+    miss = (time.perf_counter() - began) / runs
+
+    began = time.perf_counter()
+    for _ in range(runs):
+        get_hydrated_homepage_json(request=request)
+    hit = (time.perf_counter() - began) / runs
+
+    assert hit < miss, f"hydrated homepage: miss {miss * 1e6:.0f}µs, hit {hit * 1e6:.0f}µs"
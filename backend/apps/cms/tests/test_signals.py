@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import pytest
+from django.db import transaction
+
+from apps.cms import cache
+from apps.cms.pages import HeroSlide
+from apps.cms.selectors import get_hydrated_homepage_json
+from apps.cms.settings import GiftSettings
+from apps.services.models import Service
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def cached(rf, homepage_site, default_site):
+    """Warm both sites' entries; returns their current cache keys."""
+
+    def keys():
+        return {
+            site.pk: cache.payload_key(site.pk)
+            for site in (homepage_site, default_site)
+        }
+
+    for site in (homepage_site, default_site):
+        get_hydrated_homepage_json(request=rf.get("/", HTTP_HOST=site.hostname))
+    return keys
+
+
+def test_publish_invalidates(cached, homepage, django_capture_on_commit_callbacks):
+    before = cached()
+    homepage.hero_title_en = "New title"
+
+    with django_capture_on_commit_callbacks(execute=True):
+        homepage.save_revision().publish()
+
+    after = cached()
+    assert all(after[site_id] != before[site_id] for site_id in before)
+
+
+def test_draft_revision_does_not_invalidate(
+    cached, homepage, django_capture_on_commit_callbacks
+):
+    before = cached()
+    homepage.hero_title_en = "Draft title"
+
+    with django_capture_on_commit_callbacks(execute=True):
+        homepage.save_revision()
+
+    assert cached() == before
+
+
+def test_service_change_invalidates(cached, django_capture_on_commit_callbacks):
+    before = cached()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Service.objects.create(title_en="Massage", title_fr="Massage")
+
+    assert all(cached()[site_id] != key for site_id, key in before.items())
+
+
+def test_hero_slide_change_invalidates(
+    cached, homepage, django_capture_on_commit_callbacks
+):
+    before = cached()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        HeroSlide.objects.create(page=homepage, sort_order=3, title_en="Slide C")
+
+    assert all(cached()[site_id] != key for site_id, key in before.items())
+
+
+def test_site_settings_invalidate_only_their_site(
+    cached, default_site, homepage_site, django_capture_on_commit_callbacks
+):
+    before = cached()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        GiftSettings.objects.create(site=default_site, is_enabled=True)
+
+    after = cached()
+    assert after[default_site.pk] != before[default_site.pk]
+    assert after[homepage_site.pk] == before[homepage_site.pk]
+
+
+def test_rolled_back_change_does_not_invalidate(
+    cached, django_capture_on_commit_callbacks
+):
+    before = cached()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        try:
+            with transaction.atomic():
+                Service.objects.create(title_en="Massage", title_fr="Massage")
+                raise RuntimeError("rollback")
+        except RuntimeError:
+            pass
+
+    assert cached() == before
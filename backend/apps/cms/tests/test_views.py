@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import json
+
 import pytest
 from django.urls import reverse
 
@@ -20,12 +22,13 @@ class TestHydratedHomepageView:
             "testimonials": [],
         }
         monkeypatch.setattr(
-            "apps.cms.views.get_hydrated_homepage_payload",
-            lambda **kwargs: payload,
+            "apps.cms.views.get_hydrated_homepage_json",
+            lambda **kwargs: json.dumps(payload).encode(),
         )
 
         res = client.get(HOMEPAGE_URL)
         assert res.status_code == 200
+        assert res["Content-Type"] == "application/json"
         assert res.json() == payload
 
     def test_cms_hydration_error_returns_500(self, client, monkeypatch):
@@ -33,7 +36,7 @@ class TestHydratedHomepageView:
             raise CmsHydrationError("No HomePage found")
 
         monkeypatch.setattr(
-            "apps.cms.views.get_hydrated_homepage_payload",
+            "apps.cms.views.get_hydrated_homepage_json",
             boom,
         )
 
@@ -47,7 +50,7 @@ class TestHydratedHomepageView:
             raise ValueError("unexpected")
 
         monkeypatch.setattr(
-            "apps.cms.views.get_hydrated_homepage_payload",
+            "apps.cms.views.get_hydrated_homepage_json",
             boom,
         )
 
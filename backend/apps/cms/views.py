@@ -3,12 +3,13 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING
 
+from django.http import HttpResponse
 from drf_spectacular.utils import extend_schema
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
-from .selectors import CmsHydrationError, get_hydrated_homepage_payload
+from .selectors import CmsHydrationError, get_hydrated_homepage_json
 from .serializers import ErrorResponseSerializer, HydratedHomepageResponseSerializer
 
 if TYPE_CHECKING:
@@ -25,9 +26,13 @@ logger = logging.getLogger(__name__)
 )
 @api_view(["GET"])
 @permission_classes([AllowAny])
-def hydrated_homepage_view(request: Request) -> Response:
+def hydrated_homepage_view(request: Request) -> HttpResponse:
     try:
-        return Response(get_hydrated_homepage_payload(request=request))
+        # Already-rendered JSON, usually straight from the cache.
+        return HttpResponse(
+            get_hydrated_homepage_json(request=request),
+            content_type="application/json",
+        )
     except CmsHydrationError as exc:
         logger.error("Hydration pipeline failed: %s", exc)
         return Response(
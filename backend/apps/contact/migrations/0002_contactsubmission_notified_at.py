@@ -0,0 +1,26 @@
+# Generated by Django 5.2.15 on 2026-10-18 06:26
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def mark_existing_notified(apps, schema_editor):
+    # Submissions from before the field existed were emailed inline.
+    ContactSubmission = apps.get_model('contact', 'ContactSubmission')
+    ContactSubmission.objects.update(notified_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contact', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contactsubmission',
+            name='notified_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(mark_existing_notified, migrations.RunPython.noop),
+    ]
@@ -22,6 +22,8 @@ class ContactSubmission(models.Model):
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     is_read = models.BooleanField(default=False, verbose_name='Lu')
     admin_notes = models.TextField(blank=True, verbose_name='Notes admin')
+    # When the studio was emailed about it (alone or in a digest).
+    notified_at = models.DateTimeField(null=True, blank=True, editable=False)
 
     # Fix RUF012: Annotate mutable class attribute with ClassVar
     panels: ClassVar[list] = [
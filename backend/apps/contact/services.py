@@ -1,42 +1,70 @@
+"""Contact form submissions and the studio's notification emails.
+
+The request only inserts the submission and, in the same transaction,
+a `contact.notify` job (apps.jobs); the form answers at insert latency.
+The job emails the studio about every submission not yet notified.
+
+With CONTACT_NOTIFICATIONS["DIGEST_WINDOW"] set, the job runs that
+many seconds after a submission, so everything that arrived in the
+window goes out as one digest email; DIGEST_MAX pending submissions
+send the digest at once. With no window, each submission gets its own
+email as soon as the job worker picks it up.
+"""
+
+from __future__ import annotations
+
 import logging
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
 
 from django.conf import settings
-from django.core.mail import EmailMessage
-from django.http import HttpRequest
+from django.db import transaction
+from django.utils import timezone
 
 from apps.core.utils import get_client_ip
+from apps.emails.outbox import queue_email
+from apps.emails.rendering import render_email
+from apps.jobs.queue import enqueue
 
 from .models import ContactSubmission
 
+if TYPE_CHECKING:
+    from django.http import HttpRequest
+
 logger = logging.getLogger(__name__)
 
+NOTIFY = "contact.notify"
+
+_DEFAULTS: dict[str, Any] = {
+    "DIGEST_WINDOW": 0,
+    "DIGEST_MAX": 20,
+}
+
+
+def _conf() -> dict[str, Any]:
+    return {**_DEFAULTS, **getattr(settings, "CONTACT_NOTIFICATIONS", {})}
+
 
 def create_submission(
     *, request: HttpRequest, data: dict
 ) -> ContactSubmission:
     """
-    Persist a contact submission and attempt to send an email notification.
+    Persist a contact submission and schedule its email notification.
 
     `data` must already be validated (via ContactSubmissionSerializer).
     """
     ip_address = get_client_ip(request)
 
-    submission = ContactSubmission.objects.create(
-        name=data["name"],
-        email=data["email"],
-        phone=data.get("phone", ""),
-        subject=data["subject"],
-        message=data["message"],
-        ip_address=ip_address,
-    )
-
-    try:
-        _send_notification_email(submission, ip_address)
-    except Exception:
-        logger.exception(
-            "Failed to send contact notification email (submission=%s)",
-            submission.pk,
+    with transaction.atomic():
+        submission = ContactSubmission.objects.create(
+            name=data["name"],
+            email=data["email"],
+            phone=data.get("phone", ""),
+            subject=data["subject"],
+            message=data["message"],
+            ip_address=ip_address,
         )
+        _schedule_notification()
 
     logger.info(
         "Contact submission created: %s (%s)", submission.pk, ip_address
@@ -44,23 +72,66 @@ def create_submission(
     return submission
 
 
+def _schedule_notification() -> None:
+    """Queue the notify job: after the digest window, or now if it is full."""
+    conf = _conf()
+    delay = timedelta(seconds=conf["DIGEST_WINDOW"])
+    if delay and (
+        ContactSubmission.objects.filter(notified_at__isnull=True).count()
+        >= conf["DIGEST_MAX"]
+    ):
+        delay = timedelta()
+    enqueue(NOTIFY, delay=delay)
+
+
+def notify_admin() -> int:
+    """Email the studio about submissions not yet notified; how many.
+
+    The emails are queued in the outbox and the submissions marked in
+    one transaction, so a failure leaves them for the job's retry.
+    """
+    with transaction.atomic():
+        pending = list(
+            ContactSubmission.objects.select_for_update(skip_locked=True)
+            .filter(notified_at__isnull=True)
+            .order_by("created_at", "pk")
+        )
+        if not pending:
+            return 0
+        if _conf()["DIGEST_WINDOW"] and len(pending) > 1:
+            _send_digest_email(pending)
+        else:
+            for submission in pending:
+                _send_notification_email(submission, submission.ip_address or "")
+        ContactSubmission.objects.filter(
+            pk__in=[submission.pk for submission in pending]
+        ).update(notified_at=timezone.now())
+    return len(pending)
+
+
 def _send_notification_email(
     submission: ContactSubmission, ip_address: str
 ) -> None:
-    """Send admin notification email for a new contact submission."""
-    body = (
-        f"Nom: {submission.name}\n"
-        f"Email: {submission.email}\n"
-        f"Téléphone: {submission.phone}\n"
-        f"Sujet: {submission.subject}\n\n"
-        f"Message:\n{submission.message}\n\n"
-        f"IP: {ip_address}\n"
+    """Queue the admin notification email for a new contact submission."""
+    email = render_email(
+        "contact_notification",
+        {"submission": submission, "ip_address": ip_address},
     )
+    queue_email(
+        email.message(
+            to=[settings.EMAIL_HOST_USER],
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            reply_to=[submission.email],
+        )
+    )
+
 
-    EmailMessage(
-        subject=f"[Serenity] Nouvelle demande: {submission.subject}",
-        body=body,
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        to=[settings.EMAIL_HOST_USER],
-        reply_to=[submission.email],
-    ).send(fail_silently=False)
+def _send_digest_email(submissions: list[ContactSubmission]) -> None:
+    """Queue one admin email covering several submissions."""
+    email = render_email("contact_digest", {"submissions": submissions})
+    queue_email(
+        email.message(
+            to=[settings.EMAIL_HOST_USER],
+            from_email=settings.DEFAULT_FROM_EMAIL,
+        )
+    )
@@ -0,0 +1,12 @@
+"""Contact notifications, run by the job queue (apps.jobs)."""
+
+from __future__ import annotations
+
+from apps.jobs.queue import task
+
+from . import services
+
+
+@task(services.NOTIFY)
+def notify_admin() -> None:
+    services.notify_admin()
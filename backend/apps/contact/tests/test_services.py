@@ -3,9 +3,18 @@ from unittest.mock import patch
 import pytest
 from django.core import mail
 from django.test import override_settings
+from django.utils import timezone
 
 from apps.contact.models import ContactSubmission
-from apps.contact.services import _send_notification_email, create_submission
+from apps.contact.services import (
+    NOTIFY,
+    _send_notification_email,
+    create_submission,
+)
+from apps.emails.models import OutboundEmail
+from apps.emails.outbox import deliver_pending
+from apps.jobs.models import Job, JobStatus
+from apps.jobs.queue import run_pending
 
 EMAIL_BACKEND_LOCMEM = (
     "django.core.mail.backends.locmem.EmailBackend"
@@ -57,7 +66,7 @@ class TestCreateSubmission:
         assert sub.ip_address == "203.0.113.50"
 
     @patch("apps.contact.services._send_notification_email")
-    def test_calls_notification_email(
+    def test_notification_is_left_to_the_job_queue(
         self, mock_send, rf, valid_contact_data
     ):
         request = rf.post("/")
@@ -66,13 +75,19 @@ class TestCreateSubmission:
         sub = create_submission(
             request=request, data=valid_contact_data
         )
+        mock_send.assert_not_called()
+        assert Job.objects.get().task == NOTIFY
+
+        assert run_pending() == {"done": 1, "failed": 0}
         mock_send.assert_called_once_with(sub, "10.0.0.1")
+        sub.refresh_from_db()
+        assert sub.notified_at is not None
 
     @patch(
         "apps.contact.services._send_notification_email",
-        side_effect=Exception("SMTP down"),
+        side_effect=Exception("template broken"),
     )
-    def test_email_failure_does_not_raise(
+    def test_notification_failure_is_retried(
         self, mock_send, rf, valid_contact_data
     ):
         request = rf.post("/")
@@ -81,32 +96,74 @@ class TestCreateSubmission:
         sub = create_submission(
             request=request, data=valid_contact_data
         )
-        assert sub.pk is not None
-        assert ContactSubmission.objects.count() == 1
 
-    @patch(
-        "apps.contact.services._send_notification_email",
-        side_effect=Exception("boom"),
-    )
-    def test_email_failure_logs_exception(
-        self, mock_send, rf, valid_contact_data, caplog
-    ):
-        request = rf.post("/")
-        request.META["REMOTE_ADDR"] = "10.0.0.1"
+        assert run_pending() == {"done": 0, "failed": 1}
+        sub.refresh_from_db()
+        assert sub.notified_at is None
+        assert Job.objects.get().status == JobStatus.QUEUED
 
-        import logging
 
-        with caplog.at_level(
-            logging.ERROR, logger="apps.contact.services"
-        ):
+@pytest.mark.django_db
+class TestNotificationDigest:
+    @pytest.fixture(autouse=True)
+    def _admin_address(self, settings):
+        settings.EMAIL_HOST_USER = "admin@serenity.test"
+
+    def _submit(self, rf, data, n=1):
+        request = rf.post("/")
+        request.META["REMOTE_ADDR"] = "10.0.0.1"
+        for i in range(n):
             create_submission(
-                request=request, data=valid_contact_data
+                request=request, data={**data, "subject": f"Demande {i}"}
             )
 
-        assert (
-            "Failed to send contact notification email"
-            in caplog.text
-        )
+    def _run_due_now(self):
+        Job.objects.update(run_after=timezone.now())
+        return run_pending()
+
+    def test_each_submission_is_emailed_without_a_window(
+        self, rf, valid_contact_data
+    ):
+        self._submit(rf, valid_contact_data, n=3)
+
+        assert run_pending() == {"done": 3, "failed": 0}
+        assert OutboundEmail.objects.count() == 3
+
+    @override_settings(CONTACT_NOTIFICATIONS={"DIGEST_WINDOW": 600})
+    def test_window_gathers_submissions_into_one_digest(
+        self, rf, valid_contact_data
+    ):
+        self._submit(rf, valid_contact_data, n=3)
+
+        assert run_pending() == {"done": 0, "failed": 0}  # window still open
+        assert self._run_due_now() == {"done": 3, "failed": 0}
+
+        digest = OutboundEmail.objects.get()
+        assert digest.subject == "[Serenity] 3 nouvelles demandes"
+        assert "Demande 0" in digest.body
+        assert "Demande 2" in digest.body
+        assert not ContactSubmission.objects.filter(notified_at__isnull=True).exists()
+
+    @override_settings(CONTACT_NOTIFICATIONS={"DIGEST_WINDOW": 600})
+    def test_lone_submission_in_a_window_gets_the_usual_email(
+        self, rf, valid_contact_data
+    ):
+        self._submit(rf, valid_contact_data)
+
+        self._run_due_now()
+
+        email = OutboundEmail.objects.get()
+        assert email.subject == "[Serenity] Nouvelle demande: Demande 0"
+        assert email.reply_to == ["jean@example.com"]
+
+    @override_settings(
+        CONTACT_NOTIFICATIONS={"DIGEST_WINDOW": 600, "DIGEST_MAX": 2}
+    )
+    def test_full_digest_is_sent_at_once(self, rf, valid_contact_data):
+        self._submit(rf, valid_contact_data, n=2)
+
+        assert run_pending() == {"done": 1, "failed": 0}
+        assert OutboundEmail.objects.get().subject == "[Serenity] 2 nouvelles demandes"
 
 
 @pytest.mark.django_db
@@ -127,7 +184,9 @@ class TestSendNotificationEmail:
         )
 
         _send_notification_email(sub, "1.2.3.4")
+        assert mail.outbox == []  # queued, not sent
 
+        deliver_pending()
         assert len(mail.outbox) == 1
         email = mail.outbox[0]
         assert (
@@ -154,6 +213,7 @@ class TestSendNotificationEmail:
         )
 
         _send_notification_email(sub, "5.6.7.8")
+        deliver_pending()
 
         body = mail.outbox[0].body
         assert "Nom: Pierre" in body
@@ -178,7 +238,7 @@ class TestSendNotificationEmail:
         )
 
         with patch(
-            "apps.contact.services.EmailMessage.send",
+            "apps.contact.services.queue_email",
             side_effect=Exception("connection refused"),
         ):
             with pytest.raises(
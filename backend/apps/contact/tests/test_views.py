@@ -5,6 +5,8 @@ from django.core.cache import cache
 from rest_framework.test import APIClient
 
 from apps.contact.models import ContactSubmission
+from apps.contact.services import NOTIFY
+from apps.jobs.models import Job
 
 
 @pytest.fixture(autouse=True)
@@ -70,6 +72,25 @@ class TestSubmitContactView:
         assert sub.phone == ""
         assert sub.subject == "Question"
 
+    def test_submission_does_not_touch_the_mail_server(self, api_client):
+        payload = {
+            "name": "Marie",
+            "email": "marie@example.com",
+            "subject": "Question",
+            "message": (
+                "Message assez long pour passer la validation."
+            ),
+        }
+
+        with patch("django.core.mail.get_connection") as get_connection:
+            resp = api_client.post(
+                SUBMIT_URL, payload, format="json"
+            )
+
+        assert resp.status_code == 201
+        get_connection.assert_not_called()
+        assert Job.objects.filter(task=NOTIFY).count() == 1
+
     def test_missing_name_returns_400(self, api_client):
         payload = {
             "email": "a@b.com",
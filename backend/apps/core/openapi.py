@@ -0,0 +1,100 @@
+"""OpenAPI descriptions for views DRF does not dispatch.
+
+drf-spectacular only documents DRF views. Native async Django views
+(DRF cannot run async views) would otherwise drop out of schema.yml,
+and with it out of the frontend's generated types and the schemathesis
+contract run. `documented_view` registers such a view with a thin
+APIView that carries its @extend_schema annotations and answers by
+calling the view; `add_documented_views`, a PREPROCESSING_HOOKS entry,
+adds those APIViews to the schema at the views' URLs. The URL conf
+still routes requests to the async views themselves.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.urls import URLPattern, URLResolver
+from drf_spectacular.generators import EndpointEnumerator
+from drf_spectacular.utils import extend_schema
+from rest_framework.permissions import AllowAny
+from rest_framework.views import APIView
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Sequence
+
+    from django.http import HttpResponse
+    from rest_framework.request import Request
+
+View = TypeVar("View", bound="Callable[..., Any]")
+Endpoint = tuple[str, str, str, "Callable[..., Any]"]
+
+# Documented views mapped to the APIView that describes each.
+_schema_views: dict[Callable[..., Any], type[APIView]] = {}
+
+
+def _handler(view: Callable[..., Any]) -> Callable[..., Any]:
+    # extend_schema annotates the function it decorates, so every method
+    # of every documented view needs its own.
+    call = async_to_sync(view) if iscoroutinefunction(view) else view
+
+    def handler(self: APIView, request: Request, *args: Any, **kwargs: Any) -> HttpResponse:
+        return call(request._request, *args, **kwargs)
+
+    return handler
+
+
+def documented_view(
+    *, methods: Sequence[str] = ("GET",), **schema: Any
+) -> Callable[[View], View]:
+    """Describe a plain Django view to drf-spectacular.
+
+    `schema` takes extend_schema's arguments (parameters, responses,
+    ...). The view's docstring becomes the operation's description.
+    Apply it outermost, so the registered callable is the URL conf's.
+    """
+
+    def register(view: View) -> View:
+        handlers = {
+            method.lower(): extend_schema(**schema)(_handler(view)) for method in methods
+        }
+        _schema_views[view] = type(
+            f"{view.__name__}_schema",
+            (APIView,),
+            {
+                **handlers,
+                "__doc__": view.__doc__,
+                "__module__": view.__module__,
+                "authentication_classes": [],
+                "permission_classes": [AllowAny],
+            },
+        )
+        return view
+
+    return register
+
+
+def _documented(
+    patterns: Iterable[URLPattern | URLResolver], prefix: str = ""
+) -> Iterable[tuple[str, type[APIView]]]:
+    for pattern in patterns:
+        path_regex = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            yield from _documented(pattern.url_patterns, path_regex)
+        elif pattern.callback in _schema_views:
+            yield path_regex, _schema_views[pattern.callback]
+
+
+def add_documented_views(endpoints: list[Endpoint], **kwargs: Any) -> list[Endpoint]:
+    """SPECTACULAR_SETTINGS["PREPROCESSING_HOOKS"] entry for documented_view."""
+    enumerator = EndpointEnumerator()
+    added = []
+    for path_regex, schema_view in _documented(enumerator.patterns):
+        callback = schema_view.as_view()
+        path = enumerator.get_path_from_regex(path_regex)
+        added.extend(
+            (path, path_regex, method, callback)
+            for method in enumerator.get_allowed_methods(callback)
+        )
+    return [*endpoints, *added]
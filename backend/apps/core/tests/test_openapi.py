@@ -0,0 +1,43 @@
+"""Tests for apps.core.openapi: plain async views in the OpenAPI schema."""
+from __future__ import annotations
+
+from django.http import JsonResponse
+from django.urls import path
+from rest_framework.test import APIRequestFactory
+
+from apps.core import openapi
+from apps.core.openapi import add_documented_views, documented_view
+
+
+@documented_view(responses={200: None})
+async def ping(request):
+    """Answer with a pong."""
+    return JsonResponse({"pong": request.GET.get("n")})
+
+
+urlpatterns = [path("api/ping/", ping)]
+
+
+def test_views_are_left_untouched():
+    assert not hasattr(ping, "cls")
+    assert not hasattr(ping, "initkwargs")
+
+
+def test_hook_adds_documented_views_at_their_urls(settings):
+    settings.ROOT_URLCONF = __name__
+
+    endpoints = add_documented_views([])
+
+    assert [(p, regex, method) for p, regex, method, _ in endpoints] == [
+        ("/api/ping/", "api/ping/", "GET")
+    ]
+    assert endpoints[0][3].cls.__doc__ == "Answer with a pong."
+
+
+def test_schema_view_answers_like_the_view():
+    view = openapi._schema_views[ping].as_view()
+
+    response = view(APIRequestFactory().get("/api/ping/", {"n": "3"}))
+
+    assert response.status_code == 200
+    assert response.content == b'{"pong": "3"}'
@@ -0,0 +1,21 @@
+from django.contrib import admin, messages
+from django.db.models import QuerySet
+from django.http import HttpRequest
+
+from .models import OutboundEmail
+from .outbox import retry
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ("subject", "status", "attempts", "run_after", "created_at", "sent_at")
+    list_filter = ("status",)
+    search_fields = ("subject", "to", "last_error")
+    date_hierarchy = "created_at"
+    readonly_fields = ("attempts", "locked_until", "last_error", "created_at", "sent_at")
+    actions = ("retry_dead",)
+
+    @admin.action(description="Retry selected dead emails")
+    def retry_dead(self, request: HttpRequest, queryset: QuerySet[OutboundEmail]) -> None:
+        requeued = retry(queryset)
+        self.message_user(request, f"{requeued} email(s) queued again.", messages.SUCCESS)
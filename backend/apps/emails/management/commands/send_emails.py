@@ -0,0 +1,50 @@
+"""Send the messages waiting in the email outbox."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from apps.emails import sender
+from apps.emails.outbox import deliver_pending
+
+
+class Command(BaseCommand):
+    help = (
+        "Send queued emails from the outbox, one SMTP connection per batch. "
+        "Failures are retried with backoff and marked dead after their last "
+        "attempt. Drains once, or keeps polling with --loop."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running, polling every --interval seconds when idle.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=sender.POLL_INTERVAL,
+            help=f"Idle poll interval with --loop (default: {sender.POLL_INTERVAL}).",
+        )
+        parser.add_argument(
+            "--batch",
+            type=int,
+            default=None,
+            help="Messages sent per connection (default: EMAIL_OUTBOX['BATCH']).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["loop"]:
+            sender.run_forever(batch=options["batch"], interval=options["interval"])
+            return
+        sent = failed = 0
+        while True:
+            counts = deliver_pending(options["batch"])
+            if not (counts["sent"] or counts["failed"]):
+                break
+            sent += counts["sent"]
+            failed += counts["failed"]
+        self.stdout.write(f"{sent} email(s) sent, {failed} failed")
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from django.db import models
+from django.utils import timezone
+
+
+class OutboundEmailStatus(models.TextChoices):
+    QUEUED = "queued", "Queued"
+    SENDING = "sending", "Sending"
+    SENT = "sent", "Sent"
+    # Out of attempts: parked for a human to look at.
+    DEAD = "dead", "Dead"
+
+
+class OutboundEmail(models.Model):
+    """A message waiting in the outbox, sent by `manage.py send_emails`.
+
+    Queuing is an INSERT in the caller's transaction, so the mail for a
+    voucher, booking or contact submission exists exactly when that row
+    committed, and the request never waits on SMTP. The sender claims
+    due rows the way the job queue does (FOR UPDATE SKIP LOCKED plus a
+    lease) and delivers a batch over one SMTP connection.
+    """
+
+    subject = models.CharField(max_length=998)
+    body = models.TextField(blank=True, default="")
+    html = models.TextField(blank=True, default="")
+    from_email = models.CharField(max_length=254, blank=True, default="")
+    to = models.JSONField(default=list)
+    cc = models.JSONField(default=list, blank=True)
+    bcc = models.JSONField(default=list, blank=True)
+    reply_to = models.JSONField(default=list, blank=True)
+    headers = models.JSONField(default=dict, blank=True)
+    status = models.CharField(
+        max_length=20,
+        choices=OutboundEmailStatus.choices,
+        default=OutboundEmailStatus.QUEUED,
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=10)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ("-created_at",)
+        indexes = (
+            models.Index(fields=["status", "run_after"], name="outbound_email_due_idx"),
+        )
+
+    def __str__(self) -> str:
+        return f"{self.subject} → {', '.join(self.to)} ({self.status})"
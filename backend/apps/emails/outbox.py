@@ -0,0 +1,198 @@
+"""The transactional email outbox.
+
+Code that used to call `message.send()` inside a request calls
+queue_email(message) instead: the message is stored in the caller's
+transaction and sent later by deliver_pending(), from `manage.py
+send_emails` or the web worker's sender thread (sender.py). A request
+that sends mail costs one INSERT, whatever SMTP is doing.
+
+deliver_pending() claims a batch of due messages and sends them over a
+single connection from get_connection(), so a voucher's three emails
+share one TLS handshake instead of opening three. Each message keeps
+its own status: one refused recipient is retried with backoff (and
+eventually marked DEAD) without holding up the rest of the batch.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import traceback
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.jobs.queue import backoff
+
+from .models import OutboundEmail, OutboundEmailStatus
+
+if TYPE_CHECKING:
+    from django.core.mail import EmailMessage
+    from django.db.models import QuerySet
+
+logger = logging.getLogger(__name__)
+
+_DEFAULTS: dict[str, Any] = {
+    "MAX_ATTEMPTS": 10,
+    "BATCH": 50,
+    "LEASE": 300,
+}
+
+# Set when a queued message commits, so an idle sender wakes at once.
+pending = threading.Event()
+
+
+def _conf() -> dict[str, Any]:
+    return {**_DEFAULTS, **getattr(settings, "EMAIL_OUTBOX", {})}
+
+
+def queue_email(message: EmailMessage) -> OutboundEmail | None:
+    """Store `message` for delivery; commits with the caller.
+
+    Like EmailMessage.send(), a message without recipients is dropped.
+    Only text bodies with an optional HTML alternative are supported.
+    """
+    if not message.recipients():
+        return None
+    if message.attachments:
+        raise ValueError("The email outbox does not store attachments")
+    html = ""
+    for content, mimetype in getattr(message, "alternatives", ()):
+        if mimetype == "text/html":
+            html = str(content)
+    email = OutboundEmail.objects.create(
+        subject=message.subject,
+        body=message.body,
+        html=html,
+        from_email=message.from_email or "",
+        to=list(message.to),
+        cc=list(message.cc),
+        bcc=list(message.bcc),
+        reply_to=list(message.reply_to),
+        headers=dict(message.extra_headers),
+        max_attempts=_conf()["MAX_ATTEMPTS"],
+    )
+    transaction.on_commit(pending.set)
+    return email
+
+
+def to_message(email: OutboundEmail) -> EmailMultiAlternatives:
+    """Rebuild the message a row was queued from."""
+    message = EmailMultiAlternatives(
+        subject=email.subject,
+        body=email.body,
+        from_email=email.from_email or None,
+        to=email.to,
+        cc=email.cc,
+        bcc=email.bcc,
+        reply_to=email.reply_to,
+        headers=email.headers,
+    )
+    if email.html:
+        message.attach_alternative(email.html, "text/html")
+    return message
+
+
+def claim(limit: int) -> list[OutboundEmail]:
+    """Lease up to `limit` due messages to this sender.
+
+    Same rules as the job queue: queued messages whose time has come,
+    and messages whose sender died mid-batch once their lease runs out.
+    """
+    now = timezone.now()
+    lease = now + timedelta(seconds=_conf()["LEASE"])
+    with transaction.atomic():
+        emails = list(
+            OutboundEmail.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=OutboundEmailStatus.QUEUED, run_after__lte=now)
+                | Q(status=OutboundEmailStatus.SENDING, locked_until__lt=now)
+            )
+            .order_by("run_after", "id")[:limit]
+        )
+        for email in emails:
+            email.status = OutboundEmailStatus.SENDING
+            email.attempts += 1
+            email.locked_until = lease
+        OutboundEmail.objects.bulk_update(emails, ["status", "attempts", "locked_until"])
+    return emails
+
+
+def _retry_or_bury(email: OutboundEmail, error: str) -> None:
+    email.locked_until = None
+    email.last_error = error
+    if email.attempts >= email.max_attempts:
+        logger.error(
+            "Email %s dead after %d attempt(s): %s",
+            email.pk,
+            email.attempts,
+            error.splitlines()[-1],
+        )
+        email.status = OutboundEmailStatus.DEAD
+        email.save(update_fields=["status", "locked_until", "last_error"])
+        return
+    email.status = OutboundEmailStatus.QUEUED
+    email.run_after = timezone.now() + backoff(email.attempts)
+    email.save(update_fields=["status", "locked_until", "last_error", "run_after"])
+    logger.warning(
+        "Email %s failed (attempt %d); retrying at %s",
+        email.pk,
+        email.attempts,
+        email.run_after,
+    )
+
+
+def deliver(emails: list[OutboundEmail]) -> dict[str, int]:
+    """Send claimed messages over one connection; counts of outcomes.
+
+    After a failure the connection is closed and reopened for the next
+    message, in case the server dropped it.
+    """
+    counts = {"sent": 0, "failed": 0}
+    connection = get_connection(fail_silently=False)
+    is_open = False
+    try:
+        for email in emails:
+            try:
+                if not is_open:
+                    connection.open()
+                    is_open = True
+                connection.send_messages([to_message(email)])
+            except Exception:
+                counts["failed"] += 1
+                _retry_or_bury(email, traceback.format_exc(limit=5))
+                connection.close()
+                is_open = False
+                continue
+            counts["sent"] += 1
+            OutboundEmail.objects.filter(pk=email.pk).update(
+                status=OutboundEmailStatus.SENT,
+                locked_until=None,
+                last_error="",
+                sent_at=timezone.now(),
+            )
+    finally:
+        connection.close()
+    return counts
+
+
+def deliver_pending(limit: int | None = None) -> dict[str, int]:
+    """Claim and send one batch of due messages; counts of outcomes."""
+    emails = claim(limit or _conf()["BATCH"])
+    if not emails:
+        return {"sent": 0, "failed": 0}
+    return deliver(emails)
+
+
+def retry(emails: QuerySet[OutboundEmail]) -> int:
+    """Put dead messages back in the outbox with a fresh set of attempts."""
+    return emails.filter(status=OutboundEmailStatus.DEAD).update(
+        status=OutboundEmailStatus.QUEUED,
+        attempts=0,
+        run_after=timezone.now(),
+    )
@@ -0,0 +1,157 @@
+"""Render the site's transactional emails from their templates.
+
+Every email the site sends is listed in EMAILS under a name: its
+subject (per language where it differs), a plain-text template and an
+optional HTML template, both under templates/. render_email() turns a
+name, a language and a context into a RenderedEmail, whose message()
+is ready for queue_email().
+
+Each (email, language) pair is looked up and compiled once per process
+and kept; later renders only run the compiled templates against the
+context. Every email has a text template of its own, so the plain-text
+part is never derived from the HTML with strip_tags at send time. Text
+and subjects render with autoescaping off — they are not HTML.
+"""
+
+from __future__ import annotations
+
+import functools
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from django.core.mail import EmailMultiAlternatives
+from django.template import Context, engines
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+    from django.template.base import Template
+
+LANGUAGES = ("fr", "en")
+DEFAULT_LANGUAGE = "fr"
+
+
+@dataclass(frozen=True)
+class EmailTemplates:
+    """Where an email's parts come from; `{lang}` is filled in per language."""
+
+    subject: str | Mapping[str, str]
+    text: str
+    html: str = ""
+
+
+EMAILS: dict[str, EmailTemplates] = {
+    "voucher_recipient": EmailTemplates(
+        subject={
+            "fr": "Votre bon cadeau de {{ business_name }}",
+            "en": "Your gift voucher from {{ business_name }}",
+        },
+        text="vouchers/emails/voucher_recipient_{lang}.txt",
+        html="vouchers/emails/voucher_recipient_{lang}.html",
+    ),
+    "voucher_sender": EmailTemplates(
+        subject={
+            "fr": "Reçu de votre commande : {{ voucher.code }}",
+            "en": "Your order receipt: {{ voucher.code }}",
+        },
+        text="vouchers/emails/voucher_sender_{lang}.txt",
+        html="vouchers/emails/voucher_sender_{lang}.html",
+    ),
+    "voucher_admin": EmailTemplates(
+        subject="New voucher sold: {{ voucher.code }}",
+        text="vouchers/email_admin.txt",
+        html="vouchers/email_admin.html",
+    ),
+    "booking_confirmation": EmailTemplates(
+        subject={
+            "fr": "Votre réservation — La Serenity",
+            "en": "Your booking — La Serenity",
+        },
+        text="emails/booking_confirmation_{lang}.txt",
+    ),
+    "booking_admin": EmailTemplates(
+        subject="New booking: {{ booking.customer_name }} — {{ when }}",
+        text="emails/booking_admin.txt",
+    ),
+    "booking_conflict": EmailTemplates(
+        subject="Booking conflict — refund needed: {{ payload.sender_name }}",
+        text="emails/booking_conflict.txt",
+    ),
+    "contact_notification": EmailTemplates(
+        subject="[Serenity] Nouvelle demande: {{ submission.subject }}",
+        text="emails/contact_notification.txt",
+    ),
+    "contact_digest": EmailTemplates(
+        subject="[Serenity] {{ submissions|length }} nouvelles demandes",
+        text="emails/contact_digest.txt",
+    ),
+}
+
+
+@dataclass(frozen=True)
+class RenderedEmail:
+    subject: str
+    body: str
+    html: str = ""
+
+    def message(
+        self,
+        *,
+        to: Sequence[str],
+        from_email: str | None = None,
+        reply_to: Sequence[str] = (),
+    ) -> EmailMultiAlternatives:
+        message = EmailMultiAlternatives(
+            subject=self.subject,
+            body=self.body,
+            from_email=from_email,
+            to=list(to),
+            reply_to=list(reply_to),
+        )
+        if self.html:
+            message.attach_alternative(self.html, "text/html")
+        return message
+
+
+@dataclass(frozen=True)
+class _Compiled:
+    subject: Template
+    text: Template
+    html: Template | None
+
+
+@functools.cache
+def _compiled(name: str, lang: str) -> _Compiled:
+    engine = engines["django"].engine  # type: ignore[attr-defined]
+    templates = EMAILS[name]
+    subject = templates.subject
+    if not isinstance(subject, str):
+        subject = subject.get(lang) or subject[DEFAULT_LANGUAGE]
+    return _Compiled(
+        subject=engine.from_string(subject),
+        text=engine.get_template(templates.text.format(lang=lang)),
+        html=(
+            engine.get_template(templates.html.format(lang=lang))
+            if templates.html
+            else None
+        ),
+    )
+
+
+def render_email(
+    name: str, context: dict[str, Any], *, lang: str = DEFAULT_LANGUAGE
+) -> RenderedEmail:
+    """Render email `name` in `lang` (French if not a site language)."""
+    if lang not in LANGUAGES:
+        lang = DEFAULT_LANGUAGE
+    compiled = _compiled(name, lang)
+    plain = Context(context, autoescape=False)
+    subject = compiled.subject.render(plain)
+    body = compiled.text.render(plain)
+    html = compiled.html.render(Context(context)) if compiled.html else ""
+    return RenderedEmail(
+        # A header: one line, whatever the context held.
+        subject=" ".join(subject.split()),
+        body=body,
+        html=html,
+    )
@@ -0,0 +1,51 @@
+"""Drain the email outbox: a polling loop, in its own process or a thread.
+
+`manage.py send_emails --loop` is the dedicated sender; in production
+the fly.toml worker process runs the loop (`manage.py run_worker`).
+The web worker can run it on a daemon thread instead
+(EMAIL_OUTBOX_IN_WEB, off by default, started from config.asgi). A
+message queued in the loop's process wakes it as soon as it commits;
+anything else is picked up within `interval` seconds.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .outbox import deliver_pending, pending
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 5.0
+
+
+def run_forever(*, batch: int | None = None, interval: float = POLL_INTERVAL) -> None:
+    """Send due messages, waiting up to `interval` seconds whenever none are due."""
+    while True:
+        close_old_connections()
+        pending.clear()
+        try:
+            counts = deliver_pending(batch)
+        except Exception:
+            logger.exception("Email sender iteration failed")
+            counts = {"sent": 0, "failed": 0}
+        if not (counts["sent"] or counts["failed"]):
+            pending.wait(interval)
+
+
+def start_thread() -> threading.Thread:
+    """Run the sender loop on a daemon thread."""
+    thread = threading.Thread(target=run_forever, daemon=True, name="email-sender")
+    thread.start()
+    return thread
+
+
+def start_in_background() -> threading.Thread | None:
+    """Run the sender loop on a daemon thread if EMAIL_OUTBOX_IN_WEB is on."""
+    if not getattr(settings, "EMAIL_OUTBOX_IN_WEB", False):
+        return None
+    return start_thread()
@@ -0,0 +1,150 @@
+import smtplib
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.core.mail import EmailMessage, EmailMultiAlternatives
+from django.core.mail.backends import locmem
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+
+from apps.emails import outbox
+from apps.emails.models import OutboundEmail, OutboundEmailStatus
+
+pytestmark = pytest.mark.django_db
+
+
+class CountingBackend(locmem.EmailBackend):
+    """locmem, counting connections and refusing anyone at bounce.test."""
+
+    opened = 0
+
+    def open(self):
+        type(self).opened += 1
+        return True
+
+    def send_messages(self, messages):
+        for message in messages:
+            if any(r.endswith("@bounce.test") for r in message.recipients()):
+                raise smtplib.SMTPRecipientsRefused({message.to[0]: (550, b"no")})
+        return super().send_messages(messages)
+
+
+@pytest.fixture(autouse=True)
+def counting_backend(settings):
+    settings.EMAIL_BACKEND = "apps.emails.tests.test_outbox.CountingBackend"
+    CountingBackend.opened = 0
+
+
+def _message(to="jane@example.com", **kwargs):
+    return EmailMessage(subject="Hello", body="Body", to=[to], **kwargs)
+
+
+def test_queued_message_is_sent_later_with_its_html():
+    message = EmailMultiAlternatives(
+        subject="Your voucher",
+        body="Plain",
+        from_email="shop@example.com",
+        to=["jane@example.com"],
+        reply_to=["owner@example.com"],
+    )
+    message.attach_alternative("<p>Rich</p>", "text/html")
+
+    email = outbox.queue_email(message)
+
+    assert mail.outbox == []
+    assert outbox.deliver_pending() == {"sent": 1, "failed": 0}
+    [sent] = mail.outbox
+    assert sent.subject == "Your voucher"
+    assert sent.from_email == "shop@example.com"
+    assert sent.reply_to == ["owner@example.com"]
+    assert sent.alternatives[0][0] == "<p>Rich</p>"
+    email.refresh_from_db()
+    assert email.status == OutboundEmailStatus.SENT
+    assert email.sent_at is not None
+
+
+def test_batch_shares_one_connection():
+    for n in range(3):
+        outbox.queue_email(_message(f"guest{n}@example.com"))
+
+    assert outbox.deliver_pending() == {"sent": 3, "failed": 0}
+
+    assert len(mail.outbox) == 3
+    assert CountingBackend.opened == 1
+
+
+def test_failed_message_is_retried_without_holding_up_the_batch():
+    outbox.queue_email(_message("first@example.com"))
+    bounced = outbox.queue_email(_message("nobody@bounce.test"))
+    outbox.queue_email(_message("last@example.com"))
+
+    assert outbox.deliver_pending() == {"sent": 2, "failed": 1}
+
+    assert [m.to for m in mail.outbox] == [["first@example.com"], ["last@example.com"]]
+    assert CountingBackend.opened == 2  # reopened after the failure
+    bounced.refresh_from_db()
+    assert bounced.status == OutboundEmailStatus.QUEUED
+    assert bounced.attempts == 1
+    assert bounced.run_after > timezone.now()
+    assert "SMTPRecipientsRefused" in bounced.last_error
+    assert outbox.deliver_pending() == {"sent": 0, "failed": 0}  # not due yet
+
+
+def test_message_is_dead_after_its_last_attempt():
+    email = outbox.queue_email(_message("nobody@bounce.test"))
+    OutboundEmail.objects.filter(pk=email.pk).update(max_attempts=2)
+
+    outbox.deliver_pending()
+    OutboundEmail.objects.filter(pk=email.pk).update(run_after=timezone.now())
+    outbox.deliver_pending()
+
+    email.refresh_from_db()
+    assert email.status == OutboundEmailStatus.DEAD
+    assert email.attempts == 2
+
+    assert outbox.retry(OutboundEmail.objects.all()) == 1
+    email.refresh_from_db()
+    assert email.status == OutboundEmailStatus.QUEUED
+    assert email.attempts == 0
+
+
+def test_expired_lease_is_claimed_again():
+    email = outbox.queue_email(_message())
+    OutboundEmail.objects.filter(pk=email.pk).update(
+        status=OutboundEmailStatus.SENDING,
+        locked_until=timezone.now() - timedelta(seconds=1),
+    )
+
+    assert outbox.deliver_pending() == {"sent": 1, "failed": 0}
+
+
+def test_rolled_back_transaction_queues_nothing():
+    with pytest.raises(RuntimeError), transaction.atomic():
+        outbox.queue_email(_message())
+        raise RuntimeError("voucher insert failed")
+
+    assert not OutboundEmail.objects.exists()
+
+
+def test_messages_without_recipients_are_dropped():
+    assert outbox.queue_email(EmailMessage(subject="Nobody", body="x")) is None
+    assert not OutboundEmail.objects.exists()
+
+
+def test_attachments_are_refused():
+    message = _message()
+    message.attach("receipt.txt", "paid", "text/plain")
+
+    with pytest.raises(ValueError):
+        outbox.queue_email(message)
+
+
+def test_command_drains_and_reports_counts(capsys):
+    outbox.queue_email(_message())
+    outbox.queue_email(_message("nobody@bounce.test"))
+
+    call_command("send_emails", "--batch", "1")
+
+    assert "1 email(s) sent, 1 failed" in capsys.readouterr().out
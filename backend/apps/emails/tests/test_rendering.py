@@ -0,0 +1,140 @@
+import time
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+import pytest
+from django.template.loader import render_to_string
+from django.utils.html import strip_tags
+
+from apps.emails import rendering
+from apps.emails.rendering import EMAILS, render_email
+
+
+@pytest.fixture(autouse=True)
+def _cold_templates():
+    rendering._compiled.cache_clear()
+    yield
+    rendering._compiled.cache_clear()
+
+
+def _voucher(**overrides):
+    fields = {
+        "code": "ABCD123456",
+        "sender_name": "Bob",
+        "sender_email": "bob@example.com",
+        "recipient_name": "Alice",
+        "recipient_email": "alice@example.com",
+        "amount": "100.00",
+        "message": "Joyeux anniversaire",
+        "service": None,
+        "start_datetime": None,
+        "created_at": datetime(2026, 5, 1, 10, 0, tzinfo=UTC),
+    }
+    return SimpleNamespace(**{**fields, **overrides})
+
+
+def _context(**overrides):
+    return {"voucher": _voucher(**overrides), "business_name": "Serenity", "lang": "fr"}
+
+
+def test_every_email_renders_in_every_language():
+    booking = SimpleNamespace(
+        customer_name="Jean",
+        customer_email="jean@example.com",
+        service="Massage",
+        start_datetime=datetime(2026, 6, 1, 10, 0, tzinfo=UTC),
+        end_datetime=datetime(2026, 6, 1, 11, 0, tzinfo=UTC),
+        message="",
+        stripe_checkout_session_id="cs_1",
+    )
+    context = {
+        **_context(),
+        "booking": booking,
+        "when": "2026-06-01 10:00",
+        "payload": {"sender_name": "Jean"},
+        "session_id": "cs_1",
+        "submission": SimpleNamespace(
+            name="Marie", email="m@example.com", phone="", subject="Tarifs", message="?"
+        ),
+        "ip_address": "1.2.3.4",
+    }
+    context["submissions"] = [context["submission"]] * 2
+    for name in EMAILS:
+        for lang in rendering.LANGUAGES:
+            email = render_email(name, context, lang=lang)
+            assert email.subject
+            assert email.body.strip()
+            assert "\n" not in email.subject
+
+
+def test_templates_are_compiled_once_per_email_and_language():
+    for _ in range(3):
+        render_email("voucher_recipient", _context(), lang="fr")
+        render_email("voucher_recipient", _context(), lang="en")
+
+    info = rendering._compiled.cache_info()
+    assert (info.misses, info.hits) == (2, 4)
+
+
+def test_unknown_language_falls_back_to_french():
+    email = render_email("voucher_sender", _context(), lang="sv")
+
+    assert email.subject == "Reçu de votre commande : ABCD123456"
+
+
+def test_subject_and_text_are_not_escaped_but_html_is():
+    context = {**_context(), "business_name": "Zoé & Co"}
+
+    email = render_email("voucher_recipient", context, lang="en")
+
+    assert email.subject == "Your gift voucher from Zoé & Co"
+    assert "for Zoé & Co." in email.body
+    assert "Zoé &amp; Co" in email.html
+
+
+def test_message_carries_both_parts():
+    email = render_email("voucher_admin", _context())
+
+    message = email.message(to=["admin@example.com"], reply_to=["bob@example.com"])
+
+    assert message.to == ["admin@example.com"]
+    assert message.reply_to == ["bob@example.com"]
+    assert message.body == email.body
+    assert message.alternatives[0][0] == email.html
+
+
+@pytest.mark.performance
+def test_voucher_email_render_benchmark():
+    """
+    Benchmark: the three voucher emails, 300 times over.
+
+    "before" is the old path — render_to_string per part and strip_tags
+    over the receipt HTML; "after" is render_email on compiled
+    templates. Timings are informational and only reported when the
+    assertion fails; the assertion is on the compiled template cache.
+    """
+    rounds = 300
+    context = _context()
+
+    def before():
+        for name in ("voucher_recipient_fr.html", "voucher_recipient_fr.txt"):
+            render_to_string(f"vouchers/emails/{name}", context)
+        render_to_string("vouchers/email_admin.html", context)
+        strip_tags(render_to_string("vouchers/emails/voucher_sender_fr.html", context))
+
+    def after():
+        for name in ("voucher_recipient", "voucher_admin", "voucher_sender"):
+            render_email(name, context, lang="fr")
+
+    timings = {}
+    for label, render in (("before", before), ("after", after)):
+        render()  # warm the loader / compiled cache
+        began = time.perf_counter()
+        for _ in range(rounds):
+            render()
+        timings[label] = (time.perf_counter() - began) / (rounds * 3)
+
+    assert rendering._compiled.cache_info().misses == 3, (
+        f"per email: before {timings['before'] * 1e6:.0f}µs, "
+        f"after {timings['after'] * 1e6:.0f}µs"
+    )
@@ -0,0 +1,21 @@
+from django.contrib import admin, messages
+from django.db.models import QuerySet
+from django.http import HttpRequest
+
+from .models import Job
+from .queue import retry
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("task", "status", "attempts", "run_after", "created_at", "finished_at")
+    list_filter = ("status", "task")
+    search_fields = ("task", "last_error")
+    date_hierarchy = "created_at"
+    readonly_fields = ("attempts", "locked_until", "last_error", "created_at", "finished_at")
+    actions = ("retry_dead",)
+
+    @admin.action(description="Retry selected dead jobs")
+    def retry_dead(self, request: HttpRequest, queryset: QuerySet[Job]) -> None:
+        requeued = retry(queryset)
+        self.message_user(request, f"{requeued} job(s) queued again.", messages.SUCCESS)
@@ -0,0 +1,50 @@
+"""Work through the durable job queue."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from apps.jobs import worker
+from apps.jobs.queue import run_pending
+
+
+class Command(BaseCommand):
+    help = (
+        "Run due jobs from the database queue (Stripe fulfillment, ...). "
+        "Failures are retried with backoff and dead-lettered after their "
+        "last attempt. Drains once, or keeps polling with --loop."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running, polling every --interval seconds when idle.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=worker.POLL_INTERVAL,
+            help=f"Idle poll interval with --loop (default: {worker.POLL_INTERVAL}).",
+        )
+        parser.add_argument(
+            "--batch",
+            type=int,
+            default=worker.BATCH,
+            help=f"Jobs claimed per round (default: {worker.BATCH}).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["loop"]:
+            worker.run_forever(batch=options["batch"], interval=options["interval"])
+            return
+        done = failed = 0
+        while True:
+            counts = run_pending(options["batch"])
+            if not (counts["done"] or counts["failed"]):
+                break
+            done += counts["done"]
+            failed += counts["failed"]
+        self.stdout.write(f"{done} job(s) done, {failed} failed")
@@ -0,0 +1,37 @@
+"""Run all background work in one process, apart from the web worker."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from apps.availability import prewarm, upkeep
+from apps.emails import sender
+from apps.jobs import worker
+from apps.payments import reconcile
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the job queue, the email outbox, Stripe reconciliation, "
+        "calendar upkeep (mirror syncs, watch channel renewal, expired "
+        "hold sweeps) and the availability prewarm until the process "
+        "exits: the fly.toml worker process. The queue runs in the "
+        "foreground, the rest on daemon threads."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--no-reconcile",
+            action="store_true",
+            help="Leave Stripe reconciliation to cron or another process.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        sender.start_thread()
+        upkeep.start_thread()
+        prewarm.start_thread()
+        if not options["no_reconcile"]:
+            reconcile.start_thread()
+        worker.run_forever()
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from django.db import models
+from django.utils import timezone
+
+
+class JobStatus(models.TextChoices):
+    QUEUED = "queued", "Queued"
+    RUNNING = "running", "Running"
+    DONE = "done", "Done"
+    # Out of attempts (or no handler): parked for a human to look at.
+    DEAD = "dead", "Dead"
+
+
+class Job(models.Model):
+    """A unit of deferred work, run by `manage.py run_jobs`.
+
+    The row is the queue: enqueueing is an INSERT in the caller's
+    transaction, so a job exists exactly when the work that produced
+    it committed. Workers claim due rows with SELECT ... FOR UPDATE
+    SKIP LOCKED and hold a lease (`locked_until`); a worker that dies
+    mid-job leaves a lease that expires and the job is claimed again.
+    """
+
+    task = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(
+        max_length=20,
+        choices=JobStatus.choices,
+        default=JobStatus.QUEUED,
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=8)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ("-created_at",)
+        indexes = (
+            models.Index(fields=["status", "run_after"], name="job_due_idx"),
+        )
+
+    def __str__(self) -> str:
+        return f"{self.task} #{self.pk} ({self.status})"
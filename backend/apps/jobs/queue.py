@@ -0,0 +1,178 @@
+"""A durable job queue in the application database.
+
+Producers call enqueue() inside their own transaction; workers
+(`manage.py run_jobs`, or the web worker's thread, see worker.py) call
+run_pending(). Handlers are registered with @task in each app's
+tasks.py and receive the job payload as keyword arguments.
+
+A handler that raises is retried with exponential backoff; after
+`max_attempts` the job is marked DEAD and kept for inspection (and a
+retry from the admin). Handlers must be idempotent: a job can run more
+than once if its worker dies after the work but before the row update.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import traceback
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Job, JobStatus
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from django.db.models import QuerySet
+
+logger = logging.getLogger(__name__)
+
+_DEFAULTS: dict[str, Any] = {
+    "MAX_ATTEMPTS": 8,
+    "BACKOFF_BASE": 10,
+    "BACKOFF_MAX": 3600,
+    "LEASE": 300,
+}
+
+_registry: dict[str, Callable[..., None]] = {}
+
+
+def _conf() -> dict[str, Any]:
+    return {**_DEFAULTS, **getattr(settings, "JOBS", {})}
+
+
+def task(name: str) -> Callable[[Callable[..., None]], Callable[..., None]]:
+    """Register a handler under `name`; the function is returned as is."""
+
+    def register(fn: Callable[..., None]) -> Callable[..., None]:
+        _registry[name] = fn
+        return fn
+
+    return register
+
+
+def enqueue(
+    name: str,
+    payload: dict[str, Any] | None = None,
+    *,
+    delay: timedelta | None = None,
+    max_attempts: int | None = None,
+    unique: bool = False,
+) -> Job:
+    """Queue `name` to run with `payload`; commits with the caller.
+
+    With `unique`, a job for the same task and payload that is still
+    waiting to run is returned instead of queueing another. Two
+    producers racing can still both insert; handlers are idempotent.
+    """
+    if name not in _registry:
+        raise LookupError(f"No job handler registered for {name!r}")
+    if unique:
+        waiting = Job.objects.filter(
+            task=name, payload=payload or {}, status=JobStatus.QUEUED
+        ).first()
+        if waiting is not None:
+            return waiting
+    return Job.objects.create(
+        task=name,
+        payload=payload or {},
+        run_after=timezone.now() + (delay or timedelta()),
+        max_attempts=max_attempts or _conf()["MAX_ATTEMPTS"],
+    )
+
+
+def backoff(attempts: int) -> timedelta:
+    """Delay before retry number `attempts`: doubling, capped, jittered."""
+    conf = _conf()
+    delay = min(conf["BACKOFF_BASE"] * 2 ** (attempts - 1), conf["BACKOFF_MAX"])
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def claim(limit: int) -> list[Job]:
+    """Lease up to `limit` due jobs to this worker.
+
+    Queued jobs whose time has come, and running jobs whose lease ran
+    out (their worker died). Rows another worker is claiming are
+    skipped, not waited on. The attempt is counted here, so a job that
+    kills its worker every time still ends up dead.
+    """
+    now = timezone.now()
+    lease = now + timedelta(seconds=_conf()["LEASE"])
+    with transaction.atomic():
+        jobs = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=JobStatus.QUEUED, run_after__lte=now)
+                | Q(status=JobStatus.RUNNING, locked_until__lt=now)
+            )
+            .order_by("run_after", "id")[:limit]
+        )
+        for job in jobs:
+            job.status = JobStatus.RUNNING
+            job.attempts += 1
+            job.locked_until = lease
+        Job.objects.bulk_update(jobs, ["status", "attempts", "locked_until"])
+    return jobs
+
+
+def _finish(job: Job, status: str, error: str = "") -> None:
+    job.status = status
+    job.locked_until = None
+    job.last_error = error
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "locked_until", "last_error", "finished_at"])
+
+
+def _retry_or_bury(job: Job, error: str) -> None:
+    if job.attempts >= job.max_attempts:
+        logger.error(
+            "Job %s dead after %d attempt(s): %s", job, job.attempts, error.splitlines()[-1]
+        )
+        _finish(job, JobStatus.DEAD, error)
+        return
+    job.status = JobStatus.QUEUED
+    job.locked_until = None
+    job.last_error = error
+    job.run_after = timezone.now() + backoff(job.attempts)
+    job.save(update_fields=["status", "locked_until", "last_error", "run_after"])
+    logger.warning("Job %s failed (attempt %d); retrying at %s", job, job.attempts, job.run_after)
+
+
+def run_job(job: Job) -> bool:
+    """Run one claimed job; True if it succeeded."""
+    handler = _registry.get(job.task)
+    if handler is None:
+        logger.error("No handler for job %s", job)
+        _finish(job, JobStatus.DEAD, f"No handler registered for {job.task!r}")
+        return False
+    try:
+        handler(**job.payload)
+    except Exception:
+        _retry_or_bury(job, traceback.format_exc(limit=5))
+        return False
+    _finish(job, JobStatus.DONE)
+    return True
+
+
+def run_pending(limit: int = 10) -> dict[str, int]:
+    """Claim and run one batch of due jobs; counts of outcomes."""
+    counts = {"done": 0, "failed": 0}
+    for job in claim(limit):
+        counts["done" if run_job(job) else "failed"] += 1
+    return counts
+
+
+def retry(jobs: QuerySet[Job]) -> int:
+    """Put dead jobs back in the queue with a fresh set of attempts."""
+    return jobs.filter(status=JobStatus.DEAD).update(
+        status=JobStatus.QUEUED,
+        attempts=0,
+        run_after=timezone.now(),
+        finished_at=None,
+    )
@@ -0,0 +1,162 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.jobs import queue
+from apps.jobs.models import Job, JobStatus
+
+pytestmark = pytest.mark.django_db
+
+calls = []
+
+
+@queue.task("tests.record")
+def record(value, fail=0):
+    calls.append(value)
+    if len(calls) <= fail:
+        raise RuntimeError(f"boom {len(calls)}")
+
+
+@pytest.fixture(autouse=True)
+def _reset_calls():
+    calls.clear()
+
+
+def _due(job):
+    Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+
+
+def test_enqueue_refuses_unknown_tasks():
+    with pytest.raises(LookupError):
+        queue.enqueue("tests.nope")
+
+
+def test_unique_enqueue_reuses_a_waiting_job():
+    first = queue.enqueue("tests.record", {"value": 1}, unique=True)
+
+    assert queue.enqueue("tests.record", {"value": 1}, unique=True) == first
+    assert queue.enqueue("tests.record", {"value": 2}, unique=True) != first
+
+    queue.run_pending()
+    # Once it has run, the next one is queued afresh.
+    assert queue.enqueue("tests.record", {"value": 1}, unique=True) != first
+    assert Job.objects.filter(status=JobStatus.QUEUED).count() == 1
+
+
+def test_successful_job_is_done():
+    job = queue.enqueue("tests.record", {"value": 1})
+
+    assert queue.run_pending() == {"done": 1, "failed": 0}
+
+    job.refresh_from_db()
+    assert calls == [1]
+    assert job.status == JobStatus.DONE
+    assert job.attempts == 1
+    assert job.finished_at is not None
+
+
+def test_failed_job_is_retried_after_backoff():
+    job = queue.enqueue("tests.record", {"value": 1, "fail": 1})
+
+    assert queue.run_pending() == {"done": 0, "failed": 1}
+    job.refresh_from_db()
+    assert job.status == JobStatus.QUEUED
+    assert job.run_after > timezone.now()
+    assert "boom 1" in job.last_error
+    assert queue.run_pending() == {"done": 0, "failed": 0}  # not due yet
+
+    _due(job)
+    assert queue.run_pending() == {"done": 1, "failed": 0}
+    job.refresh_from_db()
+    assert job.status == JobStatus.DONE
+    assert job.attempts == 2
+
+
+def test_backoff_doubles_up_to_the_cap(settings):
+    settings.JOBS = {"BACKOFF_BASE": 10, "BACKOFF_MAX": 60}
+
+    assert 8 <= queue.backoff(1).total_seconds() <= 12
+    assert 16 <= queue.backoff(2).total_seconds() <= 24
+    assert 48 <= queue.backoff(10).total_seconds() <= 72
+
+
+def test_job_is_dead_lettered_after_its_last_attempt():
+    job = queue.enqueue("tests.record", {"value": 1, "fail": 99}, max_attempts=3)
+
+    for _ in range(3):
+        _due(job)
+        queue.run_pending()
+
+    job.refresh_from_db()
+    assert job.status == JobStatus.DEAD
+    assert job.attempts == 3
+    assert len(calls) == 3
+
+    assert queue.retry(Job.objects.all()) == 1
+    job.refresh_from_db()
+    assert (job.status, job.attempts) == (JobStatus.QUEUED, 0)
+
+
+def test_job_without_handler_is_dead():
+    job = Job.objects.create(task="tests.removed")
+
+    queue.run_pending()
+
+    job.refresh_from_db()
+    assert job.status == JobStatus.DEAD
+    assert "No handler" in job.last_error
+
+
+def test_expired_lease_is_claimed_again():
+    job = queue.enqueue("tests.record", {"value": 1})
+    [claimed] = queue.claim(10)
+    assert queue.claim(10) == []  # leased
+
+    Job.objects.filter(pk=claimed.pk).update(
+        locked_until=timezone.now() - timedelta(seconds=1)
+    )
+
+    assert [j.pk for j in queue.claim(10)] == [job.pk]
+    job.refresh_from_db()
+    assert job.attempts == 2
+
+
+def test_command_drains_the_queue(capsys):
+    for value in range(15):
+        queue.enqueue("tests.record", {"value": value})
+
+    call_command("run_jobs", "--batch", "4")
+
+    assert sorted(calls) == list(range(15))
+    assert "15 job(s) done, 0 failed" in capsys.readouterr().out
+
+
+def test_worker_command_runs_all_background_work(monkeypatch):
+    from apps.availability import prewarm, upkeep
+    from apps.emails import sender
+    from apps.jobs import worker
+    from apps.payments import reconcile
+
+    started = []
+    monkeypatch.setattr(sender, "start_thread", lambda: started.append("emails"))
+    monkeypatch.setattr(upkeep, "start_thread", lambda: started.append("upkeep"))
+    monkeypatch.setattr(prewarm, "start_thread", lambda: started.append("prewarm"))
+    monkeypatch.setattr(reconcile, "start_thread", lambda: started.append("reconcile"))
+    monkeypatch.setattr(worker, "run_forever", lambda: started.append("jobs"))
+
+    call_command("run_worker")
+    assert started == ["emails", "upkeep", "prewarm", "reconcile", "jobs"]
+
+    started.clear()
+    call_command("run_worker", "--no-reconcile")
+    assert started == ["emails", "upkeep", "prewarm", "jobs"]
+
+
+def test_web_worker_leaves_the_queue_alone_by_default(settings):
+    from apps.jobs import worker
+
+    settings.JOBS_RUN_IN_WEB = False
+
+    assert worker.start_in_background() is None
@@ -0,0 +1,53 @@
+"""Run the job queue: a polling loop, in its own process or a thread.
+
+`manage.py run_jobs --loop` is the dedicated worker; in production it
+runs in the fly.toml worker process (`manage.py run_worker`), away
+from the web worker that --max-requests recycles mid-job. As a
+fallback for a deployment without that process, the web worker can
+run the same loop on a daemon thread (JOBS_RUN_IN_WEB, off by default,
+started from config.asgi). Both can run at once — claims skip rows
+another worker holds.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .queue import run_pending
+
+logger = logging.getLogger(__name__)
+
+BATCH = 10
+POLL_INTERVAL = 2.0
+
+
+def run_forever(*, batch: int = BATCH, interval: float = POLL_INTERVAL) -> None:
+    """Drain due jobs, sleeping `interval` seconds whenever none are due."""
+    while True:
+        close_old_connections()
+        try:
+            counts = run_pending(batch)
+        except Exception:
+            logger.exception("Job worker iteration failed")
+            counts = {"done": 0, "failed": 0}
+        if not (counts["done"] or counts["failed"]):
+            time.sleep(interval)
+
+
+def start_thread() -> threading.Thread:
+    """Run the worker loop on a daemon thread."""
+    thread = threading.Thread(target=run_forever, daemon=True, name="job-worker")
+    thread.start()
+    return thread
+
+
+def start_in_background() -> threading.Thread | None:
+    """Run the worker loop on a daemon thread if JOBS_RUN_IN_WEB is on."""
+    if not getattr(settings, "JOBS_RUN_IN_WEB", False):
+        return None
+    return start_thread()
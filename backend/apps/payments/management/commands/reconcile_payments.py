@@ -0,0 +1,61 @@
+"""Fulfill paid checkout sessions whose webhook never arrived."""
+
+from __future__ import annotations
+
+import time
+from datetime import timedelta
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.payments import reconcile
+
+
+class Command(BaseCommand):
+    help = (
+        "Page through completed Stripe checkout sessions since the stored "
+        "watermark and fulfill any still-unfulfilled payment. Safe to run "
+        "at any time; run from cron or with --loop."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--hours",
+            type=float,
+            default=None,
+            help="Look back this many hours instead of from the watermark.",
+        )
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=reconcile.PAGE_SIZE,
+            help=f"Sessions per Stripe page (default: {reconcile.PAGE_SIZE}).",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running, reconciling every --interval seconds.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=reconcile.LOOP_INTERVAL,
+            help=f"Seconds between sweeps with --loop (default: {reconcile.LOOP_INTERVAL}).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        while True:
+            since = None
+            if options["hours"] is not None:
+                since = timezone.now() - timedelta(hours=options["hours"])
+            counts = reconcile.reconcile(since=since, page_size=options["page_size"])
+            self.stdout.write(
+                f"{counts['sessions']} session(s) in {counts['pages']} page(s): "
+                f"{counts['fulfilled']} fulfilled, {counts['failed']} failed"
+            )
+            if not options["loop"]:
+                if counts["failed"]:
+                    raise CommandError("Some sessions could not be fulfilled; see the log")
+                return
+            time.sleep(options["interval"])
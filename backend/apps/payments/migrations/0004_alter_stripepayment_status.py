@@ -0,0 +1,18 @@
+# Generated by Django 5.2.15 on 2026-10-18 05:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0003_stripepayment_booking_id_stripepayment_kind'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='stripepayment',
+            name='status',
+            field=models.CharField(choices=[('created', 'Created'), ('paid', 'Paid'), ('failed', 'Failed'), ('canceled', 'Canceled'), ('conflict', 'Conflict (refund due)')], db_index=True, default='created', max_length=20),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.15 on 2026-10-18 05:56
+
+from django.db import migrations, models
+
+
+def mark_existing_processed(apps, schema_editor):
+    # Events recorded before status existed were handled inline.
+    StripeWebhookEvent = apps.get_model('payments', 'StripeWebhookEvent')
+    StripeWebhookEvent.objects.update(status='processed')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0004_alter_stripepayment_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stripewebhookevent',
+            name='last_error',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='stripewebhookevent',
+            name='processed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='stripewebhookevent',
+            name='status',
+            field=models.CharField(choices=[('received', 'Received'), ('ignored', 'Ignored'), ('processed', 'Processed'), ('failed', 'Failed')], db_index=True, default='received', max_length=20),
+        ),
+        migrations.RunPython(mark_existing_processed, migrations.RunPython.noop),
+    ]
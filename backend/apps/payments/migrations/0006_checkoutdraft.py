@@ -0,0 +1,35 @@
+# Generated by Django 5.2.15 on 2026-10-18 06:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0005_stripewebhookevent_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CheckoutDraft',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stripe_checkout_session_id', models.CharField(blank=True, max_length=255, null=True, unique=True)),
+                ('kind', models.CharField(choices=[('gift', 'Gift voucher'), ('booking', 'Booking')], default='gift', max_length=20)),
+                ('sender_name', models.CharField(max_length=200)),
+                ('sender_email', models.EmailField(max_length=254)),
+                ('recipient_name', models.CharField(blank=True, default='', max_length=200)),
+                ('recipient_email', models.EmailField(blank=True, default='', max_length=254)),
+                ('preferred_language', models.CharField(default='fr', max_length=10)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('message', models.TextField(blank=True, default='')),
+                ('service_id', models.IntegerField(blank=True, null=True)),
+                ('start_datetime', models.DateTimeField(blank=True, null=True)),
+                ('end_datetime', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ('-created_at',),
+            },
+        ),
+    ]
@@ -1,6 +1,12 @@
 from __future__ import annotations
 
-from django.db import models
+from typing import TYPE_CHECKING, Any
+
+from django.db import connections, models
+from django.utils import timezone
+
+if TYPE_CHECKING:
+    from datetime import datetime
 
 
 class PaymentStatus(models.TextChoices):
@@ -8,6 +14,8 @@ class PaymentStatus(models.TextChoices):
     PAID = "paid", "Paid"
     FAILED = "failed", "Failed"
     CANCELED = "canceled", "Canceled"
+    # Paid, but the slot was taken by the time the webhook arrived.
+    CONFLICT = "conflict", "Conflict (refund due)"
 
 
 class PaymentKind(models.TextChoices):
@@ -64,9 +72,129 @@ class StripePayment(models.Model):
         )
 
 
+class CheckoutDraft(models.Model):
+    """
+    The validated checkout request, kept here until payment is confirmed.
+
+    Stripe metadata carries only `draft_id`. The session id is filled in
+    once Stripe has created the session and is what fulfillment looks
+    the draft up by.
+    """
+
+    stripe_checkout_session_id = models.CharField(
+        max_length=255, unique=True, null=True, blank=True
+    )
+    kind = models.CharField(
+        max_length=20,
+        choices=PaymentKind.choices,
+        default=PaymentKind.GIFT,
+    )
+
+    sender_name = models.CharField(max_length=200)
+    sender_email = models.EmailField()
+    recipient_name = models.CharField(max_length=200, blank=True, default="")
+    recipient_email = models.EmailField(blank=True, default="")
+    preferred_language = models.CharField(max_length=10, default="fr")
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    message = models.TextField(blank=True, default="")
+
+    service_id = models.IntegerField(null=True, blank=True)
+    start_datetime = models.DateTimeField(null=True, blank=True)
+    end_datetime = models.DateTimeField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    PAYLOAD_FIELDS = (
+        "sender_name",
+        "sender_email",
+        "recipient_name",
+        "recipient_email",
+        "preferred_language",
+        "amount",
+        "message",
+        "service_id",
+        "start_datetime",
+        "end_datetime",
+    )
+
+    class Meta:
+        ordering = ("-created_at",)
+
+    def __str__(self) -> str:
+        return f"CheckoutDraft({self.kind}) session={self.stripe_checkout_session_id}"
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> CheckoutDraft:
+        """Save a draft of a validated checkout payload."""
+        fields = {name: payload[name] for name in cls.PAYLOAD_FIELDS if name in payload}
+        return cls.objects.create(kind=payload.get("kind", PaymentKind.GIFT), **fields)
+
+    def as_payload(self) -> dict[str, Any]:
+        """The fields create_voucher and create_booking_from_payload take."""
+        return {name: getattr(self, name) for name in self.PAYLOAD_FIELDS}
+
+
+class WebhookEventStatus(models.TextChoices):
+    RECEIVED = "received", "Received"
+    # Recorded for the audit log only; nothing to fulfill.
+    IGNORED = "ignored", "Ignored"
+    PROCESSED = "processed", "Processed"
+    # The last fulfillment attempt raised; the job queue retries it.
+    FAILED = "failed", "Failed"
+
+
+class StripeWebhookEventQuerySet(models.QuerySet):
+    def record(
+        self,
+        *,
+        stripe_event_id: str,
+        event_type: str,
+        livemode: bool = False,
+        stripe_created_at: datetime | None = None,
+        status: str = WebhookEventStatus.RECEIVED,
+    ) -> bool:
+        """Insert the event unless it is already there; True if it is new.
+
+        One INSERT ... ON CONFLICT DO NOTHING RETURNING statement (Postgres,
+        and SQLite 3.35+), so concurrent deliveries of the same event
+        neither race a separate existence check nor hit the unique index
+        with an IntegrityError: exactly one of them gets a row back.
+        """
+        meta = self.model._meta
+        connection = connections[self.db]
+        qn = connection.ops.quote_name
+        values = {
+            "stripe_event_id": stripe_event_id,
+            "event_type": event_type,
+            "livemode": livemode,
+            "stripe_created_at": stripe_created_at,
+            "status": status,
+            "last_error": "",
+            "created_at": timezone.now(),
+        }
+        columns = [meta.get_field(name) for name in values]
+        params = [
+            field.get_db_prep_save(value, connection)
+            for field, value in zip(columns, values.values(), strict=True)
+        ]
+        sql = (
+            f"INSERT INTO {qn(meta.db_table)} "
+            f"({', '.join(qn(field.column) for field in columns)}) "
+            f"VALUES ({', '.join(['%s'] * len(columns))}) "
+            f"ON CONFLICT ({qn(meta.get_field('stripe_event_id').column)}) DO NOTHING "
+            f"RETURNING {qn(meta.pk.column)}"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchone() is not None
+
+
 class StripeWebhookEvent(models.Model):
     """
     Idempotency guard + audit log: Stripe can retry events.
+
+    `status` follows the event's fulfillment job, so a paid checkout
+    whose fulfillment keeps failing shows up here.
     """
 
     stripe_event_id = models.CharField(max_length=255, unique=True)
@@ -75,5 +203,34 @@ class StripeWebhookEvent(models.Model):
     stripe_created_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    status = models.CharField(
+        max_length=20,
+        choices=WebhookEventStatus.choices,
+        default=WebhookEventStatus.RECEIVED,
+        db_index=True,
+    )
+    processed_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+
+    objects = StripeWebhookEventQuerySet.as_manager()
+
     def __str__(self) -> str:
         return f"{self.event_type} ({self.stripe_event_id})"
+
+
+class ReconcileState(models.Model):
+    """
+    How far the Stripe reconciliation sweep (reconcile.py) has got.
+
+    Every checkout session created before `watermark` is settled and
+    has been matched to its payment; the next sweep lists from there.
+    """
+
+    name = models.CharField(max_length=50, unique=True)
+    watermark = models.DateTimeField(null=True, blank=True)
+
+    last_run_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.CharField(max_length=500, blank=True, default="")
+
+    def __str__(self) -> str:
+        return f"ReconcileState {self.name} @ {self.watermark}"
@@ -0,0 +1,143 @@
+"""Wake-ups for requests waiting on a payment to change.
+
+Fulfillment publishes the checkout session id when its transaction
+commits, and every long-poll request subscribed to that id, on whichever
+event loop, is woken to re-read the payment.
+
+Fulfillment usually runs in another process, the fly.toml worker
+(`manage.py run_worker`). On Postgres, publish_on_commit also issues a
+NOTIFY, which Postgres delivers only if the transaction commits; each
+web process relays the notifications it LISTENs for to its own
+subscribers from a daemon thread (start_in_background, from
+config.asgi). Elsewhere only subscribers in the publishing process are
+woken. Waiters still re-read
+the row every few seconds, so a notification lost while the listener
+reconnects only costs latency.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import select
+import threading
+import time
+from collections import defaultdict
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from django.db import connections, transaction
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks that the LISTEN connection is alive, and
+# before reconnecting after it failed.
+LISTEN_POLL = 30.0
+RECONNECT_DELAY = 5.0
+
+
+class Subscription:
+    def __init__(self) -> None:
+        self.loop = asyncio.get_running_loop()
+        self._event = asyncio.Event()
+
+    def notify(self) -> None:
+        """Wake the waiter; callable from any thread."""
+        with contextlib.suppress(RuntimeError):  # its loop has closed
+            self.loop.call_soon_threadsafe(self._event.set)
+
+    async def wait(self, timeout: float) -> bool:
+        """True if notified within `timeout` seconds (or since the last wait)."""
+        try:
+            async with asyncio.timeout(timeout):
+                await self._event.wait()
+        except TimeoutError:
+            return False
+        self._event.clear()
+        return True
+
+
+class Broadcaster:
+    def __init__(self, channel: str) -> None:
+        self.channel = channel
+        self._lock = threading.Lock()
+        self._subscribers: defaultdict[str, set[Subscription]] = defaultdict(set)
+
+    @contextlib.contextmanager
+    def subscribe(self, key: str) -> Iterator[Subscription]:
+        """Listen for `key` for the duration of the block."""
+        subscription = Subscription()
+        with self._lock:
+            self._subscribers[key].add(subscription)
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                self._subscribers[key].discard(subscription)
+                if not self._subscribers[key]:
+                    del self._subscribers[key]
+
+    def publish(self, key: str) -> int:
+        """Wake everyone subscribed to `key`; how many there were."""
+        with self._lock:
+            subscribers = list(self._subscribers.get(key, ()))
+        for subscription in subscribers:
+            subscription.notify()
+        return len(subscribers)
+
+    def publish_on_commit(self, key: str, using: str | None = None) -> None:
+        """Wake everyone subscribed to `key`, in every process, once this commits."""
+        connection = transaction.get_connection(using)
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_notify(%s, %s)", [self.channel, key])
+        transaction.on_commit(partial(self.publish, key), using=using)
+
+    def listen_forever(self, using: str = "default") -> None:
+        """Relay the channel's Postgres notifications to this process."""
+        while True:
+            try:
+                self._listen(using)
+            except Exception:
+                logger.exception("Listening on %s failed; reconnecting", self.channel)
+            time.sleep(RECONNECT_DELAY)
+
+    def _listen(self, using: str) -> None:
+        wrapper = connections[using]
+        connection = wrapper.get_new_connection(wrapper.get_connection_params())
+        try:
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.channel}"')
+            while True:
+                select.select([connection], [], [], LISTEN_POLL)
+                self.relay(connection)
+        finally:
+            connection.close()
+
+    def relay(self, connection: Any) -> int:
+        """Publish the notifications `connection` has received; how many."""
+        connection.poll()
+        relayed = 0
+        while connection.notifies:
+            self.publish(connection.notifies.pop(0).payload)
+            relayed += 1
+        return relayed
+
+
+payment_events = Broadcaster("payment_events")
+
+
+def start_in_background(using: str = "default") -> threading.Thread | None:
+    """Relay payment notifications on a daemon thread, on Postgres."""
+    if connections[using].vendor != "postgresql":
+        return None
+    thread = threading.Thread(
+        target=payment_events.listen_forever, args=(using,), daemon=True, name="payment-events"
+    )
+    thread.start()
+    return thread
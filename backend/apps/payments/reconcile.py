@@ -0,0 +1,140 @@
+"""Fulfill paid checkouts whose webhook never arrived.
+
+A lost or long-delayed webhook leaves its StripePayment in "created".
+The sweep pages through the completed checkout sessions Stripe holds
+(newest first, `starting_after` the last id of the previous page, no
+older than the watermark), matches each page to our payments in one
+`IN` query, and runs the webhook's own fulfillment for every paid
+session whose payment is still "created". Fulfillment is idempotent,
+so racing a late webhook or re-running a sweep is harmless.
+
+A session can still complete until it expires, at most
+SESSION_LIFETIME after it was created. So after a clean sweep the
+watermark moves to the sweep's start minus that lifetime, and the
+next sweep re-reads only sessions that could have changed since.
+
+Run `manage.py reconcile_payments [--loop]`; in production the
+fly.toml worker process runs the loop (`manage.py run_worker`).
+start_in_background (from config.asgi) runs it in the web worker
+instead, if STRIPE_RECONCILE is on (off by default).
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from . import stripe_gateway, webhooks
+from .models import PaymentStatus, ReconcileState, StripePayment
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+CHECKOUT_SESSIONS = "checkout_sessions"
+# Stripe lets a checkout session live 24 hours at most.
+SESSION_LIFETIME = timedelta(hours=24)
+# How far back the very first sweep looks.
+INITIAL_LOOKBACK = timedelta(days=7)
+PAGE_SIZE = 100
+LOOP_INTERVAL = 900
+
+
+def _fulfill(session: dict[str, Any]) -> bool:
+    try:
+        webhooks._fulfill_from_checkout_session(session)
+    except Exception:
+        logger.exception("Reconciliation could not fulfill session %s", session["id"])
+        return False
+    logger.warning("Reconciled session %s: its webhook never arrived", session["id"])
+    return True
+
+
+def reconcile(
+    *, since: datetime | None = None, page_size: int = PAGE_SIZE
+) -> dict[str, int]:
+    """
+    Sweep completed sessions created since `since` (default: the watermark).
+
+    Returns counts of sessions and pages read, payments fulfilled, and
+    fulfillments that failed.
+    """
+    state, _ = ReconcileState.objects.get_or_create(name=CHECKOUT_SESSIONS)
+    started = timezone.now()
+    if since is None:
+        since = state.watermark or started - INITIAL_LOOKBACK
+
+    counts = {"sessions": 0, "pages": 0, "fulfilled": 0, "failed": 0}
+    params: dict[str, Any] = {
+        "status": "complete",
+        "created": {"gte": int(since.timestamp())},
+        "limit": page_size,
+    }
+    try:
+        while True:
+            page = stripe_gateway.list_checkout_sessions(**params)
+            sessions = [webhooks._plain(session) for session in page.data]
+            counts["pages"] += 1
+            counts["sessions"] += len(sessions)
+
+            paid = {s["id"]: s for s in sessions if s.get("payment_status") == "paid"}
+            pending = StripePayment.objects.filter(
+                stripe_checkout_session_id__in=paid, status=PaymentStatus.CREATED
+            ).values_list("stripe_checkout_session_id", flat=True)
+            for session_id in pending:
+                counts["fulfilled" if _fulfill(paid[session_id]) else "failed"] += 1
+
+            if not page.has_more or not sessions:
+                break
+            params["starting_after"] = sessions[-1]["id"]
+    except Exception as error:
+        state.last_run_at = started
+        state.last_error = repr(error)[:500]
+        state.save(update_fields=["last_run_at", "last_error"])
+        raise
+
+    state.last_run_at = started
+    state.last_error = ""
+    update_fields = ["last_run_at", "last_error"]
+    # Move on only if nothing failed and this sweep left no gap behind
+    # the watermark (an explicit, later `since` would).
+    if not counts["failed"] and (state.watermark is None or since <= state.watermark):
+        state.watermark = max(state.watermark or since, started - SESSION_LIFETIME)
+        update_fields.append("watermark")
+    state.save(update_fields=update_fields)
+    return counts
+
+
+def run_forever(*, interval: float = LOOP_INTERVAL) -> None:
+    """Reconcile every `interval` seconds until the process exits."""
+    while True:
+        close_old_connections()
+        try:
+            counts = reconcile()
+            if counts["fulfilled"] or counts["failed"]:
+                logger.info("Stripe reconciliation: %s", counts)
+        except Exception:
+            logger.exception("Stripe reconciliation failed")
+        time.sleep(interval)
+
+
+def start_thread() -> threading.Thread:
+    """Run the reconciliation loop on a daemon thread."""
+    thread = threading.Thread(target=run_forever, daemon=True, name="stripe-reconcile")
+    thread.start()
+    return thread
+
+
+def start_in_background() -> threading.Thread | None:
+    """Run the reconciliation loop on a daemon thread if STRIPE_RECONCILE is on."""
+    if not getattr(settings, "STRIPE_RECONCILE", False):
+        return None
+    return start_thread()
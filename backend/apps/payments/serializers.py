@@ -11,7 +11,7 @@ from apps.core.validators import validate_no_newlines
 class CheckoutRequestSerializer(HoneypotMixin, serializers.Serializer):
     """
     Same input as voucher creation, but we won't create the voucher immediately.
-    We just validate + pass data into Stripe metadata.
+    We just validate + keep the data in a CheckoutDraft until payment.
     """
     kind = serializers.ChoiceField(
         choices=("gift", "booking"), default="gift"
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
-import json
 from decimal import Decimal
 from typing import Any
 
-import stripe
 from django.conf import settings
+from django.db import transaction
 
-from .models import PaymentStatus, StripePayment
+from apps.availability import calendars, holds, selectors
+
+from . import stripe_gateway
+from .models import CheckoutDraft, PaymentStatus, StripePayment
 
 
 def _money_to_minor_units(amount: Decimal) -> int:
@@ -18,9 +20,6 @@ def _money_to_minor_units(amount: Decimal) -> int:
 def create_checkout_session(
     *, voucher_payload: dict[str, Any]
 ) -> tuple[StripePayment, str]:
-    stripe.api_key = settings.STRIPE_SECRET_KEY
-    stripe.api_version = settings.STRIPE_API_VERSION
-
     amount = Decimal(str(voucher_payload["amount"]))
     currency = getattr(settings, "STRIPE_CURRENCY", "eur")
     kind = voucher_payload.get("kind", "gift")
@@ -42,29 +41,61 @@ def create_checkout_session(
             f"Voucher for {voucher_payload.get('recipient_name', '')}"
         ).strip()
 
-    session = stripe.checkout.Session.create(
-        mode="payment",
-        success_url=settings.STRIPE_SUCCESS_URL,
-        cancel_url=settings.STRIPE_CANCEL_URL,
-        line_items=[
-            {
-                "quantity": 1,
-                "price_data": {
-                    "currency": currency,
-                    "unit_amount": _money_to_minor_units(amount),
-                    "product_data": {
-                        "name": product_name,
-                        "description": product_description or " ",
-                    },
-                },
-            }
-        ],
-        metadata={
-            "voucher_payload": json.dumps(
-                voucher_payload, default=str
+    # A booking's slot is held for the life of the session: placed
+    # with the draft, before Stripe is called, and released with it if
+    # that call fails. The payload stays here; Stripe only carries the
+    # draft's id back. Which practitioners are free may take a Google
+    # call, so it is settled before the transaction opens.
+    hold = None
+    free_calendar_ids: list[str] = []
+    session_options: dict[str, Any] = {}
+    if kind == "booking":
+        free_calendar_ids = selectors.free_calendars(
+            voucher_payload["start_datetime"],
+            voucher_payload["end_datetime"],
+            calendars.calendars_for(voucher_payload.get("service_id")),
+        )
+    with transaction.atomic():
+        if kind == "booking":
+            hold = holds.claim_hold(
+                voucher_payload["start_datetime"],
+                voucher_payload["end_datetime"],
+                free_calendar_ids,
             )
-        },
-    )
+            session_options["expires_at"] = int(
+                (hold.expires_at - holds.HOLD_GRACE).timestamp()
+            )
+        draft = CheckoutDraft.from_payload(voucher_payload)
+
+    try:
+        session = stripe_gateway.create_checkout_session(
+            mode="payment",
+            success_url=settings.STRIPE_SUCCESS_URL,
+            cancel_url=settings.STRIPE_CANCEL_URL,
+            line_items=[
+                {
+                    "quantity": 1,
+                    "price_data": {
+                        "currency": currency,
+                        "unit_amount": _money_to_minor_units(amount),
+                        "product_data": {
+                            "name": product_name,
+                            "description": product_description or " ",
+                        },
+                    },
+                }
+            ],
+            metadata={"draft_id": str(draft.pk)},
+            **session_options,
+        )
+    except Exception:
+        if hold is not None:
+            holds.release_hold(hold)
+        draft.delete()
+        raise
+
+    draft.stripe_checkout_session_id = session["id"]
+    draft.save(update_fields=["stripe_checkout_session_id"])
 
     payment = StripePayment.objects.create(
         kind=kind,
@@ -73,5 +104,7 @@ def create_checkout_session(
         stripe_checkout_session_id=session["id"],
         status=PaymentStatus.CREATED,
     )
+    if hold is not None:
+        holds.attach_session(hold, session["id"])
 
     return payment, str(session["url"])
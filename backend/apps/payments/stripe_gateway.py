@@ -0,0 +1,162 @@
+"""The process's Stripe API client.
+
+Configuring the stripe module globals (api_key, api_version) on every
+checkout leaves each call to the library's default HTTP client and
+timeouts. Instead one StripeClient is built per process, on first use:
+
+- a requests.Session with a keep-alive pool of POOL_SIZE connections,
+  so a checkout reuses an open TLS connection to api.stripe.com;
+- explicit connect/read timeouts instead of the library's 80 seconds;
+- MAX_RETRIES network retries, which the library sends with an
+  idempotency key so a retried create cannot make two sessions;
+- the latency of every HTTP attempt logged and kept in a short window
+  (latency_summary()).
+
+STRIPE_CLIENT["API_BASE"] points the client at another server — a
+local fake for tests and benchmarks (payments/tests/fake_stripe.py).
+Webhook signature checks need no client and stay on stripe.Webhook.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlsplit
+
+import requests
+import stripe
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+logger = logging.getLogger(__name__)
+
+_DEFAULTS: dict[str, Any] = {
+    "CONNECT_TIMEOUT": 3.0,
+    "READ_TIMEOUT": 20.0,
+    "MAX_RETRIES": 2,
+    "POOL_SIZE": 10,
+    "API_BASE": None,
+}
+
+LATENCY_WINDOW = 200
+
+
+def _conf() -> dict[str, Any]:
+    return {**_DEFAULTS, **getattr(settings, "STRIPE_CLIENT", {})}
+
+
+class LatencyLog:
+    """The last `size` request latencies, in seconds."""
+
+    def __init__(self, size: int = LATENCY_WINDOW) -> None:
+        self._samples: deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def summary(self) -> dict[str, float]:
+        """Count and p50/p95/max in milliseconds over the window."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return {"count": 0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+
+        def at(q: float) -> float:
+            return samples[min(len(samples) - 1, int(q * len(samples)))] * 1000
+
+        return {"count": len(samples), "p50": at(0.5), "p95": at(0.95), "max": at(1.0)}
+
+
+class TimedRequestsClient(stripe.RequestsClient):
+    """stripe's requests transport, timing each attempt."""
+
+    def __init__(self, *, latencies: LatencyLog, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.latencies = latencies
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Mapping[str, str] | None,
+        post_data: Any = None,
+    ) -> tuple[bytes, int, Mapping[str, str]]:
+        began = time.perf_counter()
+        status: int | str = "error"
+        try:
+            content, status, response_headers = super().request(
+                method, url, headers, post_data
+            )
+        finally:
+            elapsed = time.perf_counter() - began
+            self.latencies.record(elapsed)
+            logger.info(
+                "Stripe %s %s -> %s in %.0fms",
+                method.upper(),
+                urlsplit(url).path,
+                status,
+                elapsed * 1000,
+            )
+        return content, status, response_headers
+
+
+def _session(pool_size: int) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def build_client(**overrides: Any) -> stripe.StripeClient:
+    """A StripeClient on a pooled, timed transport; see STRIPE_CLIENT."""
+    conf = {**_conf(), **overrides}
+    http_client = TimedRequestsClient(
+        latencies=_latencies,
+        session=_session(conf["POOL_SIZE"]),
+        timeout=(conf["CONNECT_TIMEOUT"], conf["READ_TIMEOUT"]),
+    )
+    base_addresses = {"api": conf["API_BASE"]} if conf["API_BASE"] else None
+    return stripe.StripeClient(
+        settings.STRIPE_SECRET_KEY,
+        stripe_version=settings.STRIPE_API_VERSION,
+        max_network_retries=conf["MAX_RETRIES"],
+        http_client=http_client,
+        base_addresses=base_addresses,
+    )
+
+
+_latencies = LatencyLog()
+_client: stripe.StripeClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> stripe.StripeClient:
+    """The shared client, built on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = build_client()
+    return _client
+
+
+def latency_summary() -> dict[str, float]:
+    return _latencies.summary()
+
+
+def create_checkout_session(**params: Any) -> stripe.checkout.Session:
+    return get_client().v1.checkout.sessions.create(params=params)  # type: ignore[arg-type]
+
+
+def list_checkout_sessions(**params: Any) -> stripe.ListObject[stripe.checkout.Session]:
+    """One page of checkout sessions, newest first."""
+    return get_client().v1.checkout.sessions.list(params=params)  # type: ignore[arg-type]
@@ -0,0 +1,27 @@
+"""Stripe webhook work, run by the job queue (apps.jobs).
+
+The webhook only verifies, records and enqueues; fulfillment — voucher
+or booking rows, the calendar insert and the emails — happens here,
+with retries. Both handlers are idempotent under redelivery, and each
+records its outcome on the StripeWebhookEvent it came from.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from apps.jobs.queue import task
+
+from . import webhooks
+
+
+@task(webhooks.FULFILL_CHECKOUT)
+def fulfill_checkout_session(session: dict[str, Any], event_id: str = "") -> None:
+    with webhooks.tracking_event(event_id):
+        webhooks._fulfill_from_checkout_session(session)
+
+
+@task(webhooks.EXPIRE_CHECKOUT)
+def expire_checkout_session(session: dict[str, Any], event_id: str = "") -> None:
+    with webhooks.tracking_event(event_id):
+        webhooks._expire_checkout_session(session)
@@ -0,0 +1,22 @@
+from collections.abc import Iterator
+
+import pytest
+
+from apps.payments import stripe_gateway
+
+from .fake_stripe import FakeStripe
+
+
+@pytest.fixture()
+def stripe_server(monkeypatch, settings) -> Iterator[FakeStripe]:
+    """A running FakeStripe that the shared Stripe client talks to."""
+    settings.STRIPE_SECRET_KEY = "sk_test_fake"
+    server = FakeStripe().start()
+    monkeypatch.setattr(stripe_gateway, "_latencies", stripe_gateway.LatencyLog())
+    monkeypatch.setattr(
+        stripe_gateway,
+        "_client",
+        stripe_gateway.build_client(API_BASE=server.url, READ_TIMEOUT=2.0),
+    )
+    yield server
+    server.stop()
@@ -0,0 +1,148 @@
+"""A local stand-in for api.stripe.com, for tests and benchmarks.
+
+Serves just the endpoints this app calls, over plain HTTP/1.1 with
+keep-alive, and records what it saw: requests (method, path, headers,
+form params) and how many TCP connections were opened. `fail_next`
+answers that many requests with a retryable 500; `delay` stalls every
+response. Sessions listed by GET /v1/checkout/sessions are seeded with
+add_session(), and paged newest first like Stripe's.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qsl
+
+
+class FakeStripe:
+    def __init__(self) -> None:
+        self.requests: list[dict[str, Any]] = []
+        self.connections = 0
+        self.fail_next = 0
+        self.delay = 0.0
+        self._ids = itertools.count(1)
+        self.sessions: list[dict[str, Any]] = []  # oldest first
+        self._positions: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(self))
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> FakeStripe:
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def add_session(self, session_id: str, *, created: int, **fields: Any) -> dict[str, Any]:
+        """Seed a session for listing; add them oldest first."""
+        session = {
+            "id": session_id,
+            "object": "checkout.session",
+            "created": created,
+            "status": "complete",
+            "payment_status": "paid",
+            "payment_intent": f"pi_{session_id}",
+            "metadata": {},
+            **fields,
+        }
+        self._positions[session_id] = len(self.sessions)
+        self.sessions.append(session)
+        return session
+
+    def _list_sessions(self, params: dict[str, str]) -> dict[str, Any]:
+        limit = int(params.get("limit", 10))
+        position = len(self.sessions) - 1
+        if "starting_after" in params:
+            position = self._positions[params["starting_after"]] - 1
+        created_gte = int(params.get("created[gte]", 0))
+        status = params.get("status")
+        data: list[dict[str, Any]] = []
+        while position >= 0 and len(data) <= limit:
+            session = self.sessions[position]
+            position -= 1
+            if session["created"] < created_gte:
+                break  # listed newest first: the rest are older
+            if status is None or session["status"] == status:
+                data.append(session)
+        return {
+            "object": "list",
+            "url": "/v1/checkout/sessions",
+            "data": data[:limit],
+            "has_more": len(data) > limit,
+        }
+
+    def respond(self, method: str, path: str, params: dict[str, str]) -> tuple[int, Any]:
+        if method == "GET" and path == "/v1/checkout/sessions":
+            return 200, self._list_sessions(params)
+        if method == "POST" and path == "/v1/checkout/sessions":
+            session_id = f"cs_fake_{next(self._ids)}"
+            return 200, {
+                "id": session_id,
+                "object": "checkout.session",
+                "url": f"https://checkout.stripe.test/{session_id}",
+                "mode": params.get("mode"),
+                "status": "open",
+            }
+        return 404, {"error": {"type": "invalid_request_error", "message": path}}
+
+
+def _handler(fake: FakeStripe) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def setup(self) -> None:
+            super().setup()
+            with fake._lock:
+                fake.connections += 1
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+        def _serve(self) -> None:
+            path, _, query = self.path.partition("?")
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length).decode() if length else query
+            params = dict(parse_qsl(body, keep_blank_values=True))
+            with fake._lock:
+                fake.requests.append(
+                    {
+                        "method": self.command,
+                        "path": path,
+                        "headers": dict(self.headers),
+                        "params": params,
+                    }
+                )
+                failing = fake.fail_next > 0
+                fake.fail_next -= failing
+            if fake.delay:
+                time.sleep(fake.delay)
+            if failing:
+                status, payload = 500, {"error": {"type": "api_error"}}
+            else:
+                status, payload = fake.respond(self.command, path, params)
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            if failing:
+                self.send_header("Stripe-Should-Retry", "true")
+            self.end_headers()
+            self.wfile.write(data)
+
+        do_GET = do_POST = do_DELETE = _serve
+
+    return Handler
@@ -14,7 +14,8 @@ from django.utils import timezone
 from rest_framework.test import APIClient
 
 from apps.availability.models import Booking
-from apps.payments.models import PaymentStatus, StripePayment
+from apps.emails.outbox import deliver_pending
+from apps.payments.models import CheckoutDraft, PaymentStatus, StripePayment
 from apps.payments.webhooks import _fulfill_from_checkout_session
 
 pytestmark = pytest.mark.django_db
@@ -57,9 +58,13 @@ class TestCheckoutKind:
             return {"id": "cs_book_1", "url": "https://stripe.test/cs_book_1"}
 
         monkeypatch.setattr(
-            "apps.payments.services.stripe.checkout.Session.create",
+            "apps.payments.services.stripe_gateway.create_checkout_session",
             fake_create,
         )
+        monkeypatch.setattr(
+            "apps.availability.selectors.calendar_gateway.list_busy_intervals",
+            lambda *args: [],
+        )
         response = APIClient().post(
             "/api/payments/checkout/", _booking_payload(service), format="json"
         )
@@ -70,7 +75,36 @@ class TestCheckoutKind:
         assert payment.kind == "booking"
         name = captured["line_items"][0]["price_data"]["product_data"]["name"]
         assert name.startswith("Booking")
-        assert '"kind": "booking"' in captured["metadata"]["voucher_payload"]
+        draft = CheckoutDraft.objects.get(stripe_checkout_session_id="cs_book_1")
+        assert captured["metadata"] == {"draft_id": str(draft.pk)}
+        assert draft.kind == "booking"
+        assert draft.service_id == service.id
+
+    @pytest.mark.django_db(transaction=True)
+    def test_google_is_asked_before_the_transaction_opens(
+        self, service, monkeypatch
+    ):
+        from django.db import connection
+
+        during_lookup = []
+
+        def busy(*args):
+            during_lookup.append(connection.in_atomic_block)
+            return []
+
+        monkeypatch.setattr(
+            "apps.payments.services.stripe_gateway.create_checkout_session",
+            lambda **kwargs: {"id": "cs_book_2", "url": "https://stripe.test/cs_book_2"},
+        )
+        monkeypatch.setattr(
+            "apps.availability.selectors.calendar_gateway.list_busy_intervals", busy
+        )
+        response = APIClient().post(
+            "/api/payments/checkout/", _booking_payload(service), format="json"
+        )
+
+        assert response.status_code == 201
+        assert during_lookup and not any(during_lookup)
 
     def test_booking_requires_schedule_fields(self, client, service):
         payload = _booking_payload(service)
@@ -113,21 +147,23 @@ class TestCheckoutKind:
 
 class TestBookingFulfillment:
     def _session(self, service, session_id="cs_book_hook"):
-        import json
-
+        draft = CheckoutDraft.objects.filter(
+            stripe_checkout_session_id=session_id
+        ).first()
+        if draft is None:
+            draft = CheckoutDraft.from_payload(_booking_payload(service))
+            draft.stripe_checkout_session_id = session_id
+            draft.save()
         return {
             "id": session_id,
             "payment_intent": "pi_123",
-            "metadata": {
-                "voucher_payload": json.dumps(
-                    _booking_payload(service), default=str
-                )
-            },
+            "metadata": {"draft_id": str(draft.pk)},
         }
 
     def _fulfill(self, session_obj):
         with transaction.atomic():
             _fulfill_from_checkout_session(session_obj)
+        deliver_pending()
 
     def test_completed_session_creates_booking_and_emails(
         self, service, monkeypatch, mailoutbox
@@ -175,6 +211,33 @@ class TestBookingFulfillment:
         assert Booking.objects.count() == 1
         assert len(mailoutbox) == emails_after_first
 
+    def test_overlapping_booking_is_flagged_for_refund(
+        self, service, monkeypatch, mailoutbox
+    ):
+        monkeypatch.setattr(
+            "apps.availability.services.calendar_gateway.create_booking_event",
+            lambda **kw: None,
+        )
+        for session_id in ("cs_first", "cs_second"):
+            StripePayment.objects.create(
+                kind="booking",
+                amount="60.00",
+                stripe_checkout_session_id=session_id,
+            )
+        self._fulfill(self._session(service, "cs_first"))
+        emails_after_first = len(mailoutbox)
+
+        self._fulfill(self._session(service, "cs_second"))
+        self._fulfill(self._session(service, "cs_second"))  # redelivery
+
+        assert Booking.objects.count() == 1
+        payment = StripePayment.objects.get(stripe_checkout_session_id="cs_second")
+        assert payment.status == PaymentStatus.CONFLICT
+        assert payment.booking_id is None
+        assert payment.paid_at is not None
+        assert len(mailoutbox) == emails_after_first + 1
+        assert "cs_second" in mailoutbox[-1].body
+
     def test_gift_fulfillment_regression(self, monkeypatch, mailoutbox):
         import json
 
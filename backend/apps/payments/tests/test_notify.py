@@ -0,0 +1,108 @@
+import asyncio
+import select
+import threading
+from types import SimpleNamespace
+
+import pytest
+from django.db import connection, transaction
+
+from apps.payments import notify
+from apps.payments.notify import Broadcaster
+
+
+@pytest.mark.asyncio
+async def test_publish_from_another_thread_wakes_subscribers():
+    events = Broadcaster("test_events")
+
+    with events.subscribe("cs_1") as first, events.subscribe("cs_1") as second:
+        with events.subscribe("cs_2") as other:
+            threading.Thread(target=events.publish, args=("cs_1",)).start()
+
+            assert await first.wait(5) is True
+            assert await second.wait(5) is True
+            assert await other.wait(0.05) is False
+
+    assert events.publish("cs_1") == 0
+    assert events._subscribers == {}
+
+
+@pytest.mark.asyncio
+async def test_a_publish_before_waiting_is_not_lost():
+    events = Broadcaster("test_events")
+
+    with events.subscribe("cs_1") as subscription:
+        assert events.publish("cs_1") == 1
+        await asyncio.sleep(0)
+
+        assert await subscription.wait(0.05) is True
+        assert await subscription.wait(0.05) is False
+
+
+class FakeListenConnection:
+    def __init__(self, *payloads):
+        self.notifies = [SimpleNamespace(payload=payload) for payload in payloads]
+        self.polls = 0
+
+    def poll(self):
+        self.polls += 1
+
+
+@pytest.mark.asyncio
+async def test_relay_publishes_received_notifications():
+    events = Broadcaster("test_events")
+    listening = FakeListenConnection("cs_1", "cs_2")
+
+    with events.subscribe("cs_1") as subscription:
+        assert events.relay(listening) == 2
+        assert await subscription.wait(5) is True
+
+    assert listening.polls == 1
+    assert listening.notifies == []
+
+
+@pytest.mark.django_db(transaction=True)
+def test_publish_on_commit_waits_for_the_commit(monkeypatch):
+    events = Broadcaster("test_events")
+    published = []
+    monkeypatch.setattr(events, "publish", published.append)
+
+    with transaction.atomic():
+        events.publish_on_commit("cs_1")
+        assert published == []
+    assert published == ["cs_1"]
+
+    with pytest.raises(RuntimeError), transaction.atomic():
+        events.publish_on_commit("cs_2")
+        raise RuntimeError("rollback")
+    assert published == ["cs_1"]
+
+
+@pytest.mark.django_db
+def test_no_listener_without_postgres():
+    if connection.vendor == "postgresql":
+        pytest.skip("listens on Postgres")
+    assert notify.start_in_background() is None
+
+
+@pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="LISTEN/NOTIFY is Postgres-only"
+)
+@pytest.mark.django_db(transaction=True)
+def test_publish_on_commit_reaches_other_connections(monkeypatch):
+    events = Broadcaster("test_events")
+    relayed = []
+    listening = connection.get_new_connection(connection.get_connection_params())
+    try:
+        listening.autocommit = True
+        with listening.cursor() as cursor:
+            cursor.execute('LISTEN "test_events"')
+
+        with transaction.atomic():
+            events.publish_on_commit("cs_1")
+        select.select([listening], [], [], 5)
+        monkeypatch.setattr(events, "publish", relayed.append)
+        events.relay(listening)
+    finally:
+        listening.close()
+
+    assert relayed == ["cs_1"]
@@ -0,0 +1,196 @@
+import time
+from datetime import timedelta
+
+import pytest
+import stripe
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.payments import reconcile
+from apps.payments.models import (
+    CheckoutDraft,
+    PaymentStatus,
+    ReconcileState,
+    StripePayment,
+)
+from apps.vouchers.models import GiftVoucher
+
+pytestmark = pytest.mark.django_db
+
+
+def _ago(**delta):
+    return int((timezone.now() - timedelta(**delta)).timestamp())
+
+
+@pytest.fixture()
+def fulfilled(monkeypatch):
+    """Record fulfillment calls instead of creating vouchers."""
+    calls = []
+
+    def _fulfill(session):
+        calls.append(session["id"])
+        StripePayment.objects.filter(stripe_checkout_session_id=session["id"]).update(
+            status=PaymentStatus.PAID
+        )
+
+    monkeypatch.setattr(reconcile.webhooks, "_fulfill_from_checkout_session", _fulfill)
+    return calls
+
+
+def _payment(session_id, status=PaymentStatus.CREATED):
+    return StripePayment.objects.create(
+        amount="45.00", stripe_checkout_session_id=session_id, status=status
+    )
+
+
+def test_lost_webhook_is_fulfilled_through_the_webhook_path(stripe_server, monkeypatch):
+    monkeypatch.setattr(
+        "apps.payments.webhooks.send_voucher_emails", lambda voucher: None
+    )
+    _payment("cs_lost")
+    draft = CheckoutDraft.objects.create(
+        stripe_checkout_session_id="cs_lost",
+        sender_name="John Doe",
+        sender_email="john@example.com",
+        recipient_name="Jane Doe",
+        recipient_email="jane@example.com",
+        amount="45.00",
+    )
+    stripe_server.add_session(
+        "cs_lost", created=_ago(hours=2), metadata={"draft_id": str(draft.pk)}
+    )
+
+    counts = reconcile.reconcile()
+
+    payment = StripePayment.objects.get(stripe_checkout_session_id="cs_lost")
+    assert counts == {"sessions": 1, "pages": 1, "fulfilled": 1, "failed": 0}
+    assert payment.status == PaymentStatus.PAID
+    assert payment.stripe_payment_intent_id == "pi_cs_lost"
+    assert GiftVoucher.objects.get(pk=payment.voucher_id).recipient_name == "Jane Doe"
+
+
+def test_only_paid_and_unfulfilled_sessions_are_fulfilled(stripe_server, fulfilled):
+    _payment("cs_pending")
+    _payment("cs_done", PaymentStatus.PAID)
+    _payment("cs_unpaid")
+    stripe_server.add_session("cs_pending", created=_ago(hours=3))
+    stripe_server.add_session("cs_done", created=_ago(hours=2))
+    stripe_server.add_session("cs_unpaid", created=_ago(hours=1), payment_status="unpaid")
+    stripe_server.add_session("cs_elsewhere", created=_ago(minutes=5))
+
+    reconcile.reconcile()
+    reconcile.reconcile()  # nothing left to do
+
+    assert fulfilled == ["cs_pending"]
+
+
+def test_pages_with_starting_after_and_one_query_per_page(stripe_server, fulfilled):
+    for n in range(25):
+        _payment(f"cs_{n}", PaymentStatus.PAID if n % 5 else PaymentStatus.CREATED)
+        stripe_server.add_session(f"cs_{n}", created=_ago(minutes=100 - n))
+
+    with CaptureQueriesContext(connection) as queries:
+        counts = reconcile.reconcile(page_size=10)
+
+    lists = [r for r in stripe_server.requests if r["method"] == "GET"]
+    assert [r["params"].get("starting_after") for r in lists] == [None, "cs_15", "cs_5"]
+    assert counts == {"sessions": 25, "pages": 3, "fulfilled": 5, "failed": 0}
+    assert sorted(fulfilled) == ["cs_0", "cs_10", "cs_15", "cs_20", "cs_5"]
+    matching = [q for q in queries if "IN (" in q["sql"] and "stripe_checkout_session_id" in q["sql"]]
+    assert len(matching) == 3
+
+
+def test_watermark_trails_the_session_lifetime(stripe_server, fulfilled):
+    stripe_server.add_session("cs_old", created=_ago(days=3))
+    stripe_server.add_session("cs_recent", created=_ago(hours=1))
+
+    assert reconcile.reconcile()["sessions"] == 2
+
+    state = ReconcileState.objects.get(name=reconcile.CHECKOUT_SESSIONS)
+    expected = timezone.now() - reconcile.SESSION_LIFETIME
+    assert abs((state.watermark - expected).total_seconds()) < 60
+    stripe_server.requests.clear()
+
+    assert reconcile.reconcile()["sessions"] == 1
+    [request] = stripe_server.requests
+    assert int(request["params"]["created[gte]"]) == int(state.watermark.timestamp())
+
+
+def test_failures_hold_the_watermark(stripe_server, monkeypatch):
+    _payment("cs_broken")
+    stripe_server.add_session("cs_broken", created=_ago(days=3))
+
+    def boom(session):
+        raise RuntimeError("db hiccup")
+
+    monkeypatch.setattr(reconcile.webhooks, "_fulfill_from_checkout_session", boom)
+
+    with pytest.raises(CommandError):
+        call_command("reconcile_payments")
+
+    state = ReconcileState.objects.get(name=reconcile.CHECKOUT_SESSIONS)
+    assert state.watermark is None
+    assert reconcile.reconcile()["failed"] == 1  # retried next sweep
+
+
+def test_stripe_errors_are_recorded(stripe_server, monkeypatch):
+    monkeypatch.setattr(
+        reconcile.stripe_gateway,
+        "_client",
+        reconcile.stripe_gateway.build_client(API_BASE=stripe_server.url, MAX_RETRIES=0),
+    )
+    stripe_server.fail_next = 1
+
+    with pytest.raises(stripe.APIError):
+        reconcile.reconcile()
+
+    state = ReconcileState.objects.get(name=reconcile.CHECKOUT_SESSIONS)
+    assert state.last_error
+    assert state.watermark is None
+
+
+def test_command_reports_counts(stripe_server, fulfilled, capsys):
+    _payment("cs_1")
+    stripe_server.add_session("cs_1", created=_ago(hours=1))
+
+    call_command("reconcile_payments", "--hours", "2")
+
+    assert "1 session(s) in 1 page(s): 1 fulfilled, 0 failed" in capsys.readouterr().out
+
+
+@pytest.mark.performance
+def test_reconcile_benchmark_10k_sessions(stripe_server, fulfilled):
+    """
+    Benchmark: a day of 10,000 completed sessions, 100 of them unfulfilled.
+
+    100 pages of 100 from the local fake, each matched in one query.
+    The timing is informational and only reported when the query
+    count assertion fails.
+    """
+    total, missed = 10_000, 100
+    created = _ago(hours=20)
+    StripePayment.objects.bulk_create(
+        StripePayment(
+            amount="45.00",
+            stripe_checkout_session_id=f"cs_{n:05d}",
+            status=PaymentStatus.CREATED if n % (total // missed) == 0 else PaymentStatus.PAID,
+        )
+        for n in range(total)
+    )
+    for n in range(total):
+        stripe_server.add_session(f"cs_{n:05d}", created=created + n)
+
+    began = time.perf_counter()
+    with CaptureQueriesContext(connection) as queries:
+        counts = reconcile.reconcile()
+    elapsed = time.perf_counter() - began
+
+    assert counts == {"sessions": total, "pages": 100, "fulfilled": missed, "failed": 0}
+    # One IN query per page, plus fulfillment and the state row.
+    assert len(queries) <= counts["pages"] + 2 * missed + 5, (
+        f"{counts['sessions']} sessions, {counts['pages']} pages, "
+        f"{len(queries)} queries in {elapsed * 1000:.0f}ms"
+    )
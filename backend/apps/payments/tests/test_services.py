@@ -2,7 +2,7 @@ from decimal import Decimal
 
 import pytest
 
-from apps.payments.models import PaymentStatus, StripePayment
+from apps.payments.models import CheckoutDraft, PaymentStatus, StripePayment
 from apps.payments.services import _money_to_minor_units, create_checkout_session
 
 pytestmark = pytest.mark.django_db
@@ -34,7 +34,7 @@ def test_create_checkout_session_creates_payment_and_returns_url(
         }
 
     monkeypatch.setattr(
-        "apps.payments.services.stripe.checkout.Session.create",
+        "apps.payments.services.stripe_gateway.create_checkout_session",
         fake_create,
     )
 
@@ -63,7 +63,35 @@ def test_create_checkout_session_creates_payment_and_returns_url(
     assert captured["line_items"][0]["price_data"]["currency"] == "eur"
     assert captured["line_items"][0]["price_data"]["unit_amount"] == 4500
     assert captured["line_items"][0]["price_data"]["product_data"]["name"] == "Gift Voucher"
-    assert "voucher_payload" in captured["metadata"]
+
+    draft = CheckoutDraft.objects.get(stripe_checkout_session_id="cs_test_123")
+    assert captured["metadata"] == {"draft_id": str(draft.pk)}
+    assert draft.kind == "gift"
+    assert draft.recipient_email == "jane@example.com"
+    assert draft.amount == Decimal("45.00")
+
+
+def test_failed_stripe_call_discards_the_draft(monkeypatch, settings):
+    def boom(**kwargs):
+        raise RuntimeError("stripe down")
+
+    monkeypatch.setattr(
+        "apps.payments.services.stripe_gateway.create_checkout_session", boom
+    )
+
+    with pytest.raises(RuntimeError):
+        create_checkout_session(
+            voucher_payload={
+                "sender_name": "John Doe",
+                "sender_email": "john@example.com",
+                "recipient_name": "Jane Doe",
+                "recipient_email": "jane@example.com",
+                "preferred_language": "en",
+                "amount": "45.00",
+            }
+        )
+
+    assert not CheckoutDraft.objects.exists()
 
 
 def test_create_checkout_session_uses_default_currency_when_setting_missing(
@@ -87,7 +115,7 @@ def test_create_checkout_session_uses_default_currency_when_setting_missing(
         }
 
     monkeypatch.setattr(
-        "apps.payments.services.stripe.checkout.Session.create",
+        "apps.payments.services.stripe_gateway.create_checkout_session",
         fake_create,
     )
 
@@ -0,0 +1,119 @@
+import time
+
+import pytest
+import stripe
+
+from apps.payments import stripe_gateway
+from apps.payments.services import create_checkout_session
+
+pytestmark = pytest.mark.django_db
+
+GIFT = {
+    "sender_name": "John Doe",
+    "sender_email": "john@example.com",
+    "recipient_name": "Jane Doe",
+    "recipient_email": "jane@example.com",
+    "preferred_language": "en",
+    "amount": "45.00",
+}
+
+
+def test_checkout_goes_through_the_configured_client(stripe_server, settings):
+    payment, url = create_checkout_session(voucher_payload=GIFT)
+
+    [request] = stripe_server.requests
+    assert request["path"] == "/v1/checkout/sessions"
+    assert request["headers"]["Authorization"] == "Bearer sk_test_fake"
+    assert request["headers"]["Stripe-Version"] == settings.STRIPE_API_VERSION
+    assert request["params"]["line_items[0][price_data][unit_amount]"] == "4500"
+    assert payment.stripe_checkout_session_id == "cs_fake_1"
+    assert url == "https://checkout.stripe.test/cs_fake_1"
+
+
+def test_calls_share_one_kept_alive_connection(stripe_server):
+    for _ in range(5):
+        stripe_gateway.create_checkout_session(mode="payment")
+
+    assert len(stripe_server.requests) == 5
+    assert stripe_server.connections == 1
+
+
+def test_retryable_errors_are_retried_with_the_same_idempotency_key(stripe_server):
+    stripe_server.fail_next = 1
+
+    session = stripe_gateway.create_checkout_session(mode="payment")
+
+    first, second = stripe_server.requests
+    assert session["id"] == "cs_fake_1"
+    assert first["headers"]["Idempotency-Key"] == second["headers"]["Idempotency-Key"]
+
+
+def test_slow_responses_time_out(stripe_server, monkeypatch):
+    monkeypatch.setattr(
+        stripe_gateway,
+        "_client",
+        stripe_gateway.build_client(
+            API_BASE=stripe_server.url, READ_TIMEOUT=0.1, MAX_RETRIES=0
+        ),
+    )
+    stripe_server.delay = 0.5
+
+    with pytest.raises(stripe.APIConnectionError):
+        stripe_gateway.create_checkout_session(mode="payment")
+
+    assert stripe_gateway.latency_summary()["count"] == 1
+
+
+def test_latency_is_recorded_per_attempt(stripe_server, caplog):
+    caplog.set_level("INFO", logger="apps.payments.stripe_gateway")
+    stripe_server.fail_next = 1
+
+    stripe_gateway.create_checkout_session(mode="payment")
+
+    summary = stripe_gateway.latency_summary()
+    assert summary["count"] == 2
+    assert 0 < summary["p50"] <= summary["max"]
+    assert "Stripe POST /v1/checkout/sessions -> 500" in caplog.text
+    assert "Stripe POST /v1/checkout/sessions -> 200" in caplog.text
+
+
+def test_latency_log_keeps_a_window():
+    log = stripe_gateway.LatencyLog(size=3)
+    for ms in (100, 1, 2, 3):
+        log.record(ms / 1000)
+
+    assert log.summary() == {"count": 3, "p50": 2.0, "p95": 3.0, "max": 3.0}
+
+
+@pytest.mark.performance
+def test_pooled_client_benchmark(stripe_server):
+    """
+    Benchmark: 50 checkout creates against the local fake.
+
+    A client per call (the old per-checkout setup) opens a connection
+    per call; the shared client reuses one. Against api.stripe.com each
+    saved connection is a TLS handshake; locally only TCP setup, so the
+    assertion is on connections and the timings are only reported when
+    it fails.
+    """
+    calls = 50
+
+    began = time.perf_counter()
+    for _ in range(calls):
+        stripe_gateway.build_client(API_BASE=stripe_server.url).v1.checkout.sessions.create(
+            params={"mode": "payment"}
+        )
+    fresh = time.perf_counter() - began
+    fresh_connections = stripe_server.connections
+
+    began = time.perf_counter()
+    for _ in range(calls):
+        stripe_gateway.create_checkout_session(mode="payment")
+    pooled = time.perf_counter() - began
+
+    report = (
+        f"client per call={fresh * 1000:.0f}ms ({fresh_connections} connections) "
+        f"pooled={pooled * 1000:.0f}ms ({stripe_server.connections - fresh_connections})"
+    )
+    assert fresh_connections == calls, report
+    assert stripe_server.connections - fresh_connections == 1, report
@@ -1,9 +1,15 @@
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
+from django.test import Client
 from django.urls import reverse
 
-from apps.payments.models import PaymentStatus, StripePayment
+from apps.payments import views
+from apps.payments.models import CheckoutDraft, PaymentStatus, StripePayment
+from apps.payments.notify import payment_events
+from apps.payments.webhooks import _fulfill_from_checkout_session
 
 pytestmark = pytest.mark.django_db
 
@@ -95,3 +101,74 @@ def test_get_payment_status_returns_status_and_voucher_id(client):
         "status": PaymentStatus.PAID,
         "voucher_id": 77,
     }
+
+
+def _wait(client, session_id, **params):
+    return client.get(
+        reverse("payments_status_wait"), {"session_id": session_id, **params}
+    )
+
+
+def test_wait_for_payment_status_validates_its_query(client):
+    assert client.get(reverse("payments_status_wait")).status_code == 400
+    assert _wait(client, "cs_x", timeout="soon").status_code == 400
+    assert _wait(client, "cs_x", timeout="nan").status_code == 400
+    assert _wait(client, "cs_x", timeout="inf").status_code == 400
+    assert _wait(client, "cs_x", timeout="-inf").status_code == 400
+    assert _wait(client, "cs_x", timeout="").status_code == 400
+    assert _wait(client, "cs_missing").status_code == 404
+
+
+def test_wait_for_payment_status_answers_settled_payments_at_once(client):
+    StripePayment.objects.create(
+        amount="45.00",
+        stripe_checkout_session_id="cs_paid",
+        status=PaymentStatus.PAID,
+        voucher_id=12,
+    )
+
+    response = _wait(client, "cs_paid")
+
+    assert response.json() == {"status": "paid", "voucher_id": 12}
+    assert "no-cache" in response["Cache-Control"]
+
+
+def test_wait_for_payment_status_gives_up_after_the_timeout(client):
+    StripePayment.objects.create(
+        amount="45.00", stripe_checkout_session_id="cs_open"
+    )
+
+    began = time.monotonic()
+    response = _wait(client, "cs_open", timeout="0.2")
+
+    assert response.json()["status"] == "created"
+    assert 0.2 <= time.monotonic() - began < 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_wait_for_payment_status_wakes_on_fulfillment(client, monkeypatch):
+    monkeypatch.setattr(views, "RECHECK_INTERVAL", 30.0)
+    monkeypatch.setattr(
+        "apps.payments.webhooks.send_voucher_emails", lambda voucher: None
+    )
+    StripePayment.objects.create(
+        amount="45.00", stripe_checkout_session_id="cs_live"
+    )
+    draft = CheckoutDraft.from_payload(
+        {**_valid_payload(), "kind": "gift"}
+    )
+    draft.stripe_checkout_session_id = "cs_live"
+    draft.save()
+
+    with ThreadPoolExecutor(1) as pool:
+        waiting = pool.submit(_wait, Client(), "cs_live", timeout="20")
+        while not payment_events._subscribers.get("cs_live"):
+            assert not waiting.done()
+            time.sleep(0.01)
+
+        began = time.monotonic()
+        _fulfill_from_checkout_session({"id": "cs_live", "metadata": {}})
+        response = waiting.result(timeout=10)
+
+    assert response.json()["status"] == "paid"
+    assert time.monotonic() - began < 5
@@ -1,31 +1,36 @@
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
 
 import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client
 from django.urls import reverse
 from django.utils import timezone
 
+from apps.jobs.models import Job
+from apps.jobs.queue import enqueue
 from apps.payments.models import (
+    CheckoutDraft,
     PaymentStatus,
     StripePayment,
     StripeWebhookEvent,
+    WebhookEventStatus,
 )
 from apps.payments.webhooks import (
-    _already_processed,
     _fulfill_from_checkout_session,
-    _mark_processed,
+    _record_event,
 )
+from apps.vouchers.models import GiftVoucher
 
 pytestmark = pytest.mark.django_db
 
 
-def test_already_processed_returns_false_initially():
-    assert _already_processed("evt_123") is False
-
-
-def test_mark_processed_creates_idempotency_record():
-    _mark_processed("evt_123", "checkout.session.completed")
-
-    assert _already_processed("evt_123") is True
+def test_record_event_is_true_only_the_first_time():
+    assert _record_event("evt_123", "checkout.session.completed") is True
+    assert _record_event("evt_123", "checkout.session.completed") is False
 
     event = StripeWebhookEvent.objects.get(
         stripe_event_id="evt_123"
@@ -33,15 +38,17 @@ def test_mark_processed_creates_idempotency_record():
     assert event.event_type == "checkout.session.completed"
     assert event.livemode is False
     assert event.stripe_created_at is None
+    assert event.status == WebhookEventStatus.RECEIVED
+    assert event.created_at is not None
 
 
-def test_mark_processed_stores_livemode_and_stripe_created_at():
+def test_record_event_stores_livemode_and_stripe_created_at():
     from datetime import UTC, datetime
 
     ts = 1700000000
     expected_dt = datetime.fromtimestamp(ts, tz=UTC)
 
-    _mark_processed(
+    _record_event(
         "evt_audit",
         "checkout.session.completed",
         livemode=True,
@@ -204,13 +211,15 @@ def test_fulfill_from_checkout_session_marks_paid_and_sets_voucher(
         "message": "Enjoy your gift",
     }
 
+    draft = CheckoutDraft.from_payload(voucher_payload)
+    draft.stripe_checkout_session_id = "cs_test_123"
+    draft.save()
+
     _fulfill_from_checkout_session(
         {
             "id": "cs_test_123",
             "payment_intent": "pi_123",
-            "metadata": {
-                "voucher_payload": json.dumps(voucher_payload),
-            },
+            "metadata": {"draft_id": str(draft.pk)},
         }
     )
 
@@ -219,10 +228,48 @@ def test_fulfill_from_checkout_session_marks_paid_and_sets_voucher(
     assert payment.voucher_id == 88
     assert payment.stripe_payment_intent_id == "pi_123"
     assert payment.paid_at is not None
-    assert created_payloads == [voucher_payload]
+    assert created_payloads == [
+        {
+            **voucher_payload,
+            "amount": Decimal("45.00"),
+            "service_id": None,
+            "start_datetime": None,
+            "end_datetime": None,
+        }
+    ]
     assert emailed_vouchers == [88]
 
 
+def test_fulfillment_finds_the_draft_by_metadata_id(monkeypatch):
+    """The draft is found even if its session id was never saved."""
+    StripePayment.objects.create(
+        amount="45.00",
+        currency="eur",
+        stripe_checkout_session_id="cs_unsaved",
+        status=PaymentStatus.CREATED,
+    )
+    draft = CheckoutDraft.objects.create(
+        sender_name="John Doe",
+        sender_email="john@example.com",
+        recipient_name="Jane Doe",
+        recipient_email="jane@example.com",
+        amount="45.00",
+    )
+    monkeypatch.setattr(
+        "apps.payments.webhooks.send_voucher_emails", lambda voucher: None
+    )
+
+    _fulfill_from_checkout_session(
+        {"id": "cs_unsaved", "metadata": {"draft_id": str(draft.pk)}}
+    )
+
+    payment = StripePayment.objects.get(stripe_checkout_session_id="cs_unsaved")
+    voucher = GiftVoucher.objects.get(pk=payment.voucher_id)
+    assert payment.status == PaymentStatus.PAID
+    assert voucher.recipient_email == "jane@example.com"
+    assert voucher.amount == Decimal("45.00")
+
+
 def test_fulfill_from_checkout_session_commits_even_if_email_fails(
     monkeypatch,
 ):
@@ -393,9 +440,17 @@ def test_stripe_webhook_processes_checkout_session_completed(
 
     assert response.status_code == 200
 
+    # Fulfillment is queued, not run inline.
     payment = StripePayment.objects.get(
         stripe_checkout_session_id="cs_test_123"
     )
+    assert payment.status == PaymentStatus.CREATED
+    job = Job.objects.get()
+    assert job.task == "payments.fulfill_checkout_session"
+
+    call_command("run_jobs")
+
+    payment.refresh_from_db()
     assert payment.status == PaymentStatus.PAID
     assert payment.voucher_id == 55
     assert StripeWebhookEvent.objects.filter(
@@ -408,6 +463,29 @@ def test_stripe_webhook_processes_checkout_session_completed(
     )
     assert event.livemode is False
     assert event.stripe_created_at is not None
+    assert event.status == WebhookEventStatus.PROCESSED
+    assert event.processed_at is not None
+
+
+def test_failed_fulfillment_is_recorded_on_the_event(monkeypatch):
+    _record_event("evt_fail", "checkout.session.completed")
+    enqueue(
+        "payments.fulfill_checkout_session",
+        {"session": {"id": "cs_x"}, "event_id": "evt_fail"},
+    )
+
+    def boom(session):
+        raise RuntimeError("db hiccup")
+
+    monkeypatch.setattr(
+        "apps.payments.webhooks._fulfill_from_checkout_session", boom
+    )
+    call_command("run_jobs")
+
+    event = StripeWebhookEvent.objects.get(stripe_event_id="evt_fail")
+    assert event.status == WebhookEventStatus.FAILED
+    assert "db hiccup" in event.last_error
+    assert event.processed_at is None
 
 
 def test_stripe_webhook_ignores_unhandled_event_type_but_marks_processed(
@@ -446,3 +524,61 @@ def test_stripe_webhook_ignores_unhandled_event_type_but_marks_processed(
     assert event.event_type == "payment_intent.created"
     assert event.livemode is True
     assert event.stripe_created_at is not None
+    assert event.status == WebhookEventStatus.IGNORED
+    assert not Job.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_duplicate_deliveries_enqueue_once(monkeypatch, settings):
+    settings.STRIPE_WEBHOOK_SECRET = "whsec_test"
+    deliveries = 8
+    barrier = threading.Barrier(deliveries, timeout=10)
+
+    first_try = threading.local()
+
+    def fake_construct_event(**kwargs):
+        if getattr(first_try, "done", False) is False:
+            first_try.done = True
+            barrier.wait()  # all first attempts reach the insert together
+        return {
+            "id": "evt_dup",
+            "type": "checkout.session.completed",
+            "livemode": False,
+            "created": 1700000000,
+            "data": {"object": {"id": "cs_dup"}},
+        }
+
+    monkeypatch.setattr(
+        "apps.payments.webhooks.stripe.Webhook.construct_event",
+        fake_construct_event,
+    )
+
+    def deliver():
+        # SQLite's in-memory test database refuses concurrent writers
+        # outright ("table is locked"); such a delivery is retried, as
+        # Stripe would. Any other failure, such as a duplicate-key
+        # error, fails the test.
+        client = Client(raise_request_exception=False)
+        try:
+            for _ in range(50):
+                response = client.post(
+                    reverse("payments_webhook"),
+                    data="{}",
+                    content_type="application/json",
+                    HTTP_STRIPE_SIGNATURE="sig_test",
+                )
+                if response.status_code == 200:
+                    break
+                _, error, _ = response.exc_info
+                if "table is locked" not in str(error):
+                    break
+            return response.status_code
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(deliveries) as pool:
+        statuses = list(pool.map(lambda _: deliver(), range(deliveries)))
+
+    assert statuses == [200] * deliveries
+    assert StripeWebhookEvent.objects.filter(stripe_event_id="evt_dup").count() == 1
+    assert Job.objects.count() == 1
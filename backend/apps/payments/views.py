@@ -1,19 +1,35 @@
 from __future__ import annotations
 
+import asyncio
+import math
 from typing import TYPE_CHECKING
 
+from django.http import JsonResponse
+from django.utils.cache import add_never_cache_headers
+from django.views.decorators.http import require_GET
 from rest_framework.decorators import api_view, permission_classes, throttle_classes
+from rest_framework.exceptions import ErrorDetail, ValidationError
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.throttling import AnonRateThrottle
 
-from .models import StripePayment
+from apps.availability.services import SlotUnavailableError
+
+from .models import PaymentStatus, StripePayment
+from .notify import payment_events
 from .serializers import CheckoutRequestSerializer, CheckoutResponseSerializer
 from .services import create_checkout_session
 
 if TYPE_CHECKING:
+    from django.http import HttpRequest
     from rest_framework.request import Request
 
+# Long-poll bounds: under Fly's 60s proxy idle timeout, and the row is
+# re-read every RECHECK_INTERVAL in case a notification was missed
+# (see notify.py).
+WAIT_TIMEOUT = 25.0
+RECHECK_INTERVAL = 5.0
+
 
 class CheckoutThrottle(AnonRateThrottle):
     rate = "10/hour"
@@ -26,7 +42,19 @@ def create_checkout(request: Request) -> Response:
     ser = CheckoutRequestSerializer(data=request.data)
     ser.is_valid(raise_exception=True)
 
-    payment, url = create_checkout_session(voucher_payload=ser.validated_data)
+    try:
+        payment, url = create_checkout_session(voucher_payload=ser.validated_data)
+    except SlotUnavailableError as error:
+        raise ValidationError(
+            {
+                "start_datetime": [
+                    ErrorDetail(
+                        "This time slot is no longer available.",
+                        code="slot_unavailable",
+                    )
+                ]
+            }
+        ) from error
 
     out = CheckoutResponseSerializer(
         {"url": url, "session_id": payment.stripe_checkout_session_id}
@@ -45,7 +73,48 @@ def get_payment_status(request: Request) -> Response:
     if not payment:
         return Response({"status": "unknown"}, status=404)
 
-    return Response({
-        "status": payment.status,
-        "voucher_id": payment.voucher_id
-    })
+    return Response(_status_payload(payment))
+
+
+def _status_payload(payment: StripePayment) -> dict[str, object]:
+    return {"status": payment.status, "voucher_id": payment.voucher_id}
+
+
+@require_GET
+async def wait_for_payment_status(request: HttpRequest) -> JsonResponse:
+    """
+    Long-poll variant of get_payment_status for the success page.
+
+    Answers as soon as the payment leaves "created" — woken by the
+    fulfillment commit — or after `timeout` seconds (at most
+    WAIT_TIMEOUT) with whatever the status is then. Native async, so a
+    waiting request holds no thread.
+    """
+    session_id = request.GET.get("session_id")
+    if not session_id:
+        return JsonResponse({"error": "Missing session_id"}, status=400)
+    try:
+        timeout = float(request.GET.get("timeout", WAIT_TIMEOUT))
+    except ValueError:
+        timeout = math.nan
+    if not math.isfinite(timeout):
+        return JsonResponse({"error": "Invalid timeout"}, status=400)
+    timeout = min(max(timeout, 0.0), WAIT_TIMEOUT)
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    payments = StripePayment.objects.filter(stripe_checkout_session_id=session_id)
+    # Subscribe before the first read so a commit in between still wakes us.
+    with payment_events.subscribe(session_id) as changed:
+        while True:
+            payment = await payments.afirst()
+            if payment is None:
+                return JsonResponse({"status": "unknown"}, status=404)
+            remaining = deadline - loop.time()
+            if payment.status != PaymentStatus.CREATED or remaining <= 0:
+                break
+            await changed.wait(min(remaining, RECHECK_INTERVAL))
+
+    response = JsonResponse(_status_payload(payment))
+    add_never_cache_headers(response)
+    return response
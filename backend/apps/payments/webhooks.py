@@ -2,8 +2,9 @@ from __future__ import annotations
 
 import json
 import logging
+from contextlib import contextmanager
 from datetime import UTC, datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import stripe
 from django.conf import settings
@@ -12,12 +13,21 @@ from django.http import HttpRequest, HttpResponse
 from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
 
+from apps.availability import holds
+from apps.jobs.queue import enqueue
 from apps.vouchers.services import create_voucher, send_voucher_emails
 
-from .models import PaymentStatus, StripePayment, StripeWebhookEvent
+from .models import (
+    CheckoutDraft,
+    PaymentStatus,
+    StripePayment,
+    StripeWebhookEvent,
+    WebhookEventStatus,
+)
+from .notify import payment_events
 
-stripe.api_key = settings.STRIPE_SECRET_KEY
-stripe.api_version = settings.STRIPE_API_VERSION
+if TYPE_CHECKING:
+    from collections.abc import Iterator
 
 logger = logging.getLogger(__name__)
 
@@ -26,34 +36,89 @@ HANDLED_EVENTS = {
     "checkout.session.async_payment_succeeded",
 }
 
+# Job names (handlers in tasks.py).
+FULFILL_CHECKOUT = "payments.fulfill_checkout_session"
+EXPIRE_CHECKOUT = "payments.expire_checkout_session"
 
-def _already_processed(event_id: str) -> bool:
-    return StripeWebhookEvent.objects.filter(
-        stripe_event_id=event_id
-    ).exists()
 
-
-def _mark_processed(
+def _record_event(
     event_id: str,
     event_type: str,
     *,
     livemode: bool = False,
     created_ts: int | None = None,
-) -> None:
+    status: str = WebhookEventStatus.RECEIVED,
+) -> bool:
+    """Record the event; False if it was already recorded (a redelivery)."""
     stripe_created_at = None
     if created_ts:
         stripe_created_at = datetime.fromtimestamp(
             created_ts, tz=UTC
         )
 
-    StripeWebhookEvent.objects.create(
+    return StripeWebhookEvent.objects.record(
         stripe_event_id=event_id,
         event_type=event_type,
         livemode=livemode,
         stripe_created_at=stripe_created_at,
+        status=status,
     )
 
 
+@contextmanager
+def tracking_event(event_id: str) -> Iterator[None]:
+    """Reflect the outcome of the wrapped fulfillment on the event row."""
+    events = StripeWebhookEvent.objects.filter(stripe_event_id=event_id)
+    try:
+        yield
+    except Exception as exc:
+        events.update(status=WebhookEventStatus.FAILED, last_error=repr(exc))
+        raise
+    events.update(
+        status=WebhookEventStatus.PROCESSED,
+        processed_at=timezone.now(),
+        last_error="",
+    )
+
+
+def _plain(obj: Any) -> dict[str, Any]:
+    """A Stripe object as plain JSON data for a job payload."""
+    data: dict[str, Any] = json.loads(json.dumps(obj))
+    return data
+
+
+def _checkout_payload(session_obj: dict[str, Any]) -> dict[str, Any] | None:
+    """The checkout's validated payload, with its "kind"; None if lost.
+
+    Read from the session's CheckoutDraft — by session id, or by the
+    draft id in metadata should the id never have been saved. Sessions
+    created before drafts existed carry the payload as JSON metadata.
+    """
+    session_id = session_obj["id"]
+    metadata = session_obj.get("metadata") or {}
+    drafts = CheckoutDraft.objects.select_for_update()
+    draft = drafts.filter(stripe_checkout_session_id=session_id).first()
+    draft_id = str(metadata.get("draft_id") or "")
+    if draft is None and draft_id.isdigit():
+        draft = drafts.filter(pk=int(draft_id)).first()
+    if draft is not None:
+        return {"kind": draft.kind, **draft.as_payload()}
+
+    raw_payload = metadata.get("voucher_payload")
+    if not raw_payload:
+        logger.error("No checkout draft for session=%s", session_id)
+        return None
+    try:
+        payload: dict[str, Any] = json.loads(raw_payload)
+    except json.JSONDecodeError:
+        logger.exception(
+            "Invalid voucher_payload JSON for session=%s",
+            session_id,
+        )
+        return None
+    return payload
+
+
 @transaction.atomic
 def _fulfill_from_checkout_session(
     session_obj: dict[str, Any],
@@ -71,58 +136,59 @@ def _fulfill_from_checkout_session(
         )
         return
 
+    # Wake long-polls on the success page once this commits.
+    payment_events.publish_on_commit(session_id)
+
     if payment.status == PaymentStatus.PAID and (
         payment.voucher_id or payment.booking_id
     ):
         return  # idempotent
+    if payment.status == PaymentStatus.CONFLICT:
+        return  # already reported; a retry would not free the slot
 
     payment_intent = session_obj.get("payment_intent") or ""
     if payment_intent:
         payment.stripe_payment_intent_id = str(payment_intent)
 
-    metadata = session_obj.get("metadata") or {}
-    raw_payload = metadata.get("voucher_payload")
-    if not raw_payload:
-        logger.error(
-            "Missing voucher_payload metadata for session=%s",
-            session_id,
-        )
-        payment.status = PaymentStatus.FAILED
-        payment.save(
-            update_fields=["status", "stripe_payment_intent_id"]
-        )
-        return
-
-    try:
-        voucher_payload = json.loads(raw_payload)
-        logger.info(
-            "Voucher payload from Stripe (session=%s): %s",
-            session_id,
-            json.dumps(voucher_payload, default=str),
-        )
-    except json.JSONDecodeError:
-        logger.exception(
-            "Invalid voucher_payload JSON for session=%s",
-            session_id,
-        )
+    voucher_payload = _checkout_payload(session_obj)
+    if voucher_payload is None:
         payment.status = PaymentStatus.FAILED
         payment.save(
             update_fields=["status", "stripe_payment_intent_id"]
         )
         return
 
-    kind = voucher_payload.get("kind", "gift")
+    kind = voucher_payload.pop("kind", "gift")
 
     if kind == "booking":
         from apps.availability.services import (
+            SlotUnavailableError,
             create_booking_from_payload,
+            send_booking_conflict_email,
             send_booking_emails,
             sync_booking_to_calendar,
         )
 
-        booking, created = create_booking_from_payload(
-            voucher_payload, session_id=session_id
-        )
+        try:
+            booking, created = create_booking_from_payload(
+                voucher_payload, session_id=session_id
+            )
+        except SlotUnavailableError:
+            logger.error(
+                "Paid booking overlaps a confirmed booking (session=%s)",
+                session_id,
+            )
+            payment.status = PaymentStatus.CONFLICT
+            payment.paid_at = timezone.now()
+            payment.save(
+                update_fields=[
+                    "status",
+                    "paid_at",
+                    "stripe_payment_intent_id",
+                ]
+            )
+            send_booking_conflict_email(voucher_payload, session_id=session_id)
+            return
         payment.status = PaymentStatus.PAID
         payment.paid_at = timezone.now()
         payment.booking_id = booking.id
@@ -153,8 +219,8 @@ def _fulfill_from_checkout_session(
         ]
     )
 
-    # Email is intentionally outside the atomic save path —
-    # fulfillment is committed even if the email fails.
+    # The emails are queued in the outbox and commit with the voucher;
+    # a failure to build them must not undo the fulfillment.
     try:
         send_voucher_emails(voucher)
     except Exception:
@@ -164,6 +230,17 @@ def _fulfill_from_checkout_session(
         )
 
 
+@transaction.atomic
+def _expire_checkout_session(session_obj: dict[str, Any]) -> None:
+    """Abandoned checkout: free its slot hold now rather than at expiry."""
+    session_id = session_obj["id"]
+    holds.release_session_holds(session_id)
+    payment_events.publish_on_commit(session_id)
+    StripePayment.objects.filter(
+        stripe_checkout_session_id=session_id, status=PaymentStatus.CREATED
+    ).update(status=PaymentStatus.CANCELED)
+
+
 @csrf_exempt
 def stripe_webhook(request: HttpRequest) -> HttpResponse:
     payload = request.body
@@ -184,22 +261,39 @@ def stripe_webhook(request: HttpRequest) -> HttpResponse:
     event_id = event["id"]
     event_type = event["type"]
 
-    if _already_processed(event_id):
-        return HttpResponse(status=200)
-
-    _mark_processed(
-        event_id,
-        event_type,
-        livemode=bool(event.get("livemode")),
-        created_ts=event.get("created"),
-    )
-
     if event_type in HANDLED_EVENTS:
-        session_obj = event["data"]["object"]
-        _fulfill_from_checkout_session(session_obj)
+        job = FULFILL_CHECKOUT
+    elif event_type == "checkout.session.expired":
+        job = EXPIRE_CHECKOUT
     else:
+        job = None
         logger.info(
             "Ignoring unhandled Stripe event type: %s", event_type
         )
 
+    # Record and enqueue together, then answer: Stripe gets its 200
+    # without waiting on Google or SMTP, and a job exists exactly when
+    # the event is recorded. A redelivery, even one racing the first
+    # delivery, finds the row and enqueues nothing.
+    with transaction.atomic():
+        is_new = _record_event(
+            event_id,
+            event_type,
+            livemode=bool(event.get("livemode")),
+            created_ts=event.get("created"),
+            status=(
+                WebhookEventStatus.RECEIVED
+                if job
+                else WebhookEventStatus.IGNORED
+            ),
+        )
+        if is_new and job:
+            enqueue(
+                job,
+                {
+                    "session": _plain(event["data"]["object"]),
+                    "event_id": event_id,
+                },
+            )
+
     return HttpResponse(status=200)
@@ -1,6 +1,9 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.db.models import QuerySet
+from django.http import HttpRequest
 
 from .models import GiftVoucher
+from .services import push_vouchers_to_calendar, remove_vouchers_from_calendar
 
 
 @admin.register(GiftVoucher)
@@ -19,3 +22,16 @@ class GiftVoucherAdmin(admin.ModelAdmin):
     search_fields = ("code", "recipient_name", "sender_name", "recipient_email")
     readonly_fields = ("code", "created_at", "updated_at", "calendar_event_id", "calendar_event_link", "calendar_event_status")
     list_select_related = ("service",)
+    actions = ("push_to_calendar", "remove_from_calendar")
+
+    @admin.action(description="Add selected vouchers to Google Calendar")
+    def push_to_calendar(self, request: HttpRequest, queryset: QuerySet[GiftVoucher]) -> None:
+        pushed = push_vouchers_to_calendar(queryset.select_related("service"))
+        self.message_user(request, f"{pushed} voucher(s) added to the calendar.", messages.SUCCESS)
+
+    @admin.action(description="Remove selected vouchers from Google Calendar")
+    def remove_from_calendar(self, request: HttpRequest, queryset: QuerySet[GiftVoucher]) -> None:
+        linked = queryset.exclude(calendar_event_id="").count()
+        removed = remove_vouchers_from_calendar(queryset)
+        level = messages.SUCCESS if removed == linked else messages.WARNING
+        self.message_user(request, f"{removed} of {linked} voucher(s) removed from the calendar.", level)
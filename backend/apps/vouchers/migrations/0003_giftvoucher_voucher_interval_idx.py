@@ -0,0 +1,18 @@
+# Generated by Django 5.2.15 on 2026-10-18 05:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0001_initial'),
+        ('vouchers', '0002_remove_giftvoucher_booking_confirmation_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='giftvoucher',
+            index=models.Index(fields=['start_datetime', 'end_datetime'], name='voucher_interval_idx'),
+        ),
+    ]
@@ -52,6 +52,12 @@ class GiftVoucher(models.Model):
 
     class Meta:
         ordering = ("-created_at",)
+        indexes = (
+            models.Index(
+                fields=("start_datetime", "end_datetime"),
+                name="voucher_interval_idx",
+            ),
+        )
 
     def __str__(self) -> str:
         return f"Voucher {self.code} — {self.recipient_name}"
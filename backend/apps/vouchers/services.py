@@ -1,14 +1,19 @@
 import logging
+from collections.abc import Iterable
 from datetime import datetime
+from typing import Any
 from zoneinfo import ZoneInfo
 
 from django.conf import settings
-from django.core.mail import EmailMultiAlternatives
-from django.template.loader import TemplateDoesNotExist, render_to_string
-from django.utils.html import strip_tags
 
-from apps.availability.calendar_gateway import create_booking_event
-from apps.core.utils import safe_format
+from apps.availability.calendar_gateway import (
+    batch_create_events,
+    batch_delete_events,
+    booking_event_body,
+    create_booking_event,
+)
+from apps.emails.outbox import queue_email
+from apps.emails.rendering import render_email
 from apps.services.models import Service
 
 from .models import GiftVoucher
@@ -62,46 +67,19 @@ def _build_email_context(
 
 
 def _send_recipient_email(
-    voucher: GiftVoucher,
-    context: dict,
-    lang: str,
-    gift_settings: dict,
+    voucher: GiftVoucher, context: dict, lang: str
 ) -> None:
-    """Send gift voucher email to recipient."""
-    subject_template = (
-        "Your gift voucher from {business_name}"
-        if lang == "en"
-        else "Votre bon cadeau de {business_name}"
-    )
-    subject = safe_format(
-        subject_template,
-        business_name=gift_settings["business_name"],
-    )
-
-    html_template = f"vouchers/emails/voucher_recipient_{lang}.html"
-    text_template = f"vouchers/emails/voucher_recipient_{lang}.txt"
-
+    """Queue the gift voucher email to the recipient."""
     try:
-        html: str = render_to_string(html_template, context)
-        try:
-            text: str = render_to_string(text_template, context)
-        except TemplateDoesNotExist:
-            text = (
-                f"You have received a gift voucher: {voucher.code}\n"
-                f"From: {voucher.sender_name}\n"
-                f"Value: {voucher.amount} EUR"
+        email = render_email("voucher_recipient", context, lang=lang)
+        queue_email(
+            email.message(
+                to=[voucher.recipient_email],
+                from_email=settings.DEFAULT_FROM_EMAIL,
             )
-
-        msg = EmailMultiAlternatives(
-            subject=subject,
-            body=text,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[voucher.recipient_email],
         )
-        msg.attach_alternative(html, "text/html")
-        msg.send()
         logger.info(
-            "Recipient email sent for voucher %s to %s",
+            "Recipient email queued for voucher %s to %s",
             voucher.code,
             voucher.recipient_email,
         )
@@ -116,46 +94,19 @@ def _send_recipient_email(
 def _send_admin_email(
     voucher: GiftVoucher, context: dict, gift_settings: dict
 ) -> None:
-    """Send admin notification for voucher sale."""
+    """Queue the admin notification for a voucher sale."""
     admin_email = gift_settings.get("business_email") or settings.EMAIL_HOST_USER
     if not admin_email:
         logger.warning("No admin email configured — skipping admin notification.")
         return
 
-    subject = f"New voucher sold: {voucher.code}"
-    html_template = "vouchers/email_admin.html"
-
     try:
-        html: str = render_to_string(html_template, context)
-    except TemplateDoesNotExist:
-        logger.error("Template not found: %s", html_template)
-        html = (
-            f"<html><body>"
-            f"<h1>New Voucher: {voucher.code}</h1>"
-            f"<p>Sold for {voucher.amount} EUR</p>"
-            f"</body></html>"
+        email = render_email("voucher_admin", context)
+        queue_email(
+            email.message(to=[admin_email], from_email=settings.DEFAULT_FROM_EMAIL)
         )
-
-    text = (
-        f"A new voucher has been purchased.\n\n"
-        f"Code: {voucher.code}\n"
-        f"Purchaser: {voucher.sender_name}\n"
-        f"Recipient: {voucher.recipient_name}\n\n"
-        f"Amount: {voucher.amount}\n"
-        f"Check the admin panel for details."
-    )
-
-    try:
-        msg = EmailMultiAlternatives(
-            subject=subject,
-            body=text,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[admin_email],
-        )
-        msg.attach_alternative(html, "text/html")
-        msg.send()
         logger.info(
-            "Admin notification sent to %s for voucher %s",
+            "Admin notification queued to %s for voucher %s",
             admin_email,
             voucher.code,
         )
@@ -166,35 +117,21 @@ def _send_admin_email(
 def _send_sender_receipt(
     voucher: GiftVoucher, context: dict, lang: str
 ) -> None:
-    """Send order receipt to voucher sender."""
+    """Queue the order receipt to the voucher sender."""
     if not voucher.sender_email:
         logger.info("No sender email provided, skipping receipt.")
         return
 
-    subject_template = (
-        "Your order receipt: {code}"
-        if lang == "en"
-        else "Reçu de votre commande : {code}"
-    )
-    subject = safe_format(subject_template, code=voucher.code)
-
-    html_template = f"vouchers/emails/voucher_sender_{lang}.html"
-
     try:
-        html_message = render_to_string(html_template, context)
-        plain_message = strip_tags(html_message)
-
-        msg = EmailMultiAlternatives(
-            subject=subject,
-            body=plain_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[voucher.sender_email],
+        email = render_email("voucher_sender", context, lang=lang)
+        queue_email(
+            email.message(
+                to=[voucher.sender_email],
+                from_email=settings.DEFAULT_FROM_EMAIL,
+            )
         )
-        msg.attach_alternative(html_message, "text/html")
-        msg.send()
-
         logger.info(
-            "Sender receipt sent to %s for voucher %s",
+            "Sender receipt queued to %s for voucher %s",
             voucher.sender_email,
             voucher.code,
         )
@@ -207,16 +144,45 @@ def _send_sender_receipt(
 
 
 def send_voucher_emails(voucher: GiftVoucher) -> None:
-    """Send all voucher-related emails."""
+    """Queue all voucher-related emails in the outbox."""
     gift_settings = _resolve_gift_settings()
     lang = _resolve_language(voucher)
     context = _build_email_context(voucher, gift_settings, lang)
 
-    _send_recipient_email(voucher, context, lang, gift_settings)
+    _send_recipient_email(voucher, context, lang)
     _send_admin_email(voucher, context, gift_settings)
     _send_sender_receipt(voucher, context, lang)
 
 
+def _voucher_event_args(voucher: GiftVoucher) -> dict[str, Any]:
+    """create_booking_event kwargs for a voucher booked at purchase."""
+    service_title = getattr(voucher.service, "title_fr", "Service")
+    return {
+        "title": f"[Voucher] {voucher.recipient_name} - {service_title}",
+        "start_datetime": voucher.start_datetime,
+        "end_datetime": voucher.end_datetime,
+        "client_email": voucher.recipient_email.strip() if voucher.recipient_email else "",
+        "client_name": voucher.recipient_name.strip() if voucher.recipient_name else "",
+        "description": (
+            f"Voucher code: {voucher.code}\n"
+            f"Sender: {voucher.sender_name} <{voucher.sender_email}>"
+        ),
+    }
+
+
+def _apply_calendar_event(voucher: GiftVoucher, event: dict[str, Any]) -> None:
+    voucher.calendar_event_id = event["id"] or ""
+    voucher.calendar_event_link = event.get("link") or ""
+    voucher.calendar_event_status = event.get("status") or ""
+
+
+_CALENDAR_FIELDS = [
+    "calendar_event_id",
+    "calendar_event_link",
+    "calendar_event_status",
+]
+
+
 def _create_calendar_event_for_voucher(
     voucher: GiftVoucher,
 ) -> None:
@@ -228,42 +194,20 @@ def _create_calendar_event_for_voucher(
     ):
         return
 
-    service_title = getattr(voucher.service, "title_fr", "Service")
-    title = f"[Voucher] {voucher.recipient_name} - {service_title}"
-
-    client_email = voucher.recipient_email.strip() if voucher.recipient_email else ""
-    client_name = voucher.recipient_name.strip() if voucher.recipient_name else ""
+    args = _voucher_event_args(voucher)
 
     logger.info(
         "Calendar sync for %s — email=%r, name=%r",
         voucher.code,
-        client_email,
-        client_name,
+        args["client_email"],
+        args["client_name"],
     )
 
-    event = create_booking_event(
-        title=title,
-        start_datetime=voucher.start_datetime,
-        end_datetime=voucher.end_datetime,
-        client_email=client_email,
-        client_name=client_name,
-        description=(
-            f"Voucher code: {voucher.code}\n"
-            f"Sender: {voucher.sender_name} <{voucher.sender_email}>"
-        ),
-    )
+    event = create_booking_event(**args)
 
     if event and event.get("id"):
-        voucher.calendar_event_id = event["id"] or ""
-        voucher.calendar_event_link = event.get("link") or ""
-        voucher.calendar_event_status = event.get("status") or ""
-        voucher.save(
-            update_fields=[
-                "calendar_event_id",
-                "calendar_event_link",
-                "calendar_event_status",
-            ]
-        )
+        _apply_calendar_event(voucher, event)
+        voucher.save(update_fields=_CALENDAR_FIELDS)
         logger.info("Calendar event created: %s", event.get("id"))
     else:
         logger.warning(
@@ -272,6 +216,60 @@ def _create_calendar_event_for_voucher(
         )
 
 
+def push_vouchers_to_calendar(vouchers: Iterable[GiftVoucher]) -> int:
+    """Create the missing calendar events for many vouchers at once.
+
+    Vouchers without a slot or already on the calendar are skipped.
+    Inserts go out in Google batch requests; only failed items are
+    retried, and a voucher whose insert still fails keeps an empty
+    calendar_event_id so the next push picks it up. Returns how many
+    vouchers were put on the calendar.
+    """
+    pending = {
+        str(v.pk): v
+        for v in vouchers
+        if v.service and v.start_datetime and v.end_datetime and not v.calendar_event_id
+    }
+    created = batch_create_events(
+        {
+            key: booking_event_body(**_voucher_event_args(voucher))
+            for key, voucher in pending.items()
+        }
+    )
+    updated = []
+    for key, event in created.items():
+        if event:
+            _apply_calendar_event(pending[key], event)
+            updated.append(pending[key])
+    GiftVoucher.objects.bulk_update(updated, _CALENDAR_FIELDS)
+    if len(updated) < len(pending):
+        logger.warning(
+            "%d voucher(s) could not be put on the calendar",
+            len(pending) - len(updated),
+        )
+    return len(updated)
+
+
+def remove_vouchers_from_calendar(vouchers: Iterable[GiftVoucher]) -> int:
+    """Delete the calendar events of many vouchers in batched requests.
+
+    Clears the calendar fields of each voucher whose event is gone.
+    Returns how many were removed.
+    """
+    by_event = {v.calendar_event_id: v for v in vouchers if v.calendar_event_id}
+    deleted = batch_delete_events(list(by_event))
+    updated = []
+    for event_id, gone in deleted.items():
+        if gone:
+            voucher = by_event[event_id]
+            voucher.calendar_event_id = ""
+            voucher.calendar_event_link = ""
+            voucher.calendar_event_status = ""
+            updated.append(voucher)
+    GiftVoucher.objects.bulk_update(updated, _CALENDAR_FIELDS)
+    return len(updated)
+
+
 def create_voucher(data: dict) -> GiftVoucher:
     """Create voucher and optionally sync calendar event."""
     service_id = data.pop("service_id", None)
@@ -2,11 +2,10 @@ from __future__ import annotations
 
 from datetime import UTC, datetime
 from decimal import Decimal
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 from zoneinfo import ZoneInfo
 
 import pytest
-from django.template import TemplateDoesNotExist
 
 from apps.vouchers import services as voucher_services
 
@@ -113,80 +112,59 @@ class TestVoucherSettingsHelpers:
         assert context["site_url"] == "https://example.com"
 
 
+def _queued(mock_queue):
+    mock_queue.assert_called_once()
+    return mock_queue.call_args.args[0]
+
+
 @pytest.mark.django_db
 class TestRecipientEmail:
-    @patch("apps.vouchers.services.EmailMultiAlternatives")
-    @patch("apps.vouchers.services.render_to_string")
-    def test_send_recipient_email_success(
-        self, mock_render, mock_email_cls, voucher_factory, settings
-    ):
+    @patch("apps.vouchers.services.queue_email")
+    def test_send_recipient_email_success(self, mock_queue, voucher_factory, settings):
         settings.DEFAULT_FROM_EMAIL = "no-reply@example.com"
-        voucher = voucher_factory(amount=Decimal("100.00"))
-        context = {"voucher": voucher}
-        gift_settings = {"business_name": "Serenity Touch"}
-
-        mock_render.side_effect = ["<p>Hello</p>", "Plain text body"]
-        mock_msg = MagicMock()
-        mock_email_cls.return_value = mock_msg
-
-        voucher_services._send_recipient_email(voucher, context, "en", gift_settings)
-
-        mock_email_cls.assert_called_once()
-        kwargs = mock_email_cls.call_args.kwargs
-        assert kwargs["subject"] == "Your gift voucher from Serenity Touch"
-        assert kwargs["from_email"] == "no-reply@example.com"
-        assert kwargs["to"] == [voucher.recipient_email]
-        mock_msg.attach_alternative.assert_called_once_with("<p>Hello</p>", "text/html")
-        mock_msg.send.assert_called_once()
-
-    @patch("apps.vouchers.services.EmailMultiAlternatives")
-    @patch("apps.vouchers.services.render_to_string")
-    def test_send_recipient_email_falls_back_when_text_template_missing(
-        self, mock_render, mock_email_cls, voucher_factory, settings
+        voucher = voucher_factory(code="ABC1234567", amount=Decimal("100.00"))
+        context = {"voucher": voucher, "business_name": "Serenity Touch"}
+
+        voucher_services._send_recipient_email(voucher, context, "en")
+
+        message = _queued(mock_queue)
+        assert message.subject == "Your gift voucher from Serenity Touch"
+        assert message.from_email == "no-reply@example.com"
+        assert message.to == [voucher.recipient_email]
+        assert "YOUR VOUCHER CODE: ABC1234567" in message.body
+        html, mimetype = message.alternatives[0]
+        assert mimetype == "text/html"
+        assert "ABC1234567" in html
+
+    @patch("apps.vouchers.services.queue_email")
+    def test_send_recipient_email_text_is_not_html_escaped(
+        self, mock_queue, voucher_factory
     ):
-        settings.DEFAULT_FROM_EMAIL = "no-reply@example.com"
-        voucher = voucher_factory(
-            code="ABC1234567",
-            sender_name="Bob",
-            amount=Decimal("100.00"),
-        )
-        context = {"voucher": voucher}
-        gift_settings = {"business_name": "Serenity Touch"}
-
-        mock_render.side_effect = [
-            "<p>Hello</p>",
-            TemplateDoesNotExist("missing txt"),
-        ]
-        mock_msg = MagicMock()
-        mock_email_cls.return_value = mock_msg
+        voucher = voucher_factory(sender_name="Zoé & Jean")
+        context = {"voucher": voucher, "business_name": "Serenity"}
 
-        voucher_services._send_recipient_email(voucher, context, "en", gift_settings)
+        voucher_services._send_recipient_email(voucher, context, "fr")
 
-        kwargs = mock_email_cls.call_args.kwargs
-        assert "You have received a gift voucher" in kwargs["body"]
-        assert "ABC1234567" in kwargs["body"]
-        mock_msg.send.assert_called_once()
+        message = _queued(mock_queue)
+        assert "Zoé & Jean vous a envoyé" in message.body
+        assert "Zoé &amp; Jean" in message.alternatives[0][0]
 
-    @patch("apps.vouchers.services.render_to_string", side_effect=Exception("boom"))
+    @patch("apps.vouchers.services.render_email", side_effect=Exception("boom"))
     def test_send_recipient_email_logs_and_does_not_raise(
         self, mock_render, voucher_factory, caplog
     ):
         voucher = voucher_factory(code="ERR1234567")
         context = {"voucher": voucher}
-        gift_settings = {"business_name": "Serenity Touch"}
 
-        voucher_services._send_recipient_email(voucher, context, "fr", gift_settings)
+        voucher_services._send_recipient_email(voucher, context, "fr")
 
         assert "Error sending recipient email" in caplog.text
 
 
 @pytest.mark.django_db
 class TestAdminEmail:
-    @patch("apps.vouchers.services.EmailMultiAlternatives")
-    @patch("apps.vouchers.services.render_to_string")
-    def test_send_admin_email_success(
-        self, mock_render, mock_email_cls, voucher_factory, settings
-    ):
+    @patch("apps.vouchers.services.queue_email")
+    def test_send_admin_email_success(self, mock_queue, voucher_factory, settings):
         settings.DEFAULT_FROM_EMAIL = "no-reply@example.com"
         settings.EMAIL_HOST_USER = "host@example.com"
 
@@ -194,16 +172,14 @@ class TestAdminEmail:
         context = {"voucher": voucher}
         gift_settings = {"business_email": "admin@example.com"}
 
-        mock_render.return_value = "<p>Admin</p>"
-        mock_msg = MagicMock()
-        mock_email_cls.return_value = mock_msg
-
         voucher_services._send_admin_email(voucher, context, gift_settings)
 
-        kwargs = mock_email_cls.call_args.kwargs
-        assert kwargs["subject"] == "New voucher sold: ADM1234567"
-        assert kwargs["to"] == ["admin@example.com"]
-        mock_msg.send.assert_called_once()
+        message = _queued(mock_queue)
+        assert message.subject == "New voucher sold: ADM1234567"
+        assert message.to == ["admin@example.com"]
+        assert "Code: ADM1234567" in message.body
+        assert "Amount: 100.00" in message.body
+        assert "ADM1234567" in message.alternatives[0][0]
 
     def test_send_admin_email_skips_when_no_admin_email(
         self, voucher_factory, settings, caplog
@@ -217,53 +193,23 @@ class TestAdminEmail:
 
         assert "skipping admin notification" in caplog.text.lower()
 
-    @patch("apps.vouchers.services.EmailMultiAlternatives")
-    @patch(
-        "apps.vouchers.services.render_to_string",
-        side_effect=TemplateDoesNotExist("missing"),
-    )
-    def test_send_admin_email_falls_back_when_template_missing(
-        self, mock_render, mock_email_cls, voucher_factory, settings
-    ):
-        settings.DEFAULT_FROM_EMAIL = "no-reply@example.com"
-        settings.EMAIL_HOST_USER = "host@example.com"
-
-        voucher = voucher_factory(code="ADM7654321", amount=Decimal("100.00"))
-        context = {"voucher": voucher}
-        gift_settings = {"business_email": "admin@example.com"}
-
-        mock_msg = MagicMock()
-        mock_email_cls.return_value = mock_msg
-
-        voucher_services._send_admin_email(voucher, context, gift_settings)
-
-        attached_html = mock_msg.attach_alternative.call_args.args[0]
-        assert "New Voucher: ADM7654321" in attached_html
-        assert "Sold for 100.00 EUR" in attached_html
-        mock_msg.send.assert_called_once()
-
 
 @pytest.mark.django_db
 class TestSenderReceipt:
-    @patch("apps.vouchers.services.EmailMultiAlternatives")
-    @patch("apps.vouchers.services.render_to_string")
-    def test_send_sender_receipt_success(
-        self, mock_render, mock_email_cls, voucher_factory, settings
-    ):
+    @patch("apps.vouchers.services.queue_email")
+    def test_send_sender_receipt_success(self, mock_queue, voucher_factory, settings):
         settings.DEFAULT_FROM_EMAIL = "no-reply@example.com"
         voucher = voucher_factory(code="SND1234567", sender_email="sender@example.com")
-        context = {"voucher": voucher}
-
-        mock_render.return_value = "<p>Receipt</p>"
-        mock_msg = MagicMock()
-        mock_email_cls.return_value = mock_msg
+        context = {"voucher": voucher, "business_name": "Serenity"}
 
         voucher_services._send_sender_receipt(voucher, context, "en")
 
-        kwargs = mock_email_cls.call_args.kwargs
-        assert kwargs["subject"] == "Your order receipt: SND1234567"
-        assert kwargs["to"] == ["sender@example.com"]
-        mock_msg.send.assert_called_once()
+        message = _queued(mock_queue)
+        assert message.subject == "Your order receipt: SND1234567"
+        assert message.to == ["sender@example.com"]
+        assert "Voucher Code: SND1234567" in message.body
+        assert "<" not in message.body
+        assert "SND1234567" in message.alternatives[0][0]
 
     def test_send_sender_receipt_skips_when_sender_email_missing(
         self, voucher_factory, caplog
@@ -275,7 +221,7 @@ class TestSenderReceipt:
 
         assert "skipping receipt" in caplog.text.lower()
 
-    @patch("apps.vouchers.services.render_to_string", side_effect=Exception("boom"))
+    @patch("apps.vouchers.services.render_email", side_effect=Exception("boom"))
     def test_send_sender_receipt_logs_and_does_not_raise(
         self, mock_render, voucher_factory, caplog
     ):
@@ -1,3 +1,4 @@
+from django.db import transaction
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import AllowAny
@@ -20,8 +21,10 @@ def create_voucher_view(request: Request) -> Response:
     serializer = GiftVoucherInputSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
 
-    voucher = create_voucher(serializer.validated_data)
-    send_voucher_emails(voucher)
+    # The voucher and its emails (queued in the outbox) commit together.
+    with transaction.atomic():
+        voucher = create_voucher(serializer.validated_data)
+        send_voucher_emails(voucher)
 
     response_serializer = GiftVoucherResponseSerializer(voucher)
     return Response(response_serializer.data, status=status.HTTP_201_CREATED)
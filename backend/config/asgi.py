@@ -14,3 +14,15 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.production')
 
 application = get_asgi_application()
+
+# Imported after setup: the app registry must be ready.
+from apps.availability import prewarm  # noqa: E402
+from apps.emails import sender  # noqa: E402
+from apps.jobs import worker  # noqa: E402
+from apps.payments import notify, reconcile  # noqa: E402
+
+prewarm.start_in_background()
+worker.start_in_background()
+sender.start_in_background()
+reconcile.start_in_background()
+notify.start_in_background()
@@ -3,6 +3,7 @@ Shared settings for all environments.
 Nothing environment-specific belongs here.
 """
 
+import json
 from pathlib import Path
 
 from corsheaders.defaults import default_headers
@@ -62,6 +63,8 @@ INSTALLED_APPS = [
     'apps.contact',
     "apps.payments",
     'apps.vouchers',
+    'apps.jobs',
+    'apps.emails',
 ]
 
 # Optional: rate limiting
@@ -139,6 +142,8 @@ SPECTACULAR_SETTINGS = {
     "SERVE_INCLUDE_SCHEMA": False,
     "COMPONENT_SPLIT_REQUEST": True,
     "SCHEMA_PATH_PREFIX": r"/api/",
+    # Native async views, described by apps.core.openapi.documented_view.
+    "PREPROCESSING_HOOKS": ["apps.core.openapi.add_documented_views"],
     "TAGS": [
         {"name": "cms", "description": "CMS & hydrated homepage"},
         {"name": "vouchers", "description": "Gift voucher operations"},
@@ -172,6 +177,18 @@ STRIPE_LIVEMODE = config(
     cast=lambda v: str(v).lower() in ("1", "true", "yes", "on"),
 )
 
+# Shared Stripe client (apps.payments.stripe_gateway). STRIPE_API_BASE
+# points it at a local fake server for benchmarks.
+STRIPE_CLIENT = {
+    "CONNECT_TIMEOUT": config("STRIPE_CONNECT_TIMEOUT", cast=float, default=3.0),
+    "READ_TIMEOUT": config("STRIPE_READ_TIMEOUT", cast=float, default=20.0),
+    "MAX_RETRIES": config("STRIPE_MAX_RETRIES", cast=int, default=2),
+    "API_BASE": config("STRIPE_API_BASE", default="") or None,
+}
+# Fulfill paid sessions whose webhook was lost (apps.payments.reconcile).
+# `manage.py run_worker` runs the loop; this runs it in the web worker.
+STRIPE_RECONCILE = config("STRIPE_RECONCILE", cast=bool, default=False)
+
 # ── CORS ────────────────────────────────────────────
 CORS_ALLOWED_ORIGINS = config('CORS_ALLOWED_ORIGINS', cast=Csv(), default='')
 CSRF_TRUSTED_ORIGINS = config('CSRF_TRUSTED_ORIGINS', cast=Csv(), default='')
@@ -271,6 +288,76 @@ CACHE_MIDDLEWARE_ALIAS = 'default'
 CACHE_MIDDLEWARE_SECONDS = 300
 CACHE_MIDDLEWARE_KEY_PREFIX = ''
 
+# Hydrated homepage payload, one entry per site (apps.cms.cache). Content
+# changes invalidate it; TTL catches what the signals cannot see.
+HOMEPAGE_CACHE = {
+    'ALIAS': 'default',
+    'TTL': config('HOMEPAGE_CACHE_TTL', cast=int, default=3600),
+}
+
+# Month-level busy-interval cache for /api/calendar/ (apps.availability.cache).
+# With a watch channel open (manage.py watch_calendar) edits invalidate
+# the affected months immediately, so TTL can safely be raised.
+AVAILABILITY_CACHE = {
+    'ALIAS': 'default',
+    'TTL': config('AVAILABILITY_CACHE_TTL', cast=int, default=300),
+    'STALE_TTL': config('AVAILABILITY_CACHE_STALE_TTL', cast=int, default=3600),
+}
+
+# Seconds the Google mirror may go without a successful sync before
+# availability falls back to live Google reads (apps.availability.sync).
+AVAILABILITY_MIRROR_MAX_AGE = config('AVAILABILITY_MIRROR_MAX_AGE', cast=int, default=900)
+
+# Calendars besides GOOGLE_CALENDAR_ID that block bookings, as JSON
+# mapping calendar id -> service ids it applies to (null: every service),
+# e.g. {"room@group.calendar.google.com": [3, 4]} (apps.availability.calendars).
+AVAILABILITY_CALENDARS = config('AVAILABILITY_CALENDARS', cast=json.loads, default='{}')
+
+# Which of those are shared resources (rooms, studio closures) rather
+# than practitioners, as a comma-separated list of calendar ids.
+AVAILABILITY_SHARED_CALENDARS = config('AVAILABILITY_SHARED_CALENDARS', cast=Csv(), default='')
+
+# Keep the next AVAILABILITY_PREWARM_WEEKS of availability cached
+# (apps.availability.prewarm). `manage.py run_worker` always does;
+# AVAILABILITY_PREWARM also runs it in each web worker, for a
+# per-process cache.
+AVAILABILITY_PREWARM = config('AVAILABILITY_PREWARM', cast=bool, default=False)
+AVAILABILITY_PREWARM_WEEKS = config('AVAILABILITY_PREWARM_WEEKS', cast=int, default=6)
+
+# Durable job queue (apps.jobs). Run `manage.py run_jobs --loop`, or let
+# each web worker poll the queue from a daemon thread.
+JOBS_RUN_IN_WEB = config('JOBS_RUN_IN_WEB', cast=bool, default=False)
+JOBS = {
+    'MAX_ATTEMPTS': config('JOBS_MAX_ATTEMPTS', cast=int, default=8),
+}
+
+# Contact form notifications (apps.contact.services). A DIGEST_WINDOW in
+# seconds gathers the submissions of that window into one admin email.
+CONTACT_NOTIFICATIONS = {
+    'DIGEST_WINDOW': config('CONTACT_DIGEST_WINDOW', cast=int, default=0),
+    'DIGEST_MAX': config('CONTACT_DIGEST_MAX', cast=int, default=20),
+}
+
+# Transactional email outbox (apps.emails). Run `manage.py send_emails
+# --loop`, or let each web worker send from a daemon thread.
+EMAIL_OUTBOX_IN_WEB = config('EMAIL_OUTBOX_IN_WEB', cast=bool, default=False)
+EMAIL_OUTBOX = {
+    'MAX_ATTEMPTS': config('EMAIL_OUTBOX_MAX_ATTEMPTS', cast=int, default=10),
+    'BATCH': config('EMAIL_OUTBOX_BATCH', cast=int, default=50),
+}
+
+# Minimum gap kept free either side of an appointment (apps.availability.slots).
+AVAILABILITY_BUFFER_MINUTES = config('AVAILABILITY_BUFFER_MINUTES', cast=int, default=0)
+
+# Seconds a CDN may share an availability response (s-maxage). Browsers
+# always revalidate against the ETag, which is answered with a 304.
+AVAILABILITY_EDGE_MAX_AGE = config('AVAILABILITY_EDGE_MAX_AGE', cast=int, default=15)
+
+# How long a booking checkout holds its slot (apps.availability.holds).
+# The Stripe session expires 5 minutes earlier; Stripe's minimum is 30,
+# so values under 36 are raised to 36.
+SLOT_HOLD_MINUTES = config('SLOT_HOLD_MINUTES', cast=int, default=40)
+
 # ── Logging ─────────────────────────────────────────
 LOGGING = {
     'version': 1,
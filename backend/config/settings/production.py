@@ -26,41 +26,65 @@ DATABASES = {
 
 
 
-# ── Cache — Redis ───────────────────────────────────
-# REDIS_URL = config("REDIS_URL", default=None)
-
-# if REDIS_URL:
-#     CACHES = {
-#         "default": {
-#             "BACKEND": "django_redis.cache.RedisCache",
-#             "LOCATION": REDIS_URL,
-#             "OPTIONS": {
-#                 "CLIENT_CLASS": "django_redis.client.DefaultClient",
-#                 "IGNORE_EXCEPTIONS": True,
-#                 "CONNECTION_POOL_KWARGS": {
-#                     "max_connections": 50,
-#                     "health_check_interval": 30,
-#                     "retry_on_timeout": True,
-#                     },
-#                 "SOCKET_CONNECT_TIMEOUT": 5,
-#                 "SOCKET_TIMEOUT": 5,
-#             },
-#             "KEY_PREFIX": "serenity",
-#         }
-#     }
-# else:
-#     CACHES = {
-#         "default": {
-#             "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-#             "LOCATION": "serenity-prod-fallback",
-#         }
-#     }
-# ── Cache — disabled for launch (no stale content) ─
-CACHES = {
-    "default": {
-        "BACKEND": "django.core.cache.backends.dummy.DummyCache",
+# ── Cache — Redis if configured, else per process ───
+# Throttling counters live in the default cache: Redis when REDIS_URL
+# is set, otherwise local memory, so rate limiting never costs a
+# Postgres round trip.
+REDIS_URL = config("REDIS_URL", default=None)
+if REDIS_URL:
+    _default_cache = {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": REDIS_URL,
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "IGNORE_EXCEPTIONS": True,
+            "CONNECTION_POOL_KWARGS": {
+                "max_connections": 50,
+                "health_check_interval": 30,
+                "retry_on_timeout": True,
+            },
+            "SOCKET_CONNECT_TIMEOUT": 5,
+            "SOCKET_TIMEOUT": 5,
+        },
+        "KEY_PREFIX": "serenity",
+    }
+else:
+    _default_cache = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "serenity-prod-fallback",
     }
+CACHES = {
+    "default": _default_cache,
+    # The hydrated homepage payload (apps.cms.cache) must be shared by
+    # every worker and machine so content signals invalidate it
+    # everywhere: Redis if configured, else the Postgres table
+    # "django_cache" (created by fly.toml's release_command).
+    "homepage": _default_cache if REDIS_URL else {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "django_cache",
+        "KEY_PREFIX": "serenity",
+    },
+    # Availability is invalidated by calendar syncs and fulfillment in
+    # the worker process, so the web process must read the same cache:
+    # Redis if configured, else its own Postgres table (so homepage
+    # entries and busy months never cull each other).
+    "availability": _default_cache if REDIS_URL else {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "availability_cache",
+        "KEY_PREFIX": "serenity",
+        "OPTIONS": {"MAX_ENTRIES": 2000},
+    },
 }
+AVAILABILITY_CACHE = {**AVAILABILITY_CACHE, "ALIAS": "availability"}
+HOMEPAGE_CACHE = {**HOMEPAGE_CACHE, "ALIAS": "homepage"}
+# The shared availability cache is warmed once, by the worker process
+# (`manage.py run_worker`); AVAILABILITY_PREWARM keeps its base default
+# (off) so web workers do not each repeat it.
+# The job queue, the email outbox and Stripe reconciliation run in the
+# fly.toml worker process (`manage.py run_worker`), not in the web
+# worker: JOBS_RUN_IN_WEB, EMAIL_OUTBOX_IN_WEB and STRIPE_RECONCILE keep
+# their base default (off) and are only a fallback for a deployment
+# without the worker process.
 # ── Cloudinary ──────────────────────────────────────
 _cloudinary.config(
     cloud_name=config("CLOUDINARY_CLOUD_NAME"),
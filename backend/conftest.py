@@ -14,3 +14,16 @@ def _isolated_cache() -> Iterator[None]:
     """
     cache.clear()
     yield
+
+
+@pytest.fixture(autouse=True)
+def _closed_calendar_breaker() -> Iterator[None]:
+    """Every test starts with the Google Calendar circuit closed.
+
+    Tests that exercise failure paths feed it failures; left alone it
+    would trip and short-circuit unrelated tests later in the run.
+    """
+    from apps.availability.calendar_gateway import _breaker
+
+    _breaker.reset()
+    yield
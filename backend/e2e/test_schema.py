@@ -29,10 +29,22 @@ class TestOpenAPISchema:
         critical = [
             "/api/homepage/hydrated/",
             "/api/vouchers/create/",
+            "/api/calendar/busy/",
+            "/api/calendar/slots/",
+            "/api/calendar/slots/range/",
         ]
         for path in critical:
             assert path in paths, f"Missing critical endpoint: {path}"
 
+    def test_async_availability_views_are_described(self) -> None:
+        schema = self._generate_schema()
+        slots = schema["paths"]["/api/calendar/slots/"]["get"]
+
+        assert {p["name"] for p in slots["parameters"]} == {"date", "service"}
+        ref = slots["responses"]["200"]["content"]["application/json"]["schema"]["$ref"]
+        component = schema["components"]["schemas"][ref.split("/")[-1]]
+        assert "times" in component["properties"]
+
     def test_hydrated_response_shape(self) -> None:
         schema = self._generate_schema()
         hydrated_path = schema["paths"].get("/api/homepage/hydrated/", {})
@@ -49,4 +49,10 @@ describe("endpoints", () => {
   it("paymentsStatus returns correct path", () => {
     expect(endpoints.paymentsStatus()).toBe("/api/payments/status/");
   });
+
+  it("paymentsStatusWait returns correct path", () => {
+    expect(endpoints.paymentsStatusWait()).toBe(
+      "/api/payments/status/wait/"
+    );
+  });
 });
@@ -9,4 +9,5 @@ export const endpoints = {
   calendarSlots: () => "/api/calendar/slots/",
   paymentsCheckout: () => "/api/payments/checkout/",
   paymentsStatus: () => "/api/payments/status/",
+  paymentsStatusWait: () => "/api/payments/status/wait/",
 } as const;
@@ -25,4 +25,20 @@ export const paymentsApi = {
     );
     return res.data;
   },
+
+  // Long-poll: the server answers as soon as the payment leaves
+  // "created", or after `timeoutSeconds` with the status as it is.
+  waitForPaymentStatus: async (
+    sessionId: string,
+    timeoutSeconds = 25,
+  ): Promise<PaymentStatusResponse> => {
+    const res = await apiClient.get<PaymentStatusResponse>(
+      endpoints.paymentsStatusWait(),
+      {
+        params: { session_id: sessionId, timeout: timeoutSeconds },
+        timeout: (timeoutSeconds + 10) * 1000,
+      },
+    );
+    return res.data;
+  },
 };
@@ -64,7 +64,7 @@ describe("Router integration", () => {
 
   it("renders voucher success page at /voucher/success with session_id", async () => {
     server.use(
-      http.get("*/api/payments/status/", () => {
+      http.get("*/api/payments/status/wait/", () => {
         return HttpResponse.json({ status: "paid" });
       }),
     );
@@ -38,53 +38,44 @@ function VoucherSuccess() {
     }
 
     let cancelled = false;
-    let attempts = 0;
-    const maxAttempts = 15;
-
-    const checkStatus = async (): Promise<boolean> => {
-      try {
-        const data = await paymentsApi.getPaymentStatus(session_id);
-
-        if (cancelled) return true;
-
-        if (data.status === "paid") {
-          setStatus("paid");
-          return true;
-        }
-
-        if (
-          data.status === "failed" ||
-          data.status === "canceled"
-        ) {
-          setStatus("failed");
-          return true;
+    // Each attempt is a long-poll that returns the moment the webhook
+    // is fulfilled, so this is usually a single request.
+    const maxAttempts = 4;
+
+    const waitForStatus = async (): Promise<void> => {
+      for (let attempt = 0; attempt < maxAttempts; attempt += 1) {
+        try {
+          const data = await paymentsApi.waitForPaymentStatus(session_id);
+
+          if (cancelled) return;
+
+          if (data.status === "paid") {
+            setStatus("paid");
+            return;
+          }
+
+          if (
+            data.status === "failed" ||
+            data.status === "canceled"
+          ) {
+            setStatus("failed");
+            return;
+          }
+
+          setStatus("processing");
+        } catch (error) {
+          console.error("Failed to check status", error);
+          await new Promise((resolve) => window.setTimeout(resolve, 2000));
         }
-
-        setStatus("processing");
-        return false;
-      } catch (error) {
-        console.error("Failed to check status", error);
-        return false;
+        if (cancelled) return;
       }
+      setStatus("failed");
     };
 
-    void checkStatus();
-
-    const interval = window.setInterval(async () => {
-      attempts += 1;
-      const done = await checkStatus();
-
-      if (done || attempts >= maxAttempts) {
-        window.clearInterval(interval);
-        if (!done && !cancelled) {
-          setStatus("failed");
-        }
-      }
-    }, 2000);
+    void waitForStatus();
 
     return () => {
       cancelled = true;
-      window.clearInterval(interval);
     };
   }, [session_id]);
 